@@ -17,32 +17,25 @@ from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QGroupBox, QGridLayout, QLabel, QProgressBar,
     QPushButton, QSlider, QDoubleSpinBox, QTextEdit,
-    QTabWidget
+    QTabWidget, QComboBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QTimer
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.image_pb2 import Image
-    from gz.msgs10.double_pb2 import Double
-    from gz.msgs10.pose_v_pb2 import Pose_V
-    from gz.msgs10.light_pb2 import Light
+    from sim_transport import (Node, Image, Double, Pose_V, Light, cmd_pos_topic,
+                               joint_state_topic, light_topic, pose_topic)
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
-WORLD_NAME = "three_link_with_tracker_plate_world"
-LIGHT_NAME = "sun"
+from kinematics import quaternion_to_rotation_matrix
+from pose_demux import PoseDemux
+from ui_model import UIModel
+from tracker_config import load_step_params
+from tracker_control import CONTROL_MODES, PITrackingLaw, feedforward_step
 
-def quaternion_to_rotation_matrix(q):
-    """Converte quaternion (w, x, y, z) para matriz de rotação 3x3."""
-    w, x, y, z = q.w, q.x, q.y, q.z
-    return np.array([
-        [1 - 2*y*y - 2*z*z,     2*x*y - 2*z*w,     2*x*z + 2*y*w],
-        [    2*x*y + 2*z*w, 1 - 2*x*x - 2*z*z,     2*y*z - 2*x*w],
-        [    2*x*z - 2*y*w,     2*y*z + 2*x*w, 1 - 2*x*x - 2*y*y]
-    ])
+LIGHT_NAME = "sun"
 
 class QuadCameraReader:
     def __init__(self, node: Node):
@@ -96,7 +89,7 @@ class JointStateReader:
     def read_joint_position(joint_name):
         try:
             cmd = (
-                f'gz topic -e -t /world/three_link_with_tracker_plate_world/model/three_link_model/joint_state '
+                f'gz topic -e -t {joint_state_topic()} '
                 f'| awk \'/name: "{joint_name}"/ {{flag=1}} flag && /position:/ {{print $2; flag=0}}\' '
                 f'| head -n 1'
             )
@@ -118,10 +111,6 @@ class JointStateReader:
 
 
 class UnifiedControlGUI(QWidget):
-    # Sinais
-    update_sensor_signal = pyqtSignal(float)
-    update_math_signal = pyqtSignal(float)
-
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Controle Unificado - Sistema Solar Parabólico")
@@ -155,7 +144,20 @@ class UnifiedControlGUI(QWidget):
         self.thresh_2 = 15.0
         self.thresh_3 = 25.0
         self.eps = 0.00001
+
+        # Tabela ajustada offline (tracker_tuning.py), se existir
+        for name, value in load_step_params().items():
+            setattr(self, name, value)
+
         self.control_freq_hz = 40.0
+
+        # Lei de rastreamento: "stepped" (tabela acima) ou "pi" (tracker_control)
+        self.control_mode = "stepped"
+        self.pi_law = PITrackingLaw(dt=1.0 / self.control_freq_hz)
+
+        # Feed-forward: a posição inicial vira a base da cinemática inversa
+        # do sol e os offsets da câmera só corrigem o resíduo
+        self.feedforward_active = False
         
         # ===== CONTROLE DO SOL =====
         self.azimute_deg = -45.0
@@ -163,18 +165,24 @@ class UnifiedControlGUI(QWidget):
         self.intensity = 1.0
         self.raio = 100.0
         
-        self.topic_light = f"/world/{WORLD_NAME}/light_config"
+        self.topic_light = light_topic()
         self.pub_light = self.node.advertise(self.topic_light, Light)
         
         self.init_ui()
+
+        # Rótulos e barras: threads gravam, o timer de exibição aplica o que mudou
+        self.ui = UIModel(parent=self)
+        self.ui.bind("sensor", self.update_sensor_ui)
+        self.ui.bind("math", self.update_math_ui)
         
+        # Poses: índice aprendido por entidade
+        self.pose_demux = PoseDemux(("link_dish", "link_arm"))
+
         # Subscribers
         self.node.subscribe(Image, "parabolic_dish/focus_cam/image", self.on_focus_image)
-        self.node.subscribe(Pose_V, f"/world/{WORLD_NAME}/pose/info", self.on_pose)
+        self.node.subscribe(Pose_V, pose_topic(), self.on_pose)
         self.node.subscribe(Light, self.topic_light, self.on_light)
         
-        self.update_sensor_signal.connect(self.update_sensor_ui)
-        self.update_math_signal.connect(self.update_math_ui)
         
         # Timer de controle
         self.timer = QTimer()
@@ -384,6 +392,19 @@ class UnifiedControlGUI(QWidget):
         grid_diff.addWidget(self.lbl_comp, 2, 0, 1, 2)
         grid_diff.addWidget(self.lbl_step1, 3, 0)
         grid_diff.addWidget(self.lbl_step2, 3, 1)
+
+        self.combo_mode = QComboBox()
+        for mode, label in CONTROL_MODES:
+            self.combo_mode.addItem(label, mode)
+        self.combo_mode.currentIndexChanged.connect(self.on_mode_changed)
+        self.lbl_err = QLabel("Erro normalizado (az, el): ---")
+        grid_diff.addWidget(QLabel("Lei:"), 4, 0)
+        grid_diff.addWidget(self.combo_mode, 4, 1)
+        grid_diff.addWidget(self.lbl_err, 5, 0, 1, 2)
+
+        self.chk_feedforward = QCheckBox("Feed-forward pela posição calculada do sol")
+        self.chk_feedforward.toggled.connect(self.on_feedforward_toggled)
+        grid_diff.addWidget(self.chk_feedforward, 6, 0, 1, 2)
         
         group_diff.setLayout(grid_diff)
         layout_tracker.addWidget(group_diff)
@@ -473,35 +494,23 @@ class UnifiedControlGUI(QWidget):
             arr = np.frombuffer(data, dtype=np.uint8)
             avg_intensity = np.mean(arr)
             self.sensor_value = avg_intensity
-            self.update_sensor_signal.emit(avg_intensity)
+            self.ui.set("sensor", float(avg_intensity))
         except Exception as e:
             print(f"Erro ao processar imagem: {e}")
 
     def on_pose(self, msg: Pose_V):
-        found = False
-        dish_rotation_matrix = np.eye(3)
-
-        for p in msg.pose:
-            if "link_dish" in p.name:
-                dish_rotation_matrix = quaternion_to_rotation_matrix(p.orientation)
-                found = True
-                break
-        
-        if not found:
-            for p in msg.pose:
-                if "link_arm" in p.name:
-                    dish_rotation_matrix = quaternion_to_rotation_matrix(p.orientation)
-                    found = True
-                    break
-        
-        if found:
-            local_normal = np.array([0, 0, 1])
-            global_normal = dish_rotation_matrix.dot(local_normal)
-            dot_raw = np.dot(global_normal, self.sun_vector)
-            dot_clamped = max(0.0, dot_raw)
-            self.dot_product = dot_clamped
-            self.update_math_signal.emit(dot_clamped)
-            self.lbl_info.setText(f"Prato detectado!")
+        poses = self.pose_demux(msg)
+        pose = poses.get("link_dish")
+        if pose is None:
+            pose = poses.get("link_arm")
+        if pose is None:
+            return
+
+        # Normal do prato = R·ẑ (terceira coluna da rotação)
+        global_normal = quaternion_to_rotation_matrix(pose.orientation)[:, 2]
+        dot_clamped = max(0.0, float(np.dot(global_normal, self.sun_vector)))
+        self.dot_product = dot_clamped
+        self.ui.set("math", dot_clamped)
 
     def on_light(self, msg: Light):
         d = msg.direction
@@ -515,6 +524,7 @@ class UnifiedControlGUI(QWidget):
         self.bar_sensor.setValue(int(value))
 
     def update_math_ui(self, value):
+        self.lbl_info.setText("Prato detectado!")
         self.lbl_math.setText(f"Alinhamento (Dot): {value:.3f}")
         angle_rad = np.arccos(np.clip(value, 0.0, 1.0))
         angle_deg = np.degrees(angle_rad)
@@ -556,17 +566,18 @@ class UnifiedControlGUI(QWidget):
             self.joint1_initial = j1_atual
             self.joint2_initial = j2_atual
             
-            self.lbl_j1_init.setText(f"joint1 inicial (rad): {self.joint1_initial:.4f}")
-            self.lbl_j2_init.setText(f"joint2 inicial (rad): {self.joint2_initial:.4f}")
+            self.ui.set_text(self.lbl_j1_init, f"joint1 inicial (rad): {self.joint1_initial:.4f}")
+            self.ui.set_text(self.lbl_j2_init, f"joint2 inicial (rad): {self.joint2_initial:.4f}")
             
             self.joint1_offset = 0.0
             self.joint2_offset = 0.0
+            self.pi_law.reset()
             
             self.pub_joint1 = self.node.advertise(
-                "/model/three_link_model/joint/joint_azimuth/cmd_pos", Double
+                cmd_pos_topic("joint_azimuth"), Double
             )
             self.pub_joint2 = self.node.advertise(
-                "/model/three_link_model/joint/joint_elevation/cmd_pos", Double
+                cmd_pos_topic("joint_elevation"), Double
             )
             
             self.tracking_active = True
@@ -604,9 +615,43 @@ class UnifiedControlGUI(QWidget):
         elif name == "joint_elevation":
             self.pub_joint2.publish(msg)
 
+    def on_mode_changed(self, index):
+        self.control_mode = self.combo_mode.itemData(index)
+        self.pi_law.reset()
+        self.log_debug(f"Lei de rastreamento: {self.combo_mode.currentText()}")
+
+    def on_feedforward_toggled(self, checked):
+        self.feedforward_active = checked
+        if checked:
+            # A rampa parte do comando atual; o resíduo recomeça do zero
+            self.joint1_initial += self.joint1_offset
+            self.joint2_initial += self.joint2_offset
+            self.joint1_offset = 0.0
+            self.joint2_offset = 0.0
+            self.pi_law.reset()
+        self.log_debug(f"Feed-forward {'ligado' if checked else 'desligado'}")
+
+    def feedforward_update(self):
+        """
+        Leva a base (joint*_initial) em direção à cinemática inversa do sol.
+        Retorna False enquanto a base anda: a câmera só vê o atraso da rampa
+        e a correção do resíduo espera.
+        """
+        base = np.array([[self.joint1_initial, self.joint2_initial]])
+        base, settled = feedforward_step(base, self.sun_vector, 1.0 / self.control_freq_hz)
+        self.joint1_initial, self.joint2_initial = (float(v) for v in base[0])
+        self.ui.set_text(self.lbl_j1_init, f"joint1 base FF (rad): {self.joint1_initial:.4f}")
+        self.ui.set_text(self.lbl_j2_init, f"joint2 base FF (rad): {self.joint2_initial:.4f}")
+        if not settled[0]:
+            self.publish_offsets()
+        return bool(settled[0])
+
     def control_step(self):
         if not self.tracking_active:
             return
+
+        if self.feedforward_active and not self.feedforward_update():
+            return
         
         lum = self.cam_reader.get_luminances()
         q1 = lum.get("cam_q1")
@@ -617,10 +662,10 @@ class UnifiedControlGUI(QWidget):
         def fmt(v):
             return "---" if v is None else f"{v:.4f}"
 
-        self.lbl_q1.setText(f"Q1 (vermelho): {fmt(q1)}")
-        self.lbl_q2.setText(f"Q2 (verde escuro): {fmt(q2)}")
-        self.lbl_q3.setText(f"Q3 (azul): {fmt(q3)}")
-        self.lbl_q4.setText(f"Q4 (amarelo escuro): {fmt(q4)}")
+        self.ui.set_text(self.lbl_q1, f"Q1 (vermelho): {fmt(q1)}")
+        self.ui.set_text(self.lbl_q2, f"Q2 (verde escuro): {fmt(q2)}")
+        self.ui.set_text(self.lbl_q3, f"Q3 (azul): {fmt(q3)}")
+        self.ui.set_text(self.lbl_q4, f"Q4 (amarelo escuro): {fmt(q4)}")
 
         if None in (q1, q2, q3, q4):
             return
@@ -629,10 +674,15 @@ class UnifiedControlGUI(QWidget):
         d14 = q1 - q4
         d32 = q3 - q2
         d34 = q3 - q4
-        self.lbl_d12.setText(f"Δ12 = Q1 - Q2: {d12:.5f}")
-        self.lbl_d14.setText(f"Δ14 = Q1 - Q4: {d14:.5f}")
-        self.lbl_d32.setText(f"Δ32 = Q3 - Q2: {d32:.5f}")
-        self.lbl_d34.setText(f"Δ34 = Q3 - Q4: {d34:.5f}")
+        self.ui.set_text(self.lbl_d12, f"Δ12 = Q1 - Q2: {d12:.5f}")
+        self.ui.set_text(self.lbl_d14, f"Δ14 = Q1 - Q4: {d14:.5f}")
+        self.ui.set_text(self.lbl_d32, f"Δ32 = Q3 - Q2: {d32:.5f}")
+        self.ui.set_text(self.lbl_d34, f"Δ34 = Q3 - Q4: {d34:.5f}")
+
+        if self.control_mode == "pi":
+            self.pi_step(q1, q2, q3, q4)
+            self.publish_offsets()
+            return
 
         def get_step(diff):
             ad = abs(diff)
@@ -648,7 +698,7 @@ class UnifiedControlGUI(QWidget):
         
         if sum_q1_q4 > sum_q2_q3:
             step1 = get_step(d14)
-            self.lbl_comp.setText(f"(Q1+Q4)={(sum_q1_q4):.2f} > (Q2+Q3)={(sum_q2_q3):.2f} → Modo 1 (d14)")
+            self.ui.set_text(self.lbl_comp, f"(Q1+Q4)={(sum_q1_q4):.2f} > (Q2+Q3)={(sum_q2_q3):.2f} → Modo 1 (d14)")
             
             if d14 > self.eps:
                 self.joint1_offset += step1
@@ -656,28 +706,45 @@ class UnifiedControlGUI(QWidget):
                 self.joint1_offset -= step1
         else:
             step1 = get_step(d32)
-            self.lbl_comp.setText(f"(Q1+Q4)={(sum_q1_q4):.2f} ≤ (Q2+Q3)={(sum_q2_q3):.2f} → Modo 2 (Q2 vs Q3)")
+            self.ui.set_text(self.lbl_comp, f"(Q1+Q4)={(sum_q1_q4):.2f} ≤ (Q2+Q3)={(sum_q2_q3):.2f} → Modo 2 (Q2 vs Q3)")
             
             if q2 > q3 + self.eps:
                 self.joint1_offset += step1
             elif q2 < q3 - self.eps:
                 self.joint1_offset -= step1
 
-        self.lbl_step1.setText(f"step joint1: {step1:.4f}")
-        self.lbl_step2.setText(f"step joint2: {step2:.4f}")
+        self.ui.set_text(self.lbl_step1, f"step joint1: {step1:.4f}")
+        self.ui.set_text(self.lbl_step2, f"step joint2: {step2:.4f}")
 
         if d12 > self.eps:
             self.joint2_offset += step2
         elif d12 < -self.eps:
             self.joint2_offset -= step2
 
+        self.publish_offsets()
+
+    def pi_step(self, q1, q2, q3, q4):
+        """Lei PI contínua sobre o erro normalizado dos quadrantes."""
+        offsets = np.array([[self.joint1_offset, self.joint2_offset]])
+        self.pi_law(np.array([[q1, q2, q3, q4]]), offsets)
+        self.joint1_offset, self.joint2_offset = (float(v) for v in offsets[0])
+
+        err_az, err_el = self.pi_law.last_error[0]
+        step1, step2 = self.pi_law.last_rate[0] * self.pi_law.dt
+        self.ui.set_text(self.lbl_err, f"Erro normalizado (az, el): {err_az:+.5f}, {err_el:+.5f}")
+        self.ui.set_text(self.lbl_comp, f"PI: kp={self.pi_law.params['kp']:g}, ki={self.pi_law.params['ki']:g}")
+        self.ui.set_text(self.lbl_step1, f"step joint1: {step1:+.5f}")
+        self.ui.set_text(self.lbl_step2, f"step joint2: {step2:+.5f}")
+
+    def publish_offsets(self):
+        """Envia posição inicial + offsets às juntas e atualiza os rótulos."""
         joint1_cmd = self.joint1_initial + self.joint1_offset
         joint2_cmd = self.joint2_initial + self.joint2_offset
 
-        self.lbl_j1.setText(f"joint1 offset (rad): {self.joint1_offset:.4f}")
-        self.lbl_j2.setText(f"joint2 offset (rad): {self.joint2_offset:.4f}")
-        self.lbl_j1_real.setText(f"joint1 comando (rad): {joint1_cmd:.4f}")
-        self.lbl_j2_real.setText(f"joint2 comando (rad): {joint2_cmd:.4f}")
+        self.ui.set_text(self.lbl_j1, f"joint1 offset (rad): {self.joint1_offset:.4f}")
+        self.ui.set_text(self.lbl_j2, f"joint2 offset (rad): {self.joint2_offset:.4f}")
+        self.ui.set_text(self.lbl_j1_real, f"joint1 comando (rad): {joint1_cmd:.4f}")
+        self.ui.set_text(self.lbl_j2_real, f"joint2 comando (rad): {joint2_cmd:.4f}")
 
         self.send_joint("joint_azimuth", joint1_cmd)
         self.send_joint("joint_elevation", joint2_cmd)
@@ -743,6 +810,7 @@ class UnifiedControlGUI(QWidget):
         dx /= norm
         dy /= norm
         dz /= norm
+        self.sun_vector = np.array([-dx, -dy, -dz])
 
         msg = Light()
         msg.name = LIGHT_NAME
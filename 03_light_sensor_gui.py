@@ -10,48 +10,30 @@ from PyQt5.QtWidgets import (
     QPushButton
 )
 from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QTimer
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.image_pb2 import Image
-    from gz.msgs10.pose_v_pb2 import Pose_V
-    from gz.msgs10.light_pb2 import Light
+    from sim_transport import Node, Image, Pose_V, Light, light_topic, pose_topic
 except ImportError:
     print("ERRO: Instale as dependencias do Gazebo Transport (python3-gz-transport13, etc)")
     sys.exit(1)
 
-WORLD_NAME = "three_link_with_tracker_plate_world"
+from kinematics import quaternion_to_rotation_matrix
+from pose_demux import PoseDemux
+from ui_model import UIModel
+
 # Tópico da câmera definido no SDF
 CAMERA_TOPIC = "parabolic_dish/focus_cam/image"
 # Novo tópico da câmera do tubo
 TUBE_CAMERA_TOPIC = "plate/sun_sensor/image"
 
 # Tópico de poses (padrão do Gazebo Sim)
-POSE_TOPIC = f"/world/{WORLD_NAME}/pose/info"
+POSE_TOPIC = pose_topic()
 # Tópico de configuração de luz (para saber a direção do sol)
-LIGHT_TOPIC = f"/world/{WORLD_NAME}/light_config"
-
-def quaternion_to_rotation_matrix(q):
-    """Converte quaternion (w, x, y, z) para matriz de rotação 3x3."""
-    w, x, y, z = q.w, q.x, q.y, q.z
-    return np.array([
-        [1 - 2*y*y - 2*z*z,     2*x*y - 2*z*w,     2*x*z + 2*y*w],
-        [    2*x*y + 2*z*w, 1 - 2*x*x - 2*z*z,     2*y*z - 2*x*w],
-        [    2*x*z - 2*y*w,     2*y*z + 2*x*w, 1 - 2*x*x - 2*y*y]
-    ])
+LIGHT_TOPIC = light_topic()
 
 class LightSensorGUI(QWidget):
-    # Sinais para atualizar a GUI a partir de threads de callback
-    update_sensor_signal = pyqtSignal(float)
-    update_math_signal = pyqtSignal(float)
-    
-    # Novo sinal para imagem (bytes, width, height, avg_intensity)
-    update_image_signal = pyqtSignal(bytes, int, int, float)
-    # Sinal para valores RGB do pixel central da câmera do tubo
-    update_rgb_signal = pyqtSignal(int, int, int)
-
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Sensor de Foco - Prato Parabólico + Tubo")
@@ -69,18 +51,25 @@ class LightSensorGUI(QWidget):
         self.update_count = 0
 
         self.init_ui()
-        
+
+        # Atualização da tela: callbacks gravam, o timer de exibição aplica o que mudou
+        self.ui = UIModel(parent=self)
+        self.ui.bind("sensor", self.update_sensor_ui)
+        self.ui.bind("math", self.update_math_ui)
+        # (contador, bytes, width, height, avg_intensity) da câmera do tubo
+        self.ui.bind("image", self.update_image_ui)
+        # RGB do pixel central da câmera do tubo
+        self.ui.bind("rgb", self.update_rgb_ui)
+
+        # Poses: índice aprendido por entidade
+        self.pose_demux = PoseDemux(("link_dish", "link_arm"))
+
         # Subscribers
         self.node.subscribe(Image, CAMERA_TOPIC, self.on_image)
         self.node.subscribe(Image, TUBE_CAMERA_TOPIC, self.on_tube_image)
         self.node.subscribe(Pose_V, POSE_TOPIC, self.on_pose)
         self.node.subscribe(Light, LIGHT_TOPIC, self.on_light)
 
-        self.update_sensor_signal.connect(self.update_sensor_ui)
-        self.update_math_signal.connect(self.update_math_ui)
-        self.update_image_signal.connect(self.update_image_ui)
-        self.update_rgb_signal.connect(self.update_rgb_ui)
-
     def init_ui(self):
         layout = QVBoxLayout()
 
@@ -182,7 +171,7 @@ class LightSensorGUI(QWidget):
             arr = np.frombuffer(data, dtype=np.uint8)
             avg_intensity = np.mean(arr)
             self.sensor_value = avg_intensity
-            self.update_sensor_signal.emit(avg_intensity)
+            self.ui.set("sensor", float(avg_intensity))
         except Exception as e:
             print(f"Erro ao processar imagem: {e}")
 
@@ -226,48 +215,37 @@ class LightSensorGUI(QWidget):
             cx = width // 2
             cy = height // 2
             pr, pg, pb = img[cy, cx]
-            self.update_rgb_signal.emit(int(pr), int(pg), int(pb))
+            self.ui.set("rgb", (int(pr), int(pg), int(pb)))
             # Também atualizar o valor de sensor global com a mesma
             # intensidade da câmera do tubo, para refletir na barra
             # "Intensidade Média" do GUI.
             self.sensor_value = avg
-            self.update_sensor_signal.emit(avg)
+            self.ui.set("sensor", avg)
         except Exception as e:
             print(f"DEBUG: Error calculating tube luminance: {e}")
             avg = 0.0
 
-        # Emitir sinal com dados brutos para atualizar na thread principal
-        self.update_image_signal.emit(data, msg.width, msg.height, avg)
+        # Dados brutos para a thread principal (só o último quadro é exibido)
+        self.update_count += 1
+        self.ui.set("image", (self.update_count, data, msg.width, msg.height, avg))
 
-    def update_rgb_ui(self, r, g, b):
+    def update_rgb_ui(self, rgb):
+        r, g, b = rgb
         self.lbl_tube_rgb.setText(f"RGB centro: ({r}, {g}, {b})")
 
     def on_pose(self, msg: Pose_V):
-        # ... (Mantendo lógica original de Pose) ...
-        found = False
-        dish_rotation_matrix = np.eye(3)
-
-        for p in msg.pose:
-            if "link_dish" in p.name:
-                dish_rotation_matrix = quaternion_to_rotation_matrix(p.orientation)
-                found = True
-                break
-        
-        if not found:
-            for p in msg.pose:
-                if "link_arm" in p.name:
-                    dish_rotation_matrix = quaternion_to_rotation_matrix(p.orientation)
-                    found = True
-                    break
-        
-        if found:
-            local_normal = np.array([0, 0, 1])
-            global_normal = dish_rotation_matrix.dot(local_normal)
-            dot_raw = np.dot(global_normal, self.sun_vector)
-            dot_clamped = max(0.0, dot_raw)
-            self.dot_product = dot_clamped
-            self.update_math_signal.emit(dot_clamped)
-            self.lbl_info.setText(f"Prato detectado!")
+        poses = self.pose_demux(msg)
+        pose = poses.get("link_dish")
+        if pose is None:
+            pose = poses.get("link_arm")
+        if pose is None:
+            return
+
+        # Normal do prato = R·ẑ (terceira coluna da rotação)
+        global_normal = quaternion_to_rotation_matrix(pose.orientation)[:, 2]
+        dot_clamped = max(0.0, float(np.dot(global_normal, self.sun_vector)))
+        self.dot_product = dot_clamped
+        self.ui.set("math", dot_clamped)
 
     def on_light(self, msg: Light):
         d = msg.direction
@@ -280,8 +258,9 @@ class LightSensorGUI(QWidget):
         self.lbl_sensor.setText(f"Intensidade Média: {value:.2f}")
         self.bar_sensor.setValue(int(value))
 
-    def update_image_ui(self, data, width, height, intensity):
+    def update_image_ui(self, frame):
         """Atualiza o QLabel com a imagem da câmera e a barra de intensidade."""
+        count, data, width, height, intensity = frame
         # Criar QImage a partir dos bytes (R8G8B8 = formato RGB888)
         qimg = QImage(data, width, height, width*3, QImage.Format_RGB888)
         
@@ -291,11 +270,11 @@ class LightSensorGUI(QWidget):
         
         self.lbl_camera_image.setPixmap(scaled_pixmap)
         
-        # Atualizar indicador numérico com contador de debug
-        self.update_count += 1
-        self.lbl_tube_intensity.setText(f"Intensidade: {intensity:.5f} ({self.update_count})")
+        # Atualizar indicador numérico com contador de debug (quadros recebidos)
+        self.lbl_tube_intensity.setText(f"Intensidade: {intensity:.5f} ({count})")
 
     def update_math_ui(self, value):
+        self.lbl_info.setText("Prato detectado!")
         self.lbl_math.setText(f"Alinhamento (Dot): {value:.3f}")
         angle_rad = np.arccos(np.clip(value, 0.0, 1.0))
         angle_deg = np.degrees(angle_rad)
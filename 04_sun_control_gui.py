@@ -11,14 +11,12 @@ from PyQt5.QtCore import Qt
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.light_pb2 import Light
+    from sim_transport import Node, Light, light_topic
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
 
-WORLD_NAME = "three_link_with_tracker_plate_world"
 LIGHT_NAME = "sun"
 
 
@@ -28,7 +26,7 @@ class SunControlGUI(QWidget):
         self.setWindowTitle("Controle do Sol - Gazebo (light_config)")
 
         self.node = Node()
-        self.topic = f"/world/{WORLD_NAME}/light_config"
+        self.topic = light_topic()
         self.pub_light = self.node.advertise(self.topic, Light)
 
         # Estado em graus
@@ -2,10 +2,11 @@
 """
 Interface Gráfica - Controle Oscilatório das Esferas
 Controla o movimento de vai e vem das 3 esferas com frequências de 0.1 Hz a 10 Hz
+
+As posições saem do WaveformEngine (waveforms.py), no tempo de simulação e
+a 1 kHz; o timer da GUI só repassa os parâmetros ao motor.
 """
 import sys
-import math
-import time
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QGroupBox, QGridLayout, QLabel, QSlider,
@@ -16,12 +17,15 @@ from PyQt5.QtGui import QFont
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.double_pb2 import Double
+    from sim_transport import Node, cmd_pos_topic
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
+from waveforms import Channel, Sine, WaveformEngine
+
+SPHERE_TOPICS = {n: cmd_pos_topic(f"joint_sphere_{n}") for n in (1, 2, 3)}
+
 
 class OscillatoryControlGUI(QWidget):
     def __init__(self):
@@ -31,16 +35,8 @@ class OscillatoryControlGUI(QWidget):
         # Nó Gazebo
         self.node = Node()
         
-        # Publishers para as 3 esferas (POSIÇÃO)
-        self.pub_sphere1 = self.node.advertise(
-            "/model/three_link_model/joint/joint_sphere_1/cmd_pos", Double
-        )
-        self.pub_sphere2 = self.node.advertise(
-            "/model/three_link_model/joint/joint_sphere_2/cmd_pos", Double
-        )
-        self.pub_sphere3 = self.node.advertise(
-            "/model/three_link_model/joint/joint_sphere_3/cmd_pos", Double
-        )
+        # Canais de POSIÇÃO das 3 esferas (repouso = centro)
+        self.engine = WaveformEngine(self.node, [Channel(t) for t in SPHERE_TOPICS.values()])
         
         # Parâmetros de oscilação para cada esfera
         self.freq_sphere1 = 1.0  # Hz
@@ -55,12 +51,12 @@ class OscillatoryControlGUI(QWidget):
         self.enabled_sphere2 = False
         self.enabled_sphere3 = False
         
-        # Tempo inicial
-        self.start_time = time.time()
-        
         self.init_ui()
         
-        # Timer para atualizar as velocidades
+        # Fase zero no tempo simulado do início
+        self.engine.start()
+        
+        # Timer que repassa os parâmetros ao motor
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_oscillations)
         self.timer.start(50)  # Atualiza a cada 50ms (20 Hz)
@@ -280,7 +276,7 @@ class OscillatoryControlGUI(QWidget):
         else:
             self.lbl_status1.setText("Status: Parado")
             self.lbl_status1.setStyleSheet("color: red; font-weight: bold;")
-            self.send_position(1, 0.0)  # Volta para o centro
+            self.update_oscillations()  # Volta para o centro
     
     def on_freq1_changed(self, value):
         freq = value / 10.0
@@ -321,7 +317,7 @@ class OscillatoryControlGUI(QWidget):
         else:
             self.lbl_status2.setText("Status: Parado")
             self.lbl_status2.setStyleSheet("color: red; font-weight: bold;")
-            self.send_position(2, 0.0)  # Volta para o centro
+            self.update_oscillations()  # Volta para o centro
     
     def on_freq2_changed(self, value):
         freq = value / 10.0
@@ -362,7 +358,7 @@ class OscillatoryControlGUI(QWidget):
         else:
             self.lbl_status3.setText("Status: Parado")
             self.lbl_status3.setStyleSheet("color: red; font-weight: bold;")
-            self.send_position(3, 0.0)  # Volta para o centro
+            self.update_oscillations()  # Volta para o centro
     
     def on_freq3_changed(self, value):
         freq = value / 10.0
@@ -396,36 +392,16 @@ class OscillatoryControlGUI(QWidget):
 
     # ===== FUNÇÕES AUXILIARES =====
     def update_oscillations(self):
-        """Atualiza as posições oscilatórias de todas as esferas."""
-        current_time = time.time() - self.start_time
-        
-        # Esfera 1
-        if self.enabled_sphere1:
-            # Posição senoidal: x(t) = A × sin(2π × f × t)
-            position1 = self.amplitude_sphere1 * math.sin(2 * math.pi * self.freq_sphere1 * current_time)
-            self.send_position(1, position1)
-        
-        # Esfera 2
-        if self.enabled_sphere2:
-            position2 = self.amplitude_sphere2 * math.sin(2 * math.pi * self.freq_sphere2 * current_time)
-            self.send_position(2, position2)
-        
-        # Esfera 3
-        if self.enabled_sphere3:
-            position3 = self.amplitude_sphere3 * math.sin(2 * math.pi * self.freq_sphere3 * current_time)
-            self.send_position(3, position3)
-
-    def send_position(self, sphere_num, position):
-        """Envia comando de posição para a esfera especificada."""
-        msg = Double()
-        msg.data = position
-        
-        if sphere_num == 1:
-            self.pub_sphere1.publish(msg)
-        elif sphere_num == 2:
-            self.pub_sphere2.publish(msg)
-        elif sphere_num == 3:
-            self.pub_sphere3.publish(msg)
+        """Repassa frequência/amplitude das esferas ao motor de formas de onda."""
+        params = (
+            (self.enabled_sphere1, self.amplitude_sphere1, self.freq_sphere1),
+            (self.enabled_sphere2, self.amplitude_sphere2, self.freq_sphere2),
+            (self.enabled_sphere3, self.amplitude_sphere3, self.freq_sphere3),
+        )
+        for n, (enabled, amp, freq) in zip(SPHERE_TOPICS, params):
+            # Posição senoidal: x(t) = A × sin(2π × f × t), t em tempo simulado;
+            # desligada, o motor publica o repouso (centro) uma vez
+            self.engine.set_waveform(SPHERE_TOPICS[n], Sine(amp, freq) if enabled else None)
 
     def start_all(self):
         """Inicia oscilação de todas as esferas com 1 Hz."""
@@ -445,7 +421,7 @@ class OscillatoryControlGUI(QWidget):
 
     def sync_phase(self):
         """Sincroniza a fase de todas as oscilações (reinicia o tempo)."""
-        self.start_time = time.time()
+        self.engine.reset_origin()
 
 
 def main():
@@ -2,41 +2,48 @@
 """
 GUI de Controle de Torque (Constante + Senoidal) para Cilindros
 Controla:
-- /model/three_link_model/joint/joint_cylinder/cmd_force (Vermelho)
-- /model/three_link_model/joint/joint_cylinder_green/cmd_force (Verde)
+- /model/<modelo>/joint/joint_cylinder/cmd_force (Vermelho)
+- /model/<modelo>/joint/joint_cylinder_green/cmd_force (Verde)
+(mundo e modelo: ROBOTSIM_WORLD / ROBOTSIM_MODEL, ver sim_transport.py)
+
+IDENTIFICAÇÃO:
+O grupo "Identificação" roda uma varredura (chirp logarítmico ou multisine)
+nos cilindros, grava juntas e sensores force_torque e calcula a FRF com
+coerência ao fim (sysid.py); o resultado vai para sysid_<data>.npz.
 
 SINCRONIZAÇÃO:
-Usa o tempo de simulação do Gazebo (/world/.../stats) para gerar as senoides,
-garantindo frequência correta independente do Real Time Factor.
+As amostras saem do WaveformEngine (waveforms.py), numa thread própria a
+1 kHz na grade do tempo de simulação (/world/.../stats): a frequência fica
+correta independente do Real Time Factor e sem aliasing até 500 Hz. O timer
+da GUI só atualiza os rótulos.
 """
 
 import sys
-import math
-import time
 import numpy as np
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QGroupBox, QGridLayout, QLabel, QPushButton, 
-    QSlider, QDoubleSpinBox, QCheckBox, QFrame, QSpacerItem, QSizePolicy
+    QSlider, QDoubleSpinBox, QCheckBox, QFrame, QSpacerItem, QSizePolicy,
+    QComboBox, QProgressBar
 )
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QPalette, QColor
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.double_pb2 import Double
-    from gz.msgs10.world_stats_pb2 import WorldStatistics
+    from sim_transport import Node, WorldStatistics, cmd_force_topic, stats_topic
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
+from sysid import KINDS, SysIdRun, default_path, save_result, summarize
+from waveforms import Channel, Constant, Sine, WaveformEngine
+
 # Configurações de Tópicos
-TOPIC_RED = "/model/three_link_model/joint/joint_cylinder/cmd_force"
-TOPIC_GREEN = "/model/three_link_model/joint/joint_cylinder_green/cmd_force"
-# Nome do mundo no SDF é "three_link_with_tracker_plate_world"
-TOPIC_STATS = "/world/three_link_with_tracker_plate_world/stats"
+TOPIC_RED = cmd_force_topic("joint_cylinder")
+TOPIC_GREEN = cmd_force_topic("joint_cylinder_green")
+TOPIC_STATS = stats_topic()
 
 class TorqueControlGUI(QWidget):
     def __init__(self):
@@ -44,8 +51,9 @@ class TorqueControlGUI(QWidget):
         self.setWindowTitle("Controle de Torque Sincronizado - FRONTIER")
         
         self.node = Node()
-        self.pub_red = self.node.advertise(TOPIC_RED, Double)
-        self.pub_green = self.node.advertise(TOPIC_GREEN, Double)
+        # Senoides na fase de sin(2π f sim_time), como antes (origem absoluta)
+        self.engine = WaveformEngine(self.node, [Channel(TOPIC_RED), Channel(TOPIC_GREEN)],
+                                     origin=0.0)
         
         # Subscribe to World Stats
         self.node.subscribe(WorldStatistics, TOPIC_STATS, self.on_world_stats)
@@ -54,6 +62,7 @@ class TorqueControlGUI(QWidget):
         self.sim_time = 0.0
         self.last_sim_time = 0.0
         self.active = False
+        self.sysid_run = None
         
         # Parâmetros Vermelho
         self.red_const = 0.0
@@ -70,8 +79,7 @@ class TorqueControlGUI(QWidget):
         self.apply_light_theme()
         self.init_ui()
         
-        # Timer de Controle (50 Hz)
-        # O timer serve para atualizar a UI e enviar comandos periodicamente
+        # Timer de Display (50 Hz); os comandos saem do WaveformEngine
         self.output_freq = 50.0
         self.timer = QTimer()
         self.timer.timeout.connect(self.control_loop)
@@ -161,6 +169,9 @@ class TorqueControlGUI(QWidget):
         self.group_green['spin_amp'].valueChanged.connect(self.update_params)
         self.group_green['spin_freq'].valueChanged.connect(self.update_params)
         
+        # ===== GRUPO IDENTIFICAÇÃO =====
+        main_layout.addWidget(self.create_sysid_group())
+
         # Espaçador
         main_layout.addSpacerItem(QSpacerItem(20, 10, QSizePolicy.Minimum, QSizePolicy.Expanding))
         
@@ -280,7 +291,7 @@ class TorqueControlGUI(QWidget):
         # Linha 4: Frequência
         layout.addWidget(QLabel("Frequência (Hz):"), 3, 0)
         spin_freq = QDoubleSpinBox()
-        self.config_spin(spin_freq, 0.0, 50.0, default_freq, step=0.1)
+        self.config_spin(spin_freq, 0.0, 500.0, default_freq, step=0.1)
         spin_freq.setStyleSheet(spin_style)
         layout.addWidget(spin_freq, 3, 1)
         # Reset
@@ -312,6 +323,74 @@ class TorqueControlGUI(QWidget):
             'lbl_out': lbl_out
         }
 
+    def create_sysid_group(self):
+        group = QGroupBox("Identificação (Varredura + FRF)")
+        group.setStyleSheet("""
+            QGroupBox {
+                font-weight: bold;
+                color: #1565C0;
+                border: 1px solid #ccc;
+                border-radius: 8px;
+                margin-top: 12px;
+                background-color: #E3F2FD;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px;
+            }
+        """)
+        layout = QGridLayout()
+        layout.setHorizontalSpacing(15)
+        layout.setVerticalSpacing(8)
+
+        layout.addWidget(QLabel("Sinal:"), 0, 0)
+        self.combo_kind = QComboBox()
+        self.combo_kind.addItems(["Chirp logarítmico", "Multisine"])
+        layout.addWidget(self.combo_kind, 0, 1)
+        self.chk_id_red = QCheckBox("Vermelho")
+        self.chk_id_red.setChecked(True)
+        self.chk_id_green = QCheckBox("Verde")
+        self.chk_id_green.setChecked(True)
+        checks = QHBoxLayout()
+        checks.addWidget(self.chk_id_red)
+        checks.addWidget(self.chk_id_green)
+        layout.addLayout(checks, 0, 2, 1, 2)
+
+        layout.addWidget(QLabel("Banda (Hz):"), 1, 0)
+        self.spin_id_f0 = QDoubleSpinBox()
+        self.config_spin(self.spin_id_f0, 0.1, 499.0, 0.5, step=0.1)
+        layout.addWidget(self.spin_id_f0, 1, 1)
+        self.spin_id_f1 = QDoubleSpinBox()
+        self.config_spin(self.spin_id_f1, 0.2, 500.0, 100.0, step=1.0)
+        layout.addWidget(self.spin_id_f1, 1, 2)
+
+        layout.addWidget(QLabel("Amplitude (Nm):"), 2, 0)
+        self.spin_id_amp = QDoubleSpinBox()
+        self.config_spin(self.spin_id_amp, 0.0, 10000.0, 200.0)
+        layout.addWidget(self.spin_id_amp, 2, 1)
+        layout.addWidget(QLabel("Duração (s sim):"), 3, 0)
+        self.spin_id_duration = QDoubleSpinBox()
+        self.config_spin(self.spin_id_duration, 5.0, 3600.0, 120.0, step=10.0)
+        layout.addWidget(self.spin_id_duration, 3, 1)
+
+        self.btn_sysid = QPushButton("INICIAR IDENTIFICAÇÃO")
+        self.btn_sysid.setCheckable(True)
+        self.btn_sysid.setCursor(Qt.PointingHandCursor)
+        self.btn_sysid.toggled.connect(self.toggle_sysid)
+        layout.addWidget(self.btn_sysid, 2, 2, 2, 2)
+
+        self.progress_id = QProgressBar()
+        self.progress_id.setRange(0, 100)
+        layout.addWidget(self.progress_id, 4, 0, 1, 4)
+        self.lbl_id_result = QLabel("—")
+        self.lbl_id_result.setWordWrap(True)
+        self.lbl_id_result.setStyleSheet("font-weight: normal; color: #333;")
+        layout.addWidget(self.lbl_id_result, 5, 0, 1, 4)
+
+        group.setLayout(layout)
+        return group
+
     def config_spin(self, spin, min_val, max_val, default, step=1.0):
         spin.setRange(min_val, max_val)
         spin.setValue(default)
@@ -331,50 +410,96 @@ class TorqueControlGUI(QWidget):
         self.green_amp = self.group_green['spin_amp'].value()
         self.green_freq = self.group_green['spin_freq'].value()
 
+        if self.active:
+            self.apply_waveforms()
+
+    def apply_waveforms(self):
+        for topic, const, sine_active, amp, freq in (
+                (TOPIC_RED, self.red_const, self.red_sine_active, self.red_amp, self.red_freq),
+                (TOPIC_GREEN, self.green_const, self.green_sine_active, self.green_amp, self.green_freq)):
+            waveform = Constant(const)
+            if sine_active:
+                waveform = waveform + Sine(amp, freq)
+            self.engine.set_waveform(topic, waveform)
+
     def toggle_active(self, checked):
         self.active = checked
         if checked:
             self.btn_toggle.setText("PARAR APLICAÇÃO DE TORQUE")
+            self.apply_waveforms()
+            self.engine.start()
         else:
             self.btn_toggle.setText("INICIAR CONTROLE")
-            self.publish_torque(self.pub_red, 0.0)
-            self.publish_torque(self.pub_green, 0.0)
+            # Formas manuais desligadas: não vazam para a identificação
+            for topic in (TOPIC_RED, TOPIC_GREEN):
+                self.engine.set_waveform(topic, None)
+            self.engine.stop()  # publica 0 Nm nos dois cilindros
             self.group_red['lbl_out'].setText("PARADO")
             self.group_green['lbl_out'].setText("PARADO")
 
+    def toggle_sysid(self, checked):
+        if not checked:
+            if self.sysid_run is not None:
+                self.finish_sysid()  # interrompido: FRF com o que foi gravado
+            return
+        joints = [j for j, chk in (("joint_cylinder", self.chk_id_red),
+                                   ("joint_cylinder_green", self.chk_id_green)) if chk.isChecked()]
+        if self.btn_toggle.isChecked():
+            self.btn_toggle.setChecked(False)
+        try:
+            self.sysid_run = SysIdRun(
+                self.node, self.engine, joints, KINDS[self.combo_kind.currentIndex()],
+                self.spin_id_amp.value(), self.spin_id_f0.value(), self.spin_id_f1.value(),
+                self.spin_id_duration.value()).start()
+        except (ValueError, RuntimeError) as e:
+            self.sysid_run = None
+            self.lbl_id_result.setText(f"❌ {e}")
+            self.btn_sysid.setChecked(False)
+            return
+        self.btn_toggle.setEnabled(False)
+        self.btn_sysid.setText("PARAR IDENTIFICAÇÃO")
+        self.lbl_id_result.setText(f"Varrendo {', '.join(joints)} por "
+                                   f"{self.sysid_run.duration:.0f} s simulados...")
+
+    def finish_sysid(self):
+        run, self.sysid_run = self.sysid_run, None
+        try:
+            result = run.finish()
+        except (ValueError, RuntimeError) as e:
+            self.lbl_id_result.setText(f"❌ {e}")
+        else:
+            path = default_path()
+            save_result(path, result)
+            lines = summarize(result)
+            self.lbl_id_result.setText("\n".join(lines[:6] or ["Nenhum par com coerência suficiente"])
+                                       + f"\n💾 {path}")
+        self.engine.stop()
+        self.btn_toggle.setEnabled(True)
+        self.btn_sysid.blockSignals(True)
+        self.btn_sysid.setChecked(False)
+        self.btn_sysid.blockSignals(False)
+        self.btn_sysid.setText("INICIAR IDENTIFICAÇÃO")
+
     def control_loop(self):
         # Atualiza display de tempo
         self.lbl_time.setText(f"Sim Time: {self.sim_time:.3f} s")
+
+        if self.sysid_run is not None:
+            self.progress_id.setValue(int(self.sysid_run.progress() * 100))
+            if self.sysid_run.done():
+                self.finish_sysid()
         
         if not self.active:
             return
             
-        # Usa o tempo de simulação para o cálculo
-        t = self.sim_time
-        
-        # Cálculo Vermelho
-        torque_red = self.red_const
-        if self.red_sine_active:
-            torque_red += self.red_amp * math.sin(2 * math.pi * self.red_freq * t)
-            
-        # Cálculo Verde
-        torque_green = self.green_const
-        if self.green_sine_active:
-            torque_green += self.green_amp * math.sin(2 * math.pi * self.green_freq * t)
-            
-        # Publicar
-        self.publish_torque(self.pub_red, torque_red)
-        self.publish_torque(self.pub_green, torque_green)
+        # Últimas amostras publicadas pelo motor
+        torque_red = self.engine.last.get(TOPIC_RED, 0.0)
+        torque_green = self.engine.last.get(TOPIC_GREEN, 0.0)
         
         # Atualizar Labels
         self.group_red['lbl_out'].setText(f"{torque_red:.2f} Nm")
         self.group_green['lbl_out'].setText(f"{torque_green:.2f} Nm")
 
-    def publish_torque(self, publisher, value):
-        msg = Double()
-        msg.data = value
-        publisher.publish(msg)
-
 def main():
     app = QApplication(sys.argv)
     
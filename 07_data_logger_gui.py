@@ -5,6 +5,9 @@ Versão Avançada:
 - Grava dados de juntas (Posição, Velocidade) do JointState.
 - Recupera Esforço dos Cilindros via comando (cmd_force).
 - Estima Esforço das Juntas PID (Azimuth/Elevation) via cálculo matemático (Engenharia Reversa do PID).
+- Mede o torque das juntas PID pelos sensores force_torque (joint1/joint2, 1 kHz)
+  e grava os Wrench em binário (recording.py) direto da thread do transporte,
+  sem passar pelo Qt, com o resíduo medido - estimado (force_torque.py).
 """
 
 import sys
@@ -25,25 +28,30 @@ from PyQt5.QtGui import QFont, QPalette, QColor
 
 # Imports Gazebo
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.model_pb2 import Model
-    from gz.msgs10.world_stats_pb2 import WorldStatistics
-    from gz.msgs10.double_pb2 import Double
+    from sim_transport import (Node, Model, WorldStatistics, Double, Wrench,
+                               FORCE_TORQUE_SENSORS, cmd_force_topic, cmd_pos_topic,
+                               force_torque_topic, joint_state_topic, stats_topic)
 except ImportError:
     print("ERRO: Instale as dependências: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
+from force_torque import (WRENCH_COLUMNS, ResidualStats, sensor_axes, stream_name,
+                          torque_about_axis)
+from recording import Recording
+from ui_model import UIModel
+
 # === CONFIGURAÇÕES ===
-TOPIC_JOINT_STATE = "/world/three_link_with_tracker_plate_world/model/three_link_model/joint_state"
-TOPIC_STATS = "/world/three_link_with_tracker_plate_world/stats"
+# Mundo e modelo: ROBOTSIM_WORLD / ROBOTSIM_MODEL (sim_transport)
+TOPIC_JOINT_STATE = joint_state_topic()
+TOPIC_STATS = stats_topic()
 
 # Tópicos de Comando (Para Cilindros)
-TOPIC_CMD_FORCE_RED = "/model/three_link_model/joint/joint_cylinder/cmd_force"
-TOPIC_CMD_FORCE_GREEN = "/model/three_link_model/joint/joint_cylinder_green/cmd_force"
+TOPIC_CMD_FORCE_RED = cmd_force_topic("joint_cylinder")
+TOPIC_CMD_FORCE_GREEN = cmd_force_topic("joint_cylinder_green")
 
 # Tópicos de Alvo (Para PIDs)
-TOPIC_CMD_POS_AZIMUTH = "/model/three_link_model/joint/joint_azimuth/cmd_pos"
-TOPIC_CMD_POS_ELEVATION = "/model/three_link_model/joint/joint_elevation/cmd_pos"
+TOPIC_CMD_POS_AZIMUTH = cmd_pos_topic("joint_azimuth")
+TOPIC_CMD_POS_ELEVATION = cmd_pos_topic("joint_elevation")
 
 # Parâmetros PID (Copiados do SDF)
 PID_GAINS = {
@@ -67,7 +75,6 @@ KNOWN_JOINTS = [
 ]
 
 class Signals(QObject):
-    update_stats = pyqtSignal(float, float) # current_time, dt
     update_data = pyqtSignal(object)
     update_cmd_force = pyqtSignal(str, float)
     update_cmd_pos = pyqtSignal(str, float)
@@ -81,27 +88,14 @@ class DataLoggerGUI(QWidget):
         # Gazebo setup
         self.node = Node()
         self.signals = Signals()
-        self.signals.update_stats.connect(self.update_sim_time)
         self.signals.update_data.connect(self.process_joint_state)
         self.signals.update_cmd_force.connect(self.update_force_command)
         self.signals.update_cmd_pos.connect(self.update_pos_command)
         
-        # Subscribers
-        self.node.subscribe(WorldStatistics, TOPIC_STATS, self.on_stats)
-        self.node.subscribe(Model, TOPIC_JOINT_STATE, self.on_joint_state)
-        
-        # Cmd Force Subs
-        self.node.subscribe(Double, TOPIC_CMD_FORCE_RED, lambda msg: self.on_double(msg, "joint_cylinder"))
-        self.node.subscribe(Double, TOPIC_CMD_FORCE_GREEN, lambda msg: self.on_double(msg, "joint_cylinder_green"))
-        
-        # Cmd Pos Subs
-        self.node.subscribe(Double, TOPIC_CMD_POS_AZIMUTH, lambda msg: self.on_double_pos(msg, "joint_azimuth"))
-        self.node.subscribe(Double, TOPIC_CMD_POS_ELEVATION, lambda msg: self.on_double_pos(msg, "joint_elevation"))
-        
         # Estado
         self.recording = False
         self.current_sim_time = 0.0
-        self.last_sim_time = 0.0
+        self.last_sim_time = 0.0   # último passo do PID (thread do Qt)
         self.dt = 0.0
         
         # Data Stores
@@ -112,6 +106,12 @@ class DataLoggerGUI(QWidget):
         # PID Integrators
         self.pid_integrals = defaultdict(float)
         self.calculated_pid_efforts = defaultdict(float)
+
+        # Torque medido + gravação binária
+        self.latest_ft_torque = {}   # {joint: tau medido}
+        self.ft_recording = None
+        self.ft_streams = {}         # {joint: Stream}
+        self.ft_stats = {}           # {joint: ResidualStats}
         
         self.csv_file = None
         self.csv_writer = None
@@ -122,6 +122,31 @@ class DataLoggerGUI(QWidget):
         self.init_ui()
         self.update_default_filename()
 
+        # Rótulos na taxa de tela (stats chega a até 1 kHz)
+        self.ui = UIModel(parent=self)
+        for j_name, lbl in self.ft_labels.items():
+            self.ui.bind(f"ft_{j_name}", lambda v, l=lbl: l.setText(
+                f"medido {v[0]:9.1f} Nm | estimado {v[1]:9.1f} Nm | resíduo {v[0] - v[1]:+9.1f} Nm"))
+        self.ui.bind("stats", self.update_sim_time)
+
+        # Subscribers: só depois do estado e da UI (os callbacks já os usam)
+        self.node.subscribe(WorldStatistics, TOPIC_STATS, self.on_stats)
+        self.node.subscribe(Model, TOPIC_JOINT_STATE, self.on_joint_state)
+        
+        # Cmd Force Subs
+        self.node.subscribe(Double, TOPIC_CMD_FORCE_RED, lambda msg: self.on_double(msg, "joint_cylinder"))
+        self.node.subscribe(Double, TOPIC_CMD_FORCE_GREEN, lambda msg: self.on_double(msg, "joint_cylinder_green"))
+        
+        # Cmd Pos Subs
+        self.node.subscribe(Double, TOPIC_CMD_POS_AZIMUTH, lambda msg: self.on_double_pos(msg, "joint_azimuth"))
+        self.node.subscribe(Double, TOPIC_CMD_POS_ELEVATION, lambda msg: self.on_double_pos(msg, "joint_elevation"))
+        
+        # Sensores força/torque: callback na thread do transporte (1 kHz)
+        self.ft_axes = sensor_axes()
+        for j_name in FORCE_TORQUE_SENSORS:
+            self.node.subscribe(Wrench, force_torque_topic(j_name),
+                                lambda msg, j=j_name: self.on_wrench(msg, j))
+
     def apply_light_theme(self):
         self.setStyle(QApplication.style())
         p = QPalette()
@@ -231,6 +256,23 @@ class DataLoggerGUI(QWidget):
         scroll.setWidget(container)
         main.addWidget(scroll)
 
+        # Force/Torque
+        grp_ft = QGroupBox("Sensores Força/Torque (medido x estimado PID)")
+        grp_ft.setStyleSheet("QGroupBox { font-weight: bold; border: 1px solid #ccc; border-radius: 6px; margin-top: 10px; }")
+        lay_ft = QGridLayout()
+        self.ft_labels = {}
+        for row, j_name in enumerate(FORCE_TORQUE_SENSORS):
+            lay_ft.addWidget(QLabel(j_name), row, 0)
+            lbl_val = QLabel("aguardando Wrench...")
+            lbl_val.setStyleSheet("font-family: Monospace; font-weight: normal; color: #333;")
+            lay_ft.addWidget(lbl_val, row, 1)
+            self.ft_labels[j_name] = lbl_val
+        self.chk_ft_bin = QCheckBox("Gravar Wrench em binário a 1 kHz (<nome>_wrench_<junta>.bin)")
+        self.chk_ft_bin.setChecked(True)
+        lay_ft.addWidget(self.chk_ft_bin, len(FORCE_TORQUE_SENSORS), 0, 1, 2)
+        grp_ft.setLayout(lay_ft)
+        main.addWidget(grp_ft)
+
         # Controls
         lay_ctrl = QHBoxLayout()
         self.btn_rec = QPushButton("INICIAR GRAVAÇÃO")
@@ -273,11 +315,26 @@ class DataLoggerGUI(QWidget):
         t = msg.sim_time.sec + (msg.sim_time.nsec * 1e-9)
         dt = t - self.current_sim_time
         if dt < 0: dt = 0 # Reset or lag
-        self.signals.update_stats.emit(t, dt)
+        self.current_sim_time = t   # carimbo das linhas do CSV
+        # Rótulo e PID na taxa de tela, pelo UIModel (stats chega a até 1 kHz)
+        self.ui.set("stats", (t, dt))
 
     def on_joint_state(self, msg):
         self.signals.update_data.emit(msg)
 
+    def on_wrench(self, msg, joint_name):
+        # Thread do transporte: nada de sinais Qt a 1 kHz
+        t = msg.header.stamp.sec + msg.header.stamp.nsec * 1e-9
+        f, m = msg.force, msg.torque
+        tau = float(torque_about_axis((m.x, m.y, m.z), self.ft_axes[joint_name]))
+        est = self.calculated_pid_efforts.get(joint_name, 0.0)
+        self.latest_ft_torque[joint_name] = tau
+        self.ui.set(f"ft_{joint_name}", (tau, est))
+        stream = self.ft_streams.get(joint_name)
+        if stream is not None:
+            stream.append(t, f.x, f.y, f.z, m.x, m.y, m.z, tau, est, tau - est)
+            self.ft_stats[joint_name].add(tau, est)
+
     def on_double(self, msg, joint_name):
         self.signals.update_cmd_force.emit(joint_name, msg.data)
 
@@ -285,11 +342,13 @@ class DataLoggerGUI(QWidget):
         self.signals.update_cmd_pos.emit(joint_name, msg.data)
 
     # -- Signal Handlers --
-    def update_sim_time(self, t, dt):
-        self.current_sim_time = t
-        self.dt = dt
+    def update_sim_time(self, stats):
+        t, dt = stats
+        # O integrador do PID avança o tempo decorrido desde a última exibição
+        self.dt = max(t - self.last_sim_time, 0.0)
+        self.last_sim_time = t
         status = "GRAVANDO" if self.recording else "Inativo"
-        self.lbl_time.setText(f"Sim Time: {t:.3f} s  (dt={dt*1000:.1f}ms) [{status}]")
+        self.ui.set_text(self.lbl_time, f"Sim Time: {t:.3f} s  (dt={dt*1000:.1f}ms) [{status}]")
         
         # Run PID Calculation continuously regardless of recording 
         # to convert state to effort
@@ -369,31 +428,61 @@ class DataLoggerGUI(QWidget):
                 if chk["eff"].isChecked():
                     self.active_cols.append((j, "eff"))
                     header.append(f"{j}_eff")
+                    if j in FORCE_TORQUE_SENSORS:
+                        self.active_cols.append((j, "eff_meas"))
+                        header.append(f"{j}_eff_meas")
             
             try:
                 self.csv_file = open(path, 'w', newline='')
                 self.csv_writer = csv.writer(self.csv_file)
                 self.csv_writer.writerow(header)
+                if self.chk_ft_bin.isChecked():
+                    self.start_ft_recording(path)
                 self.recording = True
                 self.data_count = 0
                 self.btn_rec.setText("PARAR GRAVAÇÃO")
                 self.progress.setRange(0, 0)
                 self.txt_name.setEnabled(False)
+                self.chk_ft_bin.setEnabled(False)
             except Exception as e:
                 QMessageBox.critical(self, "Erro", str(e))
                 self.btn_rec.setChecked(False)
         else:
             self.stop_recording()
 
+    def start_ft_recording(self, csv_path):
+        prefix = os.path.splitext(csv_path)[0]
+        self.ft_recording = Recording(prefix, meta={"csv": os.path.basename(csv_path),
+                                                    "start_sim_time": self.current_sim_time})
+        self.ft_stats = {j: ResidualStats() for j in FORCE_TORQUE_SENSORS}
+        for j_name, sensor in FORCE_TORQUE_SENSORS.items():
+            meta = {"joint": j_name, "sensor": sensor, "topic": force_torque_topic(j_name),
+                    "axis": [float(a) for a in self.ft_axes[j_name]],
+                    "estimate": "PID reverso (07)", "gains": PID_GAINS.get(j_name, {})}
+            self.ft_streams[j_name] = self.ft_recording.stream(stream_name(j_name), WRENCH_COLUMNS, meta)
+
+    def stop_ft_recording(self):
+        # Para de alimentar os fluxos antes de fechar (a thread de escrita esvazia a fila)
+        streams, self.ft_streams = self.ft_streams, {}
+        rec, self.ft_recording = self.ft_recording, None
+        rec.close()
+        lines = [f"{j}: {s.rows} amostras; {self.ft_stats[j].summary()}"
+                 for j, s in streams.items()]
+        for line in lines:
+            print(f"🔩 {line}")
+        return lines
+
     def stop_recording(self):
         self.recording = False
         if self.csv_file: self.csv_file.close()
+        ft_lines = self.stop_ft_recording() if self.ft_recording is not None else []
         self.btn_rec.setText("INICIAR GRAVAÇÃO")
         self.progress.setRange(0, 100)
         self.progress.setValue(0)
         self.txt_name.setEnabled(True)
+        self.chk_ft_bin.setEnabled(True)
         self.update_default_filename()
-        QMessageBox.information(self, "Salvo", f"Gravado {self.data_count} linhas.")
+        QMessageBox.information(self, "Salvo", "\n".join([f"Gravado {self.data_count} linhas."] + ft_lines))
 
     def write_log_row(self):
         row = [f"{self.current_sim_time:.4f}"]
@@ -414,13 +503,17 @@ class DataLoggerGUI(QWidget):
                 elif j_name in self.calculated_pid_efforts:
                     # PID (Calculated)
                     val = self.calculated_pid_efforts[j_name]
+
+            # EFF medido -> sensor force_torque
+            elif v_type == "eff_meas":
+                val = self.latest_ft_torque.get(j_name, 0.0)
                     
             row.append(f"{val:.6f}")
             
         self.csv_writer.writerow(row)
         self.data_count += 1
         if self.data_count % 50 == 0:
-            self.lbl_status.setText(f"Linhas: {self.data_count}")
+            self.ui.set_text(self.lbl_status, f"Linhas: {self.data_count}")
 
 def main():
     app = QApplication(sys.argv)
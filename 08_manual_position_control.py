@@ -3,22 +3,18 @@ import sys
 import math
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QDoubleSpinBox, QPushButton, QGroupBox)
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt
 
 # Gazebo imports
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.double_pb2 import Double
-    from gz.msgs10.model_pb2 import Model
+    from sim_transport import Node, Double, Model, cmd_pos_topic, joint_state_topic
 except ImportError:
     print("ERRO: Instale as bibliotecas do Gazebo Transport (gz-transport13, gz-msgs10)")
     sys.exit(1)
 
-class ManualPositionGUI(QWidget):
-    # Sinais para atualizar a GUI a partir da thread do Gazebo
-    update_az_signal = pyqtSignal(float)
-    update_el_signal = pyqtSignal(float)
+from ui_model import UIModel
 
+class ManualPositionGUI(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Controle Manual e Monitor (Graus) - RÁPIDO")
@@ -26,15 +22,12 @@ class ManualPositionGUI(QWidget):
 
         # Configuração Gazebo
         self.node = Node()
-        self.topic_az = "/model/three_link_model/joint/joint_azimuth/cmd_pos"
-        self.topic_el = "/model/three_link_model/joint/joint_elevation/cmd_pos"
+        self.topic_az = cmd_pos_topic("joint_azimuth")
+        self.topic_el = cmd_pos_topic("joint_elevation")
         
         self.pub_az = self.node.advertise(self.topic_az, Double)
         self.pub_el = self.node.advertise(self.topic_el, Double)
 
-        # Assinar tópico de estados (Nome Completo)
-        self.node.subscribe(Model, "/world/three_link_with_tracker_plate_world/model/three_link_model/joint_state", self.on_joint_state)
-
         # Variáveis de monitoramento
         self.az_min = float('inf')
         self.az_max = float('-inf')
@@ -42,10 +35,13 @@ class ManualPositionGUI(QWidget):
         self.el_max = float('-inf')
         
         self.init_ui()
-        
-        # Conectar sinais
-        self.update_az_signal.connect(self.process_az_update)
-        self.update_el_signal.connect(self.process_el_update)
+
+        # Monitores: o callback grava o texto, o timer de exibição aplica
+        self.ui = UIModel(parent=self)
+
+        # Assinar tópico de estados (Nome Completo) só depois da UI: o
+        # callback roda na thread do gz e já usa self.ui
+        self.node.subscribe(Model, joint_state_topic(), self.on_joint_state)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -152,20 +148,18 @@ class ManualPositionGUI(QWidget):
         for joint in msg.joint:
             # Verifica se tem axis1 e posição
             if joint.HasField("axis1") and joint.name == "joint_azimuth":
-                pos = joint.axis1.position
-                self.update_az_signal.emit(pos)
+                self.process_az_update(joint.axis1.position)
             
             elif joint.HasField("axis1") and joint.name == "joint_elevation":
-                pos = joint.axis1.position
-                self.update_el_signal.emit(pos)
+                self.process_el_update(joint.axis1.position)
 
-    # Processamento na Thread da GUI
+    # Min/Max a cada mensagem (thread do Gazebo); a tela só na taxa de exibição
     def process_az_update(self, rad_val):
         deg = math.degrees(rad_val)
         if deg < self.az_min: self.az_min = deg
         if deg > self.az_max: self.az_max = deg
         
-        self.lbl_az_monitor.setText(f"Atual: {deg:.2f}° | Min: {self.az_min:.2f}° | Max: {self.az_max:.2f}°")
+        self.ui.set_text(self.lbl_az_monitor, f"Atual: {deg:.2f}° | Min: {self.az_min:.2f}° | Max: {self.az_max:.2f}°")
 
     def process_el_update(self, rad_val):
         deg = math.degrees(rad_val)
@@ -174,7 +168,7 @@ class ManualPositionGUI(QWidget):
         
         # Ajuste visual para evitar flickering se o valor mudar muito rápido
         # (Opcional, mas aqui estamos mostrando tudo raw)
-        self.lbl_el_monitor.setText(f"Atual: {deg:.2f}° | Min: {self.el_min:.2f}° | Max: {self.el_max:.2f}°")
+        self.ui.set_text(self.lbl_el_monitor, f"Atual: {deg:.2f}° | Min: {self.el_min:.2f}° | Max: {self.el_max:.2f}°")
 
     def reset_az_stats(self):
         self.az_min = float('inf')
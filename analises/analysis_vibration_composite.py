@@ -15,7 +15,8 @@ Descrição:
 """
 
 import numpy as np
-import math
+
+from full_robot_vibration_analysis import Material, dish_modes
 
 class StructuralAnalysis:
     def __init__(self):
@@ -29,6 +30,7 @@ class StructuralAnalysis:
         # Alumínio 6061-T6 (Estrutura de Reforço)
         self.E_al = 68.9e9        # Pa (68.9 GPa)
         self.rho_al = 2700        # kg/m^3
+        self.nu_al = 0.33
         
         # 2. DEFINIÇÃO GEOMÉTRICA
         # -----------------------
@@ -96,7 +98,11 @@ class StructuralAnalysis:
         # w_tip = c * R^2  => c = w_tip / R^2
         # U_plate = 8 * pi * D * R^2 * (w_tip^2 / R^4) = (8 * pi * D / R^2) * w_tip^2
         # Logo: 1/2 * K_plate = 8 * pi * D / R^2
-        self.K_plate_eq = 16 * np.pi * self.D_plate / (self.R**2)
+        res = dish_modes(self.h_skin, self.num_ribs, self.mass_ribs_total, self.I_rib,
+                         skin=Material("Fibra de Vidro", self.E_glass, self.rho_glass, self.nu_glass),
+                         rib=Material("Alumínio 6061-T6", self.E_al, self.rho_al, self.nu_al),
+                         R=self.R, L_rib=self.L_rib)
+        self.K_plate_eq = res["K_plate_eq"]
         
         # Para as Varetas (Beams):
         # U_beam = (1/2) * EI * Integral((d2w/dr2)^2) dr
@@ -105,9 +111,9 @@ class StructuralAnalysis:
         # U_beam = 0.5 * EI * 4c^2 * L = 2 * EI * L * c^2
         # Substituindo c = w_tip / L^2 (sendo L=R): 
         # U_beam = 2 * EI * L * (w_tip^2 / L^4) = (2 * EI / L^3) * w_tip^2
-        self.K_rib_eq = (4 * self.E_al * self.I_rib) / (self.L_rib**3) # Stiffness per rib
+        self.K_rib_eq = res["K_rib_eq"] # Stiffness per rib
         
-        self.K_total = self.K_plate_eq + (self.num_ribs * self.K_rib_eq)
+        self.K_total = res["K_total"]
         
         # 2. Energia Cinética Equivalente (Kinetic Energy) - T
         # T = 1/2 * omega^2 * Integral(rho * w^2) dV
@@ -119,7 +125,7 @@ class StructuralAnalysis:
         # Integral(r^5) = R^6 / 6
         # M_eq_plate = rho * h * 2*pi * (R^6/6) / R^4 = rho * h * pi * R^2 / 3
         # Ou seja, M_eq_plate = Mass_plate / 3
-        self.M_eq_plate = self.mass_skin / 3.0
+        self.M_eq_plate = res["M_eq_skin"]
         
         # Massa Equivalente das Varetas:
         # Integral (rho_al * A_rib * (w_tip * r^2/L^2)^2) dr
@@ -127,14 +133,14 @@ class StructuralAnalysis:
         # Integral(r^4) = L^5 / 5
         # M_eq_rib = rho * A * L^5/5 / L^4 = (rho * A * L) / 5
         # M_eq_rib = Mass_rib / 5
-        self.M_eq_ribs = (self.mass_one_rib * self.num_ribs) / 5.0
+        self.M_eq_ribs = res["M_eq_ribs"]
         
-        self.M_total_eq = self.M_eq_plate + self.M_eq_ribs
+        self.M_total_eq = res["M_eq"]
         
         # 3. Frequência Natural
         # omega_n = sqrt(K_total / M_total_eq)
-        self.omega_n = math.sqrt(self.K_total / self.M_total_eq)
-        self.freq_hz = self.omega_n / (2 * math.pi)
+        self.omega_n = res["omega"]
+        self.freq_hz = res["freq"]
         
         return self.freq_hz
 
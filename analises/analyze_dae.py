@@ -1,7 +1,13 @@
+import os
 import xml.etree.ElementTree as ET
 import numpy as np
 import sys
 
+# Utilitários de malha compartilhados (utils/mesh_io.py, utils/mesh_index.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils"))
+from mesh_io import load_dae
+from mesh_index import get_mesh_index
+
 def analyze_dae(filepath, target_y_local, search_radius=0.1):
     print(f"Analisando {filepath}...")
     try:
@@ -23,34 +29,9 @@ def analyze_dae(filepath, target_y_local, search_radius=0.1):
                             if tag_name in ['matrix', 'rotate', 'translate', 'scale']:
                                 print(f"  Transform {tag_name}: {child.text}")
         
-        positions = []
-        
-        # Busca recursiva por float_array
-        for elem in root.iter():
-            if 'float_array' in elem.tag and 'positions' in elem.get('id', ''):
-                text = elem.text
-                if text:
-                    floats = [float(x) for x in text.split()]
-                    positions = floats
-                    print(f"Encontrado array de posições com {len(floats)} elementos.")
-                    break
-        
-        if not positions:
-            print("Não foi possível encontrar float_array com 'positions' no ID. Tentando buscar o maior float_array.")
-            max_len = 0
-            for elem in root.iter():
-                if 'float_array' in elem.tag:
-                    text = elem.text
-                    if text:
-                        floats = [float(x) for x in text.split()]
-                        if len(floats) > max_len:
-                            max_len = len(floats)
-                            positions = floats
-            print(f"Maior array encontrado tem {len(positions)} elementos.")
-
-        if not positions:
-            print("Nenhum dado encontrado.")
-            return
+        # Geometria (todas as <triangles>/<polylist> do arquivo)
+        vertices, faces = load_dae(filepath)
+        print(f"Encontrados {len(vertices)} vértices e {len(faces)} triângulos.")
 
         # Checar up_axis
         up_axis = "Z_UP" # Default
@@ -60,8 +41,7 @@ def analyze_dae(filepath, target_y_local, search_radius=0.1):
                 break
         print(f"Up Axis detectado no DAE: {up_axis}")
 
-        # Converter para numpy reshape (-1, 3)
-        pts = np.array(positions).reshape(-1, 3)
+        pts = vertices
         
         print(f"Total de vértices: {len(pts)}")
         print(f"Bounds Originais (DAE):")
@@ -98,29 +78,17 @@ def analyze_dae(filepath, target_y_local, search_radius=0.1):
         # 0 0 0 1
         
         print("\nAplicando Matriz de Transformação da Cena...")
-        # pts é N x 3. Precisamos N x 4 (homogêneo)
-        ones = np.ones((len(pts), 1))
-        pts_h = np.hstack([pts, ones])
-        
-        # Matriz (Transposta para multiplicar v * M se v for linha, mas aqui é M * v^T.
-        # Vamos fazer dot product normal: v_new = M . v_old (coluna)
-        # Ou v_new = v_old . M.T (linha)
-        
         M = np.array([
             [1, 0, 0, 0.07],
             [0, 0, 1, 0.17],
             [0, -1, 0, -2.04],
             [0, 0, 0, 1]
         ])
-        
-        # pts_h é (N, 4). M é (4, 4).
-        # Queremos (N, 4).
-        # v' = M * v.T -> Resultado (4, N). Transpor de volta -> (N, 4)
-        pts_trans = M @ pts_h.T
-        pts_trans = pts_trans.T
-        
-        pts_final = pts_trans[:, :3] # descarta w
-        
+
+        # Índice espacial construído uma única vez (cache por arquivo + matriz)
+        index = get_mesh_index(filepath, transform=M)
+        pts_final = index.points
+
         print(f"Bounds Finais (Sistema Local do Visual):")
         print(f"  X: {pts_final[:,0].min():.4f} a {pts_final[:,0].max():.4f}")
         print(f"  Y: {pts_final[:,1].min():.4f} a {pts_final[:,1].max():.4f}")
@@ -132,23 +100,31 @@ def analyze_dae(filepath, target_y_local, search_radius=0.1):
         
         print(f"\nBuscando Z máximo em Y = {target_y_local} +/- {search_radius}")
         
-        mask = (np.abs(pts_final[:,1] - target_y_local) < search_radius) & (np.abs(pts_final[:,0]) < 0.2)
-        candidates = pts_final[mask]
-        
-        if len(candidates) > 0:
-            z_max = candidates[:,2].max()
-            print(f"Encontrado! Z local máximo na região: {z_max:.6f}")
-            print(f"Isso corresponde a uma geometria que vai até esse Z.")
-            
-            # Printar mais stats
-            avg_z = np.mean(candidates[:,2])
-            print(f"Z médio na região: {avg_z:.6f}")
-        else:
-            print("Nenhum ponto encontrado nessa região após transformação.")
+        return probe_max_z(index, target_y_local, search_radius)
 
     except Exception as e:
         print(f"Erro ao processar DAE: {e}")
 
+
+def probe_max_z(index, target_y_local, search_radius=0.1, half_width_x=0.2):
+    """Sonda "Z máximo" na faixa |y - target_y_local| < search_radius, |x| < half_width_x."""
+    lo = [-half_width_x, target_y_local - search_radius, -np.inf]
+    hi = [half_width_x, target_y_local + search_radius, np.inf]
+    candidates = index.points[index.query_box(lo, hi)]
+
+    if len(candidates) > 0:
+        z_max = candidates[:,2].max()
+        print(f"Encontrado! Z local máximo na região: {z_max:.6f}")
+        print(f"Isso corresponde a uma geometria que vai até esse Z.")
+
+        # Printar mais stats
+        avg_z = np.mean(candidates[:,2])
+        print(f"Z médio na região: {avg_z:.6f}")
+        return z_max
+
+    print("Nenhum ponto encontrado nessa região após transformação.")
+    return None
+
 if __name__ == "__main__":
     # Y_mundo desejado = 2.143
     # Y_local = Y_mundo - (-0.1725) = 2.143 + 0.1725 = 2.3155
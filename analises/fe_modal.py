@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análise Modal por Elementos Finitos: Torre + Braço + Refletor
+
+Objetivo:
+    Substituir as aproximações de 1 grau de liberdade (Rayleigh, viga
+    engastada com massa na ponta) e o "fator de curvatura" de
+    calculate_vibration_modes.py por modos de vibração reais da estrutura
+    completa, com os materiais de full_robot_vibration_analysis.py.
+
+Metodologia:
+    - Torre, braço e costelas: elementos de pórtico 3D (Timoshenko, ou
+      Euler-Bernoulli com --euler-bernoulli), 6 GDL por nó, massa consistente
+    - Pele do refletor: casca plana quadrilateral (membrana bilinear +
+      placa de Mindlin com cisalhamento MITC4 + rigidez fictícia de
+      "drilling"), massa concentrada, sobre o paraboloide z = r^2 / 4f
+    - Costelas radiais nas linhas da malha (excentricidade desprezada);
+      cubo central ligado à ponta do braço por raios rígidos de aço
+    - Matrizes de elemento calculadas em lote (NumPy), montagem esparsa
+      (scipy.sparse) e autovalores mais baixos por shift-invert (eigsh)
+
+Uso:
+    python3 fe_modal.py                               # ~15 mil GDL
+    python3 fe_modal.py --radial 60 --circumferential 276   # ~100 mil GDL
+    python3 fe_modal.py --dish-only [--flat]          # prato com centro engastado
+"""
+
+import argparse
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
+
+from full_robot_vibration_analysis import (ALUMINUM_6061, ARM_LENGTH, DISH_RADIUS,
+                                           FIBERGLASS, JOINTS_MASS, STEEL_A36,
+                                           TOWER_HEIGHT, TRACKER_MASS, ArmAnalyzer,
+                                           DishAnalyzer, Material, TowerAnalyzer,
+                                           rect_tube_section)
+
+DOF = 6                 # u, v, w, θx, θy, θz por nó
+DISH_FOCAL = 1.8        # Distância focal (11_3d_concentrator_simulation.py)
+HUB_RADIUS = 0.15       # Raio do cubo central do refletor
+SKIN_THICKNESS = 0.01   # 10mm (DishAnalyzer)
+DRILLING_FACTOR = 1e-3  # Rigidez de drilling / rigidez de flexão da casca
+
+DIRECTIONS = ("x", "y", "z")
+
+
+# ==============================================================================
+# SEÇÕES DE VIGA
+# ==============================================================================
+class BeamSection:
+    """
+    Seção de viga no referencial local (x ao longo da viga, z na direção
+    da altura h da seção). I_y resiste à flexão no plano x-z (como I_y de
+    rect_tube_section); shear_y / shear_z são as frações de área efetivas
+    ao cisalhamento em y / z.
+    """
+
+    def __init__(self, area, I_y, I_z, J, shear_y=5.0 / 6.0, shear_z=5.0 / 6.0):
+        self.area = area
+        self.I_y = I_y
+        self.I_z = I_z
+        self.J = J
+        self.shear_y = shear_y
+        self.shear_z = shear_z
+
+    @classmethod
+    def rect_tube(cls, b, h, t):
+        """Tubo retangular b x h, parede t (>= metade do menor lado: maciço)."""
+        area, I_y, I_z = rect_tube_section(b, h, t)
+        if t >= min(b, h) / 2:
+            a, c = max(b, h), min(b, h)
+            J = a * c**3 * (1 / 3 - 0.21 * (c / a) * (1 - c**4 / (12 * a**4)))
+            return cls(area, I_y, I_z, J)
+        # Bredt (seção fechada de parede fina); cisalhamento pelas almas
+        J = 2 * t * (b - t)**2 * (h - t)**2 / ((b - t) + (h - t))
+        return cls(area, I_y, I_z, J, shear_y=2 * t * b / area, shear_z=2 * t * h / area)
+
+
+# Perfis do projeto (mesmos de ArmAnalyzer / TowerAnalyzer)
+ARM_SECTION = BeamSection.rect_tube(0.15, 0.20, 0.006)
+TOWER_SECTION = BeamSection.rect_tube(0.30, 0.30, 0.008)
+# Costela 50x100 com parede de 4mm: ~3,1 kg/m, a massa do CAD
+# (costelas.stl: 28,16 kg em 6 costelas de 1,5m)
+RIB_SECTION = BeamSection.rect_tube(0.05, 0.10, 0.004)
+# Raios do cubo: barra maciça de aço sem massa (ligação rígida); um raio
+# por nó do anel, então a massa real dependeria da malha
+HUB_SECTION = BeamSection.rect_tube(0.10, 0.10, 1.0)
+HUB_LINK = Material("Ligação rígida (aço sem massa)", STEEL_A36.E, 0.0, STEEL_A36.nu)
+
+
+# ==============================================================================
+# MATRIZES DE ELEMENTO (em lote sobre n elementos)
+# ==============================================================================
+def _unit(v):
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def _rotate_blocks(k_local, R):
+    """Tᵀ K T com T = diag(R, R, ...) para K (n, 3b, 3b) e R (n, 3, 3)."""
+    n, size, _ = k_local.shape
+    b = size // 3
+    k = k_local.reshape(n, b, 3, b, 3)
+    return np.einsum('npi,napbq,nqj->naibj', R, k, R, optimize=True).reshape(n, size, size)
+
+
+def beam_matrices(x1, x2, ref, material, section, timoshenko=True):
+    """
+    Rigidez e massa consistente (n, 12, 12), no referencial global, de
+    elementos de pórtico 3D entre x1 e x2 (n, 3). ref (3,) ou (n, 3)
+    aponta a altura da seção (eixo z local).
+    """
+    d = x2 - x1
+    L = np.linalg.norm(d, axis=-1)
+    ex = d / L[:, None]
+    ez = _unit(np.broadcast_to(ref, d.shape) - np.sum(np.broadcast_to(ref, d.shape) * ex,
+                                                      axis=-1, keepdims=True) * ex)
+    ey = np.cross(ez, ex)
+    R = np.stack([ex, ey, ez], axis=1)
+
+    E, rho = material.E, material.rho
+    G = E / (2 * (1 + material.nu))
+    s = section
+    n = len(L)
+    if timoshenko:
+        phi_y = 12 * E * s.I_z / (G * s.shear_y * s.area * L**2)   # flexão em x-y
+        phi_z = 12 * E * s.I_y / (G * s.shear_z * s.area * L**2)   # flexão em x-z
+    else:
+        phi_y = phi_z = np.zeros(n)
+
+    k = np.zeros((n, 12, 12))
+    ea = E * s.area / L
+    gj = G * s.J / L
+    k[:, 0, 0] = k[:, 6, 6] = ea
+    k[:, 0, 6] = -ea
+    k[:, 3, 3] = k[:, 9, 9] = gj
+    k[:, 3, 9] = -gj
+
+    # Plano x-y (v, θz)
+    a = E * s.I_z / ((1 + phi_y) * L**3)
+    k[:, 1, 1] = k[:, 7, 7] = 12 * a
+    k[:, 1, 7] = -12 * a
+    k[:, 1, 5] = k[:, 1, 11] = 6 * L * a
+    k[:, 5, 7] = k[:, 7, 11] = -6 * L * a
+    k[:, 5, 5] = k[:, 11, 11] = (4 + phi_y) * L**2 * a
+    k[:, 5, 11] = (2 - phi_y) * L**2 * a
+
+    # Plano x-z (w, θy)
+    b = E * s.I_y / ((1 + phi_z) * L**3)
+    k[:, 2, 2] = k[:, 8, 8] = 12 * b
+    k[:, 2, 8] = -12 * b
+    k[:, 2, 4] = k[:, 2, 10] = -6 * L * b
+    k[:, 4, 8] = k[:, 8, 10] = 6 * L * b
+    k[:, 4, 4] = k[:, 10, 10] = (4 + phi_z) * L**2 * b
+    k[:, 4, 10] = (2 - phi_z) * L**2 * b
+
+    k = np.triu(k) + np.transpose(np.triu(k, 1), (0, 2, 1))
+
+    # Massa consistente de Euler-Bernoulli + inércia de torção
+    m = np.zeros((n, 12, 12))
+    mass = rho * s.area * L
+    m[:, 0, 0] = m[:, 6, 6] = mass / 3
+    m[:, 0, 6] = m[:, 6, 0] = mass / 6
+    jp = rho * (s.I_y + s.I_z) * L
+    m[:, 3, 3] = m[:, 9, 9] = jp / 3
+    m[:, 3, 9] = m[:, 9, 3] = jp / 6
+    c = mass / 420
+    base = np.array([[156, 22, 54, -13],
+                     [22, 4, 13, -3],
+                     [54, 13, 156, -22],
+                     [-13, -3, -22, 4]], dtype=float)
+    powers = np.array([[0, 1, 0, 1], [1, 2, 1, 2], [0, 1, 0, 1], [1, 2, 1, 2]])
+    block = c[:, None, None] * base * L[:, None, None] ** powers
+    flip = np.array([1, -1, 1, -1], dtype=float)
+    for dofs, sign in (((1, 5, 7, 11), np.ones(4)), ((2, 4, 8, 10), flip)):
+        idx = np.ix_(range(n), dofs, dofs)
+        m[idx] = block * np.outer(sign, sign)
+
+    return _rotate_blocks(k, R), _rotate_blocks(m, R)
+
+
+_GAUSS = np.array([-1.0, 1.0]) / np.sqrt(3.0)
+_XI = np.array([-1.0, 1.0, 1.0, -1.0])
+_ETA = np.array([-1.0, -1.0, 1.0, 1.0])
+
+
+def _shape(xi, eta):
+    """N (4,), dN/dξ (4,), dN/dη (4,) do quadrilátero bilinear."""
+    N = (1 + _XI * xi) * (1 + _ETA * eta) / 4
+    dxi = _XI * (1 + _ETA * eta) / 4
+    deta = _ETA * (1 + _XI * xi) / 4
+    return N, dxi, deta
+
+
+def _jacobian(xy, xi, eta):
+    N, dxi, deta = _shape(xi, eta)
+    J = np.stack([dxi @ xy, deta @ xy], axis=1)          # (n, 2, 2)
+    return N, dxi, deta, J
+
+
+def _covariant_shear(xy, xi, eta):
+    """
+    Linhas (n, 2, 24) das deformações de cisalhamento covariantes
+    γ_ξ, γ_η = ∂w/∂ξ,η + β·∂x/∂ξ,η com β = (θy, -θx).
+    """
+    N, dxi, deta, J = _jacobian(xy, xi, eta)
+    n = len(xy)
+    B = np.zeros((n, 2, 4, DOF))
+    for row, dN in enumerate((dxi, deta)):
+        B[:, row, :, 2] = dN
+        B[:, row, :, 4] = N * J[:, row, 0][:, None]
+        B[:, row, :, 3] = -N * J[:, row, 1][:, None]
+    return B.reshape(n, 2, 4 * DOF)
+
+
+def shell_matrices(X, material, thickness):
+    """
+    Rigidez (n, 24, 24) no referencial global e massa concentrada (n, 24)
+    de cascas planas quadrilaterais de nós X (n, 4, 3), sentido anti-horário
+    em torno da normal.
+    """
+    n = len(X)
+    g_xi = 0.25 * (-X[:, 0] + X[:, 1] + X[:, 2] - X[:, 3])
+    g_eta = 0.25 * (-X[:, 0] - X[:, 1] + X[:, 2] + X[:, 3])
+    e3 = _unit(np.cross(g_xi, g_eta))
+    e1 = _unit(g_xi - np.sum(g_xi * e3, axis=-1, keepdims=True) * e3)
+    e2 = np.cross(e3, e1)
+    R = np.stack([e1, e2, e3], axis=1)
+    center = X.mean(axis=1, keepdims=True)
+    xy = np.einsum('nij,nkj->nki', R[:, :2], X - center)   # (n, 4, 2)
+
+    E, nu, t = material.E, material.nu, thickness
+    G = E / (2 * (1 + nu))
+    iso = np.array([[1, nu, 0], [nu, 1, 0], [0, 0, (1 - nu) / 2]]) / (1 - nu**2)
+    Cm = E * t * iso
+    Cb = E * t**3 / 12 * iso
+    Cs = 5.0 / 6.0 * G * t
+
+    # Pontos de amarração do MITC4: γ_ξ em (0, ∓1), γ_η em (∓1, 0)
+    tie_xi = [_covariant_shear(xy, 0.0, e)[:, 0] for e in (-1.0, 1.0)]
+    tie_eta = [_covariant_shear(xy, x, 0.0)[:, 1] for x in (-1.0, 1.0)]
+
+    k = np.zeros((n, 4 * DOF, 4 * DOF))
+    area = np.zeros(n)
+    for xi in _GAUSS:
+        for eta in _GAUSS:
+            N, dxi, deta, J = _jacobian(xy, xi, eta)
+            det = np.linalg.det(J)
+            Jinv = np.linalg.inv(J)
+            dN = Jinv @ np.stack([dxi, deta])                # (n, 2, 4): d/dx, d/dy
+            dx, dy = dN[:, 0], dN[:, 1]
+            area += det
+
+            Bm = np.zeros((n, 3, 4, DOF))
+            Bm[:, 0, :, 0] = dx
+            Bm[:, 1, :, 1] = dy
+            Bm[:, 2, :, 0] = dy
+            Bm[:, 2, :, 1] = dx
+            Bb = np.zeros((n, 3, 4, DOF))
+            Bb[:, 0, :, 4] = dx
+            Bb[:, 1, :, 3] = -dy
+            Bb[:, 2, :, 4] = dy
+            Bb[:, 2, :, 3] = -dx
+            Bm = Bm.reshape(n, 3, -1)
+            Bb = Bb.reshape(n, 3, -1)
+
+            cov = np.stack([(1 - eta) / 2 * tie_xi[0] + (1 + eta) / 2 * tie_xi[1],
+                            (1 - xi) / 2 * tie_eta[0] + (1 + xi) / 2 * tie_eta[1]], axis=1)
+            Bs = Jinv @ cov
+
+            w = det[:, None, None]
+            k += w * (np.einsum('nki,kl,nlj->nij', Bm, Cm, Bm)
+                      + np.einsum('nki,kl,nlj->nij', Bb, Cb, Bb)
+                      + Cs * np.einsum('nki,nkj->nij', Bs, Bs))
+
+    rot = [DOF * i + j for i in range(4) for j in (3, 4)]
+    drill = DRILLING_FACTOR * k[:, rot, rot].max(axis=1)
+    for i in range(4):
+        k[:, DOF * i + 5, DOF * i + 5] += drill
+
+    # Massa concentrada: isotrópica, não depende do referencial
+    m_node = material.rho * t * area / 4
+    m = np.zeros((n, 4, DOF))
+    m[:, :, :3] = m_node[:, None, None]
+    m[:, :, 3:] = (m_node * t**2 / 12)[:, None, None]
+    return _rotate_blocks(k, R), m.reshape(n, -1)
+
+
+# ==============================================================================
+# MODELO
+# ==============================================================================
+class FEModel:
+    """
+    Malha de nós com 6 GDL, grupos de elementos de viga e casca, massas
+    pontuais e nós engastados. Os elementos são guardados em lote e
+    montados de uma vez em assemble().
+    """
+
+    def __init__(self):
+        self.nodes = np.zeros((0, 3))
+        self.groups = {}
+        self.beams = []
+        self.shells = []
+        self.point_masses = []
+        self.fixed = np.zeros(0, dtype=int)
+
+    @property
+    def n_dof(self):
+        return DOF * len(self.nodes)
+
+    def add_nodes(self, xyz, group=None):
+        xyz = np.atleast_2d(np.asarray(xyz, dtype=float))
+        ids = np.arange(len(self.nodes), len(self.nodes) + len(xyz))
+        self.nodes = np.vstack([self.nodes, xyz])
+        if group is not None:
+            self.groups[group] = np.concatenate([self.groups.get(group, ids[:0]), ids])
+        return ids
+
+    def add_beams(self, n1, n2, material, section, ref=(0.0, 0.0, 1.0), timoshenko=True):
+        self.beams.append((np.atleast_1d(n1), np.atleast_1d(n2), material, section,
+                           np.asarray(ref, dtype=float), timoshenko))
+
+    def add_shells(self, quads, material, thickness):
+        self.shells.append((np.atleast_2d(quads), material, thickness))
+
+    def add_point_mass(self, node, mass):
+        self.point_masses.append((int(node), float(mass)))
+
+    def fix(self, nodes):
+        self.fixed = np.union1d(self.fixed, np.atleast_1d(nodes))
+
+    def assemble(self):
+        """(K, M) esparsas (csr) com todos os GDL."""
+        rows, cols, k_data, m_data = [], [], [], []
+        m_diag = np.zeros(self.n_dof)
+
+        def scatter(conn, ke, me):
+            dofs = (DOF * conn[:, :, None] + np.arange(DOF)).reshape(len(conn), -1)
+            rows.append(np.repeat(dofs, dofs.shape[1], axis=1).ravel())
+            cols.append(np.tile(dofs, (1, dofs.shape[1])).ravel())
+            k_data.append(ke.ravel())
+            m_data.append(np.zeros(ke.size) if me is None else me.ravel())
+            return dofs
+
+        for n1, n2, material, section, ref, timoshenko in self.beams:
+            ke, me = beam_matrices(self.nodes[n1], self.nodes[n2], ref, material, section,
+                                   timoshenko)
+            scatter(np.stack([n1, n2], axis=1), ke, me)
+
+        for quads, material, thickness in self.shells:
+            ke, me = shell_matrices(self.nodes[quads], material, thickness)
+            dofs = scatter(quads, ke, None)
+            np.add.at(m_diag, dofs.ravel(), me.ravel())
+
+        for node, mass in self.point_masses:
+            m_diag[DOF * node:DOF * node + 3] += mass
+
+        shape = (self.n_dof, self.n_dof)
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        K = sp.csr_matrix((np.concatenate(k_data), (rows, cols)), shape=shape)
+        M = sp.csr_matrix((np.concatenate(m_data), (rows, cols)), shape=shape)
+        M = M + sp.diags(m_diag)
+        return K, M.tocsr()
+
+    def free_dofs(self):
+        fixed = (DOF * self.fixed[:, None] + np.arange(DOF)).ravel()
+        return np.setdiff1d(np.arange(self.n_dof), fixed)
+
+    def modes(self, k=10, shift=None, K=None, M=None):
+        """
+        Os k modos de menor frequência: (freqs (k,) Hz, formas (n_nós, 6, k)
+        normalizadas pela massa). shift em Hz (padrão: abaixo de zero, para
+        fatorar K mesmo com um modo de corpo rígido esquecido). K e M já
+        montadas evitam uma nova montagem.
+        """
+        if K is None:
+            K, M = self.assemble()
+        free = self.free_dofs()
+        Kf = K[free][:, free].tocsc()
+        Mf = M[free][:, free].tocsc()
+        sigma = -1.0 if shift is None else (2 * np.pi * shift) ** 2
+        # K - σM é simétrica: ordenação MMD em AᵀA + A e pivô na diagonal
+        # fatoram bem mais rápido que o COLAMD padrão de eigsh
+        lu = splu((Kf - sigma * Mf).tocsc(), permc_spec="MMD_AT_PLUS_A",
+                  diag_pivot_thresh=0.0, options={"SymmetricMode": True})
+        op = LinearOperator(Kf.shape, matvec=lu.solve, dtype=float)
+        w2, vecs = eigsh(Kf, k=k, M=Mf, sigma=sigma, which='LM', OPinv=op)
+        order = np.argsort(w2)
+        w2, vecs = w2[order], vecs[:, order]
+        vecs /= np.sqrt(np.einsum('ik,ik->k', vecs, Mf @ vecs))
+        shapes = np.zeros((self.n_dof, k))
+        shapes[free] = vecs
+        freqs = np.sqrt(np.maximum(w2, 0.0)) / (2 * np.pi)
+        return freqs, shapes.reshape(len(self.nodes), DOF, k)
+
+
+# ==============================================================================
+# ESTRUTURA DO RASTREADOR
+# ==============================================================================
+def add_dish(model, center, n_radial, n_circumferential, n_ribs=6, focal=DISH_FOCAL,
+             skin=FIBERGLASS, rib=ALUMINUM_6061, thickness=SKIN_THICKNESS,
+             rib_section=RIB_SECTION):
+    """
+    Refletor parabólico de eixo z com vértice em center (nó existente):
+    anel do cubo em HUB_RADIUS ligado a center por raios rígidos, pele em
+    malha polar até DISH_RADIUS e n_ribs costelas radiais nas linhas da malha.
+    """
+    if n_circumferential % n_ribs:
+        raise ValueError(f"circumferential ({n_circumferential}) deve ser múltiplo de n_ribs ({n_ribs})")
+    r = np.linspace(HUB_RADIUS, DISH_RADIUS, n_radial + 1)
+    theta = np.linspace(0.0, 2 * np.pi, n_circumferential, endpoint=False)
+    rr, tt = np.meshgrid(r, theta, indexing='ij')
+    depth = rr**2 / (4 * focal)
+    xyz = np.stack([rr * np.cos(tt), rr * np.sin(tt), depth], axis=-1).reshape(-1, 3)
+    ids = model.add_nodes(model.nodes[center] + xyz, group="prato")
+    grid = ids.reshape(n_radial + 1, n_circumferential)
+
+    nxt = np.roll(grid, -1, axis=1)
+    quads = np.stack([grid[:-1], grid[1:], nxt[1:], nxt[:-1]], axis=-1).reshape(-1, 4)
+    model.add_shells(quads, skin, thickness)
+
+    hub = grid[0]
+    model.add_beams(np.full(len(hub), center), hub, HUB_LINK, HUB_SECTION)
+
+    step = n_circumferential // n_ribs
+    lines = grid[:, ::step]
+    n1, n2 = lines[:-1].ravel(), lines[1:].ravel()
+    p = model.nodes[n1] - model.nodes[center]
+    normal = _unit(np.stack([-p[:, 0] / (2 * focal), -p[:, 1] / (2 * focal),
+                             np.ones(len(p))], axis=-1)) if np.isfinite(focal) \
+        else np.array([0.0, 0.0, 1.0])
+    model.add_beams(n1, n2, rib, rib_section, ref=normal)
+    return grid
+
+
+def tracker_model(n_radial=24, n_circumferential=96, n_ribs=6, focal=DISH_FOCAL,
+                  dish_only=False, timoshenko=True, n_tower=10, n_arm=16):
+    """
+    Torre (engastada na base) + braço horizontal + refletor na ponta, com o
+    tracker (TRACKER_MASS) na ponta do braço e as juntas (JOINTS_MASS) no
+    topo da torre. dish_only: só o refletor, com o centro engastado.
+    """
+    model = FEModel()
+    if dish_only:
+        center = model.add_nodes([ARM_LENGTH, 0.0, TOWER_HEIGHT], group="braço")[0]
+        model.fix(center)
+    else:
+        z = np.linspace(0.0, TOWER_HEIGHT, n_tower + 1)
+        tower = model.add_nodes(np.stack([np.zeros_like(z), np.zeros_like(z), z], axis=-1),
+                                group="torre")
+        x = np.linspace(0.0, ARM_LENGTH, n_arm + 1)[1:]
+        arm = np.concatenate([tower[-1:], model.add_nodes(
+            np.stack([x, np.zeros_like(x), np.full_like(x, TOWER_HEIGHT)], axis=-1),
+            group="braço")])
+        model.add_beams(tower[:-1], tower[1:], STEEL_A36, TOWER_SECTION,
+                        ref=(1.0, 0.0, 0.0), timoshenko=timoshenko)
+        model.add_beams(arm[:-1], arm[1:], STEEL_A36, ARM_SECTION,
+                        ref=(0.0, 0.0, 1.0), timoshenko=timoshenko)
+        model.fix(tower[0])
+        model.add_point_mass(tower[-1], JOINTS_MASS)
+        model.add_point_mass(arm[-1], TRACKER_MASS)
+        center = arm[-1]
+    add_dish(model, center, n_radial, n_circumferential, n_ribs, focal)
+    return model
+
+
+def modal_summary(model, shapes, M):
+    """
+    Por modo: fração da energia cinética em cada grupo de nós e massa
+    modal efetiva (% da massa total) nas translações x, y, z.
+    """
+    n_nodes, _, k = shapes.shape
+    phi = shapes.reshape(-1, k)
+    Mphi = (M @ phi).reshape(n_nodes, DOF, k)
+    kinetic = np.einsum('ndk,ndk->nk', shapes, Mphi)
+    share = {g: kinetic[ids].sum(axis=0) for g, ids in model.groups.items()}
+
+    total = {}
+    eff = {}
+    for i, d in enumerate(DIRECTIONS):
+        r = np.zeros((n_nodes, DOF))
+        r[:, i] = 1.0
+        Mr = M @ r.ravel()
+        total[d] = r.ravel() @ Mr
+        eff[d] = (phi.T @ Mr) ** 2 / total[d]
+    return share, eff, total
+
+
+def _rayleigh_report(dish_only):
+    res_dish = DishAnalyzer(n_ribs=6).analyze()
+    if dish_only:
+        return {"prato": res_dish["freq"]}
+    load_on_arm = res_dish["mass"] + TRACKER_MASS
+    res_arm = ArmAnalyzer(tip_mass=load_on_arm).analyze()
+    res_tower = TowerAnalyzer(top_mass=res_arm["beam_mass"] + load_on_arm + JOINTS_MASS).analyze()
+    return {"torre": res_tower["freq"], "braço": res_arm["freq"], "prato": res_dish["freq"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise modal por elementos finitos do rastreador")
+    parser.add_argument("--radial", type=int, default=24, help="Divisões radiais da pele")
+    parser.add_argument("--circumferential", type=int, default=96,
+                        help="Divisões circunferenciais (múltiplo do número de costelas)")
+    parser.add_argument("--ribs", type=int, default=6, help="Número de costelas")
+    parser.add_argument("--modes", type=int, default=10, help="Modos calculados")
+    parser.add_argument("--dish-only", action="store_true", help="Só o refletor, centro engastado")
+    parser.add_argument("--flat", action="store_true", help="Pele plana (sem curvatura)")
+    parser.add_argument("--euler-bernoulli", action="store_true",
+                        help="Vigas sem deformação por cisalhamento")
+    parser.add_argument("--save", default=None, help="Grava nós, frequências e formas em .npz")
+    args = parser.parse_args()
+    if args.radial < 1 or args.ribs < 1:
+        parser.error("--radial e --ribs devem ser >= 1")
+    if args.circumferential < 3 or args.circumferential % args.ribs:
+        parser.error(f"--circumferential ({args.circumferential}) deve ser >= 3 e múltiplo de "
+                     f"--ribs ({args.ribs})")
+
+    focal = np.inf if args.flat else DISH_FOCAL
+    print("=" * 80)
+    print("ANÁLISE MODAL POR ELEMENTOS FINITOS - ROBÔ SOLAR")
+    print("=" * 80)
+
+    t0 = time.perf_counter()
+    model = tracker_model(args.radial, args.circumferential, args.ribs, focal,
+                          args.dish_only, not args.euler_bernoulli)
+    K, M = model.assemble()
+    t_asm = time.perf_counter() - t0
+    print(f"🔧 {len(model.nodes):,} nós, {model.n_dof:,} GDL, {K.nnz:,} não nulos "
+          f"(montagem {t_asm:.2f} s)")
+
+    t0 = time.perf_counter()
+    freqs, shapes = model.modes(args.modes, K=K, M=M)
+    t_eig = time.perf_counter() - t0
+    print(f"📦 {args.modes} modos em {t_eig:.2f} s (fatoração + shift-invert)")
+
+    share, eff, total = modal_summary(model, shapes, M)
+    groups = list(model.groups)
+    print(f"   massa do modelo: {total['z']:.1f} kg")
+    print(f"\n  modo  f (Hz) | energia cinética (%) {' '.join(f'{g:>6}' for g in groups)}"
+          f" | massa efetiva (%) {' '.join(f'{d:>6}' for d in DIRECTIONS)}")
+    for i, f in enumerate(freqs):
+        kin = " ".join(f"{100 * share[g][i]:6.1f}" for g in groups)
+        meff = " ".join(f"{100 * eff[d][i]:6.1f}" for d in DIRECTIONS)
+        print(f"  {i + 1:4d} {f:7.2f} | {'':20} {kin} | {'':17} {meff}")
+
+    print("\n--- Comparação com Rayleigh (full_robot_vibration_analysis.py) ---")
+    for name, f in _rayleigh_report(args.dish_only).items():
+        print(f"  {name:>6}: Rayleigh {f:6.2f} Hz")
+    umbrella = int(np.argmax(eff["z"]))
+    if eff["z"][umbrella] > 0.1:
+        print(f"  Modo {umbrella + 1} ({freqs[umbrella]:.2f} Hz) é o de maior massa efetiva "
+              f"vertical ({100 * eff['z'][umbrella]:.1f}%)")
+    else:
+        print(f"  Nenhum dos {args.modes} modos tem massa efetiva vertical relevante "
+              f"(guarda-chuva acima de {freqs[-1]:.2f} Hz)")
+    if args.dish_only:
+        print("  (com e sem --flat, a razão entre os modos substitui o fator de curvatura 1.5x "
+              "de calculate_vibration_modes.py)")
+
+    if args.save:
+        np.savez(args.save, nodes=model.nodes, freqs=freqs, shapes=shapes,
+                 **{f"group_{g}": ids for g, ids in model.groups.items()})
+        print(f"\n💾 Modos salvos em {args.save}")
+
+
+if __name__ == "__main__":
+    main()
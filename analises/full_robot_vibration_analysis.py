@@ -15,10 +15,13 @@ Objetivo:
 Metodologia:
     - Método da Energia de Rayleigh (Sistemas Contínuos Simplificados)
     - Modelo de Vigas de Euler-Bernoulli com Massa Concentrada na Ponta
+
+As fórmulas (dish_modes, cantilever_modes, rect_tube_section) aceitam
+arrays NumPy e são reutilizadas por modal_sweep.py para varrer o espaço
+de projeto.
 """
 
 import numpy as np
-import math
 
 # ==============================================================================
 # CLASSE DE MATERIAIS
@@ -35,12 +38,105 @@ STEEL_A36 = Material("Aço ASTM A36", 200e9, 7850, 0.26)
 ALUMINUM_6061 = Material("Alumínio 6061-T6", 68.9e9, 2700, 0.33)
 FIBERGLASS = Material("Fibra de Vidro/Epóxi", 30e9, 1900, 0.28)
 
+# Geometria fixa do projeto
+DISH_RADIUS = 1.5         # Raio 1.5m (Diam 3m)
+SKIN_AREA_FACTOR = 1.05   # Área de paraboloide raso ~ 1.05 * pi * R^2
+ARM_LENGTH = 2.0          # Comprimento do braço
+TOWER_HEIGHT = 1.3        # Altura até a junta do braço
+TRACKER_MASS = 5.0        # Tracker na ponta do braço (estimado)
+JOINTS_MASS = 20.0        # Mecanismos das juntas no topo da torre (estimado)
+
+
+def stack_materials(materials):
+    """
+    Material com E, rho e nu em arrays (um elemento por material), para
+    varrer o material como mais um eixo do projeto.
+    """
+    materials = list(materials)
+    return Material(" | ".join(m.name for m in materials),
+                    np.array([m.E for m in materials], dtype=float),
+                    np.array([m.rho for m in materials], dtype=float),
+                    np.array([m.nu for m in materials], dtype=float))
+
+
+# ==============================================================================
+# FÓRMULAS VETORIZADAS (escalares ou arrays que façam broadcast)
+# ==============================================================================
+def rect_tube_section(b, h, t):
+    """
+    Área e inércias (I_y, I_x) de tubo retangular b x h com parede t.
+    Parede >= metade do menor lado dá a barra maciça (b h^3 / 12).
+    """
+    t = np.minimum(t, np.minimum(b, h) / 2)
+    b_in = b - 2*t
+    h_in = h - 2*t
+    area = b*h - b_in*h_in
+    I_y = (b * h**3 - b_in * h_in**3) / 12
+    I_x = (h * b**3 - h_in * b_in**3) / 12
+    return area, I_y, I_x
+
+
+def dish_modes(h_skin, n_ribs, mass_ribs, I_rib, skin=FIBERGLASS, rib=ALUMINUM_6061,
+               R=DISH_RADIUS, L_rib=None):
+    """
+    Modo guarda-chuva do refletor pelo quociente de Rayleigh com
+    w(r) = w_tip (r/R)^2 (dedução em analysis_vibration_composite.py):
+    K = 16 pi D / R^2 + n 4 E I / L^3,  M_eq = m_pele / 3 + m_costelas / 5.
+    """
+    L_rib = R if L_rib is None else L_rib
+    area_skin = SKIN_AREA_FACTOR * np.pi * R**2
+    mass_skin = area_skin * h_skin * skin.rho
+
+    D_plate = (skin.E * h_skin**3) / (12 * (1 - skin.nu**2))
+    K_plate_eq = 16 * np.pi * D_plate / (R**2)
+    K_rib_eq = (4 * rib.E * I_rib) / (L_rib**3)
+    K_total = K_plate_eq + (n_ribs * K_rib_eq)
+
+    M_eq_skin = mass_skin / 3.0
+    M_eq_ribs = mass_ribs / 5.0
+    M_eq = M_eq_skin + M_eq_ribs
+
+    omega = np.sqrt(K_total / M_eq)
+    return {
+        "mass": mass_skin + mass_ribs,
+        "freq": omega / (2 * np.pi),
+        "omega": omega,
+        "area_skin": area_skin,
+        "mass_skin": mass_skin,
+        "mass_ribs": mass_ribs,
+        "D_plate": D_plate,
+        "K_plate_eq": K_plate_eq,
+        "K_rib_eq": K_rib_eq,
+        "K_total": K_total,
+        "M_eq_skin": M_eq_skin,
+        "M_eq_ribs": M_eq_ribs,
+        "M_eq": M_eq,
+    }
+
+
+def cantilever_modes(material, area, I, L, tip_mass):
+    """
+    Viga engastada com massa na ponta (Rayleigh):
+    f = 1 / (2pi) * sqrt( 3EI / (L^3 * (M_tip + 0.24*M_beam)) )
+    """
+    beam_mass = area * L * material.rho
+    k = (3 * material.E * I) / (L**3)
+    m_eff = tip_mass + (0.24 * beam_mass)
+    omega = np.sqrt(k / m_eff)
+    return {
+        "freq": omega / (2 * np.pi),
+        "beam_mass": beam_mass,
+        "stiffness_k": k,
+        "m_eff": m_eff,
+    }
+
+
 # ==============================================================================
 # ANALISADOR DO PRATO (FIBRA + COSTELAS ALUMÍNIO)
 # ==============================================================================
 class DishAnalyzer:
     def __init__(self, n_ribs=6):
-        self.R = 1.5              # Raio 1.5m (Diam 3m)
+        self.R = DISH_RADIUS      # Raio 1.5m (Diam 3m)
         self.h_skin = 0.01        # 10mm espessura
         self.n_ribs = n_ribs      # 6 costelas
         
@@ -51,22 +147,10 @@ class DishAnalyzer:
         
     def analyze(self):
         """Retorna massa total e frequência natural do prato"""
-        # 1. Massa da Pele (Fibra)
-        # Área superficial aprox de paraboloide raso ~ 1.05 * pi * R^2
-        area_skin = 1.05 * np.pi * self.R**2
-        mass_skin = area_skin * self.h_skin * FIBERGLASS.rho
-        
-        # 2. Massa das Costelas (Alumínio)
+        # Massa das Costelas (Alumínio)
         # ATUALIZADO: Massa real medida do arquivo CAD (costelas.stl)
         mass_ribs = 28.16  # kg (Volume 0.010431 m3 * 2700 kg/m3)
         
-        total_mass = mass_skin + mass_ribs
-        
-        # 3. Rigidez e Frequência Fundamental (Método Rayleigh - Modo Guarda-Chuva)
-        # Rigidez Placa
-        D_plate = (FIBERGLASS.E * self.h_skin**3) / (12 * (1 - FIBERGLASS.nu**2))
-        K_plate_eq = 16 * np.pi * D_plate / (self.R**2)
-        
         # Rigidez Costelas
         # Inércia equivalente retrocalculada baseada na massa realista
         # Se 6 costelas pesam 28kg, cada uma pesa ~4.7kg.
@@ -76,21 +160,16 @@ class DishAnalyzer:
         # I ~ 80 cm^4 = 80e-8 m^4 (Estimativa conservadora para perfil leve)
         I_rib = 80e-8 
         
-        K_rib_eq = (4 * ALUMINUM_6061.E * I_rib) / (self.L_rib**3)
-        
-        K_total = K_plate_eq + (self.n_ribs * K_rib_eq)
-        
+        # Rigidez e Frequência Fundamental (Método Rayleigh - Modo Guarda-Chuva)
         # Massa Efetiva (1/3 placa + 1/5 costelas para modo quártico)
-        M_eq = (mass_skin / 3.0) + (mass_ribs / 5.0)
-        
-        omega = math.sqrt(K_total / M_eq)
-        freq = omega / (2 * math.pi)
+        res = dish_modes(self.h_skin, self.n_ribs, mass_ribs, I_rib,
+                         FIBERGLASS, ALUMINUM_6061, self.R, self.L_rib)
         
         return {
-            "mass": total_mass,
-            "freq": freq,
+            "mass": res["mass"],
+            "freq": res["freq"],
             "I_rib": I_rib,
-            "mass_skin": mass_skin,
+            "mass_skin": res["mass_skin"],
             "mass_ribs": mass_ribs
         }
 
@@ -99,7 +178,7 @@ class DishAnalyzer:
 # ==============================================================================
 class ArmAnalyzer:
     def __init__(self, tip_mass):
-        self.L = 2.0                # Comprimento 2m
+        self.L = ARM_LENGTH         # Comprimento 2m
         self.tip_mass = tip_mass    # Massa do prato na ponta
         
         # Perfil Tubo Retangular Aço
@@ -109,33 +188,20 @@ class ArmAnalyzer:
         
     def analyze(self):
         # Propriedades da Seção
-        area_outer = self.b * self.h
-        area_inner = (self.b - 2*self.t) * (self.h - 2*self.t)
-        area = area_outer - area_inner
-        
-        I_y = (self.b * self.h**3 - (self.b - 2*self.t)*(self.h - 2*self.t)**3) / 12
-        I_x = (self.h * self.b**3 - (self.h - 2*self.t)*(self.b - 2*self.t)**3) / 12
+        area, I_y, I_x = rect_tube_section(self.b, self.h, self.t)
         
         # Usando I_y (menor inércia se for de pé? assumindo flexão vertical)
         # Vamos usar a inércia que resiste à gravidade (Eixo X da seção, flexão em torno de Y global)
         I_flex = I_y 
         
-        beam_mass = area * self.L * STEEL_A36.rho
-        
         # Frequência Beam Cantilever com Tip Mass
         # Método aproximação de Dunkerley ou Rayleigh
-        # f = 1 / (2pi) * sqrt( 3EI / (L^3 * (M_tip + 0.24*M_beam)) )
-        
-        k_beam = (3 * STEEL_A36.E * I_flex) / (self.L**3)
-        m_eff = self.tip_mass + (0.24 * beam_mass)
-        
-        omega = math.sqrt(k_beam / m_eff)
-        freq = omega / (2 * math.pi)
+        res = cantilever_modes(STEEL_A36, area, I_flex, self.L, self.tip_mass)
         
         return {
-            "freq": freq,
-            "beam_mass": beam_mass,
-            "stiffness_k": k_beam,
+            "freq": res["freq"],
+            "beam_mass": res["beam_mass"],
+            "stiffness_k": res["stiffness_k"],
             "I_flex": I_flex
         }
 
@@ -144,7 +210,7 @@ class ArmAnalyzer:
 # ==============================================================================
 class TowerAnalyzer:
     def __init__(self, top_mass):
-        self.H = 1.3                # Altura até a junta do braço
+        self.H = TOWER_HEIGHT       # Altura até a junta do braço
         self.top_mass = top_mass    # Massa do Braço + Prato
         
         # Perfil Torre (Mais larga para aguentar torção)
@@ -152,22 +218,15 @@ class TowerAnalyzer:
         self.t = 0.008    # 8mm parede
         
     def analyze(self):
-        area = self.side**2 - (self.side - 2*self.t)**2
-        I = (self.side**4 - (self.side - 2*self.t)**4) / 12
-        
-        tower_mass = area * self.H * STEEL_A36.rho
+        area, I, _ = rect_tube_section(self.side, self.side, self.t)
         
         # Modelo Cantilever com Massa no Topo (Pêndulo Invertido Elástico)
-        k_tower = (3 * STEEL_A36.E * I) / (self.H**3)
-        m_eff = self.top_mass + (0.24 * tower_mass)
-        
-        omega = math.sqrt(k_tower / m_eff)
-        freq = omega / (2 * math.pi)
+        res = cantilever_modes(STEEL_A36, area, I, self.H, self.top_mass)
         
         return {
-            "freq": freq,
-            "tower_mass": tower_mass,
-            "stiffness_k": k_tower
+            "freq": res["freq"],
+            "tower_mass": res["beam_mass"],
+            "stiffness_k": res["stiffness_k"]
         }
 
 # ==============================================================================
@@ -189,7 +248,7 @@ if __name__ == "__main__":
 
     # 2. BRAÇO
     # O braço carrega o prato + tracker (estimado 5kg)
-    load_on_arm = res_dish['mass'] + 5.0 
+    load_on_arm = res_dish['mass'] + TRACKER_MASS
     arm = ArmAnalyzer(tip_mass=load_on_arm)
     res_arm = arm.analyze()
     print(f"\n[2] BRAÇO DE ELEVAÇÃO (AÇO)")
@@ -200,7 +259,7 @@ if __name__ == "__main__":
 
     # 3. TORRE
     # A torre carrega Braço + Prato + Mecanismos (estimado 20kg juntas)
-    load_on_tower = res_arm['beam_mass'] + load_on_arm + 20.0
+    load_on_tower = res_arm['beam_mass'] + load_on_arm + JOINTS_MASS
     tower = TowerAnalyzer(top_mass=load_on_tower)
     res_tower = tower.analyze()
     print(f"\n[3] TORRE DA BASE (AÇO)")
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análise Espectral dos Logs: Welch, FRF e Identificação Modal
+
+Objetivo:
+    Processar os CSVs gravados por 07_data_logger_gui.py (posição,
+    velocidade e esforço das juntas em tempo de simulação) e identificar
+    as frequências naturais e o amortecimento do robô, comparando com as
+    previsões de full_robot_vibration_analysis.py e multibody_modes.py.
+
+Metodologia:
+    - Leitura em blocos (CHUNK_ROWS linhas): logs de vários GB passam sem
+      carregar o arquivo inteiro; a memória fica em O(bloco + nperseg x canais²)
+    - Reamostragem linear para uma grade uniforme em tempo de simulação (as
+      linhas chegam na taxa do joint_state e o tempo tem carimbos repetidos)
+    - Welch em fluxo: janela de Hann, 50% de sobreposição, média removida por
+      segmento; acumula a matriz espectral cruzada G (F, c, c) de todos os
+      canais, com a mesma escala de densidade de scipy.signal.csd
+    - Com torque dos cilindros (06_torque_control_gui.py) como entrada:
+      FRF H1 = G_yx G_xx⁻¹ e coerência múltipla por saída
+    - Entradas puramente senoidais não excitam a banda: nesse caso (ou sem
+      entradas) usa a decomposição no domínio da frequência (FDD) — 1º valor
+      singular de G_yy das saídas — e descarta as linhas forçadas
+    - Picos com proeminência mínima; amortecimento pela banda de meia
+      potência: ζ = (f₂ - f₁) / (2 fₙ)
+
+Uso:
+    python3 log_spectra.py robot_pid_data_20251212_203100.csv
+    python3 log_spectra.py log.csv --nperseg 8192 --outputs joint_elevation_vel
+"""
+
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+from scipy.signal import find_peaks, get_window
+
+from multibody_modes import MultibodyModel, read_controller_gains
+from pid_response import structural_modes
+
+TIME_COLUMN = "Time_s"
+INPUT_JOINTS = ("joint_cylinder", "joint_cylinder_green")  # cmd_force de 06
+CHUNK_ROWS = 200_000
+COHERENCE_MIN = 0.5       # bins com coerência acima disto contam para a FRF
+FRF_BAND_SHARE = 0.2      # fração mínima desses bins para usar H1 em vez de FDD
+PEAK_PROMINENCE = 6.0     # dB
+DYNAMIC_RANGE = 30.0      # dB abaixo do maior pico: ruído, não modo
+FORCED_BINS = 2           # picos a até 2 bins de uma linha de entrada = forçados
+
+
+# ==============================================================================
+# LEITURA EM BLOCOS
+# ==============================================================================
+def read_header(path):
+    with open(path, encoding="utf-8") as f:
+        return f.readline().strip().split(",")
+
+
+def iter_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """Gera (t (n,), dados (n, len(columns))) em blocos de chunk_rows linhas."""
+    header = read_header(path)
+    usecols = [header.index(TIME_COLUMN)] + [header.index(c) for c in columns]
+    with open(path, encoding="utf-8") as f:
+        f.readline()
+        while True:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")    # fim do arquivo: bloco vazio
+                block = np.loadtxt(f, delimiter=",", usecols=usecols, max_rows=chunk_rows,
+                                   ndmin=2)
+            if len(block) == 0:
+                return
+            yield block[:, 0], block[:, 1:]
+            if len(block) < chunk_rows:
+                return
+
+
+def estimate_rate(path, chunk_rows=CHUNK_ROWS):
+    """Taxa de amostragem (Hz) pela mediana dos incrementos positivos de tempo."""
+    for t, _ in iter_chunks(path, [], chunk_rows):
+        dt = np.diff(t)
+        dt = dt[dt > 0]
+        if len(dt):
+            return 1.0 / np.median(dt)
+    raise ValueError(f"{path}: menos de duas amostras com tempo crescente")
+
+
+class UniformResampler:
+    """Interpolação linear em fluxo para a grade t₀ + k / fs."""
+
+    def __init__(self, fs):
+        self.fs = fs
+        self.last_t = None
+        self.last_x = None
+        self.next_k = 0
+        self.t0 = None
+
+    def __call__(self, t, x):
+        if self.last_t is not None:
+            t = np.concatenate([[self.last_t], t])
+            x = np.concatenate([self.last_x[None], x])
+        keep = np.concatenate([[True], np.diff(t) > 0])   # carimbos repetidos
+        t, x = t[keep], x[keep]
+        if len(t) == 0:
+            return x[:0]
+        if self.t0 is None:
+            self.t0 = t[0]
+        k_end = int(np.floor((t[-1] - self.t0) * self.fs + 1e-9)) + 1
+        grid = self.t0 + np.arange(self.next_k, k_end) / self.fs
+        self.next_k = max(k_end, self.next_k)
+        self.last_t, self.last_x = t[-1], x[-1]
+        return np.stack([np.interp(grid, t, x[:, i]) for i in range(x.shape[1])], axis=-1) \
+            if x.shape[1] else np.empty((len(grid), 0))
+
+
+# ==============================================================================
+# WELCH EM FLUXO
+# ==============================================================================
+class CrossSpectrum:
+    """
+    Matriz espectral cruzada G[f, i, j] = E[conj(Xᵢ) Xⱼ] (densidade
+    unilateral, como scipy.signal.csd(xᵢ, xⱼ)) acumulada bloco a bloco.
+    """
+
+    def __init__(self, fs, nperseg, channels, noverlap=None, window="hann"):
+        self.fs = fs
+        self.nperseg = nperseg
+        self.step = nperseg - (nperseg // 2 if noverlap is None else noverlap)
+        self.window = get_window(window, nperseg)
+        self.scale = 1.0 / (fs * (self.window ** 2).sum())
+        self.freqs = np.fft.rfftfreq(nperseg, 1.0 / fs)
+        self.G = np.zeros((len(self.freqs), channels, channels), dtype=complex)
+        self.segments = 0
+        self.pending = np.empty((0, channels))
+
+    def feed(self, x):
+        x = np.concatenate([self.pending, x])
+        n_seg = 0 if len(x) < self.nperseg else (len(x) - self.nperseg) // self.step + 1
+        if n_seg:
+            seg = np.lib.stride_tricks.sliding_window_view(x, self.nperseg, axis=0)[::self.step][:n_seg]
+            seg = seg - seg.mean(axis=-1, keepdims=True)
+            X = np.fft.rfft(seg * self.window, axis=-1)               # (S, c, F)
+            self.G += np.einsum('sif,sjf->fij', X.conj(), X)
+            self.segments += n_seg
+        self.pending = x[n_seg * self.step:]
+
+    def result(self):
+        """(freqs, G) com média e escala de densidade; G (F, c, c)."""
+        if not self.segments:
+            raise ValueError(f"Sinal menor que nperseg = {self.nperseg} amostras")
+        G = self.G * (self.scale / self.segments)
+        last = -1 if self.nperseg % 2 == 0 else None
+        G[1:last] *= 2
+        return self.freqs, G
+
+
+def log_spectra(path, columns, nperseg=4096, fs=None, chunk_rows=CHUNK_ROWS):
+    """Percorre o log uma vez e devolve (freqs, G, fs, duração, média por coluna)."""
+    fs = fs or estimate_rate(path, chunk_rows)
+    resample = UniformResampler(fs)
+    spec = CrossSpectrum(fs, nperseg, len(columns))
+    total = np.zeros(len(columns))
+    n = 0
+    for t, x in iter_chunks(path, columns, chunk_rows):
+        u = resample(t, x)
+        spec.feed(u)
+        total += u.sum(axis=0)
+        n += len(u)
+    freqs, G = spec.result()
+    return freqs, G, fs, n / fs, total / max(n, 1)
+
+
+# ==============================================================================
+# IDENTIFICAÇÃO MODAL
+# ==============================================================================
+def frf_h1(G, inputs, outputs):
+    """H1 (F, saídas, entradas) e coerência múltipla (F, saídas)."""
+    Gxx = G[:, inputs][:, :, inputs]
+    Gxy = G[:, inputs][:, :, outputs]
+    Ht = np.linalg.pinv(Gxx, rcond=1e-10) @ Gxy                       # (F, ni, no)
+    Gyy = np.real(np.diagonal(G[:, outputs][:, :, outputs], axis1=1, axis2=2))
+    explained = np.real(np.einsum('fab,fab->fb', Gxy.conj(), Ht))
+    coherence = np.clip(explained / np.maximum(Gyy, 1e-300), 0.0, 1.0)
+    return np.swapaxes(Ht, 1, 2), coherence
+
+
+def fdd_indicator(G, outputs, normalize=True):
+    """1º valor singular da matriz espectral das saídas (normalizadas pela potência)."""
+    Gyy = G[:, outputs][:, :, outputs]
+    if normalize:
+        power = np.sqrt(np.real(np.einsum('fii->i', Gyy)))
+        Gyy = Gyy / np.outer(power, power)
+    return np.linalg.svd(Gyy, compute_uv=False)[:, 0]
+
+
+def pick_modes(freqs, power, prominence_db=PEAK_PROMINENCE, f_min=None, exclude=(),
+               dynamic_range=DYNAMIC_RANGE):
+    """
+    Picos de um indicador em potência (|H|², PSD) com ζ pela meia potência;
+    picos mais de dynamic_range dB abaixo do maior são ignorados.
+    Retorna lista de dicts freq, damping, level_db; picos a até FORCED_BINS
+    bins das frequências em exclude saem com forced=True.
+    """
+    df = freqs[1] - freqs[0]
+    f_min = 2 * df if f_min is None else f_min
+    db = 10 * np.log10(np.maximum(power, 1e-300))
+    peaks, _ = find_peaks(db, prominence=prominence_db)
+    peaks = peaks[freqs[peaks] >= f_min]
+    if len(peaks):
+        peaks = peaks[db[peaks] >= db[peaks].max() - dynamic_range]
+    modes = []
+    for p in peaks:
+        half = power[p] / 2
+        lo = p
+        while lo > 0 and power[lo] > half:
+            lo -= 1
+        hi = p
+        while hi < len(power) - 1 and power[hi] > half:
+            hi += 1
+        f1 = np.interp(half, [power[lo], power[lo + 1]], [freqs[lo], freqs[lo + 1]])
+        f2 = np.interp(half, [power[hi], power[hi - 1]], [freqs[hi], freqs[hi - 1]])
+        forced = any(abs(freqs[p] - f) <= FORCED_BINS * df for f in exclude)
+        modes.append({"freq": freqs[p], "damping": (f2 - f1) / (2 * freqs[p]),
+                      "level_db": db[p], "forced": forced})
+    return modes
+
+
+def input_lines(freqs, G, inputs, prominence_db=20.0):
+    """Frequências das linhas espectrais (senoides) nos canais de entrada."""
+    lines = []
+    for i in inputs:
+        db = 10 * np.log10(np.maximum(np.real(G[:, i, i]), 1e-300))
+        peaks, _ = find_peaks(db, prominence=prominence_db)
+        lines.extend(freqs[peaks])
+    return sorted(lines)
+
+
+def identify(freqs, G, inputs, outputs, method="auto"):
+    """
+    Identificação modal: FRF H1 quando as entradas cobrem a banda (ou
+    method="frf"), senão FDD. Retorna dict com method, indicator, modes,
+    coherence (None no FDD) e input_lines.
+    """
+    lines = input_lines(freqs, G, inputs) if inputs else []
+    coherence = None
+    if inputs and method != "fdd":
+        H, coherence = frf_h1(G, inputs, outputs)
+        good = coherence.mean(axis=1) > COHERENCE_MIN
+        if method == "frf" or good.mean() > FRF_BAND_SHARE:
+            # |H|² normalizado por par e ponderado pela coerência da saída
+            mag2 = np.abs(H) ** 2 * coherence[:, :, None]
+            mag2 /= np.maximum(mag2.max(axis=0, keepdims=True), 1e-300)
+            indicator = mag2.mean(axis=(1, 2))
+            return {"method": "frf", "indicator": indicator, "coherence": coherence,
+                    "modes": pick_modes(freqs, indicator), "input_lines": lines}
+    indicator = fdd_indicator(G, outputs)
+    return {"method": "fdd", "indicator": indicator, "coherence": coherence,
+            "modes": pick_modes(freqs, indicator, exclude=lines), "input_lines": lines}
+
+
+def predicted_modes(pose=(0.0, 0.0), fe=False):
+    """Previsões: Rayleigh (e MEF) por componente + multicorpos na pose média."""
+    modes = structural_modes(fe)
+    res = MultibodyModel().modes(np.atleast_2d(pose), read_controller_gains())
+    for k, f in enumerate(res["freq"][0]):
+        if np.isfinite(f):
+            dominant = res["coords"][int(np.nanargmax(res["participation"][0, k]))]
+            modes[f"multicorpos {dominant}"] = f
+    return modes
+
+
+# ==============================================================================
+# EXECUÇÃO E RELATÓRIO
+# ==============================================================================
+def default_channels(header):
+    """(entradas, saídas): esforço dos cilindros e pos/vel das juntas."""
+    inputs = [f"{j}_eff" for j in INPUT_JOINTS if f"{j}_eff" in header]
+    outputs = [c for c in header if c.endswith(("_pos", "_vel"))]
+    return inputs, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Welch e identificação modal dos logs do 07")
+    parser.add_argument("log", help="CSV de 07_data_logger_gui.py")
+    parser.add_argument("--inputs", nargs="*", default=None, help="Colunas de entrada")
+    parser.add_argument("--outputs", nargs="*", default=None, help="Colunas de saída")
+    parser.add_argument("--nperseg", type=int, default=4096, help="Amostras por segmento")
+    parser.add_argument("--fs", type=float, default=None,
+                        help="Taxa de reamostragem (Hz); padrão: mediana do log")
+    parser.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="Linhas por bloco")
+    parser.add_argument("--method", choices=("auto", "frf", "fdd"), default="auto")
+    parser.add_argument("--fe-modes", action="store_true", help="Inclui os modos do MEF")
+    parser.add_argument("--save", default=None, help="Grava freqs, G e o indicador em .npz")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("ANÁLISE ESPECTRAL DO LOG - WELCH E IDENTIFICAÇÃO MODAL")
+    print("=" * 80)
+    header = read_header(args.log)
+    inputs, outputs = default_channels(header)
+    inputs = inputs if args.inputs is None else args.inputs
+    outputs = outputs if args.outputs is None else args.outputs
+    columns = inputs + outputs
+    size = os.path.getsize(args.log) / 1e6
+    print(f"📂 {args.log} ({size:.1f} MB)")
+    print(f"   entradas: {', '.join(inputs) or '-'}")
+    print(f"   saídas:   {', '.join(outputs)}")
+
+    t0 = time.perf_counter()
+    freqs, G, fs, duration, mean = log_spectra(args.log, columns, args.nperseg, args.fs, args.chunk)
+    elapsed = time.perf_counter() - t0
+    print(f"📦 {duration:.1f} s de simulação a {fs:.1f} Hz em {elapsed:.2f} s "
+          f"({size / max(elapsed, 1e-9):.0f} MB/s); resolução {freqs[1]:.3f} Hz")
+
+    idx = {c: i for i, c in enumerate(columns)}
+    result = identify(freqs, G, [idx[c] for c in inputs], [idx[c] for c in outputs], args.method)
+    if result["input_lines"]:
+        print("🔧 Linhas forçadas nas entradas: "
+              + ", ".join(f"{f:.2f} Hz" for f in result["input_lines"]))
+    method = {"frf": "FRF H1 (entrada -> saída)", "fdd": "FDD (somente saídas)"}[result["method"]]
+    print(f"🔍 Método: {method}")
+
+    pose = [mean[idx[c]] if c in idx else 0.0
+            for c in ("joint_azimuth_pos", "joint_elevation_pos")]
+    predicted = predicted_modes(pose, args.fe_modes)
+    names = list(predicted)
+    fp = np.array([predicted[k] for k in names])
+
+    print(f"\n  {'f (Hz)':>8} {'ζ (%)':>7} {'nível':>8} | previsão mais próxima")
+    found = [m for m in result["modes"] if not m["forced"]]
+    for m in found:
+        k = int(np.argmin(np.abs(fp - m["freq"])))
+        err = (m["freq"] - fp[k]) / fp[k] * 100
+        print(f"  {m['freq']:8.2f} {m['damping'] * 100:7.2f} {m['level_db']:7.1f}dB | "
+              f"{names[k]} {fp[k]:.2f} Hz ({err:+.0f}%)")
+    if not found:
+        print("  ❌ Nenhum pico acima da proeminência mínima")
+    if result["coherence"] is not None:
+        print(f"\n  Coerência média na banda: {result['coherence'].mean():.2f}")
+
+    if args.save:
+        np.savez(args.save, freqs=freqs, G=G, columns=np.array(columns),
+                 indicator=result["indicator"], fs=fs)
+        print(f"\n💾 Espectros salvos em {args.save}")
+
+
+if __name__ == "__main__":
+    main()
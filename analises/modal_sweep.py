@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Varredura Vetorizada do Espaço de Projeto: Massa x Frequência Fundamental
+
+Objetivo:
+    Avaliar, numa única chamada, todas as combinações de espessura da pele,
+    número e perfil das costelas, perfis do braço e da torre e materiais,
+    com as fórmulas de Rayleigh/viga engastada de
+    full_robot_vibration_analysis.py, e devolver a fronteira de Pareto
+    (menor massa para cada frequência fundamental).
+
+Metodologia:
+    - Cada eixo do projeto vira uma dimensão de broadcast do NumPy; a
+      grade completa só é materializada nas grandezas que dependem de
+      todos os eixos (massa total e frequências da torre)
+    - Cadeia de cargas como no relatório completo: prato + tracker na ponta
+      do braço; braço + carga + juntas no topo da torre
+    - Costelas com perfil de tubo retangular (parede >= metade do menor
+      lado = barra maciça, como em analysis_vibration_composite.py): massa
+      e inércia saem do perfil, e não do CAD como em DishAnalyzer
+    - Frequência fundamental do robô = menor entre prato, braço e torre
+
+Uso:
+    python3 modal_sweep.py                     # grade padrão (~4,5 milhões)
+    python3 modal_sweep.py --min-freq 20 --csv fronteira.csv
+"""
+
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from full_robot_vibration_analysis import (ALUMINUM_6061, ARM_LENGTH, DISH_RADIUS,
+                                           FIBERGLASS, JOINTS_MASS, STEEL_A36,
+                                           TOWER_HEIGHT, TRACKER_MASS, Material,
+                                           cantilever_modes, dish_modes,
+                                           rect_tube_section, stack_materials)
+
+# Eixos do projeto, na ordem das dimensões da grade (comprimentos em m)
+AXES = (
+    "skin_thickness",      # espessura da pele
+    "skin_material",
+    "n_ribs",
+    "rib_width",
+    "rib_height",
+    "rib_wall",            # >= metade do menor lado: barra maciça
+    "rib_material",
+    "arm_width",
+    "arm_height",
+    "arm_wall",
+    "tower_side",
+    "tower_wall",
+    "structure_material",  # braço e torre
+)
+MATERIAL_AXES = ("skin_material", "rib_material", "structure_material")
+
+# Projeto atual (relatório de full_robot_vibration_analysis.py, com as
+# costelas maciças de analysis_vibration_composite.py)
+BASELINE = {
+    "skin_thickness": 0.01,
+    "skin_material": FIBERGLASS,
+    "n_ribs": 6,
+    "rib_width": 0.05,
+    "rib_height": 0.10,
+    "rib_wall": 1.0,
+    "rib_material": ALUMINUM_6061,
+    "arm_width": 0.15,
+    "arm_height": 0.20,
+    "arm_wall": 0.006,
+    "tower_side": 0.30,
+    "tower_wall": 0.008,
+    "structure_material": STEEL_A36,
+}
+
+# Grade padrão: 11 x 9 x 6 x 6 x 3 x 2 x 7 x 3 x 5 x 2 = 4.490.640 projetos
+DEFAULT_GRID = {
+    "skin_thickness": np.round(np.arange(0.006, 0.0165, 0.001), 4),
+    "n_ribs": np.arange(4, 13),
+    "rib_width": np.round(np.arange(0.03, 0.085, 0.01), 4),
+    "rib_height": np.round(np.arange(0.06, 0.165, 0.02), 4),
+    "rib_wall": (0.003, 0.005, 1.0),
+    "rib_material": (ALUMINUM_6061, STEEL_A36),
+    "arm_height": np.round(np.arange(0.15, 0.3125, 0.025), 4),
+    "arm_wall": (0.004, 0.006, 0.008),
+    "tower_side": np.round(np.arange(0.20, 0.425, 0.05), 4),
+    "tower_wall": (0.006, 0.008),
+}
+
+
+# ==============================================================================
+# AVALIAÇÃO VETORIZADA
+# ==============================================================================
+def robot_modes(d):
+    """
+    Massa e frequências do robô para um dict de projeto (valores escalares
+    ou arrays que façam broadcast; materiais como Material, possivelmente
+    de arrays). Retorna dict de arrays no shape de broadcast.
+    """
+    rib_area, rib_I, _ = rect_tube_section(d["rib_width"], d["rib_height"], d["rib_wall"])
+    mass_ribs = d["n_ribs"] * rib_area * DISH_RADIUS * d["rib_material"].rho
+    dish = dish_modes(d["skin_thickness"], d["n_ribs"], mass_ribs, rib_I,
+                      d["skin_material"], d["rib_material"])
+
+    load_on_arm = dish["mass"] + TRACKER_MASS
+    arm_area, arm_I, _ = rect_tube_section(d["arm_width"], d["arm_height"], d["arm_wall"])
+    arm = cantilever_modes(d["structure_material"], arm_area, arm_I, ARM_LENGTH, load_on_arm)
+
+    load_on_tower = arm["beam_mass"] + load_on_arm + JOINTS_MASS
+    tower_area, tower_I, _ = rect_tube_section(d["tower_side"], d["tower_side"], d["tower_wall"])
+    tower = cantilever_modes(d["structure_material"], tower_area, tower_I, TOWER_HEIGHT,
+                             load_on_tower)
+
+    return {
+        "mass": load_on_tower + tower["beam_mass"],
+        "freq": np.minimum(np.minimum(dish["freq"], arm["freq"]), tower["freq"]),
+        "freq_dish": dish["freq"],
+        "freq_arm": arm["freq"],
+        "freq_tower": tower["freq"],
+        "mass_dish": dish["mass"],
+        "mass_arm": arm["beam_mass"],
+        "mass_tower": tower["beam_mass"],
+    }
+
+
+def design_grid(grid=None):
+    """
+    Eixos da varredura -> (valores (tupla por eixo), dict de projeto em
+    broadcast). Eixos ausentes ficam no valor de BASELINE (tamanho 1).
+    """
+    grid = grid or {}
+    values = []
+    design = {}
+    for i, name in enumerate(AXES):
+        axis = grid.get(name, (BASELINE[name],))
+        if isinstance(axis, Material) or np.ndim(axis) == 0:
+            axis = (axis,)
+        axis = tuple(axis)
+        values.append(axis)
+        shape = [1] * len(AXES)
+        shape[i] = len(axis)
+        if name in MATERIAL_AXES:
+            m = stack_materials(axis)
+            design[name] = Material(m.name, m.E.reshape(shape), m.rho.reshape(shape),
+                                    m.nu.reshape(shape))
+        else:
+            design[name] = np.asarray(axis, dtype=float).reshape(shape)
+    return values, design
+
+
+def sweep(grid=None):
+    """
+    Avalia todas as combinações dos eixos de grid (dict nome -> sequência).
+    Retorna (values, resultados de robot_modes no shape da grade).
+    """
+    values, design = design_grid(grid)
+    shape = tuple(len(v) for v in values)
+    res = robot_modes(design)
+    return values, {k: np.broadcast_to(v, shape) for k, v in res.items()}
+
+
+def pareto_front(mass, freq):
+    """
+    Índices (achatados) dos projetos não dominados em (massa mínima,
+    frequência máxima), em ordem crescente de massa: ordena por massa e
+    guarda quem supera a maior frequência vista até ali.
+    """
+    mass = np.ravel(mass)
+    freq = np.ravel(freq)
+    order = np.lexsort((-freq, mass))
+    f = freq[order]
+    keep = np.empty(len(f), dtype=bool)
+    keep[:1] = True
+    keep[1:] = f[1:] > np.maximum.accumulate(f)[:-1]
+    return order[keep]
+
+
+def describe(values, flat_index, shape):
+    """Projeto (dict nome -> valor) do índice achatado da grade."""
+    idx = np.unravel_index(flat_index, shape)
+    return {name: values[i][idx[i]] for i, name in enumerate(AXES)}
+
+
+# ==============================================================================
+# EXECUÇÃO E RELATÓRIO
+# ==============================================================================
+def _label(name, value):
+    if isinstance(value, Material):
+        return value.name
+    if name == "n_ribs":
+        return f"{int(value)}"
+    if name == "rib_wall" and value >= BASELINE["rib_wall"]:
+        return "maciça"
+    return f"{value * 1000:.0f}"
+
+
+def _row(design, res, i):
+    return (f"{res['mass'][i]:8.1f} {res['freq'][i]:7.2f} | "
+            f"pele {_label('skin_thickness', design['skin_thickness']):>2} mm, "
+            f"{_label('n_ribs', design['n_ribs']):>2}x costela "
+            f"{_label('rib_width', design['rib_width'])}x{_label('rib_height', design['rib_height'])} "
+            f"({_label('rib_wall', design['rib_wall'])}, {design['rib_material'].name}) | "
+            f"braço {_label('arm_width', design['arm_width'])}x{_label('arm_height', design['arm_height'])}"
+            f"x{_label('arm_wall', design['arm_wall'])} | "
+            f"torre {_label('tower_side', design['tower_side'])}x{_label('tower_wall', design['tower_wall'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura massa x frequência do robô")
+    parser.add_argument("--min-freq", type=float, default=None,
+                        help="Frequência fundamental mínima (Hz) para o projeto recomendado")
+    parser.add_argument("--top", type=int, default=25, help="Linhas da fronteira no relatório")
+    parser.add_argument("--csv", default=None, help="Grava a fronteira de Pareto em CSV")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("VARREDURA DO ESPAÇO DE PROJETO - MASSA x FREQUÊNCIA FUNDAMENTAL")
+    print("=" * 80)
+
+    _, base = sweep()
+    print(f"📐 Projeto atual: {base['mass'].item():.1f} kg, fundamental {base['freq'].item():.2f} Hz "
+          f"(prato {base['freq_dish'].item():.2f} | braço {base['freq_arm'].item():.2f} | "
+          f"torre {base['freq_tower'].item():.2f} Hz)")
+
+    t0 = time.perf_counter()
+    values, res = sweep(DEFAULT_GRID)
+    shape = res["mass"].shape
+    n = res["mass"].size
+    t_eval = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    front = pareto_front(res["mass"], res["freq"])
+    t_front = time.perf_counter() - t0
+    print(f"📦 {n:,} projetos em {t_eval:.2f} s ({n / t_eval:,.0f}/s); "
+          f"fronteira de Pareto: {len(front)} projetos em {t_front:.2f} s")
+
+    flat = {k: np.ravel(v) for k, v in res.items()}
+    designs = [describe(values, i, shape) for i in front]
+
+    print("\n  massa(kg) f(Hz) | projeto (mm)")
+    step = max(1, len(front) // args.top)
+    for j in range(0, len(front), step):
+        print("  " + _row(designs[j], flat, front[j]))
+
+    if args.min_freq is not None:
+        ok = flat["freq"][front] >= args.min_freq
+        if ok.any():
+            j = int(np.argmax(ok))
+            print(f"\n✅ Mais leve com fundamental >= {args.min_freq:.1f} Hz:")
+            print("  " + _row(designs[j], flat, front[j]))
+        else:
+            print(f"\n❌ Nenhum projeto da grade atinge {args.min_freq:.1f} Hz")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["mass", "freq", "freq_dish", "freq_arm", "freq_tower"] + list(AXES))
+            for i, d in zip(front, designs):
+                writer.writerow([f"{flat[k][i]:.4f}" for k in
+                                 ("mass", "freq", "freq_dish", "freq_arm", "freq_tower")]
+                                + [v.name if isinstance(v, Material) else v for v in d.values()])
+        print(f"\n💾 Fronteira salva em {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
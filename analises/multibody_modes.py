@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análise Modal Multicorpos Acoplada: Ganhos PID + Flexibilidade Estrutural
+
+Objetivo:
+    Substituir os modos desacoplados sqrt(K/J) de calculate_robot_modes.py
+    (inércias estimadas à mão) por um modelo linearizado acoplado, montado a
+    partir do SDF, e responder em quais poses do braço os ganhos dos
+    controladores de junta excitam a estrutura.
+
+Metodologia:
+    - Cadeia serial por produto de exponenciais com 6 coordenadas:
+      joint_azimuth, flexão da torre (x, y), joint_elevation e flexão do
+      braço (vertical, lateral). As juntas vêm do SDF (kinematics.py); cada
+      flexão é uma mola de rotação na raiz do elemento com a rigidez de
+      ponta da viga engastada (k = 3EI/L, analítico ou pelo MEF de fe_modal)
+    - Matriz de massa M(q) das inércias dos links do SDF (massa, CM e
+      tensor), pelas jacobianas de cada corpo, em lote sobre N poses
+    - Controladores JointPositionController do SDF: P como rigidez, D como
+      amortecimento e I como estado integrador; mais o <damping> das juntas,
+      rigidez geométrica da gravidade e amortecimento estrutural ζ
+    - Autovalores da matriz de estado em malha fechada (np.linalg.eig em lote)
+
+    Os CMs são os do SDF: link_arm e link_tower têm o CM na origem do
+    modelo, e o modelo reproduz o que o Gazebo simula. As juntas dos
+    cilindros (só torque) ficam travadas; joint_azimuth, "fixed" no SDF, é
+    tratada como revoluta, como nas GUIs.
+
+Uso:
+    python3 multibody_modes.py                       # grade de poses padrão
+    python3 multibody_modes.py --flex fe --set joint_elevation.d=2000
+"""
+
+import argparse
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from kinematics import ARM_JOINTS, MODEL_NAME, SDF_FILE, axis_angle_matrix, rpy_matrix
+
+from fe_modal import ARM_SECTION, DOF, TOWER_SECTION, FEModel
+from full_robot_vibration_analysis import (STEEL_A36, ArmAnalyzer, TowerAnalyzer,
+                                           rect_tube_section)
+
+GRAVITY = np.array([0.0, 0.0, -9.8])
+STRUCTURAL_DAMPING = 0.02   # ζ das coordenadas de flexão
+COUPLING_SHARE = 0.2        # fração mínima em juntas E em flexão para "modo acoplado"
+CONTROLLER_PLUGIN = "gz-sim-joint-position-controller-system"
+
+AZIMUTH, ELEVATION = ARM_JOINTS
+FLEX_COORDS = ("flex_tower_x", "flex_tower_y", "flex_arm_vertical", "flex_arm_lateral")
+COORDS = (AZIMUTH, "flex_tower_x", "flex_tower_y", ELEVATION, "flex_arm_vertical",
+          "flex_arm_lateral")
+
+
+def _floats(text, n):
+    if text is None:
+        return np.zeros(n)
+    return np.array([float(v) for v in text.split()], dtype=float)
+
+
+# ==============================================================================
+# LEITURA DO SDF
+# ==============================================================================
+def read_controller_gains(sdf_path=SDF_FILE, model_name=MODEL_NAME):
+    """
+    Ganhos dos blocos gz-sim-joint-position-controller-system, no formato
+    de PID_GAINS (07_data_logger_gui.py): {junta: {"p", "i", "d", "i_min",
+    "i_max", "cmd_min", "cmd_max"}}. Limites ausentes ficam infinitos.
+    """
+    root = ET.parse(sdf_path).getroot()
+    model = next(m for m in root.iter('model') if m.get('name') == model_name)
+    gains = {}
+    for plugin in model.findall('plugin'):
+        if plugin.get('filename') != CONTROLLER_PLUGIN:
+            continue
+        text = lambda tag, default: float(plugin.findtext(tag, default))
+        gains[plugin.findtext('joint_name')] = {
+            "p": text('p_gain', 1.0), "i": text('i_gain', 0.0), "d": text('d_gain', 0.0),
+            "i_min": text('i_min', '-inf'), "i_max": text('i_max', 'inf'),
+            "cmd_min": text('cmd_min', '-inf'), "cmd_max": text('cmd_max', 'inf'),
+        }
+    return gains
+
+
+def read_physics_step(sdf_path=SDF_FILE):
+    """<max_step_size> do mundo (s)."""
+    root = ET.parse(sdf_path).getroot()
+    return float(root.findtext('.//physics/max_step_size', '0.001'))
+
+
+def structural_flexibility(source="analytic"):
+    """
+    Rigidez de rotação (N.m/rad) das coordenadas de flexão, equivalente à
+    rigidez de ponta da viga engastada: k = k_ponta L^2.
+    analytic: 3EI/L com os perfis de ArmAnalyzer / TowerAnalyzer;
+    fe: deflexão de ponta do modelo de vigas de Timoshenko de fe_modal.
+    """
+    arm = ArmAnalyzer(tip_mass=0.0)
+    tower = TowerAnalyzer(top_mass=0.0)
+    if source == "analytic":
+        _, I_v, I_l = rect_tube_section(arm.b, arm.h, arm.t)
+        _, I_t, _ = rect_tube_section(tower.side, tower.side, tower.t)
+        k_tower = 3 * STEEL_A36.E * I_t / tower.H
+        return {"flex_tower_x": k_tower, "flex_tower_y": k_tower,
+                "flex_arm_vertical": 3 * STEEL_A36.E * I_v / arm.L,
+                "flex_arm_lateral": 3 * STEEL_A36.E * I_l / arm.L}
+    if source == "fe":
+        k_tower = _fe_root_stiffness(TOWER_SECTION, tower.H, 2)
+        return {"flex_tower_x": k_tower, "flex_tower_y": k_tower,
+                "flex_arm_vertical": _fe_root_stiffness(ARM_SECTION, arm.L, 2),
+                "flex_arm_lateral": _fe_root_stiffness(ARM_SECTION, arm.L, 1)}
+    raise ValueError(f"Fonte de flexibilidade desconhecida: {source}")
+
+
+def _fe_root_stiffness(section, length, direction, n_elements=20):
+    """k_ponta L^2 de uma viga engastada ao longo de x (altura em z) com carga em direction."""
+    model = FEModel()
+    x = np.linspace(0.0, length, n_elements + 1)
+    nodes = model.add_nodes(np.stack([x, np.zeros_like(x), np.zeros_like(x)], axis=-1))
+    model.add_beams(nodes[:-1], nodes[1:], STEEL_A36, section, ref=(0.0, 0.0, 1.0))
+    model.fix(nodes[0])
+    K, _ = model.assemble()
+    free = model.free_dofs()
+    load = np.zeros(model.n_dof)
+    load[DOF * nodes[-1] + direction] = 1.0
+    u = spsolve(K[free][:, free].tocsc(), load[free])
+    deflection = u[np.searchsorted(free, DOF * nodes[-1] + direction)]
+    return length**2 / deflection
+
+
+# ==============================================================================
+# MODELO MULTICORPOS LINEARIZADO
+# ==============================================================================
+class MultibodyModel:
+    """
+    Cadeia azimute -> flexão da torre -> elevação -> flexão do braço, com
+    os links do SDF presos à última coordenada que os move.
+
+    Args:
+        flexibility: dict coordenada de flexão -> rigidez (structural_flexibility)
+        zeta_struct: amortecimento relativo das coordenadas de flexão
+    """
+
+    def __init__(self, sdf_path=SDF_FILE, model_name=MODEL_NAME, flexibility=None,
+                 zeta_struct=STRUCTURAL_DAMPING):
+        root = ET.parse(sdf_path).getroot()
+        model = next(m for m in root.iter('model') if m.get('name') == model_name)
+        joints = {j.findtext('child'): j for j in model.findall('joint')}
+        self.flexibility = dict(flexibility or structural_flexibility())
+        self.zeta_struct = zeta_struct
+
+        # Eixos e âncoras das juntas na configuração zero (como ArmKinematics)
+        link_poses = {l.get('name'): _floats(l.findtext('pose'), 6) for l in model.findall('link')}
+        axes, anchors, self.joint_damping = {}, {}, {}
+        for name in ARM_JOINTS:
+            joint = model.find(f"joint[@name='{name}']")
+            child_pose = link_poses[joint.findtext('child')]
+            child_rot = rpy_matrix(*child_pose[3:])
+            jpose = _floats(joint.findtext('pose'), 6)
+            axis = child_rot @ rpy_matrix(*jpose[3:]) @ _floats(joint.findtext('axis/xyz'), 3)
+            axes[name] = axis / np.linalg.norm(axis)
+            anchors[name] = child_pose[:3] + child_rot @ jpose[:3]
+            self.joint_damping[name] = float(joint.findtext('axis/dynamics/damping', '0'))
+
+        # Corpos: massa, CM e tensor no mundo em q = 0, e a coordenada que os move
+        owner = {ELEVATION: COORDS.index("flex_arm_lateral"),
+                 AZIMUTH: COORDS.index("flex_tower_y")}
+        self.bodies = []
+        for link in model.findall('link'):
+            inertial = link.find('inertial')
+            chain = self._chain(link.get('name'), joints)
+            moving = [owner[j] for j in (ELEVATION, AZIMUTH) if j in chain]
+            if inertial is None or not moving:
+                continue
+            pose = link_poses[link.get('name')]
+            ipose = _floats(inertial.findtext('pose'), 6)
+            rot = rpy_matrix(*pose[3:]) @ rpy_matrix(*ipose[3:])
+            it = inertial.find('inertia')
+            get = lambda tag: float(it.findtext(tag, '0')) if it is not None else 0.0
+            inertia = np.array([[get('ixx'), get('ixy'), get('ixz')],
+                                [get('ixy'), get('iyy'), get('iyz')],
+                                [get('ixz'), get('iyz'), get('izz')]])
+            self.bodies.append({
+                "name": link.get('name'),
+                "mass": float(inertial.findtext('mass', '0')),
+                "com": pose[:3] + rpy_matrix(*pose[3:]) @ ipose[:3],
+                "inertia": rot @ inertia @ rot.T,
+                "last": moving[0],
+            })
+
+        # Coordenadas de flexão: torre na âncora do azimute; braço na âncora
+        # da elevação, perpendiculares à direção elevação -> CM do braço
+        arm_mass = sum(b["mass"] for b in self.bodies if b["last"] == owner[ELEVATION])
+        arm_com = sum(b["mass"] * b["com"] for b in self.bodies
+                      if b["last"] == owner[ELEVATION]) / arm_mass
+        along = arm_com - anchors[ELEVATION]
+        along /= np.linalg.norm(along)
+        vertical = np.cross(along, [0.0, 0.0, 1.0])
+        vertical /= np.linalg.norm(vertical)
+        axes.update({"flex_tower_x": np.array([1.0, 0.0, 0.0]),
+                     "flex_tower_y": np.array([0.0, 1.0, 0.0]),
+                     "flex_arm_vertical": vertical,
+                     "flex_arm_lateral": np.cross(vertical, along)})
+        anchors.update({"flex_tower_x": anchors[AZIMUTH], "flex_tower_y": anchors[AZIMUTH],
+                        "flex_arm_vertical": anchors[ELEVATION],
+                        "flex_arm_lateral": anchors[ELEVATION]})
+        self.axes = np.array([axes[c] for c in COORDS])
+        self.anchors = np.array([anchors[c] for c in COORDS])
+
+    @staticmethod
+    def _chain(link, joints):
+        names = []
+        while link in joints:
+            joint = joints[link]
+            names.append(joint.get('name'))
+            link = joint.findtext('parent')
+        return names
+
+    def __repr__(self):
+        return (f"MultibodyModel({len(self.bodies)} corpos, "
+                f"{sum(b['mass'] for b in self.bodies):.1f} kg móveis)")
+
+    # ----- cinemática da cadeia -----
+    def _frames(self, q):
+        """Eixos (N, n, 3) e âncoras (N, n, 3) atuais, e (R, t) após cada coordenada."""
+        N, n = q.shape
+        R = np.broadcast_to(np.eye(3), (N, 3, 3))
+        t = np.zeros((N, 3))
+        axes = np.empty((N, n, 3))
+        anchors = np.empty((N, n, 3))
+        frames = []
+        for i in range(n):
+            a, c = self.axes[i], self.anchors[i]
+            axes[:, i] = R @ a
+            anchors[:, i] = R @ c + t
+            Ri = axis_angle_matrix(a, q[:, i])
+            t = np.einsum('nij,nj->ni', R, c - Ri @ c) + t
+            R = R @ Ri
+            frames.append((R, t))
+        return axes, anchors, frames
+
+    def mass_matrix(self, q):
+        """M(q) (N, n, n) e torques generalizados da gravidade (N, n)."""
+        q = np.atleast_2d(q)
+        N, n = q.shape
+        axes, anchors, frames = self._frames(q)
+        M = np.zeros((N, n, n))
+        tau_g = np.zeros((N, n))
+        for body in self.bodies:
+            k = body["last"] + 1
+            R, t = frames[body["last"]]
+            p = R @ body["com"] + t
+            Jv = np.cross(axes[:, :k], p[:, None, :] - anchors[:, :k])   # (N, k, 3)
+            Jw = axes[:, :k]
+            I = R @ body["inertia"] @ np.swapaxes(R, 1, 2)
+            M[:, :k, :k] += (body["mass"] * np.einsum('nia,nja->nij', Jv, Jv)
+                             + np.einsum('nia,nab,njb->nij', Jw, I, Jw))
+            tau_g[:, :k] += body["mass"] * Jv @ GRAVITY
+        return M, tau_g
+
+    def gravity_stiffness(self, q, h=1e-6):
+        """-∂τ_g/∂q (N, n, n) por diferenças centrais, simetrizada."""
+        q = np.atleast_2d(q)
+        n = q.shape[1]
+        K = np.empty((len(q), n, n))
+        for j in range(n):
+            dq = np.zeros(n)
+            dq[j] = h
+            K[:, :, j] = -(self.mass_matrix(q + dq)[1] - self.mass_matrix(q - dq)[1]) / (2 * h)
+        return (K + np.swapaxes(K, 1, 2)) / 2
+
+    # ----- malha fechada -----
+    def linearize(self, poses, gains):
+        """
+        (M, C, K, Ki) em lote para poses (N, 2) = (azimute, elevação) com as
+        flexões nulas. Ki (N, n) é o ganho integral de cada coordenada.
+        """
+        poses = np.atleast_2d(np.asarray(poses, dtype=float))
+        N, n = len(poses), len(COORDS)
+        q = np.zeros((N, n))
+        q[:, COORDS.index(AZIMUTH)] = poses[:, 0]
+        q[:, COORDS.index(ELEVATION)] = poses[:, 1]
+        M, _ = self.mass_matrix(q)
+        K = self.gravity_stiffness(q)
+        C = np.zeros((N, n, n))
+        Ki = np.zeros((N, n))
+        for i, name in enumerate(COORDS):
+            if name in self.flexibility:
+                k = self.flexibility[name]
+                K[:, i, i] += k
+                C[:, i, i] += 2 * self.zeta_struct * np.sqrt(k * M[:, i, i])
+            else:
+                g = gains.get(name, {})
+                K[:, i, i] += g.get("p", 0.0)
+                C[:, i, i] += g.get("d", 0.0) + self.joint_damping.get(name, 0.0)
+                Ki[:, i] = g.get("i", 0.0)
+        return M, C, K, Ki
+
+    def state_matrix(self, poses, gains):
+        """A (N, 3n, 3n) para x = [∫q, q, q̇] (erro de posição = -q)."""
+        M, C, K, Ki = self.linearize(poses, gains)
+        return state_matrix(M, C, K, Ki), M
+
+    def modes(self, poses, gains):
+        """
+        Modos oscilatórios em malha fechada para cada pose:
+        dict com freq (N, m) Hz, damping (N, m), eigvals (N, m) e
+        participation (N, m, n): fração de cada coordenada em φᵀ diag(M) φ.
+        Só os autovalores com parte imaginária > 0 (um por par conjugado),
+        ordenados por frequência; m = n (polos reais viram NaN).
+        max_real (N,): maior parte real do espectro completo, polos reais
+        incluídos (> 0 = instável).
+        """
+        A, M = self.state_matrix(poses, gains)
+        N, n = M.shape[:2]
+        lam, vec = np.linalg.eig(A)
+        max_real = lam.real.max(axis=1)
+        phi = vec[:, n:2 * n, :]
+        energy = np.abs(phi) ** 2 * np.diagonal(M, axis1=1, axis2=2)[:, :, None]
+        share = energy / np.maximum(energy.sum(axis=1, keepdims=True), 1e-300)
+
+        osc = lam.imag > 1e-9
+        key = np.where(osc, np.abs(lam), np.inf)
+        order = np.argsort(key, axis=1)[:, :n]
+        lam = np.take_along_axis(lam, order, axis=1)
+        valid = np.take_along_axis(osc, order, axis=1)
+        share = np.take_along_axis(share, order[:, None, :], axis=2).transpose(0, 2, 1)
+        wn = np.where(valid, np.abs(lam), np.nan)
+        safe = np.where(valid, np.abs(lam), 1.0)    # polos reais (inclusive 0) sem divisão
+        return {
+            "eigvals": np.where(valid, lam, np.nan),
+            "freq": wn / (2 * np.pi),
+            "damping": np.where(valid, -lam.real / safe, np.nan),
+            "participation": np.where(valid[:, :, None], share, np.nan),
+            "max_real": max_real,
+            "coords": COORDS,
+        }
+
+
+def state_matrix(M, C, K, Ki):
+    """
+    Matriz de estado (..., 3n, 3n) para x = [∫q, q, q̇] de
+    M q̈ + C q̇ + K q + Ki ∫q = 0. Os argumentos fazem broadcast entre si
+    (ex.: M de uma pose com ganhos (G, n) de G conjuntos).
+    """
+    M, C, K = np.broadcast_arrays(M, C, K)
+    Ki = np.broadcast_to(Ki, M.shape[:-1])
+    n = M.shape[-1]
+    Minv = np.linalg.inv(M)
+    A = np.zeros(M.shape[:-2] + (3 * n, 3 * n))
+    eye = np.eye(n)
+    A[..., :n, n:2 * n] = eye
+    A[..., n:2 * n, 2 * n:] = eye
+    A[..., 2 * n:, :n] = -Minv * Ki[..., None, :]
+    A[..., 2 * n:, n:2 * n] = -Minv @ K
+    A[..., 2 * n:, 2 * n:] = -Minv @ C
+    return A
+
+
+def coupling(result):
+    """Fração (N, m) de cada modo nas juntas e nas flexões -> min das duas."""
+    part = result["participation"]
+    flex = np.array([c in FLEX_COORDS for c in result["coords"]])
+    return np.minimum(np.nansum(part[:, :, flex], axis=2), np.nansum(part[:, :, ~flex], axis=2))
+
+
+# ==============================================================================
+# EXECUÇÃO E RELATÓRIO
+# ==============================================================================
+def _parse_overrides(items, gains):
+    gains = {j: dict(g) for j, g in gains.items()}
+    for item in items or ():
+        key, value = item.split("=")
+        joint, term = key.rsplit(".", 1)
+        gains.setdefault(joint, {})[term] = float(value)
+    return gains
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modos multicorpos acoplados (PID + flexibilidade)")
+    parser.add_argument("--azimuth-steps", type=int, default=24, help="Poses de azimute (0-360°)")
+    parser.add_argument("--elevation-steps", type=int, default=19, help="Poses de elevação (-90°-90°)")
+    parser.add_argument("--flex", choices=("analytic", "fe"), default="analytic",
+                        help="Fonte da rigidez estrutural")
+    parser.add_argument("--zeta", type=float, default=STRUCTURAL_DAMPING,
+                        help="Amortecimento estrutural relativo")
+    parser.add_argument("--set", action="append", metavar="JUNTA.TERMO=VALOR",
+                        help="Sobrescreve um ganho do SDF (ex.: joint_elevation.d=2000)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("ANÁLISE MODAL MULTICORPOS - GANHOS PID x FLEXIBILIDADE ESTRUTURAL")
+    print("=" * 80)
+    gains = _parse_overrides(args.set, read_controller_gains())
+    model = MultibodyModel(flexibility=structural_flexibility(args.flex), zeta_struct=args.zeta)
+    print(f"🔧 {model}")
+    for name, g in gains.items():
+        print(f"   {name}: P={g['p']:g} I={g['i']:g} D={g['d']:g}")
+    for name, k in model.flexibility.items():
+        print(f"   {name}: k={k / 1e6:.2f} MN.m/rad ({args.flex})")
+
+    az = np.linspace(0.0, 2 * np.pi, args.azimuth_steps, endpoint=False)
+    el = np.linspace(-np.pi / 2, np.pi / 2, args.elevation_steps)
+    poses = np.stack(np.meshgrid(az, el, indexing='ij'), axis=-1).reshape(-1, 2)
+
+    t0 = time.perf_counter()
+    res = model.modes(poses, gains)
+    dt = time.perf_counter() - t0
+    print(f"📦 {len(poses)} poses em {dt:.3f} s")
+
+    # Comparação com o modelo desacoplado na pose zero
+    M0, _ = model.mass_matrix(np.zeros((1, len(COORDS))))
+    print("\n--- Desacoplado (calculate_robot_modes.py) x acoplado, pose zero ---")
+    for name in (AZIMUTH, ELEVATION):
+        i = COORDS.index(name)
+        J = M0[0, i, i]
+        f = np.sqrt(max(gains.get(name, {}).get("p", 0.0), 0.0) / J) / (2 * np.pi)
+        print(f"   {name}: J={J:.1f} kg.m², sqrt(Kp/J) = {f:.2f} Hz")
+
+    step = read_physics_step()
+    couple = coupling(res)
+    dominant = np.nanargmax(np.nan_to_num(res["participation"], nan=-1.0), axis=2)
+    print(f"\n  elev(°)  modo: f (Hz) / ζ / coordenada dominante   [* acoplado junta-estrutura]")
+    for j, e in enumerate(el):
+        idx = np.flatnonzero(np.isclose(poses[:, 1], e))
+        row = idx[0]
+        cells = []
+        for m in range(len(COORDS)):
+            if np.isnan(res["freq"][row, m]):
+                continue
+            mark = "*" if couple[row, m] >= COUPLING_SHARE else " "
+            cells.append(f"{res['freq'][row, m]:6.2f}/{res['damping'][row, m]:.3f}/"
+                         f"{COORDS[dominant[row, m]].replace('joint_', '').replace('flex_', '~')}{mark}")
+        print(f"  {np.degrees(e):6.1f}  " + " ".join(cells))
+
+    coupled = couple >= COUPLING_SHARE
+    weak = coupled & (res["damping"] < 0.01)
+    unstable = res["max_real"] > 0    # espectro completo: pega também polos reais
+    fast = res["freq"] * 2 * np.pi * step > 0.5
+    print(f"\n--- Diagnóstico ({len(poses)} poses) ---")
+    print(f"   Modos acoplados junta-estrutura (≥{COUPLING_SHARE:.0%} em ambos): "
+          f"{np.any(coupled, axis=1).sum()} poses")
+    if weak.any():
+        rows, cols = np.nonzero(weak)
+        worst = np.argmin(res["damping"][rows, cols])
+        r, m = rows[worst], cols[worst]
+        print(f"⚠️ Modo acoplado com ζ < 1% em {np.any(weak, axis=1).sum()} poses; pior: "
+              f"az={np.degrees(poses[r, 0]):.0f}° el={np.degrees(poses[r, 1]):.0f}°, "
+              f"{res['freq'][r, m]:.2f} Hz, ζ={res['damping'][r, m]:.4f}")
+    if unstable.any():
+        print(f"❌ Instável em {unstable.sum()} poses")
+    if fast.any():
+        print(f"⚠️ Modos com ω·dt > 0.5 (dt={step * 1000:g} ms): a integração do Gazebo "
+              f"distorce essas frequências")
+    if not (weak.any() or unstable.any()):
+        print("✅ Nenhum modo acoplado pouco amortecido na grade")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Avaliação em Lote de Ganhos PID: Bode e Resposta ao Degrau
+
+Objetivo:
+    Trocar o ajuste por tentativa e erro no Gazebo (minutos por conjunto
+    de ganhos) por milissegundos: para muitos conjuntos de ganhos de uma
+    junta, calcula a resposta em frequência (módulo/fase) e ao degrau em
+    malha fechada e aponta ressonâncias perto dos modos estruturais das
+    análises (full_robot_vibration_analysis.py / fe_modal.py).
+
+Metodologia:
+    - Planta: modelo multicorpos linearizado de multibody_modes.py (inércias
+      dos links do SDF + flexibilidade da torre e do braço) numa pose
+    - Controlador como o JointPositionController do Gazebo:
+      τ = P e + I ∫e + D de/dt, e = referência - posição (o degrau da
+      referência dá o "chute" derivativo). Saturações (i_max, cmd_max) não
+      entram no modelo linear
+    - Matrizes de estado (G, 3n, 3n) para G conjuntos de ganhos e forma
+      modal: A = V Λ V⁻¹, H(jω) = C V (jω - Λ)⁻¹ V⁻¹ (B + jω B_d) e degrau
+      pela mesma decomposição, sem integração numérica
+
+Uso:
+    python3 pid_response.py                              # grade na elevação
+    python3 pid_response.py --joint joint_azimuth --kp 100 1e4 12 --ki 0 10 --kd 0 1e4 12
+"""
+
+import argparse
+import ast
+import csv
+import os
+import time
+
+import numpy as np
+
+from full_robot_vibration_analysis import (JOINTS_MASS, TRACKER_MASS, ArmAnalyzer,
+                                           DishAnalyzer, TowerAnalyzer)
+from multibody_modes import (COORDS, ELEVATION, MultibodyModel, read_controller_gains,
+                             read_physics_step, state_matrix, structural_flexibility)
+
+LOGGER_GUI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                          "07_data_logger_gui.py")
+PID_TERMS = ("p", "i", "d")
+RESONANCE_MARGIN = 0.15   # polo a ±15% de uma frequência estrutural
+RESONANCE_DAMPING = 0.05  # ... com ζ abaixo disto
+PEAK_LIMIT = 6.0          # pico de |H| (dB) acima disto: pouco amortecido
+SAMPLING_LIMIT = 0.2      # max(D/J, sqrt(P/J)) * dt acima disto: rápido para o passo
+SETTLING_BAND = 0.02      # faixa de acomodação (2%)
+CHUNK = 64                # conjuntos por bloco em bode() e step()
+
+
+# ==============================================================================
+# CONJUNTOS DE GANHOS
+# ==============================================================================
+def read_logger_gains(path=LOGGER_GUI):
+    """PID_GAINS de 07_data_logger_gui.py (lido do código, sem importar o Qt)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == "PID_GAINS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    return {}
+
+
+def stack_gains(gain_dicts):
+    """Lista de dicts no formato PID_GAINS -> {junta: {"p", "i", "d": (G,)}}."""
+    joints = sorted({j for g in gain_dicts for j in g})
+    return {j: {t: np.array([g.get(j, {}).get(t, 0.0) for g in gain_dicts], dtype=float)
+                for t in PID_TERMS} for j in joints}
+
+
+def gain_grid(base, joint, kp, ki, kd):
+    """
+    Produto cartesiano kp x ki x kd para joint; as outras juntas ficam com
+    os ganhos de base. Retorna ({junta: {termo: (G,)}}, G).
+    """
+    P, I, D = (a.ravel() for a in np.meshgrid(kp, ki, kd, indexing='ij'))
+    sets = {j: {t: np.full(len(P), float(g.get(t, 0.0))) for t in PID_TERMS}
+            for j, g in base.items()}
+    sets[joint] = {"p": P, "i": I, "d": D}
+    return sets, len(P)
+
+
+def structural_modes(fe=False):
+    """Frequências estruturais de referência (Hz): Rayleigh e, opcionalmente, MEF."""
+    res_dish = DishAnalyzer(n_ribs=6).analyze()
+    load_on_arm = res_dish["mass"] + TRACKER_MASS
+    res_arm = ArmAnalyzer(tip_mass=load_on_arm).analyze()
+    res_tower = TowerAnalyzer(top_mass=res_arm["beam_mass"] + load_on_arm + JOINTS_MASS).analyze()
+    modes = {"prato (Rayleigh)": res_dish["freq"], "braço (Rayleigh)": res_arm["freq"],
+             "torre (Rayleigh)": res_tower["freq"]}
+    if fe:
+        from fe_modal import tracker_model
+        freqs, _ = tracker_model().modes(6)
+        modes.update({f"MEF modo {i + 1}": f for i, f in enumerate(freqs)})
+    return modes
+
+
+# ==============================================================================
+# MALHA FECHADA EM LOTE
+# ==============================================================================
+class ClosedLoopBatch:
+    """
+    G conjuntos de ganhos numa pose; entrada = referência de joint, saída =
+    posição de joint.
+
+    Args:
+        model: MultibodyModel
+        pose: (azimute, elevação) em rad
+        gains: {junta: {"p", "i", "d": (G,)}} (stack_gains / gain_grid)
+    """
+
+    def __init__(self, model, pose, gains, joint=ELEVATION):
+        M, C, K, _ = model.linearize(np.atleast_2d(pose), {})
+        n = len(COORDS)
+        G = len(next(iter(next(iter(gains.values())).values())))
+        P, I, D = (np.zeros((G, n)) for _ in PID_TERMS)
+        for name, g in gains.items():
+            if name in COORDS:
+                i = COORDS.index(name)
+                P[:, i], I[:, i], D[:, i] = g["p"], g["i"], g["d"]
+        eye = np.eye(n)
+        K = K + P[:, :, None] * eye
+        C = C + D[:, :, None] * eye
+        self.A = state_matrix(M, C, K, I)
+
+        j = COORDS.index(joint)
+        Minv_j = np.linalg.inv(M[0])[:, j]
+        self.B = np.zeros((G, 3 * n))
+        self.B[:, j] = -1.0                                  # ∫(q - r)
+        self.B[:, 2 * n:] = P[:, j, None] * Minv_j           # P r
+        self.Bd = np.zeros((G, 3 * n))
+        self.Bd[:, 2 * n:] = D[:, j, None] * Minv_j          # D dr/dt
+        self.out = n + j
+        self.n_sets = G
+        self.gains = {"p": P[:, j], "i": I[:, j], "d": D[:, j]}
+        self.joint = joint
+        self.inertia = M[0, j, j]
+
+        self.eigvals, V = np.linalg.eig(self.A)
+        Vinv = np.linalg.inv(V)
+        self.cv = V[:, self.out, :]                          # (G, s)
+        self.vb = np.einsum('gij,gj->gi', Vinv, self.B)
+        self.vbd = np.einsum('gij,gj->gi', Vinv, self.Bd)
+
+    def poles(self):
+        """(freq (G, s) Hz, ζ (G, s)) dos polos."""
+        wn = np.abs(self.eigvals)
+        zeta = np.where(wn > 0, -self.eigvals.real / np.maximum(wn, 1e-300), 1.0)
+        return wn / (2 * np.pi), zeta
+
+    def stable(self, tol=1e-9):
+        """(G,) bool; λ = 0 vem do ∫ desacoplado das coordenadas com I = 0."""
+        lam = self.eigvals
+        return np.where(np.abs(lam) < tol, -1.0, lam.real).max(axis=1) < 0
+
+    def bode(self, freqs):
+        """Módulo (dB) e fase (graus) (G, F) nas frequências freqs (Hz)."""
+        s = 2j * np.pi * np.asarray(freqs, dtype=float)
+        H = np.empty((self.n_sets, len(s)), dtype=complex)
+        for a in range(0, self.n_sets, CHUNK):
+            b = min(a + CHUNK, self.n_sets)
+            resolvent = 1.0 / (s[None, :, None] - self.eigvals[a:b, None, :])
+            H[a:b] = np.einsum('gk,gfk,gfk->gf', self.cv[a:b], resolvent,
+                               self.vb[a:b, None, :] + s[None, :, None] * self.vbd[a:b, None, :])
+        return 20 * np.log10(np.maximum(np.abs(H), 1e-300)), np.degrees(np.unwrap(np.angle(H), axis=1))
+
+    def step(self, t):
+        """Resposta (G, T) ao degrau unitário da referência (x(0) = 0)."""
+        t = np.asarray(t, dtype=float)
+        y = np.empty((self.n_sets, len(t)))
+        for a in range(0, self.n_sets, CHUNK):
+            b = min(a + CHUNK, self.n_sets)
+            lam = self.eigvals[a:b, None, :]
+            e = np.exp(lam * t[None, :, None])
+            small = np.abs(lam) < 1e-9
+            integral = np.where(small, t[None, :, None], (e - 1) / np.where(small, 1.0, lam))
+            # o chute derivativo entra como condição inicial: x(0+) = B_d
+            y[a:b] = np.einsum('gk,gtk->gt', self.cv[a:b],
+                               integral * self.vb[a:b, None, :]
+                               + e * self.vbd[a:b, None, :]).real
+        return y
+
+
+def step_metrics(t, y):
+    """Sobressinal (%), subida 10-90% (s), acomodação 2% (s) e erro final, em lote."""
+    final_error = 1.0 - y[:, -1]
+    overshoot = np.maximum(y.max(axis=1) - 1.0, 0.0) * 100
+    t10 = t[np.argmax(y >= 0.1, axis=1)]
+    t90 = np.where((y >= 0.9).any(axis=1), t[np.argmax(y >= 0.9, axis=1)], np.inf)
+    outside = np.abs(y - 1.0) > SETTLING_BAND
+    last = len(t) - 1 - np.argmax(outside[:, ::-1], axis=1)
+    settling = np.where(~outside.any(axis=1), 0.0,
+                        np.where(outside[:, -1], np.inf, t[np.minimum(last + 1, len(t) - 1)]))
+    return {"overshoot": overshoot, "rise": t90 - t10, "settling": settling,
+            "final_error": final_error}
+
+
+def resonance_flags(batch, modes, margin=RESONANCE_MARGIN, zeta_max=RESONANCE_DAMPING):
+    """
+    (G,) bool e o nome do modo estrutural mais próximo de algum polo pouco
+    amortecido (ζ < zeta_max e |f - f_s| / f_s < margin).
+    """
+    freq, zeta = batch.poles()
+    names = list(modes)
+    fs = np.array([modes[k] for k in names])
+    near = np.abs(freq[:, :, None] - fs) / fs < margin                 # (G, s, m)
+    hit = near & (zeta < zeta_max)[:, :, None] & (batch.eigvals.imag > 0)[:, :, None]
+    flagged = hit.any(axis=(1, 2))
+    which = np.array([names[i] for i in np.argmax(hit.any(axis=1), axis=1)])
+    return flagged, np.where(flagged, which, "")
+
+
+def evaluate(batch, freqs, t, modes, dt):
+    """
+    Bode, degrau e classificação de cada conjunto. status (G,) vazio quando
+    o conjunto é aceitável; senão o primeiro problema encontrado: instável,
+    polo pouco amortecido perto de um modo estrutural, pico de ressonância
+    ou banda incompatível com o passo dt da física (não modelado).
+    """
+    mag, _ = batch.bode(freqs)
+    res = step_metrics(t, batch.step(t))
+    res["peak"] = mag.max(axis=1)
+    res["peak_hz"] = freqs[np.argmax(mag, axis=1)]
+    res["stable"] = batch.stable()
+    flagged, near = resonance_flags(batch, modes)
+    g = batch.gains
+    res["wdt"] = np.maximum(g["d"] / batch.inertia, np.sqrt(g["p"] / batch.inertia)) * dt
+
+    status = np.full(batch.n_sets, "", dtype=object)
+    status[res["wdt"] > SAMPLING_LIMIT] = "rápido p/ dt"
+    status[res["peak"] > PEAK_LIMIT] = "pouco amortecido"
+    status[flagged] = ["ressonância ~ " + n for n in near[flagged]]
+    status[~res["stable"]] = "instável"
+    res["status"] = status
+    return res
+
+
+# ==============================================================================
+# EXECUÇÃO E RELATÓRIO
+# ==============================================================================
+def _logrange(lo, hi, n):
+    """n valores log-espaçados entre lo e hi; lo = 0 acrescenta o zero (e parte de hi/1000)."""
+    zero = [0.0] if lo == 0 else []
+    lo = lo if lo > 0 else hi / 1e3
+    return np.concatenate([zero, np.logspace(np.log10(lo), np.log10(hi), int(n))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bode e degrau em lote para ganhos PID de junta")
+    parser.add_argument("--joint", default=ELEVATION, choices=("joint_azimuth", "joint_elevation"))
+    parser.add_argument("--pose", type=float, nargs=2, default=(0.0, 0.0),
+                        metavar=("AZ", "EL"), help="Pose (graus)")
+    parser.add_argument("--kp", type=float, nargs=3, default=(1e4, 1e7, 16),
+                        metavar=("MIN", "MAX", "N"), help="Faixa log de P")
+    parser.add_argument("--ki", type=float, nargs="+", default=(0.0, 100.0, 1000.0),
+                        help="Valores de I")
+    parser.add_argument("--kd", type=float, nargs=3, default=(0.0, 1e5, 15),
+                        metavar=("MIN", "MAX", "N"), help="Faixa log de D; MIN 0 inclui D = 0")
+    parser.add_argument("--t-end", type=float, default=10.0, help="Duração do degrau (s)")
+    parser.add_argument("--samples", type=int, default=4000, help="Amostras do degrau")
+    parser.add_argument("--flex", choices=("analytic", "fe"), default="analytic")
+    parser.add_argument("--fe-modes", action="store_true",
+                        help="Inclui os modos do MEF (fe_modal.py) nas referências estruturais")
+    parser.add_argument("--top", type=int, default=10, help="Melhores conjuntos listados")
+    parser.add_argument("--csv", default=None, help="Grava métricas de todos os conjuntos")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("AVALIAÇÃO EM LOTE DE GANHOS PID - BODE E DEGRAU")
+    print("=" * 80)
+    sdf = read_controller_gains()
+    logger = read_logger_gains()
+    model = MultibodyModel(flexibility=structural_flexibility(args.flex))
+    modes = structural_modes(args.fe_modes)
+    pose = np.radians(args.pose)
+    print("🔧 Modos estruturais de referência: "
+          + ", ".join(f"{k} {v:.2f} Hz" for k, v in modes.items()))
+
+    kp, ki, kd = _logrange(*args.kp), np.asarray(args.ki), _logrange(*args.kd)
+    grid, G = gain_grid(sdf, args.joint, kp, ki, kd)
+    dt = read_physics_step()
+    freqs = np.logspace(-2, np.log10(0.5 / dt), 400)  # até Nyquist
+    t = np.linspace(0.0, args.t_end, args.samples)
+
+    t0 = time.perf_counter()
+    batch = ClosedLoopBatch(model, pose, grid, args.joint)
+    res = evaluate(batch, freqs, t, modes, dt)
+    elapsed = time.perf_counter() - t0
+    print(f"📦 {G} conjuntos ({len(kp)} P x {len(ki)} I x {len(kd)} D) em {elapsed * 1000:.0f} ms "
+          f"({elapsed / G * 1000:.3f} ms/conjunto); J efetivo = {batch.inertia:.1f} kg.m²")
+
+    def row(label, gains, r, k):
+        status = r["status"][k]
+        mark = "✅" if not status else ("❌ " if status == "instável" else "⚠️ ") + status
+        return (f"  {label:>10} P={gains['p'][k]:<9.3g} I={gains['i'][k]:<8.3g} "
+                f"D={gains['d'][k]:<8.3g} | OS {r['overshoot'][k]:6.1f}%  "
+                f"tr {r['rise'][k]:6.3f}s  ts {r['settling'][k]:6.3f}s | "
+                f"pico {r['peak'][k]:6.1f} dB @ {r['peak_hz'][k]:6.2f} Hz | {mark}")
+
+    print(f"\n--- Conjuntos nomeados ({args.joint}) ---")
+    named = stack_gains([sdf, logger])
+    ref = ClosedLoopBatch(model, pose, named, args.joint)
+    ref_res = evaluate(ref, freqs, t, modes, dt)
+    for k, label in enumerate(("SDF", "07 (GUI)")):
+        print(row(label, ref.gains, ref_res, k))
+
+    status = res["status"]
+    ok = (status == "") & np.isfinite(res["settling"])
+    counts = {}
+    for st in status[status != ""]:
+        key = st.split(" ~ ")[0]
+        counts[key] = counts.get(key, 0) + 1
+    print(f"\n--- Grade: {ok.sum()} aceitáveis; "
+          + ", ".join(f"{n} {k}" for k, n in sorted(counts.items())) + " ---")
+    score = np.where(ok, res["settling"] + 1e-3 * res["overshoot"], np.inf)
+    for rank, k in enumerate(np.argsort(score)[:min(args.top, ok.sum())]):
+        print(row(f"#{rank + 1}", batch.gains, res, k))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["p", "i", "d", "status", "overshoot", "rise", "settling",
+                             "final_error", "peak_db", "peak_hz", "omega_dt"])
+            for k in range(G):
+                writer.writerow([batch.gains["p"][k], batch.gains["i"][k], batch.gains["d"][k],
+                                 status[k] or "ok",
+                                 f"{res['overshoot'][k]:.3f}", f"{res['rise'][k]:.4f}",
+                                 f"{res['settling'][k]:.4f}", f"{res['final_error'][k]:.5f}",
+                                 f"{res['peak'][k]:.2f}", f"{res['peak_hz'][k]:.3f}",
+                                 f"{res['wdt'][k]:.3f}"])
+        print(f"\n💾 Métricas salvas em {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Torque medido nas juntas pelos sensores force_torque do SDF.
+
+joint1_force_torque (joint_azimuth) e joint2_force_torque (joint_elevation)
+publicam o Wrench transmitido pela junta a 1 kHz. O torque do acionamento
+é a componente do momento ao longo do eixo da junta, no referencial do
+sensor (<frame> child/parent/sensor) e com o sinal de <measure_direction>
+(child_to_parent mede a reação do filho sobre o pai: sinal trocado).
+
+Compara com o esforço estimado pelo 07 (engenharia reversa do PID): o
+resíduo medido - estimado mostra o que a estimativa não vê (gravidade,
+atrito, saturação, termo derivativo sobre a medida...). Para dimensionar
+acionamentos valem os valores de pico e RMS do torque medido.
+
+Uso:
+    from force_torque import sensor_axes, ResidualStats
+
+    axes = sensor_axes()                       # {junta: eixo (3,) com sinal}
+    tau = torque_about_axis((mx, my, mz), axes["joint_elevation"])
+
+    python3 force_torque.py robot_pid_data_2025-12-12_20-31-00   # prefixo dos .bin
+"""
+
+import argparse
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from kinematics import MODEL_NAME, SDF_FILE, rpy_matrix
+from recording import list_streams, read_stream
+
+# Colunas do fluxo binário gravado pelo 07 para cada sensor
+WRENCH_COLUMNS = ["Time_s", "fx", "fy", "fz", "tx", "ty", "tz", "tau_meas", "tau_est", "residual"]
+
+
+def _floats(text, n):
+    if text is None:
+        return np.zeros(n)
+    return np.array([float(v) for v in text.split()], dtype=float)
+
+
+def stream_name(joint):
+    return f"wrench_{joint}"
+
+
+def sensor_axes(sdf_path=SDF_FILE, model_name=MODEL_NAME):
+    """
+    Eixo de cada junta com sensor force_torque, no referencial do sensor e
+    já com o sinal de measure_direction: torque = momento · eixo.
+    """
+    root = ET.parse(sdf_path).getroot()
+    model = next(m for m in root.iter('model') if m.get('name') == model_name)
+    link_rot = {l.get('name'): rpy_matrix(*_floats(l.findtext('pose'), 6)[3:])
+                for l in model.findall('link')}
+    axes = {}
+    for joint in model.findall('joint'):
+        sensor = joint.find("sensor[@type='force_torque']")
+        if sensor is None:
+            continue
+        jrot = rpy_matrix(*_floats(joint.findtext('pose'), 6)[3:])
+        axis = jrot @ _floats(joint.findtext('axis/xyz'), 3)   # no referencial do filho
+        axis = axis / np.linalg.norm(axis)
+        frame = (sensor.findtext('force_torque/frame') or "child").strip()
+        if frame == "parent":
+            child_rot = link_rot[joint.findtext('child')]
+            axis = link_rot[joint.findtext('parent')].T @ child_rot @ axis
+        elif frame == "sensor":
+            axis = rpy_matrix(*_floats(sensor.findtext('pose'), 6)[3:]).T @ jrot.T @ axis
+        direction = (sensor.findtext('force_torque/measure_direction') or "child_to_parent").strip()
+        axes[joint.get('name')] = -axis if direction == "child_to_parent" else axis
+    return axes
+
+
+def torque_about_axis(torque, axis):
+    """Componente do momento (..., 3) ao longo do eixo (3,)."""
+    return np.asarray(torque, dtype=float) @ np.asarray(axis, dtype=float)
+
+
+class ResidualStats:
+    """Média, RMS e pico em fluxo (Welford) de medido, estimado e resíduo."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.peak_residual = 0.0
+        self.peak_measured = 0.0
+        self.sq_measured = 0.0
+
+    def add(self, measured, estimated):
+        r = measured - estimated
+        self.n += 1
+        delta = r - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (r - self.mean)
+        self.peak_residual = max(self.peak_residual, abs(r))
+        self.peak_measured = max(self.peak_measured, abs(measured))
+        self.sq_measured += measured * measured
+
+    def add_array(self, measured, estimated):
+        measured = np.asarray(measured, dtype=float)
+        r = measured - np.asarray(estimated, dtype=float)
+        if len(r) == 0:
+            return
+        n = self.n + len(r)
+        mean_b = r.mean()
+        delta = mean_b - self.mean
+        self.m2 += ((r - mean_b) ** 2).sum() + delta ** 2 * self.n * len(r) / n
+        self.mean += delta * len(r) / n
+        self.n = n
+        self.peak_residual = max(self.peak_residual, np.abs(r).max())
+        self.peak_measured = max(self.peak_measured, np.abs(measured).max())
+        self.sq_measured += (measured ** 2).sum()
+
+    @property
+    def rms(self):
+        """RMS do resíduo."""
+        return np.sqrt(self.m2 / self.n + self.mean ** 2) if self.n else 0.0
+
+    @property
+    def rms_measured(self):
+        return np.sqrt(self.sq_measured / self.n) if self.n else 0.0
+
+    def summary(self):
+        return (f"medido pico {self.peak_measured:.1f} / RMS {self.rms_measured:.1f} Nm | "
+                f"resíduo média {self.mean:+.1f}, RMS {self.rms:.1f}, pico {self.peak_residual:.1f} Nm")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torque medido x estimado das gravações do 07")
+    parser.add_argument("prefix", help="Prefixo da gravação (CSV sem extensão)")
+    args = parser.parse_args()
+
+    prefix = os.path.splitext(args.prefix)[0] if args.prefix.endswith(".csv") else args.prefix
+    found = list_streams(prefix)
+    streams = {j: found[stream_name(j)] for j in sensor_axes() if stream_name(j) in found}
+    if not streams:
+        print(f"❌ Nenhum fluxo wrench_* em {prefix}_*.bin")
+        return
+    for joint, path in streams.items():
+        columns, data = read_stream(path, mmap=True)
+        measured = data[:, columns.index("tau_meas")]
+        if "tau_est" not in columns:    # scenario_runner: sem estimativa do PID
+            print(f"🔩 {joint} ({len(data)} amostras): medido pico {np.abs(measured).max():.1f} / "
+                  f"RMS {np.sqrt(np.mean(measured ** 2)):.1f} Nm")
+            continue
+        stats = ResidualStats()
+        stats.add_array(measured, data[:, columns.index("tau_est")])
+        print(f"🔩 {joint} ({len(data)} amostras): {stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Cinemática da cadeia joint_azimuth -> joint_elevation do three_link_model,
+vetorizada sobre N configurações.
+
+- FK: ângulos (N, 2) -> normais (N, 3) e posições do link_dish (ou de
+  qualquer link preso ao link_arm), pelas fórmulas de Rodrigues com os
+  eixos e âncoras das juntas lidos do SDF;
+- IK: vetores para o sol (N, 3) -> ângulos (N, 2), em forma fechada
+  (subproblema 2 de Paden-Kahan: duas rotações de eixos concorrentes).
+
+O SDF atual declara joint_azimuth como "fixed"; aqui ela é tratada como
+revoluta em torno do seu eixo, como nos comandos cmd_pos das GUIs.
+
+Uso:
+    from kinematics import default_arm
+
+    arm = default_arm()
+    normals = arm.normal(q)                  # (N, 2) -> (N, 3)
+    q = arm.inverse(sun, reference=q_atual)  # (N, 3) -> (N, 2)
+
+    python3 kinematics.py --n 1000000        # vazão e erro de ida e volta
+"""
+
+import functools
+import os
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+SDF_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "01_three_link_with_tracker_plate.sdf")
+MODEL_NAME = "three_link_model"
+ARM_JOINTS = ("joint_azimuth", "joint_elevation")
+DISH_LINK = "link_dish"
+# Normal do prato no referencial do link (a mesma de on_pose)
+LOCAL_NORMAL = np.array([0.0, 0.0, 1.0])
+
+
+# ==============================================================================
+# ROTAÇÕES
+# ==============================================================================
+def rpy_matrix(roll, pitch, yaw):
+    """Rotação R = Rz(yaw) Ry(pitch) Rx(roll), convenção do SDF. Aceita arrays -> (..., 3, 3)."""
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    return np.stack([
+        np.stack([cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr], axis=-1),
+        np.stack([sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr], axis=-1),
+        np.stack([-sp, cp * sr, cp * cr], axis=-1),
+    ], axis=-2)
+
+
+def quaternion_to_rotation_matrix(q):
+    """
+    Converte quaternion (w, x, y, z) para matriz de rotação 3x3.
+    Aceita uma mensagem (campos .w .x .y .z) ou um array (..., 4).
+    """
+    if hasattr(q, "w"):
+        q = (q.w, q.x, q.y, q.z)
+    w, x, y, z = np.moveaxis(np.asarray(q, dtype=float), -1, 0)
+    return np.stack([
+        np.stack([1 - 2*y*y - 2*z*z,     2*x*y - 2*z*w,     2*x*z + 2*y*w], axis=-1),
+        np.stack([    2*x*y + 2*z*w, 1 - 2*x*x - 2*z*z,     2*y*z - 2*x*w], axis=-1),
+        np.stack([    2*x*z - 2*y*w,     2*y*z + 2*x*w, 1 - 2*x*x - 2*y*y], axis=-1),
+    ], axis=-2)
+
+
+def _dot(a, b):
+    return np.einsum('...i,...i->...', a, b)
+
+
+def rotate(vectors, axis, angle):
+    """Rodrigues: gira vectors (N, 3) de angle (N,) em torno do eixo unitário axis (3,)."""
+    c = np.cos(angle)[..., None]
+    s = np.sin(angle)[..., None]
+    return vectors * c + np.cross(axis, vectors) * s + np.outer(_dot(vectors, axis), axis) * (1 - c)
+
+
+def axis_angle_matrix(axis, angle):
+    """Matrizes (N, 3, 3) de rotação de angle (N,) em torno do eixo unitário axis (3,)."""
+    angle = np.asarray(angle, dtype=float)
+    k = np.array([[0.0, -axis[2], axis[1]],
+                  [axis[2], 0.0, -axis[0]],
+                  [-axis[1], axis[0], 0.0]])
+    c = np.cos(angle)[..., None, None]
+    s = np.sin(angle)[..., None, None]
+    return np.eye(3) + s * k + (1 - c) * (k @ k)
+
+
+def signed_angle(u, v, axis):
+    """Ângulo (N,) que leva u a v girando em torno de axis (projeções no plano normal)."""
+    u_p = u - np.outer(_dot(u, axis), axis)
+    v_p = v - np.outer(_dot(v, axis), axis)
+    return np.arctan2(_dot(np.cross(u_p, v_p), axis), _dot(u_p, v_p))
+
+
+# ==============================================================================
+# CADEIA AZIMUTE -> ELEVAÇÃO
+# ==============================================================================
+def _floats(text, n):
+    if text is None:
+        return np.zeros(n)
+    return np.array([float(v) for v in text.split()], dtype=float)
+
+
+class ArmKinematics:
+    """
+    Cadeia de duas juntas revolutas a partir do SDF. Na configuração zero,
+    cada junta é um eixo (unitário, no mundo) passando por uma âncora; o
+    link seguido (link_dish por padrão) está preso ao filho da última junta.
+
+    Args:
+        sdf_path / model_name: de onde ler juntas e links
+        link: link cuja pose e normal são calculadas
+        local_normal: normal no referencial do link
+    """
+
+    def __init__(self, sdf_path=SDF_FILE, model_name=MODEL_NAME, joints=ARM_JOINTS,
+                 link=DISH_LINK, local_normal=LOCAL_NORMAL):
+        root = ET.parse(sdf_path).getroot()
+        model = next(m for m in root.iter('model') if m.get('name') == model_name)
+        link_poses = {l.get('name'): _floats(l.findtext('pose'), 6) for l in model.findall('link')}
+
+        self.joint_names = tuple(joints)
+        self.axes = []
+        self.anchors = []
+        for name in joints:
+            joint = model.find(f"joint[@name='{name}']")
+            child_pose = link_poses[joint.findtext('child')]
+            jpose = _floats(joint.findtext('pose'), 6)
+            child_rot = rpy_matrix(*child_pose[3:])
+            axis = child_rot @ rpy_matrix(*jpose[3:]) @ _floats(joint.findtext('axis/xyz'), 3)
+            self.axes.append(axis / np.linalg.norm(axis))
+            self.anchors.append(child_pose[:3] + child_rot @ jpose[:3])
+
+        pose = link_poses[link]
+        self.link = link
+        self.position_zero = pose[:3]
+        self.rotation_zero = rpy_matrix(*pose[3:])
+        normal = self.rotation_zero @ np.asarray(local_normal, dtype=float)
+        self.normal_zero = normal / np.linalg.norm(normal)
+
+    def __repr__(self):
+        axes = ", ".join(f"{n}: eixo {np.round(a, 4)} em {np.round(c, 4)}"
+                         for n, a, c in zip(self.joint_names, self.axes, self.anchors))
+        return f"ArmKinematics({self.link}; {axes})"
+
+    # ----- FK -----
+    def rotation(self, q):
+        """Orientação (N, 3, 3) do link para ângulos q (N, 2)."""
+        q = np.atleast_2d(q)
+        return (axis_angle_matrix(self.axes[0], q[:, 0])
+                @ axis_angle_matrix(self.axes[1], q[:, 1]) @ self.rotation_zero)
+
+    def normal(self, q):
+        """Normal (N, 3) do link no mundo para ângulos q (N, 2)."""
+        q = np.atleast_2d(q)
+        n = np.broadcast_to(self.normal_zero, (len(q), 3))
+        return rotate(rotate(n, self.axes[1], q[:, 1]), self.axes[0], q[:, 0])
+
+    def position(self, q, point=None):
+        """Posição (N, 3) da origem do link (ou de point, no mundo em q = 0)."""
+        q = np.atleast_2d(q)
+        p = self.position_zero if point is None else np.asarray(point, dtype=float)
+        (a1, a2), (c1, c2) = self.axes, self.anchors
+        p = np.broadcast_to(p - c2, (len(q), 3))
+        p = rotate(p, a2, q[:, 1]) + (c2 - c1)
+        return rotate(p, a1, q[:, 0]) + c1
+
+    def forward(self, q):
+        """(posições (N, 3), normais (N, 3)) do link."""
+        return self.position(q), self.normal(q)
+
+    # ----- IK -----
+    def inverse(self, sun_world, reference=None):
+        """
+        Ângulos (N, 2) que alinham a normal do link com sun_world (N, 3).
+
+        Das duas soluções fica a mais próxima de reference (posição atual ou
+        alvo anterior), com os ângulos desenrolados em 2π. Sem reference,
+        a de elevação com o sinal da configuração zero. Direções fora do
+        alcance da cadeia dão a aproximação mais próxima; com o sol sobre o
+        eixo do azimute ele é indefinido e o de reference é mantido.
+        """
+        s = np.atleast_2d(np.asarray(sun_world, dtype=float))
+        s = s / np.linalg.norm(s, axis=-1, keepdims=True)
+        n = len(s)
+        (a1, a2), p = self.axes, self.normal_zero
+
+        # exp(a1 θ1) exp(a2 θ2) p = s  ->  c = exp(a2 θ2) p = exp(-a1 θ1) s
+        k = a1 @ a2
+        den = k * k - 1.0
+        alpha = (k * (a2 @ p) - s @ a1) / den
+        beta = (k * (s @ a1) - a2 @ p) / den
+        cross = np.cross(a1, a2)
+        gamma = np.sqrt(np.maximum(1.0 - alpha ** 2 - beta ** 2 - 2 * alpha * beta * k, 0.0)
+                        / (cross @ cross))
+        base = np.outer(alpha, a1) + np.outer(beta, a2)
+
+        candidates = np.empty((2, n, 2))
+        for i, sign in enumerate((-1.0, 1.0)):
+            c = base + sign * np.outer(gamma, cross)
+            candidates[i, :, 1] = signed_angle(np.broadcast_to(p, (n, 3)), c, a2)
+            candidates[i, :, 0] = signed_angle(c, s, a1)
+
+        if reference is None:
+            return candidates[0]
+
+        ref = np.broadcast_to(np.atleast_2d(np.asarray(reference, dtype=float)), (n, 2))
+        on_axis = np.linalg.norm(np.cross(s, a1), axis=-1) < 1e-9
+        candidates[:, on_axis, 0] = ref[on_axis, 0]
+        candidates += 2.0 * np.pi * np.round((ref - candidates) / (2.0 * np.pi))
+        cost = np.abs(candidates - ref).sum(axis=-1)
+        return candidates[np.argmin(cost, axis=0), np.arange(n)]
+
+
+@functools.lru_cache(maxsize=1)
+def default_arm():
+    """ArmKinematics do SDF do repositório (lido uma vez)."""
+    return ArmKinematics()
+
+
+def _benchmark():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vazão da cinemática do braço")
+    parser.add_argument("--n", type=int, default=1_000_000, help="Configurações por lote")
+    args = parser.parse_args()
+
+    arm = default_arm()
+    print(f"🔧 {arm}")
+    rng = np.random.default_rng(0)
+    q = np.stack([rng.uniform(-np.pi, np.pi, args.n), rng.uniform(-1.5, 1.5, args.n)], axis=-1)
+
+    t0 = time.perf_counter()
+    normals = arm.normal(q)
+    t_fk = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    q_ik = arm.inverse(normals, reference=q)
+    t_ik = time.perf_counter() - t0
+
+    err = np.abs(q_ik - q).max()
+    print(f"📦 FK: {args.n / t_fk:,.0f} configurações/s | IK: {args.n / t_ik:,.0f} direções/s")
+    print(f"   erro máximo de ida e volta: {err:.2e} rad")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Orquestrador de estudos: N cópias do mundo em paralelo, cada uma num
+servidor `gz sim -s` próprio, com os cenários distribuídos entre elas.
+
+- Gera N variantes de 01_three_link_with_tracker_plate.sdf com nomes de
+  mundo únicos (<prefixo>_00, _01...), URIs file:// relativas tornadas
+  absolutas e, opcionalmente, real_time_factor / max_step_size trocados
+- Lança cada variante sem GUI (gz sim -s -r --headless-rendering, as
+  câmeras do rastreador precisam de renderização) numa partição própria
+  do gz-transport (GZ_PARTITION), então os tópicos não se misturam
+- Cada mundo tem uma thread que tira cenários de uma fila comum e roda
+  scenario_runner.py num subprocesso com GZ_PARTITION e ROBOTSIM_WORLD da
+  variante (a partição é lida pelo gz-transport na criação do processo)
+- Por padrão o servidor é reiniciado a cada cenário (estado inicial
+  idêntico); --reuse-worlds mantém o mesmo servidor entre cenários
+- --sweep chave.aninhada=v1,v2 multiplica os cenários (produto cartesiano
+  dos --sweep), p.ex. tracker.params.kp=320,640,1280; uma chave
+  tracker.params.* que o modo do rastreador do cenário não aceita (kp num
+  cenário stepped) não é varrida nesse cenário, e isso é avisado
+- Ao fim, study.json reúne status, mundo, parâmetros e métricas de resumo
+  de cada execução (dos manifest.json dos pacotes)
+
+Uso:
+    python3 orchestrator.py scenarios/exemplo_rastreamento.yaml -n 4
+    python3 orchestrator.py scenarios/exemplo_rastreamento.yaml -n 4 --sweep tracker.params.kp=320,640,1280
+    python3 orchestrator.py noite.yaml -n 8 --sweep tracker.params.kp=320,640,1280 --rtf 0
+    python3 orchestrator.py noite.yaml -n 2 --dry-run      # só gera mundos e comandos
+"""
+
+import argparse
+import copy
+import datetime
+import itertools
+import json
+import os
+import queue
+import re
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from kinematics import SDF_FILE
+from scenario_runner import TRACKER_PARAMS, load_scenarios, validate_scenario
+from sim_transport import DEFAULT_WORLD_NAME
+
+RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenario_runner.py")
+GZ_COMMAND = ("gz", "sim", "-s", "-r", "--headless-rendering")
+# Espera pelo primeiro /stats: carregar as malhas leva bem mais que os 10 s do runner
+WAIT_STATS = 120.0
+STOP_TIMEOUT = 10.0      # s entre SIGINT e SIGKILL do servidor
+
+
+# ==============================================================================
+# VARIANTES DO MUNDO
+# ==============================================================================
+def world_variant(sdf_text, world_name, source_dir, real_time_factor=None, step_size=None):
+    """Texto do SDF com outro nome de mundo, URIs file:// absolutas e física opcional."""
+    text, n = re.subn(r'(<world\s+name=")[^"]*(")', rf'\g<1>{world_name}\g<2>', sdf_text, count=1)
+    if n != 1:
+        raise ValueError("SDF sem <world name=...>")
+    # file://models/... é relativo ao diretório do SDF original
+    text = re.sub(r'file://(?!/)([^<\s]+)',
+                  lambda m: "file://" + os.path.join(os.path.abspath(source_dir), m.group(1)), text)
+    if real_time_factor is not None:
+        text = re.sub(r'<real_time_factor>[^<]*</real_time_factor>',
+                      f'<real_time_factor>{real_time_factor:g}</real_time_factor>', text)
+    if step_size is not None:
+        text = re.sub(r'<max_step_size>[^<]*</max_step_size>',
+                      f'<max_step_size>{step_size:g}</max_step_size>', text)
+    return text
+
+
+def write_variants(n, out_dir, prefix=DEFAULT_WORLD_NAME, source=SDF_FILE, **physics):
+    """Grava n variantes em out_dir; retorna [(nome do mundo, caminho)]."""
+    with open(source, encoding="utf-8") as f:
+        sdf_text = f.read()
+    os.makedirs(out_dir, exist_ok=True)
+    variants = []
+    for i in range(n):
+        name = f"{prefix}_{i:02d}"
+        path = os.path.join(out_dir, f"{name}.sdf")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(world_variant(sdf_text, name, os.path.dirname(source), **physics))
+        variants.append((name, path))
+    return variants
+
+
+# ==============================================================================
+# VARREDURAS DE PARÂMETROS
+# ==============================================================================
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_sweep(spec):
+    """"tracker.params.kp=320,640" -> ("tracker.params.kp", [320, 640])."""
+    key, sep, values = spec.partition("=")
+    if not sep or not key or not values:
+        raise ValueError(f"--sweep inválido: {spec!r} (use chave.aninhada=v1,v2,...)")
+    return key, [_parse_value(v) for v in values.split(",")]
+
+
+def _set_path(scenario, key, value):
+    node = scenario
+    parts = key.split(".")
+    for part in parts[:-1]:
+        node = node.setdefault(part, {})
+    node[parts[-1]] = value
+
+
+def _applies(scenario, key):
+    """tracker.params.<p> só vale se o modo do rastreador do cenário aceita <p>."""
+    if not key.startswith("tracker.params."):
+        return True
+    return key.split(".", 2)[2] in TRACKER_PARAMS[scenario["tracker"]["mode"]]
+
+
+def expand_sweeps(scenarios, sweeps):
+    """
+    Cada cenário x produto cartesiano dos valores; o nome ganha _<chave><valor>.
+    Retorna (execuções, puladas): puladas lista (cenário, chave) das varreduras
+    que não se aplicam ao modo do rastreador do cenário.
+    """
+    out, skipped = [], []
+    for scenario in scenarios:
+        applicable = [(k, v) for k, v in sweeps if _applies(scenario, k)]
+        skipped.extend((scenario["name"], k) for k, _ in sweeps if not _applies(scenario, k))
+        if not applicable:
+            out.append((scenario, {}))
+            continue
+        keys = [k for k, _ in applicable]
+        for values in itertools.product(*(v for _, v in applicable)):
+            s = copy.deepcopy(scenario)
+            params = dict(zip(keys, values))
+            for key, value in params.items():
+                _set_path(s, key, value)
+            suffix = "_".join(f"{k.rsplit('.', 1)[-1]}{v}" for k, v in params.items())
+            s["name"] = f"{scenario['name']}_{suffix}"
+            out.append((validate_scenario(s), params))
+    return out, skipped
+
+
+# ==============================================================================
+# SERVIDORES
+# ==============================================================================
+class WorldServer:
+    """Um `gz sim -s` de uma variante, numa partição própria."""
+
+    def __init__(self, name, sdf_path, partition, log_path, command=GZ_COMMAND):
+        self.name = name
+        self.sdf_path = sdf_path
+        self.partition = partition
+        self.log_path = log_path
+        self.command = list(command) + [sdf_path]
+        self.process = None
+        self.starts = 0
+
+    @property
+    def env(self):
+        return {**os.environ, "GZ_PARTITION": self.partition, "ROBOTSIM_WORLD": self.name}
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        if self.alive:
+            return
+        log = open(self.log_path, "a", encoding="utf-8")
+        log.write(f"\n=== {datetime.datetime.now().isoformat(timespec='seconds')} "
+                  f"{shlex.join(self.command)} (GZ_PARTITION={self.partition})\n")
+        log.flush()
+        try:
+            # Grupo próprio: o gz sim lança processos filhos (servidor, sensores)
+            self.process = subprocess.Popen(self.command, env=self.env, stdout=log,
+                                            stderr=subprocess.STDOUT, start_new_session=True)
+        finally:
+            log.close()
+        self.starts += 1
+
+    def stop(self):
+        if not self.alive:
+            self.process = None
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGINT)
+            self.process.wait(timeout=STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+        self.process = None
+
+
+# ==============================================================================
+# ESTUDO
+# ==============================================================================
+def _collect(run_dir):
+    """Resumo da campanha (única) que o runner gravou em run_dir."""
+    for entry in sorted(os.listdir(run_dir)) if os.path.isdir(run_dir) else []:
+        index = os.path.join(run_dir, entry, "campaign.json")
+        if os.path.exists(index):
+            with open(index, encoding="utf-8") as f:
+                runs = json.load(f)["runs"]
+            if runs:
+                run = runs[0]
+                run["bundle"] = os.path.join(run_dir, entry, run["bundle"])
+                return run
+    return None
+
+
+class Study:
+    """
+    Fila de execuções distribuída entre os mundos.
+
+    Args:
+        runs: [(cenário validado, parâmetros da varredura)]
+        variants: [(nome do mundo, caminho do SDF)]
+        out_dir: diretório do estudo (mundos/, cenarios/, execucoes/, logs/)
+        reuse_worlds: mantém o servidor entre cenários
+        dry_run: só grava os arquivos e imprime os comandos
+    """
+
+    def __init__(self, runs, variants, out_dir, reuse_worlds=False, wait_stats=WAIT_STATS,
+                 dry_run=False):
+        self.runs = runs
+        self.out_dir = out_dir
+        self.reuse_worlds = reuse_worlds
+        self.wait_stats = wait_stats
+        self.dry_run = dry_run
+        tag = f"robotsim_{os.getpid()}"
+        for sub in ("cenarios", "execucoes", "logs"):
+            os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+        self.servers = [WorldServer(name, path, f"{tag}_{i:02d}",
+                                    os.path.join(out_dir, "logs", f"{name}.log"))
+                        for i, (name, path) in enumerate(variants)]
+        self.queue = queue.Queue()
+        for i, run in enumerate(runs):
+            self.queue.put((i, *run))
+        self.results = [None] * len(runs)
+        self.lock = threading.Lock()
+
+    def _rel(self, path):
+        """Caminhos do study.json relativos ao diretório do estudo."""
+        return os.path.relpath(path, self.out_dir)
+
+    def _runner_command(self, scenario_path, run_dir):
+        return [sys.executable, RUNNER, scenario_path, "--out", run_dir,
+                "--wait-stats", f"{self.wait_stats:g}"]
+
+    def _execute(self, server, i, scenario, params):
+        scenario = dict(scenario, world=server.name)
+        label = f"{i + 1:03d}_{scenario['name']}"
+        scenario_path = os.path.join(self.out_dir, "cenarios", f"{label}.json")
+        with open(scenario_path, "w", encoding="utf-8") as f:
+            json.dump(scenario, f, indent=2, ensure_ascii=False)
+        run_dir = os.path.join(self.out_dir, "execucoes", label)
+        command = self._runner_command(scenario_path, run_dir)
+        result = {"index": i + 1, "name": scenario["name"], "params": params, "world": server.name,
+                  "partition": server.partition, "scenario_file": self._rel(scenario_path)}
+        if self.dry_run:
+            print(f"   GZ_PARTITION={server.partition} {shlex.join(server.command)}")
+            print(f"   GZ_PARTITION={server.partition} ROBOTSIM_WORLD={server.name} {shlex.join(command)}")
+            return {**result, "status": "dry-run"}
+
+        wall0 = time.perf_counter()
+        server.start()
+        log_path = os.path.join(self.out_dir, "logs", f"{label}.runner.log")
+        with open(log_path, "w", encoding="utf-8") as log:
+            code = subprocess.run(command, env=server.env, stdout=log, stderr=subprocess.STDOUT).returncode
+        if not server.alive:
+            result["server_exit"] = server.process.returncode if server.process else None
+        if not self.reuse_worlds or not server.alive:
+            server.stop()
+        run = _collect(run_dir) or {"status": "erro", "error": f"runner saiu com código {code} sem pacote"}
+        if "bundle" in run:
+            run["bundle"] = self._rel(run["bundle"])
+        return {**result, **run, "runner_exit": code, "runner_log": self._rel(log_path),
+                "wall_seconds": round(time.perf_counter() - wall0, 1)}
+
+    def _worker(self, server):
+        try:
+            while True:
+                try:
+                    i, scenario, params = self.queue.get_nowait()
+                except queue.Empty:
+                    return
+                with self.lock:
+                    print(f"▶️  [{i + 1}/{len(self.runs)}] {scenario['name']} -> {server.name}")
+                try:
+                    result = self._execute(server, i, scenario, params)
+                except Exception as e:     # a fila continua nos outros cenários
+                    result = {"index": i + 1, "name": scenario["name"], "params": params,
+                              "world": server.name, "status": "erro",
+                              "error": f"{type(e).__name__}: {e}"}
+                self.results[i] = result
+                if result["status"] not in ("ok", "dry-run"):
+                    with self.lock:
+                        print(f"   ❌ {scenario['name']}: {result['status']} {result.get('error') or ''}")
+        finally:
+            server.stop()
+
+    def run(self):
+        if self.dry_run:
+            # Mesma distribuição de uma fila equilibrada, sem lançar nada
+            while not self.queue.empty():
+                i, scenario, params = self.queue.get_nowait()
+                server = self.servers[i % len(self.servers)]
+                print(f"▶️  [{i + 1}/{len(self.runs)}] {scenario['name']} -> {server.name}")
+                self.results[i] = self._execute(server, i, scenario, params)
+            return self.results
+        threads = [threading.Thread(target=self._worker, args=(server,), name=server.name, daemon=True)
+                   for server in self.servers]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                while t.is_alive():
+                    t.join(timeout=0.5)
+        except KeyboardInterrupt:
+            print("⏹️  Interrompido: parando os servidores")
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            for server in self.servers:
+                server.stop()
+            raise
+        return self.results
+
+    def write_index(self, path=None):
+        path = path or os.path.join(self.out_dir, "study.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"created": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "worlds": [{"name": s.name, "sdf": self._rel(s.sdf_path),
+                                   "partition": s.partition, "starts": s.starts} for s in self.servers],
+                       "runs": self.results}, f, indent=2, ensure_ascii=False, default=str)
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cenários em paralelo sobre N mundos gz sim -s")
+    parser.add_argument("scenarios", nargs="+", help="Arquivos de cenário (scenario_runner.py)")
+    parser.add_argument("-n", "--worlds", type=int, default=None,
+                        help="Número de mundos (padrão: metade dos núcleos, até o nº de execuções)")
+    parser.add_argument("--out", default=None, help="Diretório do estudo (padrão: estudos/<data>)")
+    parser.add_argument("--sdf", default=SDF_FILE, help="SDF de origem")
+    parser.add_argument("--prefix", default=DEFAULT_WORLD_NAME, help="Prefixo dos nomes de mundo")
+    parser.add_argument("--sweep", action="append", default=[], help="chave.aninhada=v1,v2,... (repetível)")
+    parser.add_argument("--rtf", type=float, default=None, help="real_time_factor das variantes")
+    parser.add_argument("--step", type=float, default=None, help="max_step_size das variantes (s)")
+    parser.add_argument("--reuse-worlds", action="store_true",
+                        help="Não reinicia o servidor entre cenários")
+    parser.add_argument("--wait-stats", type=float, default=WAIT_STATS,
+                        help="Espera máxima pelo /stats de cada servidor (s)")
+    parser.add_argument("--dry-run", action="store_true", help="Só gera mundos e arquivos de cenário")
+    args = parser.parse_args()
+
+    scenarios = []
+    try:
+        for path in args.scenarios:
+            scenarios.extend(load_scenarios(path))
+        runs, skipped = expand_sweeps(scenarios, [parse_sweep(s) for s in args.sweep])
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    for name, key in skipped:
+        print(f"⚠️  {name}: --sweep {key} não se aplica ao modo do rastreador; rodado sem varrer")
+    n = args.worlds or max(1, (os.cpu_count() or 2) // 2)
+    n = max(1, min(n, len(runs)))
+    out_dir = args.out or os.path.join("estudos", datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+
+    variants = write_variants(n, os.path.join(out_dir, "mundos"), args.prefix, args.sdf,
+                              real_time_factor=args.rtf, step_size=args.step)
+    print(f"🌍 {n} mundo(s), {len(runs)} execução(ões) -> {out_dir}")
+    study = Study(runs, variants, out_dir, args.reuse_worlds, args.wait_stats, args.dry_run)
+    wall0 = time.perf_counter()
+    results = study.run()
+    index = study.write_index()
+
+    ok = sum(r is not None and r["status"] in ("ok", "dry-run") for r in results)
+    print(f"🏁 {ok}/{len(results)} ok em {time.perf_counter() - wall0:.1f} s — {index}")
+    sys.exit(0 if ok == len(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,44 @@ from PyQt5.QtGui import QImage, QPixmap, QFont
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.image_pb2 import Image
+    from sim_transport import Node, Image
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
+from ui_model import UIModel
+
+CAMERAS = ("cam_q1", "cam_q2", "cam_q3", "cam_q4")
+# Coeficientes de luminância (0.299 R + 0.587 G + 0.114 B)
+LUMA = np.array([0.299, 0.587, 0.114])
+
+
+class FrameBuffer:
+    """
+    Buffer duplo do último quadro de uma câmera, sem cópia: guarda os bytes
+    da mensagem (imutáveis). O callback escreve no slot de trás e troca;
+    a GUI lê o da frente. generation cresce a cada quadro, então a tela só
+    converte quando ela muda.
+    """
+
+    def __init__(self):
+        self.slots = [None, None]
+        self.front = 0
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def publish(self, data, width, height):
+        back = 1 - self.front
+        self.slots[back] = (data, width, height)
+        with self.lock:
+            self.front = back
+            self.generation += 1
+
+    def latest(self):
+        """(generation, (bytes, width, height) ou None)."""
+        with self.lock:
+            return self.generation, self.slots[self.front]
+
 
 class QuadCameraReader:
     def __init__(self):
@@ -29,12 +61,7 @@ class QuadCameraReader:
             "cam_q3": None,
             "cam_q4": None,
         }
-        self.img = {
-            "cam_q1": None,
-            "cam_q2": None,
-            "cam_q3": None,
-            "cam_q4": None,
-        }
+        self.frames = {cam: FrameBuffer() for cam in CAMERAS}
 
         self.lock = threading.Lock()
 
@@ -50,31 +77,27 @@ class QuadCameraReader:
     def image_callback(self, msg, cam_name):
         width = msg.width
         height = msg.height
-        data = np.frombuffer(msg.data, dtype=np.uint8)
+        data = msg.data
         expected_size = width * height * 3
-        if data.size < expected_size:
+        if len(data) < expected_size:
             return
 
-        data = data[:expected_size]
-        img = data.reshape((height, width, 3))
-
-        r = img[:, :, 0].astype(float)
-        g = img[:, :, 1].astype(float)
-        b = img[:, :, 2].astype(float)
-        lum = 0.299 * r + 0.587 * g + 0.114 * b
-        avg_lum = float(lum.mean())
+        # Média por canal e depois a ponderação: mesma média da luminância,
+        # sem as cópias em float da imagem inteira
+        pixels = np.frombuffer(data, dtype=np.uint8, count=expected_size).reshape(-1, 3)
+        avg_lum = float(pixels.mean(axis=0) @ LUMA)
 
         with self.lock:
             self.lum[cam_name] = avg_lum
-            self.img[cam_name] = img.copy()
+        self.frames[cam_name].publish(data, width, height)
 
     def get_luminances(self):
         with self.lock:
             return dict(self.lum)
 
-    def get_images(self):
-        with self.lock:
-            return dict(self.img)
+    def get_frames(self):
+        """{câmera: (generation, (bytes, width, height) ou None)}."""
+        return {cam: buf.latest() for cam, buf in self.frames.items()}
 
     def compute_error(self):
         with self.lock:
@@ -103,6 +126,13 @@ class QuadCamGUI(QWidget):
         self.reader = QuadCameraReader()
         self.init_ui()
 
+        self.ui = UIModel(parent=self)
+        self.views = {"cam_q1": self.view_q1, "cam_q2": self.view_q2,
+                      "cam_q3": self.view_q3, "cam_q4": self.view_q4}
+        # (generation, largura, altura) do pixmap exibido em cada view
+        self.view_keys = {cam: None for cam in CAMERAS}
+        self.pixmaps = {cam: None for cam in CAMERAS}
+
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_ui)
         self.timer.start(100)
@@ -209,21 +239,30 @@ class QuadCamGUI(QWidget):
         self.setLayout(main_layout)
         self.resize(800, 800)
 
-    def ndarray_to_qpixmap(self, img):
-        if img is None:
-            return None
-
-        img = np.fliplr(img)
-
-        h, w, ch = img.shape
-        bytes_per_line = ch * w
-        buffer = img.tobytes()
-        qimg = QImage(buffer, w, h, bytes_per_line, QImage.Format_RGB888)
-        return QPixmap.fromImage(qimg)
+    @staticmethod
+    def frame_to_qimage(frame):
+        """Espelha horizontalmente no próprio Qt (uma cópia, já no formato final)."""
+        data, w, h = frame
+        return QImage(data, w, h, 3 * w, QImage.Format_RGB888).mirrored(True, False)
+
+    def update_views(self):
+        """Converte e escala só as câmeras com quadro novo (ou view redimensionada)."""
+        for cam, (generation, frame) in self.reader.get_frames().items():
+            if frame is None:
+                continue
+            view = self.views[cam]
+            size = view.size()
+            key = (generation, size.width(), size.height())
+            if key == self.view_keys[cam]:
+                continue
+            qimg = self.frame_to_qimage(frame).scaled(size, Qt.KeepAspectRatio,
+                                                      Qt.SmoothTransformation)
+            self.pixmaps[cam] = QPixmap.fromImage(qimg)
+            self.view_keys[cam] = key
+            view.setPixmap(self.pixmaps[cam])
 
     def update_ui(self):
         lum = self.reader.get_luminances()
-        imgs = self.reader.get_images()
 
         q1 = lum["cam_q1"]
         q2 = lum["cam_q2"]
@@ -234,42 +273,22 @@ class QuadCamGUI(QWidget):
         def fmt(v):
             return "---" if v is None else f"{v:.3f}"
 
-        self.lbl_q1.setText(f"Q1 (+x,+y): {fmt(q1)}")
-        self.lbl_q2.setText(f"Q2 (-x,+y): {fmt(q2)}")
-        self.lbl_q3.setText(f"Q3 (-x,-y): {fmt(q3)}")
-        self.lbl_q4.setText(f"Q4 (+x,-y): {fmt(q4)}")
-
-        pix1 = self.ndarray_to_qpixmap(imgs["cam_q1"])
-        pix2 = self.ndarray_to_qpixmap(imgs["cam_q2"])
-        pix3 = self.ndarray_to_qpixmap(imgs["cam_q3"])
-        pix4 = self.ndarray_to_qpixmap(imgs["cam_q4"])
-
-        if pix2:
-            self.view_q2.setPixmap(pix2.scaled(self.view_q2.size(),
-                                               Qt.KeepAspectRatio,
-                                               Qt.SmoothTransformation))
-        if pix1:
-            self.view_q1.setPixmap(pix1.scaled(self.view_q1.size(),
-                                               Qt.KeepAspectRatio,
-                                               Qt.SmoothTransformation))
-        if pix3:
-            self.view_q3.setPixmap(pix3.scaled(self.view_q3.size(),
-                                               Qt.KeepAspectRatio,
-                                               Qt.SmoothTransformation))
-        if pix4:
-            self.view_q4.setPixmap(pix4.scaled(self.view_q4.size(),
-                                               Qt.KeepAspectRatio,
-                                               Qt.SmoothTransformation))
+        self.ui.set_text(self.lbl_q1, f"Q1 (+x,+y): {fmt(q1)}")
+        self.ui.set_text(self.lbl_q2, f"Q2 (-x,+y): {fmt(q2)}")
+        self.ui.set_text(self.lbl_q3, f"Q3 (-x,-y): {fmt(q3)}")
+        self.ui.set_text(self.lbl_q4, f"Q4 (+x,-y): {fmt(q4)}")
+
+        self.update_views()
 
         err_x, err_y = self.reader.compute_error()
         if err_x is None:
-            self.lbl_err_x.setText("err_x: ---")
-            self.lbl_err_y.setText("err_y: ---")
-            self.lbl_sug_x.setText("Sugestão X: ---")
-            self.lbl_sug_y.setText("Sugestão Y: ---")
+            self.ui.set_text(self.lbl_err_x, "err_x: ---")
+            self.ui.set_text(self.lbl_err_y, "err_y: ---")
+            self.ui.set_text(self.lbl_sug_x, "Sugestão X: ---")
+            self.ui.set_text(self.lbl_sug_y, "Sugestão Y: ---")
         else:
-            self.lbl_err_x.setText(f"err_x (dir - esq): {err_x:.3f}")
-            self.lbl_err_y.setText(f"err_y (cima - baixo): {err_y:.3f}")
+            self.ui.set_text(self.lbl_err_x, f"err_x (dir - esq): {err_x:.3f}")
+            self.ui.set_text(self.lbl_err_y, f"err_y (cima - baixo): {err_y:.3f}")
 
             sug_x = "centro"
             if err_x > 5:
@@ -283,8 +302,8 @@ class QuadCamGUI(QWidget):
             elif err_y < -5:
                 sug_y = "mover para -Y (baixo)"
 
-            self.lbl_sug_x.setText(f"Sugestão X: {sug_x}")
-            self.lbl_sug_y.setText(f"Sugestão Y: {sug_y}")
+            self.ui.set_text(self.lbl_sug_x, f"Sugestão X: {sug_x}")
+            self.ui.set_text(self.lbl_sug_y, f"Sugestão Y: {sug_y}")
 
 
 def main():
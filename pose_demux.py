@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Demultiplexador de Pose_V (/world/<world>/pose/info) para as GUIs.
+
+A mensagem traz a pose de todas as entidades da cena na taxa de difusão
+do Gazebo; varrer a lista inteira por nome a cada mensagem cresce com o
+número de modelos no mundo e disputa a thread de transporte com as
+câmeras. PoseDemux aprende, na primeira mensagem, o índice de cada
+entidade pedida e depois só confere o nome nesse índice. A lista é
+varrida de novo apenas quando o índice deixa de bater (entidade criada
+ou removida) ou quando o número de poses muda.
+
+A limitação da taxa de exibição do que se calcula a partir das poses
+(sinal de alinhamento do 02/03) fica no ui_model.UIModel.
+
+Uso:
+    self.pose_demux = PoseDemux(("link_dish", "link_arm"))
+
+    def on_pose(self, msg):
+        poses = self.pose_demux(msg)         # {nome: pose} só dos pedidos
+"""
+
+
+class PoseDemux:
+    """
+    Args:
+        names: entidades de interesse; casam como em on_pose (substring do
+               nome da pose, primeira ocorrência na mensagem)
+    """
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.index = {}
+        self.matched = {}
+        self.size = None
+        self.scans = 0
+
+    def _learn(self, poses):
+        self.scans += 1
+        self.size = len(poses)
+        self.index.clear()
+        self.matched.clear()
+        pending = set(self.names)
+        for i, pose in enumerate(poses):
+            for name in list(pending):
+                if name in pose.name:
+                    self.index[name] = i
+                    self.matched[name] = pose.name
+                    pending.discard(name)
+            if not pending:
+                break
+
+    def _valid(self, poses):
+        if len(poses) != self.size:
+            return False
+        for name, i in self.index.items():
+            if poses[i].name != self.matched[name]:
+                return False
+        return True
+
+    def __call__(self, msg):
+        """{nome pedido: pose} das entidades encontradas em msg (Pose_V)."""
+        poses = msg.pose
+        if self.size is None or not self._valid(poses):
+            self._learn(poses)
+        return {name: poses[i] for name, i in self.index.items()}
+
+    def reset(self):
+        self.size = None
+
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Gerador sintético das 4 câmeras de quadrante do link_tracker_plate.
+
+Substitui a renderização do Gazebo (sensores camera 64x64 R8G8B8) por um
+traçado de raios vetorizado da geometria da placa:
+- visual_wall_x_axis / visual_wall_y_axis (paredes de sombreamento)
+- visual_disk_opaque (disco acima das câmeras)
+- visual_plate_base
+
+Os raios primários de cada pixel são fixos no referencial da placa, então
+a interseção é calculada uma única vez. Para cada direção do sol só é
+preciso sombrear os pixels que veem geometria: Lambert com a luz ambiente
+da cena + raio de sombra contra as mesmas primitivas. Pixels sem
+interseção mostram o <background> da cena.
+
+Aproximações (documentadas para não confundir com o Ogre):
+- sem especular, sem sombras suaves e sem o resto do mundo (braço, prato,
+  chão): o que não é a placa aparece como fundo;
+- os marcadores esféricos ficam em volta das câmeras (raio 7 mm contra
+  5 mm de distância) e o Ogre descarta as faces internas: não aparecem.
+Os níveis absolutos diferem dos do Gazebo, mas a ordem dos quadrantes e o
+sinal dos erros err_x / err_y são os mesmos.
+
+Uso:
+    from quad_camera_synth import QuadCameraSynth, sun_vector, plate_rotation
+
+    synth = QuadCameraSynth()
+    frames = synth.render(sun_vector(-45, 45))              # (1, 4, 64, 64, 3)
+    lum = synth.luminances(sun_plate_batch)                 # (B, 4)
+
+    python3 quad_camera_synth.py --batch 4096               # benchmark
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from kinematics import rpy_matrix
+
+# ==============================================================================
+# GEOMETRIA E CENA (01_three_link_with_tracker_plate.sdf)
+# ==============================================================================
+QUAD_CAMERAS = ("cam_q1", "cam_q2", "cam_q3", "cam_q4")
+CAMERA_POSITIONS = {
+    "cam_q1": (0.05, 0.05, 0.003),
+    "cam_q2": (-0.05, 0.05, 0.003),
+    "cam_q3": (-0.05, -0.05, 0.003),
+    "cam_q4": (0.05, -0.05, 0.003),
+}
+CAMERA_RPY = (0.0, -1.5708, -1.5708)
+IMAGE_SIZE = 64
+HFOV = 1.2
+NEAR_CLIP = 0.01
+
+SCENE_AMBIENT = np.array([0.6, 0.6, 0.7])
+BACKGROUND = np.array([0.8, 0.8, 0.95])
+SUN_DIFFUSE = np.array([1.0, 1.0, 1.0])
+SUN_INTENSITY = 1.0
+
+# (nome, tipo, centro, dimensões, ambient, diffuse)
+# box: dimensões = size; cylinder: (raio, comprimento) com eixo Z
+PLATE_PRIMITIVES = (
+    ("visual_plate_base", "box", (0, 0, 0), (0.2, 0.2, 0.005), 0.8, 0.8),
+    ("visual_disk_opaque", "cylinder", (0, 0, 0.105), (0.0475, 0.005), 0.15, 0.15),
+    ("visual_wall_x_axis", "box", (0, 0, 0.05), (0.2, 0.005, 0.1), 0.2, 0.2),
+    ("visual_wall_y_axis", "box", (0, 0, 0.05), (0.005, 0.2, 0.1), 0.2, 0.2),
+)
+
+# Sol padrão do 02_unified_control_gui.py
+DEFAULT_AZIMUTH_DEG = -45.0
+DEFAULT_ELEVATION_DEG = 45.0
+
+# Elementos (B x pixels) por bloco no cálculo das sombras
+CHUNK_ELEMENTS = 1 << 20
+# Deslocamento da origem do raio de sombra ao longo da normal
+SHADOW_BIAS = 1e-6
+# Coeficientes de luminância usados pelos leitores de câmera
+LUMA = np.array([0.299, 0.587, 0.114])
+
+
+def sun_vector(azimuth_deg, elevation_deg):
+    """
+    Vetor unitário apontando para o sol (mesma convenção de
+    enviar_light_config: direção da luz = -sun_vector). Aceita arrays.
+    """
+    az = np.radians(np.asarray(azimuth_deg, dtype=float))
+    el = np.radians(np.asarray(elevation_deg, dtype=float))
+    return np.stack([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)], axis=-1)
+
+
+def plate_rotation(azimuth, elevation):
+    """
+    Orientação da placa no mundo: Rz(joint_azimuth) Ry(joint_elevation)
+    (a placa está presa ao link_arm sem rotação). Aceita arrays -> (..., 3, 3).
+    """
+    ca, sa = np.cos(azimuth), np.sin(azimuth)
+    ce, se = np.cos(elevation), np.sin(elevation)
+    ca, sa, ce, se = np.broadcast_arrays(ca, sa, ce, se)
+    zero = np.zeros_like(ca)
+    return np.stack([
+        np.stack([ca * ce, -sa, ca * se], axis=-1),
+        np.stack([sa * ce, ca, sa * se], axis=-1),
+        np.stack([-se, zero, ce], axis=-1),
+    ], axis=-2)
+
+
+def sun_in_plate(sun_world, rotation):
+    """Direção do sol no referencial da placa: R^T s (broadcast em lote)."""
+    return np.einsum('...ji,...j->...i', rotation, sun_world)
+
+
+# ==============================================================================
+# INTERSEÇÃO RAIO x PRIMITIVA (vetorizada)
+# ==============================================================================
+def _safe_direction(d):
+    return np.where(np.abs(d) < 1e-12, 1e-12, d)
+
+
+def _unit_rows(v):
+    v = np.atleast_2d(np.asarray(v, dtype=float))
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def ray_box(origins, dirs, center, size):
+    """
+    Interseção raio x caixa alinhada (método das placas).
+
+    Returns:
+        t_in, t_out: distâncias de entrada/saída (t_in > t_out = sem interseção)
+        axis_in: eixo da face de entrada
+    """
+    half = 0.5 * np.asarray(size, dtype=float)
+    lo = np.asarray(center, dtype=float) - half
+    hi = np.asarray(center, dtype=float) + half
+    inv = 1.0 / _safe_direction(dirs)
+    t1 = (lo - origins) * inv
+    t2 = (hi - origins) * inv
+    t_near = np.minimum(t1, t2)
+    t_far = np.maximum(t1, t2)
+    return t_near.max(axis=-1), t_far.min(axis=-1), t_near.argmax(axis=-1)
+
+
+def ray_cylinder(origins, dirs, center, radius, length):
+    """
+    Interseção raio x cilindro de eixo Z.
+
+    Returns:
+        t_in, t_out e cap_in (True quando a entrada é por uma das tampas)
+    """
+    center = np.asarray(center, dtype=float)
+    o = origins - center
+    dx, dy, dz = dirs[..., 0], dirs[..., 1], dirs[..., 2]
+    ox, oy, oz = o[..., 0], o[..., 1], o[..., 2]
+
+    a = dx * dx + dy * dy
+    b = 2.0 * (ox * dx + oy * dy)
+    c = ox * ox + oy * oy - radius * radius
+    disc = b * b - 4.0 * a * c
+    parallel = a < 1e-12
+    root = np.sqrt(np.maximum(disc, 0.0))
+    a_safe = np.where(parallel, 1.0, a)
+    ts0 = np.where(parallel, -np.inf, (-b - root) / (2.0 * a_safe))
+    ts1 = np.where(parallel, np.inf, (-b + root) / (2.0 * a_safe))
+    # Sem interseção com a superfície lateral (ou paralelo ao eixo fora do raio)
+    miss = np.where(parallel, c > 0.0, disc < 0.0)
+    ts0 = np.where(miss, np.inf, ts0)
+    ts1 = np.where(miss, -np.inf, ts1)
+
+    inv = 1.0 / _safe_direction(dz)
+    tz1 = (-0.5 * length - oz) * inv
+    tz2 = (0.5 * length - oz) * inv
+    tz0, tz1 = np.minimum(tz1, tz2), np.maximum(tz1, tz2)
+    return np.maximum(ts0, tz0), np.minimum(ts1, tz1), tz0 >= ts0
+
+
+def intersect_primitive(prim, origins, dirs):
+    """(t_in, t_out, normal_in) de uma primitiva de PLATE_PRIMITIVES."""
+    _, kind, center, dims, _, _ = prim
+    if kind == "box":
+        t_in, t_out, axis = ray_box(origins, dirs, center, dims)
+        normal = np.zeros(dirs.shape)
+        sign = -np.sign(np.take_along_axis(dirs, axis[..., None], axis=-1))
+        np.put_along_axis(normal, axis[..., None], sign, axis=-1)
+        return t_in, t_out, normal
+    t_in, t_out, cap = ray_cylinder(origins, dirs, center, *dims)
+    t = np.where(np.isfinite(t_in), t_in, 0.0)
+    p = origins + t[..., None] * dirs - np.asarray(center, dtype=float)
+    radial = p * [1.0, 1.0, 0.0]
+    radial /= np.maximum(np.linalg.norm(radial, axis=-1, keepdims=True), 1e-12)
+    axial = np.zeros(dirs.shape)
+    axial[..., 2] = -np.sign(dirs[..., 2])
+    return t_in, t_out, np.where(cap[..., None], axial, radial)
+
+
+# ==============================================================================
+# GERADOR
+# ==============================================================================
+class QuadCameraSynth:
+    """
+    Quadros das câmeras cam_q1..cam_q4 em lote para direções do sol dadas
+    no referencial da placa.
+
+    Todos os métodos recebem sun_plate (3,) ou (B, 3) (vetor para o sol) e
+    devolvem o lote (B, ...).
+    """
+
+    def __init__(self, size=IMAGE_SIZE, hfov=HFOV, primitives=PLATE_PRIMITIVES,
+                 cameras=QUAD_CAMERAS):
+        self.size = size
+        self.cameras = tuple(cameras)
+        self.primitives = primitives
+
+        # Raios primários no referencial da câmera (X à frente, Y à esquerda,
+        # Z para cima); coluna cresce para -Y e linha para -Z
+        focal = 0.5 * size / np.tan(0.5 * hfov)
+        pix = np.arange(size) + 0.5 - 0.5 * size
+        row, col = np.meshgrid(pix, pix, indexing='ij')
+        rays = np.stack([np.full_like(row, focal), -col, -row], axis=-1)
+        rays /= np.linalg.norm(rays, axis=-1, keepdims=True)
+        dirs = rays.reshape(-1, 3) @ rpy_matrix(*CAMERA_RPY).T
+
+        n_pix = size * size
+        origins = np.concatenate([np.tile(CAMERA_POSITIONS[c], (n_pix, 1)) for c in self.cameras])
+        dirs = np.tile(dirs, (len(self.cameras), 1))
+
+        t_best = np.full(len(dirs), np.inf)
+        normal = np.zeros_like(dirs)
+        owner = np.full(len(dirs), -1)
+        for k, prim in enumerate(primitives):
+            t_in, t_out, n = intersect_primitive(prim, origins, dirs)
+            # Geometria antes do plano near é recortada pelo sensor
+            hit = (t_in <= t_out) & (t_in >= NEAR_CLIP) & (t_in < t_best)
+            t_best[hit] = t_in[hit]
+            normal[hit] = n[hit]
+            owner[hit] = k
+
+        hit = np.isfinite(t_best)
+        self.hit_index = np.flatnonzero(hit)
+        self.points = origins[hit] + t_best[hit, None] * dirs[hit] + SHADOW_BIAS * normal[hit]
+        self.normals = normal[hit]
+        self.owner = owner[hit]
+        materials = np.array([prim[4:6] for prim in primitives], dtype=float)
+        self.ambient = (materials[self.owner, 0, None] * SCENE_AMBIENT).astype(np.float32)
+        self.diffuse = (materials[self.owner, 1, None] * SUN_DIFFUSE * SUN_INTENSITY).astype(np.float32)
+
+        self.sky = np.round(np.clip(BACKGROUND, 0.0, 1.0) * 255.0).astype(np.uint8)
+        self.camera_of_hit = self.hit_index // n_pix
+        n_cams = len(self.cameras)
+        sky_count = n_pix - np.bincount(self.camera_of_hit, minlength=n_cams)
+        self._sky_luma = sky_count * float(self.sky @ LUMA) / n_pix
+        self._hit_to_camera = np.zeros((len(self.hit_index), n_cams), dtype=np.float32)
+        self._hit_to_camera[np.arange(len(self.hit_index)), self.camera_of_hit] = 1.0 / n_pix
+        self._shadow_cache = {}
+        self._ambient_luma = None
+
+    # ------------------------------------------------------------------
+    def _shadow_setup(self, sx, sy):
+        """
+        Pontos que podem receber sol quando sign(Lx), sign(Ly) = sx, sy (com
+        Lz > 0) e os termos dos raios de sombra que só dependem do ponto,
+        em float32. Com os sinais da direção fixos, as faces de entrada e
+        saída de cada placa do teste de caixa já ficam escolhidas.
+
+        Cada ponto é testado contra as outras primitivas (todas são convexas
+        e não fazem sombra sobre si mesmas). Os pontos são ordenados pela
+        primitiva dona, então os "outros" são duas fatias contíguas.
+        Primitivas inteiramente abaixo dos pontos não fazem sombra.
+        """
+        key = (sx, sy)
+        if key in self._shadow_cache:
+            return self._shadow_cache[key]
+
+        n = self.normals
+        idx = np.flatnonzero((n[:, 0] * sx > 1e-9) | (n[:, 1] * sy > 1e-9) | (n[:, 2] > 1e-9))
+        idx = idx[np.argsort(self.owner[idx], kind='stable')]
+        owners = self.owner[idx]
+        signs = np.array([sx, sy, 1.0])
+        occluders = []
+        for k, (_, kind, center, dims, _, _) in enumerate(self.primitives):
+            start, stop = np.searchsorted(owners, [k, k + 1])
+            points = np.concatenate([self.points[idx[:start]], self.points[idx[stop:]]])
+            if len(points) == 0:
+                continue
+            center = np.asarray(center, dtype=float)
+            top = center[2] + (0.5 * dims[2] if kind == "box" else 0.5 * dims[1])
+            if top <= points[:, 2].min():
+                continue
+            if kind == "box":
+                half = 0.5 * np.asarray(dims, dtype=float)
+                # Distâncias (3, pontos) às faces de entrada e de saída por eixo
+                near = center - signs * half - points
+                far = center + signs * half - points
+                terms = (np.ascontiguousarray(near.T, dtype=np.float32),
+                         np.ascontiguousarray(far.T, dtype=np.float32))
+            else:
+                radius, length = dims
+                o = (points - center).astype(np.float32)
+                c = o[:, 0] ** 2 + o[:, 1] ** 2 - np.float32(radius ** 2)
+                terms = (np.ascontiguousarray(o[:, :2]), c,
+                         -0.5 * length - o[:, 2], 0.5 * length - o[:, 2])
+            occluders.append((kind, terms, start, stop))
+
+        setup = (idx, self.normals[idx].T.astype(np.float32), occluders)
+        self._shadow_cache[key] = setup
+        return setup
+
+    @staticmethod
+    def _blocked(kind, terms, d):
+        """
+        (b, pontos) True onde o raio de sombra na direção d atravessa o
+        oclusor. d tem os sinais do grupo de _shadow_setup (Lz > 0).
+        """
+        if kind == "box":
+            near, far = terms
+            inv = 1.0 / _safe_direction(d)
+            t_in = near[0] * inv[:, 0, None]
+            t_out = far[0] * inv[:, 0, None]
+            for k in (1, 2):
+                np.maximum(t_in, near[k] * inv[:, k, None], out=t_in)
+                np.minimum(t_out, far[k] * inv[:, k, None], out=t_out)
+            return (t_in <= t_out) & (t_out > 0.0)
+
+        oxy, c, z_lo, z_hi = terms
+        a = (d[:, 0] ** 2 + d[:, 1] ** 2)[:, None]
+        b = 2.0 * (d[:, :2] @ oxy.T)
+        disc = b * b - 4.0 * a * c
+        root = np.sqrt(np.maximum(disc, 0.0))
+        a = np.maximum(a, 1e-12)
+        inv = (1.0 / d[:, 2])[:, None]
+        t_in = np.maximum((-b - root) / (2.0 * a), z_lo * inv)
+        t_out = np.minimum((-b + root) / (2.0 * a), z_hi * inv)
+        return (disc >= 0.0) & (t_in <= t_out) & (t_out > 0.0)
+
+    def _lit_groups(self, sun):
+        """
+        Percorre o lote em blocos de mesmo sinal (Lx, Ly) com Lz > 0.
+
+        Yields:
+            (linhas do lote, índices dos pontos, Lambert x visibilidade (b, pontos))
+        """
+        up = sun[:, 2] > 0.0
+        sx = np.where(sun[:, 0] >= 0.0, 1, -1)
+        sy = np.where(sun[:, 1] >= 0.0, 1, -1)
+        for x_sign in (1, -1):
+            for y_sign in (1, -1):
+                rows = np.flatnonzero(up & (sx == x_sign) & (sy == y_sign))
+                if len(rows) == 0:
+                    continue
+                idx, normals_t, occluders = self._shadow_setup(x_sign, y_sign)
+                step = max(1, CHUNK_ELEMENTS // max(len(idx), 1))
+                for start in range(0, len(rows), step):
+                    chunk = rows[start:start + step]
+                    d = sun[chunk].astype(np.float32)
+                    lam = np.maximum(d @ normals_t, 0.0)
+                    for kind, terms, start, stop in occluders:
+                        free = ~self._blocked(kind, terms, d)
+                        lam[:, :start] *= free[:, :start]
+                        lam[:, stop:] *= free[:, start:]
+                    yield chunk, idx, lam
+
+    def lighting(self, sun_plate):
+        """
+        Fator de Lambert já multiplicado pela visibilidade do sol, (B, pixels
+        com geometria) em float32. Com o sol abaixo do plano da placa tudo
+        fica à sombra (a placa e o resto do rastreador ficam no caminho).
+        """
+        sun = _unit_rows(sun_plate)
+        lit = np.zeros((len(sun), len(self.points)), dtype=np.float32)
+        for chunk, idx, lam in self._lit_groups(sun):
+            lit[np.ix_(chunk, idx)] = lam
+        return lit
+
+    def _quantized_luma(self, idx, lam):
+        """Luminância dos pixels idx após a quantização em uint8, (b, pontos)."""
+        lum = np.zeros(lam.shape, dtype=np.float32)
+        for c in range(3):
+            channel = self.ambient[idx, c] + lam * self.diffuse[idx, c]
+            lum += np.float32(LUMA[c]) * np.round(np.clip(channel, 0.0, 1.0) * 255.0)
+        return lum
+
+    def shade(self, sun_plate):
+        """Cores uint8 (B, pixels com geometria, 3) dos pontos com geometria."""
+        color = self.ambient + self.lighting(sun_plate)[..., None] * self.diffuse
+        return np.round(np.clip(color, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+    def render(self, sun_plate):
+        """Lote de quadros uint8 (B, 4, H, W, 3)."""
+        colors = self.shade(sun_plate)
+        n_cams, size = len(self.cameras), self.size
+        frames = np.empty((len(colors), n_cams * size * size, 3), dtype=np.uint8)
+        frames[:] = self.sky
+        frames[:, self.hit_index] = colors
+        return frames.reshape(len(colors), n_cams, size, size, 3)
+
+    def luminances(self, sun_plate):
+        """
+        Luminância média por câmera (B, 4), idêntica à calculada pelos
+        leitores de câmera sobre render(), sem montar os quadros: só os
+        pixels que podem receber sol são quantizados a cada passo; o resto
+        entra como a contribuição constante da luz ambiente.
+        """
+        sun = _unit_rows(sun_plate)
+        if self._ambient_luma is None:
+            all_points = np.arange(len(self.points))
+            ambient = self._quantized_luma(all_points, np.zeros((1, len(all_points)), np.float32))[0]
+            self._ambient_luma = ambient
+            self._dark_luma = self._sky_luma + ambient @ self._hit_to_camera
+        out = np.tile(self._dark_luma, (len(sun), 1))
+        for chunk, idx, lam in self._lit_groups(sun):
+            delta = self._quantized_luma(idx, lam) - self._ambient_luma[idx]
+            out[chunk] += delta @ self._hit_to_camera[idx]
+        return out
+
+    def render_pose(self, sun_world, azimuth, elevation):
+        """Quadros para o sol no mundo e ângulos das juntas (escalares ou lotes)."""
+        return self.render(sun_in_plate(sun_world, plate_rotation(azimuth, elevation)))
+
+    def luminances_pose(self, sun_world, azimuth, elevation):
+        return self.luminances(sun_in_plate(sun_world, plate_rotation(azimuth, elevation)))
+
+
+# ==============================================================================
+# INTEGRAÇÃO COM sim_transport
+# ==============================================================================
+def to_image_messages(frames, t=0.0, cameras=QUAD_CAMERAS):
+    """Lote (B, 4, H, W, 3) -> lista de {cam: Image} (uma entrada por quadro)."""
+    from sim_transport import make_image
+
+    frames = np.asarray(frames)
+    if frames.ndim == 4:
+        frames = frames[None]
+    return [{cam: make_image(batch[i], t) for i, cam in enumerate(cameras)} for batch in frames]
+
+
+class SunFrameSource:
+    """
+    frame_source para sim_transport.default_replay: acompanha o sol
+    publicado em /world/<mundo>/light_config (mesmo tópico do 02) e a
+    posição das juntas ecoada dos cmd_pos.
+    """
+
+    def __init__(self, node=None, azimuth_deg=DEFAULT_AZIMUTH_DEG,
+                 elevation_deg=DEFAULT_ELEVATION_DEG, synth=None):
+        self.synth = synth or QuadCameraSynth()
+        self.lock = threading.Lock()
+        self.sun_world = sun_vector(azimuth_deg, elevation_deg)
+        if node is not None:
+            from sim_transport import Light, light_topic
+            node.subscribe(Light, light_topic(), self.on_light)
+
+    def on_light(self, msg):
+        d = msg.direction
+        vec = np.array([-d.x, -d.y, -d.z])
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            with self.lock:
+                self.sun_world = vec / norm
+
+    def __call__(self, t, joints):
+        with self.lock:
+            sun = self.sun_world
+        frames = self.synth.render_pose(sun, joints.get("joint_azimuth", 0.0),
+                                        joints.get("joint_elevation", 0.0))[0]
+        return {cam: frames[i] for i, cam in enumerate(self.synth.cameras)}
+
+
+def _benchmark():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark do gerador de quadros sintéticos")
+    parser.add_argument("--batch", type=int, default=1024, help="Direções do sol por lote")
+    parser.add_argument("--azimuth", type=float, default=DEFAULT_AZIMUTH_DEG)
+    parser.add_argument("--elevation", type=float, default=DEFAULT_ELEVATION_DEG)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    synth = QuadCameraSynth()
+    t_init = time.perf_counter() - t0
+    print(f"🔧 Raios primários: {len(synth.hit_index):,} de {4 * synth.size ** 2:,} "
+          f"pixels veem a placa ({t_init * 1e3:.1f} ms)")
+
+    lum = synth.luminances(sun_vector(args.azimuth, args.elevation))[0]
+    q1, q2, q3, q4 = lum
+    print(f"☀️  Sol az={args.azimuth:.1f}° el={args.elevation:.1f}° (placa em zero)")
+    print("   " + "  ".join(f"{c}={v:.2f}" for c, v in zip(synth.cameras, lum)))
+    print(f"   err_x={(q1 + q4) / 2 - (q2 + q3) / 2:+.3f}  err_y={(q1 + q2) / 2 - (q3 + q4) / 2:+.3f}")
+
+    rng = np.random.default_rng(0)
+    az = rng.uniform(-180.0, 180.0, args.batch)
+    el = rng.uniform(5.0, 90.0, args.batch)
+    suns = sun_vector(az, el)
+
+    t0 = time.perf_counter()
+    frames = synth.render(suns)
+    t_render = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    lum = synth.luminances(suns)
+    t_lum = time.perf_counter() - t0
+
+    check = (frames.astype(float) @ LUMA).mean(axis=(2, 3))
+    print(f"\n📦 Lote de {args.batch} direções")
+    print(f"   render:      {t_render * 1e3:8.1f} ms  ({args.batch * 4 / t_render:,.0f} quadros/s)")
+    print(f"   luminâncias: {t_lum * 1e3:8.1f} ms  ({args.batch / t_lum:,.0f} passos de controle/s)")
+    print(f"   diferença máxima render x luminâncias: {np.abs(check - lum).max():.2e}")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Gravação binária em fluxo, fora da thread do Qt.
+
+Cada fluxo (stream) é um arquivo <prefixo>_<nome>.bin autodescritivo:
+
+    ROBOTSIM4-REC 1\\n
+    {"stream": ..., "columns": [...], "dtype": "<f8", "meta": {...}}\\n
+    linhas float64 contíguas (len(columns) valores cada)
+
+Os callbacks do transporte só chamam stream.append(...), que é um put numa
+fila; uma thread própria agrupa as linhas em blocos e os grava com
+ndarray.tofile. Assim tópicos de 1 kHz (force_torque, joint_state) não
+passam por sinais Qt nem formatam texto por amostra.
+
+Um arquivo interrompido (queda da GUI) continua legível: read_stream
+descarta a última linha incompleta.
+
+Uso:
+    from recording import Recording, read_stream
+
+    rec = Recording("logs/ensaio_01")
+    ft = rec.stream("wrench_joint_elevation", ["Time_s", "fx", "fy", "fz"])
+    ft.append(t, fx, fy, fz)            # de qualquer thread
+    rec.close()
+
+    columns, data = read_stream("logs/ensaio_01_wrench_joint_elevation.bin")
+
+    python3 recording.py logs/ensaio_01_wrench_joint_elevation.bin
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"ROBOTSIM4-REC 1\n"
+DTYPE = "<f8"
+# Linhas por bloco gravado e intervalo máximo entre flushes (s)
+BLOCK_ROWS = 4096
+FLUSH_INTERVAL = 0.5
+
+_STOP = object()
+
+
+class Stream:
+    """Um arquivo .bin de colunas fixas; append() é seguro em qualquer thread."""
+
+    def __init__(self, recording, name, columns, path):
+        self.recording = recording
+        self.name = name
+        self.columns = list(columns)
+        self.path = path
+        self.appended = 0
+        self.rows = 0
+        self.dropped = 0
+
+    def append(self, *values):
+        if len(values) != len(self.columns):
+            self.dropped += 1
+            return
+        self.appended += 1
+        self.recording._queue.put((self, values))
+
+    def __repr__(self):
+        return f"Stream({self.name!r}, {len(self.columns)} colunas, {self.rows} linhas)"
+
+
+class Recording:
+    """
+    Conjunto de fluxos com um prefixo comum e uma thread de escrita.
+
+    Args:
+        prefix: caminho sem extensão; os arquivos são <prefix>_<nome>.bin
+        meta: dict gravado no cabeçalho de todos os fluxos
+    """
+
+    def __init__(self, prefix, meta=None):
+        self.prefix = prefix
+        self.meta = dict(meta or {})
+        self.streams = {}
+        self._files = {}
+        self._lock = threading.Lock()    # _files: stream() na GUI x flush na thread de escrita
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="recording", daemon=True)
+        self._thread.start()
+        self.closed = False
+
+    def stream(self, name, columns, meta=None):
+        """Cria (ou devolve) o fluxo name e grava o cabeçalho."""
+        if name in self.streams:
+            return self.streams[name]
+        path = f"{self.prefix}_{name}.bin"
+        header = {"stream": name, "columns": list(columns), "dtype": DTYPE,
+                  "meta": {**self.meta, **(meta or {})}}
+        f = open(path, "wb")
+        f.write(MAGIC)
+        f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+        stream = Stream(self, name, columns, path)
+        with self._lock:
+            self._files[stream] = f
+        self.streams[name] = stream
+        return stream
+
+    @property
+    def rows(self):
+        return sum(s.rows for s in self.streams.values())
+
+    def close(self):
+        """Grava o que está na fila e fecha os arquivos."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- Thread de escrita --
+    def _write(self, pending):
+        for stream, rows in pending.items():
+            if rows:
+                np.asarray(rows, dtype=DTYPE).tofile(self._files[stream])
+                stream.rows += len(rows)
+                rows.clear()
+
+    def _run(self):
+        pending = {}
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                stream, values = item
+                rows = pending.setdefault(stream, [])
+                rows.append(values)
+                if len(rows) < BLOCK_ROWS and time.monotonic() - last_flush < FLUSH_INTERVAL:
+                    continue
+            self._write(pending)
+            with self._lock:
+                files = list(self._files.values())
+            for f in files:
+                f.flush()
+            last_flush = time.monotonic()
+        # Fila restante
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                pending.setdefault(item[0], []).append(item[1])
+        self._write(pending)
+
+
+def read_header(path):
+    """Cabeçalho JSON de um .bin (stream, columns, dtype, meta)."""
+    with open(path, "rb") as f:
+        if f.readline() != MAGIC:
+            raise ValueError(f"{path}: não é uma gravação ROBOTSIM4-REC")
+        header = json.loads(f.readline().decode("utf-8"))
+        header["offset"] = f.tell()
+    return header
+
+
+def read_stream(path, mmap=False):
+    """(colunas, dados (n, c)); mmap=True mapeia o arquivo em vez de lê-lo."""
+    header = read_header(path)
+    columns = header["columns"]
+    itemsize = np.dtype(header["dtype"]).itemsize
+    n = (os.path.getsize(path) - header["offset"]) // (itemsize * len(columns))
+    if mmap:
+        data = np.memmap(path, dtype=header["dtype"], mode="r", offset=header["offset"],
+                         shape=(n, len(columns)))
+    else:
+        data = np.fromfile(path, dtype=header["dtype"], count=n * len(columns),
+                           offset=header["offset"]).reshape(n, len(columns))
+    return columns, data
+
+
+def list_streams(prefix):
+    """Arquivos .bin de uma gravação: {nome: caminho}."""
+    directory, base = os.path.split(prefix)
+    directory = directory or "."
+    found = {}
+    for entry in sorted(os.listdir(directory)):
+        if entry.startswith(base + "_") and entry.endswith(".bin"):
+            found[entry[len(base) + 1:-4]] = os.path.join(directory, entry)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumo de gravações binárias")
+    parser.add_argument("paths", nargs="+", help="Arquivos .bin")
+    parser.add_argument("--csv", default=None, help="Exporta o (único) fluxo para CSV")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        header = read_header(path)
+        columns, data = read_stream(path, mmap=True)
+        print(f"📁 {path}: {header['stream']}, {len(data)} linhas x {len(columns)} colunas")
+        if len(data) > 1 and columns[0] == "Time_s":
+            t = data[:, 0]
+            dt = np.diff(t)
+            dt = dt[dt > 0]
+            rate = 1.0 / np.median(dt) if len(dt) else float("nan")
+            print(f"   t = {t[0]:.3f} .. {t[-1]:.3f} s, taxa ~ {rate:.0f} Hz")
+        for name, col in zip(columns[1:], np.asarray(data[:, 1:]).T):
+            if len(col):
+                print(f"   {name:<24} min {col.min():12.4g}  max {col.max():12.4g}  "
+                      f"rms {np.sqrt(np.mean(col ** 2)):12.4g}")
+    if args.csv:
+        columns, data = read_stream(args.paths[0])
+        np.savetxt(args.csv, data, delimiter=",", header=",".join(columns), comments="",
+                   fmt="%.6f")
+        print(f"💾 {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
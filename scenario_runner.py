@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+Execução de cenários sem interface gráfica.
+
+Um arquivo de cenário (YAML, ou JSON sem PyYAML instalado) descreve o que
+hoje se faz clicando nas GUIs numeradas: trajetória do sol (04/02), modo e
+parâmetros do rastreador (02), formas de onda de excitação (06/05, via
+waveforms.py), canais gravados (07) e duração em tempo simulado. O runner
+publica e assina os mesmos tópicos pelo sim_transport, então funciona com
+o Gazebo ou com ROBOTSIM_TRANSPORT=local.
+
+Cada execução gera um pacote autodescritivo:
+
+    <saída>/<campanha>/<nn>_<nome>/
+        manifest.json     cenário resolvido, status, versões, tempos,
+                          fluxos (colunas, linhas) e métricas de resumo
+        log_<fluxo>.bin   gravações de recording.py (cabeçalho próprio)
+
+Vários cenários (vários arquivos, ou "scenarios: [...]" num arquivo, com
+"defaults" comuns) rodam em sequência; um erro ou timeout num cenário fica
+registrado no manifesto e a campanha segue. O código de saída é 1 se algum
+cenário não terminou "ok" (regressão noturna).
+
+Formato (todas as chaves exceto duration são opcionais):
+
+    name: rastreio_pi_chirp
+    duration: 60                  # s simulados
+    settle: 2                     # s simulados com sol e repouso antes de gravar
+    timeout: 600                  # s de relógio (padrão: 10 x duration + 30)
+    sun:
+      intensity: 1.0
+      rate: 10                    # Hz de light_config
+      trajectory:                 # interpolação linear (graus)
+        - {t: 0,  azimuth: -45, elevation: 45}
+        - {t: 60, azimuth: -30, elevation: 55}
+    tracker:
+      mode: pi                    # off | stepped | pi
+      feedforward: true
+      rate: 40
+      params: {kp: 640, ki: 2}
+    excitation:                   # junta -> make_waveform (cmd_force ou cmd_pos)
+      joint_cylinder: {type: chirp, amp: 200, f0: 0.5, f1: 50, duration: 30}
+    log: [joint_state, wrench, commands, tracker, stats]
+
+Uso:
+    python3 scenario_runner.py scenarios/exemplo_rastreamento.yaml
+    python3 scenario_runner.py noite/*.yaml --out resultados --stop-on-error
+"""
+
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+
+import numpy as np
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from sim_transport import (BACKEND, FORCE_TORQUE_SENSORS, MODEL_NAME, QUAD_CAMERAS, WORLD_NAME,
+                           Double, Image, Light, Model, Node, WorldStatistics, Wrench,
+                           camera_topic, cmd_force_topic, cmd_pos_topic, force_torque_topic,
+                           joint_state_topic, light_topic, make_sun_light, stats_topic)
+from force_torque import WRENCH_COLUMNS, sensor_axes, stream_name, torque_about_axis
+from kinematics import default_arm
+from quad_camera_synth import LUMA, sun_vector
+from recording import Recording, read_stream
+from tracker_config import DEFAULT_STEP_PARAMS, STEP_PARAMS, load_step_params
+from tracker_control import PI_PARAMS, PITrackingLaw, broadcast_params, feedforward_step, stepped_law
+from waveforms import CMD_FORCE_JOINTS, CMD_POS_JOINTS, Channel, SimClock, WaveformEngine, make_waveform
+
+BUNDLE_FORMAT = "robotsim4-bundle 1"
+LOG_STREAMS = ("joint_state", "wrench", "commands", "tracker", "stats")
+TRACKER_MODES = ("off", "stepped", "pi")
+# Chaves aceitas em tracker.params para cada modo
+TRACKER_PARAMS = {"off": (), "stepped": STEP_PARAMS, "pi": PI_PARAMS}
+# Juntas do joint_state gravadas (as do 07)
+LOGGED_JOINTS = ("joint_azimuth", "joint_elevation", "joint_cylinder", "joint_cylinder_green")
+TRACKER_COLUMNS = ["Time_s", "q1", "q2", "q3", "q4", "base_az", "base_el", "offset_az",
+                   "offset_el", "cmd_az", "cmd_el", "sun_az_deg", "sun_el_deg", "align_deg"]
+# Sem estimativa do PID no runner: só o medido
+RUNNER_WRENCH_COLUMNS = WRENCH_COLUMNS[:WRENCH_COLUMNS.index("tau_meas") + 1]
+
+DEFAULT_SUN = {"azimuth": -45.0, "elevation": 45.0, "intensity": 1.0, "radius": 100.0,
+               "rate": 10.0, "trajectory": None}
+DEFAULT_TRACKER = {"mode": "off", "feedforward": False, "rate": 40.0, "params": {}}
+SCENARIO_KEYS = ("name", "duration", "settle", "timeout", "world", "model", "sun", "tracker",
+                 "excitation", "log")
+
+WAIT_STATS = 10.0        # s de relógio esperando o primeiro /stats
+POLL_INTERVAL = 0.001    # s de relógio entre verificações do laço principal
+
+
+# ==============================================================================
+# ARQUIVOS DE CENÁRIO
+# ==============================================================================
+def _read_file(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".json"):
+        return json.loads(text)
+    if yaml is None:
+        raise ValueError(f"{path}: PyYAML não instalado (pip install pyyaml) — use um cenário .json")
+    return yaml.safe_load(text)
+
+
+def _merge(base, override):
+    out = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = _merge(out[key], value)
+        else:
+            out[key] = copy.deepcopy(value)
+    return out
+
+
+def load_scenarios(path, invalid=None):
+    """
+    Lista de cenários validados de um arquivo (um cenário, lista ou {defaults, scenarios}).
+
+    Com invalid (lista), um cenário rejeitado não interrompe a leitura: vira
+    {"name", "source", "error"} em invalid e os demais seguem.
+    """
+    content = _read_file(path)
+    defaults = {}
+    if isinstance(content, dict) and "scenarios" in content:
+        defaults = content.get("defaults") or {}
+        content = content["scenarios"]
+    items = content if isinstance(content, list) else [content]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    scenarios = []
+    for i, item in enumerate(items):
+        scenario = _merge(defaults, item)
+        scenario.setdefault("name", stem if len(items) == 1 else f"{stem}_{i + 1}")
+        try:
+            scenario = validate_scenario(scenario)
+        except (TypeError, ValueError) as e:
+            if invalid is None:
+                raise
+            invalid.append({"name": scenario.get("name"), "source": os.path.abspath(path),
+                            "error": str(e)})
+            continue
+        scenario["source"] = os.path.abspath(path)
+        scenarios.append(scenario)
+    return scenarios
+
+
+def validate_scenario(scenario):
+    """Cenário com padrões preenchidos; ValueError com a chave problemática."""
+    if not isinstance(scenario, dict):
+        raise ValueError("cenário deve ser um mapeamento")
+    unknown = sorted(set(scenario) - set(SCENARIO_KEYS) - {"source"})
+    if unknown:
+        raise ValueError(f"chaves desconhecidas: {', '.join(unknown)} (use {', '.join(SCENARIO_KEYS)})")
+    if "duration" not in scenario:
+        raise ValueError(f"{scenario.get('name')}: 'duration' é obrigatório")
+    s = dict(scenario)
+    s["duration"] = float(s["duration"])
+    s["settle"] = float(s.get("settle", 0.0))
+    if s["duration"] <= 0 or s["settle"] < 0:
+        raise ValueError(f"{s['name']}: duration > 0 e settle >= 0")
+    s["timeout"] = float(s.get("timeout") or 10.0 * (s["duration"] + s["settle"]) + 30.0)
+    s.setdefault("world", WORLD_NAME)
+    s.setdefault("model", MODEL_NAME)
+
+    s["sun"] = _merge(DEFAULT_SUN, s.get("sun"))
+    SunTrajectory(s["sun"])    # valida os pontos
+
+    s["tracker"] = _merge(DEFAULT_TRACKER, s.get("tracker"))
+    if s["tracker"]["mode"] not in TRACKER_MODES:
+        raise ValueError(f"{s['name']}: tracker.mode deve ser um de {', '.join(TRACKER_MODES)}")
+    allowed = TRACKER_PARAMS[s["tracker"]["mode"]]
+    unknown = sorted(set(s["tracker"]["params"] or {}) - set(allowed))
+    if unknown:
+        raise ValueError(f"{s['name']}: tracker.params {', '.join(unknown)} não se aplicam ao modo "
+                         f"{s['tracker']['mode']!r} (use {', '.join(allowed) or 'nenhum'})")
+
+    s["excitation"] = dict(s.get("excitation") or {})
+    for joint, spec in s["excitation"].items():
+        if joint not in CMD_FORCE_JOINTS + CMD_POS_JOINTS:
+            raise ValueError(f"{s['name']}: junta de excitação desconhecida {joint!r}")
+        if s["tracker"]["mode"] != "off" and joint in ("joint_azimuth", "joint_elevation"):
+            raise ValueError(f"{s['name']}: {joint} é comandada pelo rastreador")
+        make_waveform(spec)    # valida a especificação
+
+    s["log"] = list(LOG_STREAMS if s.get("log") is None else s["log"])
+    bad = [name for name in s["log"] if name not in LOG_STREAMS]
+    if bad:
+        raise ValueError(f"{s['name']}: fluxos desconhecidos {bad} (use {', '.join(LOG_STREAMS)})")
+    return s
+
+
+# ==============================================================================
+# SOL E RASTREADOR
+# ==============================================================================
+class SunTrajectory:
+    """Azimute/elevação (graus) interpolados linearmente entre pontos (t, az, el)."""
+
+    def __init__(self, sun):
+        points = sun.get("trajectory") or [{"t": 0.0, "azimuth": sun["azimuth"],
+                                            "elevation": sun["elevation"]}]
+        points = sorted(points, key=lambda p: float(p["t"]))
+        self.t = np.array([float(p["t"]) for p in points])
+        self.azimuth = np.array([float(p.get("azimuth", sun["azimuth"])) for p in points])
+        self.elevation = np.array([float(p.get("elevation", sun["elevation"])) for p in points])
+        if np.any(np.diff(self.t) <= 0):
+            raise ValueError("sun.trajectory: tempos repetidos")
+
+    def __call__(self, t):
+        return (float(np.interp(t, self.t, self.azimuth)),
+                float(np.interp(t, self.t, self.elevation)))
+
+
+class HeadlessTracker:
+    """
+    Rastreador do 02 sem Qt: luminância média das 4 câmeras, lei de passos
+    ou PI (tracker_control) e feed-forward pela cinemática inversa do sol.
+    """
+
+    def __init__(self, node, config, model=MODEL_NAME):
+        self.mode = config["mode"]
+        self.feedforward = bool(config["feedforward"])
+        self.dt = 1.0 / float(config["rate"])
+        params = dict(config.get("params") or {})
+        if self.mode == "pi":
+            self.law = PITrackingLaw(dt=self.dt, params=params)
+            self.params = None
+        else:
+            step = {**DEFAULT_STEP_PARAMS, **load_step_params(), **params}
+            self.law = stepped_law
+            self.params = broadcast_params(step, 1)
+        self.lum = {cam: None for cam in QUAD_CAMERAS}
+        self.topics = [camera_topic(cam) for cam in QUAD_CAMERAS]
+        for cam, topic in zip(QUAD_CAMERAS, self.topics):
+            node.subscribe(Image, topic, lambda msg, c=cam: self._on_image(c, msg))
+        self.pubs = [node.advertise(cmd_pos_topic(j, model), Double)
+                     for j in ("joint_azimuth", "joint_elevation")]
+        self.base = np.zeros((1, 2))
+        self.offsets = np.zeros((1, 2))
+
+    def _on_image(self, cam, msg):
+        n = msg.width * msg.height * 3
+        data = np.frombuffer(msg.data, dtype=np.uint8)
+        if data.size < n:
+            return
+        self.lum[cam] = float(data[:n].reshape(-1, 3).mean(axis=0) @ LUMA)
+
+    def start(self, joints):
+        self.base = np.array([[joints.get("joint_azimuth", 0.0), joints.get("joint_elevation", 0.0)]])
+        self.offsets = np.zeros((1, 2))
+        if self.mode == "pi":
+            self.law.reset()
+
+    def step(self, sun_world):
+        """Um passo da lei; retorna as luminâncias usadas (ou None)."""
+        if self.feedforward:
+            self.base, settled = feedforward_step(self.base, sun_world, self.dt)
+            if not settled[0]:
+                self.publish()
+                return None
+        lum = [self.lum[cam] for cam in QUAD_CAMERAS]
+        if None in lum:
+            return None
+        self.law(np.array([lum]), self.offsets, self.params)
+        self.publish()
+        return lum
+
+    @property
+    def command(self):
+        return (self.base + self.offsets)[0]
+
+    def publish(self):
+        for pub, value in zip(self.pubs, self.command):
+            msg = Double()
+            msg.data = float(value)
+            pub.publish(msg)
+
+
+# ==============================================================================
+# EXECUÇÃO
+# ==============================================================================
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             timeout=5, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _now_iso():
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class CampaignNode:
+    """
+    Node único de uma campanha, reaproveitado pelas execuções.
+
+    Um Node por cenário não serve: com ROBOTSIM_REPLAY a reprodução local
+    assina os cmd_pos/light_config no primeiro Node criado. advertise()
+    devolve o mesmo publicador por tópico, porque o gz recusa anunciar o
+    mesmo tópico duas vezes no mesmo Node.
+    """
+
+    def __init__(self, node=None):
+        self.node = node or Node()
+        self._publishers = {}
+
+    def subscribe(self, msg_type, topic, callback):
+        return self.node.subscribe(msg_type, topic, callback)
+
+    def unsubscribe(self, topic):
+        return self.node.unsubscribe(topic)
+
+    def advertise(self, topic, msg_type):
+        key = (topic, msg_type.__name__)
+        if key not in self._publishers:
+            self._publishers[key] = self.node.advertise(topic, msg_type)
+        return self._publishers[key]
+
+
+class ScenarioRun:
+    """
+    Uma execução: assina/anuncia os tópicos no Node da campanha, espera o
+    /stats, publica o sol durante o settle e, de t = 0 a duration (tempo
+    simulado), liga excitação, rastreador e gravação. No fim cancela só as
+    assinaturas que ela mesma fez.
+    """
+
+    def __init__(self, scenario, bundle_dir, node=None, wait_stats=WAIT_STATS):
+        self.scenario = scenario
+        self.wait_stats = wait_stats
+        self.bundle_dir = bundle_dir
+        self.node = node or CampaignNode()
+        self.topics = []    # assinados por esta execução
+        self.world, self.model = scenario["world"], scenario["model"]
+        self.clock = SimClock()
+        self.sun = SunTrajectory(scenario["sun"])
+        self.joints = {}
+        self.active = False
+        self.streams = {}
+        self.recording = None
+        self.engine = None
+        self.tracker = None
+        self.t0 = None
+        self.ft_axes = sensor_axes()
+
+    # -- Callbacks (thread do transporte) --
+    def _on_stats(self, msg):
+        self.clock.on_stats(msg)
+        stream = self.streams.get("stats")
+        if self.active and stream is not None:
+            t = msg.sim_time.sec + msg.sim_time.nsec * 1e-9
+            real = msg.real_time.sec + msg.real_time.nsec * 1e-9
+            stream.append(t, real, msg.real_time_factor)
+
+    def _on_joint_state(self, msg):
+        state = {j.name: (j.axis1.position, j.axis1.velocity) for j in msg.joint}
+        self.joints = {name: pv[0] for name, pv in state.items()}
+        stream = self.streams.get("joint_state")
+        if self.active and stream is not None:
+            t = msg.header.stamp.sec + msg.header.stamp.nsec * 1e-9
+            row = [t]
+            for name in LOGGED_JOINTS:
+                row.extend(state.get(name, (np.nan, np.nan)))
+            stream.append(*row)
+
+    def _on_wrench(self, joint, msg):
+        stream = self.streams.get(stream_name(joint))
+        if self.active and stream is not None:
+            t = msg.header.stamp.sec + msg.header.stamp.nsec * 1e-9
+            f, m = msg.force, msg.torque
+            tau = float(torque_about_axis((m.x, m.y, m.z), self.ft_axes[joint]))
+            stream.append(t, f.x, f.y, f.z, m.x, m.y, m.z, tau)
+
+    def _on_commands(self, t, k, values):
+        stream = self.streams.get("commands")
+        if self.active and stream is not None:
+            stream.append(t, *(values.get(topic, np.nan) for topic in self.command_topics))
+
+    # -- Montagem --
+    def _subscribe(self, msg_type, topic, callback):
+        self.topics.append(topic)
+        self.node.subscribe(msg_type, topic, callback)
+
+    def _setup(self):
+        s = self.scenario
+        self._subscribe(WorldStatistics, stats_topic(self.world), self._on_stats)
+        self._subscribe(Model, joint_state_topic(self.world, self.model), self._on_joint_state)
+        if "wrench" in s["log"]:
+            for joint in FORCE_TORQUE_SENSORS:
+                self._subscribe(Wrench, force_torque_topic(joint, self.world, self.model),
+                                lambda msg, j=joint: self._on_wrench(j, msg))
+        self.pub_light = self.node.advertise(light_topic(self.world), Light)
+
+        channels = [Channel((cmd_force_topic if j in CMD_FORCE_JOINTS else cmd_pos_topic)(j, self.model))
+                    for j in s["excitation"]]
+        self.command_topics = [c.topic for c in channels]
+        if channels:
+            self.engine = WaveformEngine(self.node, channels, world=self.world)
+            self.engine.add_listener(self._on_commands)
+            self.topics.append(stats_topic(self.world))
+        if s["tracker"]["mode"] != "off":
+            self.tracker = HeadlessTracker(self.node, s["tracker"], self.model)
+            self.topics.extend(self.tracker.topics)
+
+        self.recording = Recording(os.path.join(self.bundle_dir, "log"),
+                                   meta={"scenario": s["name"], "world": self.world,
+                                         "model": self.model})
+        if "joint_state" in s["log"]:
+            columns = ["Time_s"] + [f"{j}_{v}" for j in LOGGED_JOINTS for v in ("pos", "vel")]
+            self.streams["joint_state"] = self.recording.stream("joint_state", columns)
+        if "wrench" in s["log"]:
+            for joint, sensor in FORCE_TORQUE_SENSORS.items():
+                meta = {"joint": joint, "sensor": sensor,
+                        "axis": [float(a) for a in self.ft_axes[joint]]}
+                self.streams[stream_name(joint)] = self.recording.stream(
+                    stream_name(joint), RUNNER_WRENCH_COLUMNS, meta)
+        if "commands" in s["log"] and channels:
+            self.streams["commands"] = self.recording.stream(
+                "commands", ["Time_s"] + [os.path.basename(os.path.dirname(t)) for t in self.command_topics],
+                {"topics": self.command_topics, "waveforms": s["excitation"]})
+        if "tracker" in s["log"] and self.tracker is not None:
+            self.streams["tracker"] = self.recording.stream("tracker", TRACKER_COLUMNS, s["tracker"])
+        if "stats" in s["log"]:
+            self.streams["stats"] = self.recording.stream(
+                "stats", ["Time_s", "real_time_s", "real_time_factor"])
+
+    def _publish_sun(self, t):
+        az, el = self.sun(t)
+        sun = self.scenario["sun"]
+        self.pub_light.publish(make_sun_light(az, el, sun["intensity"], sun["radius"]))
+        return az, el
+
+    def _tracker_step(self, t):
+        az, el = self.sun(t)
+        sun_world = sun_vector(az, el)
+        lum = self.tracker.step(sun_world)
+        stream = self.streams.get("tracker")
+        if stream is None:
+            return
+        q = np.array([[self.joints.get("joint_azimuth", 0.0), self.joints.get("joint_elevation", 0.0)]])
+        align = np.degrees(np.arccos(np.clip(default_arm().normal(q)[0] @ sun_world, -1.0, 1.0)))
+        lum = lum or [np.nan] * 4
+        stream.append(self.t0 + t, *lum, *self.tracker.base[0], *self.tracker.offsets[0],
+                      *self.tracker.command, az, el, align)
+
+    # -- Laço principal --
+    def run(self):
+        s = self.scenario
+        manifest = {"format": BUNDLE_FORMAT, "scenario": s, "status": "erro", "error": None,
+                    "backend": BACKEND, "git_commit": _git_commit(), "host": platform.node(),
+                    "python": platform.python_version(), "numpy": np.__version__,
+                    "wall_start": _now_iso()}
+        wall0 = time.perf_counter()
+        os.makedirs(self.bundle_dir, exist_ok=True)
+        try:
+            self._setup()
+            manifest["status"] = self._loop(wall0)
+        except Exception as e:
+            manifest["error"] = f"{type(e).__name__}: {e}"
+            manifest["traceback"] = traceback.format_exc()
+        finally:
+            self._teardown()
+        manifest["wall_end"] = _now_iso()
+        manifest["wall_seconds"] = round(time.perf_counter() - wall0, 3)
+        manifest["sim_start"] = self.t0
+        manifest["sim_end"] = self.clock.now()
+        if self.engine is not None:
+            manifest["commands"] = {"published": self.engine.published, "skipped": self.engine.skipped}
+        manifest["streams"] = {name: {"file": os.path.basename(st.path), "columns": st.columns,
+                                      "rows": st.rows} for name, st in self.streams.items()}
+        manifest["summary"] = summarize_bundle(self.bundle_dir, manifest)
+        with open(os.path.join(self.bundle_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False, default=float)
+        return manifest
+
+    def _loop(self, wall0):
+        s = self.scenario
+        while self.clock.now() is None:
+            if time.perf_counter() - wall0 > self.wait_stats:
+                raise RuntimeError(f"Sem /stats de {self.world} em {self.wait_stats:.0f} s: o Gazebo está rodando?")
+            time.sleep(0.05)
+
+        self.t0 = self.clock.now() + s["settle"]
+        sun_period = 1.0 / float(s["sun"]["rate"])
+        k_sun = k_tracker = None
+        started = False
+        while True:
+            if time.perf_counter() - wall0 > s["timeout"]:
+                return "timeout"
+            t = self.clock.now() - self.t0
+            if t >= s["duration"]:
+                return "ok"
+            k = int(np.floor(t / sun_period))
+            if k != k_sun:
+                k_sun = k
+                self._publish_sun(max(t, 0.0))
+            if t >= 0 and not started:
+                started = True
+                self.active = True
+                for joint, spec in s["excitation"].items():
+                    topic = (cmd_force_topic if joint in CMD_FORCE_JOINTS else cmd_pos_topic)(joint, self.model)
+                    self.engine.set_waveform(topic, make_waveform(spec))
+                if self.engine is not None:
+                    self.engine.start()
+                if self.tracker is not None:
+                    self.tracker.start(self.joints)
+            if started and self.tracker is not None:
+                k = int(np.floor(t / self.tracker.dt))
+                if k != k_tracker:
+                    k_tracker = k
+                    self._tracker_step(t)
+            time.sleep(POLL_INTERVAL)
+
+    def _teardown(self):
+        self.active = False
+        if self.engine is not None:
+            self.engine.stop()
+        for topic in dict.fromkeys(self.topics):
+            self.node.unsubscribe(topic)
+        self.topics = []
+        if self.recording is not None:
+            self.recording.close()
+
+
+def summarize_bundle(bundle_dir, manifest):
+    """Métricas de regressão lidas dos fluxos gravados."""
+    summary = {}
+    for name, info in manifest["streams"].items():
+        if info["rows"] == 0:
+            continue
+        columns, data = read_stream(os.path.join(bundle_dir, info["file"]), mmap=True)
+        if name.startswith("wrench_"):
+            tau = np.asarray(data[:, columns.index("tau_meas")])
+            summary[name] = {"tau_peak": float(np.abs(tau).max()),
+                             "tau_rms": float(np.sqrt(np.mean(tau ** 2)))}
+        elif name == "tracker":
+            align = np.asarray(data[:, columns.index("align_deg")])
+            last = align[int(0.75 * len(align)):]
+            summary[name] = {"align_final_deg": float(align[-1]),
+                             "align_last_quarter_mean_deg": float(np.mean(last)),
+                             "align_last_quarter_max_deg": float(np.max(last))}
+        elif name == "stats":
+            summary[name] = {"rtf_mean": float(np.mean(data[:, columns.index("real_time_factor")]))}
+        elif name == "joint_state":
+            t = np.asarray(data[:, 0])
+            dt = np.diff(t)
+            dt = dt[dt > 0]
+            summary[name] = {"rate_hz": float(1.0 / np.median(dt)) if len(dt) else None}
+    return summary
+
+
+def run_campaign(paths, out_dir, stop_on_error=False, wait_stats=WAIT_STATS):
+    """Roda os cenários dos arquivos em sequência; grava campaign.json no diretório da campanha."""
+    scenarios, invalid = [], []
+    for path in paths:
+        try:
+            scenarios.extend(load_scenarios(path, invalid))
+        except (OSError, ValueError) as e:    # arquivo ilegível: perde só os seus cenários
+            invalid.append({"name": None, "source": os.path.abspath(path), "error": str(e)})
+    campaign_dir = os.path.join(out_dir, datetime.datetime.now().strftime("campanha_%Y-%m-%d_%H-%M-%S"))
+    os.makedirs(campaign_dir, exist_ok=True)
+    print(f"📋 {len(scenarios)} cenário(s) -> {campaign_dir}")
+
+    index = []
+    for entry in invalid:
+        print(f"❌ inválido ({os.path.basename(entry['source'])}): {entry['error']}")
+        index.append({"name": entry["name"], "bundle": None, "status": "invalid",
+                      "error": entry["error"], "summary": {}})
+    if stop_on_error and invalid:
+        scenarios = []
+    node = CampaignNode()
+    for i, scenario in enumerate(scenarios, 1):
+        bundle = os.path.join(campaign_dir, f"{i:02d}_{scenario['name']}")
+        print(f"▶️  [{i}/{len(scenarios)}] {scenario['name']} ({scenario['duration']:.1f} s simulados)")
+        manifest = ScenarioRun(scenario, bundle, node=node, wait_stats=wait_stats).run()
+        icon = "✅" if manifest["status"] == "ok" else "❌"
+        print(f"   {icon} {manifest['status']} em {manifest['wall_seconds']:.1f} s"
+              + (f": {manifest['error']}" if manifest["error"] else ""))
+        for name, metrics in manifest["summary"].items():
+            print(f"      {name}: " + ", ".join(f"{k}={v:.4g}" for k, v in metrics.items()
+                                                if isinstance(v, float)))
+        index.append({"name": scenario["name"], "bundle": os.path.basename(bundle),
+                      "status": manifest["status"], "error": manifest["error"],
+                      "summary": manifest["summary"]})
+        if stop_on_error and manifest["status"] != "ok":
+            break
+    with open(os.path.join(campaign_dir, "campaign.json"), "w", encoding="utf-8") as f:
+        json.dump({"format": BUNDLE_FORMAT, "created": _now_iso(), "sources": list(paths),
+                   "runs": index}, f, indent=2, ensure_ascii=False)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa cenários sem interface gráfica")
+    parser.add_argument("scenarios", nargs="+", help="Arquivos de cenário (.yaml/.yml/.json)")
+    parser.add_argument("--out", default="resultados", help="Diretório das campanhas")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="Interrompe a campanha no primeiro cenário sem status ok")
+    parser.add_argument("--wait-stats", type=float, default=WAIT_STATS,
+                        help="Espera máxima pelo primeiro /stats (s de relógio)")
+    parser.add_argument("--check", action="store_true", help="Só valida os arquivos")
+    args = parser.parse_args()
+
+    if args.check:
+        invalid = []
+        for path in args.scenarios:
+            try:
+                scenarios = load_scenarios(path, invalid)
+            except (OSError, ValueError) as e:
+                invalid.append({"name": None, "source": path, "error": str(e)})
+                continue
+            for s in scenarios:
+                print(f"✅ {path}: {s['name']} ({s['duration']:.1f} s, rastreador {s['tracker']['mode']}, "
+                      f"excitação {', '.join(s['excitation']) or '—'})")
+        for entry in invalid:
+            print(f"❌ {entry['source']}: {entry['error']}")
+        sys.exit(1 if invalid else 0)
+    runs = run_campaign(args.scenarios, args.out, args.stop_on_error, args.wait_stats)
+    failed = [r for r in runs if r["status"] != "ok"]
+    print(f"🏁 {len(runs) - len(failed)}/{len(runs)} ok")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
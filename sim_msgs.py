@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Mensagens em Python puro compatíveis com os campos de gz.msgs10 usados
+pelos scripts do robotSim (Image, Double, Pose_V, Light, Model,
+WorldStatistics, Wrench).
+
+Usadas pelo backend "local" de sim_transport quando os protobufs do
+Gazebo não estão instalados. Reproduzem o comportamento que os scripts
+exploram: campos com valor padrão, submensagens criadas automaticamente,
+campos repetidos com .add(), CopyFrom() e as constantes de enum.
+"""
+
+
+class _Repeated(list):
+    """Campo repetido de mensagens (equivalente ao RepeatedCompositeContainer)."""
+
+    def __init__(self, cls):
+        super().__init__()
+        self._cls = cls
+
+    def add(self, **fields):
+        item = self._cls(**fields)
+        self.append(item)
+        return item
+
+    def _copy(self):
+        out = _Repeated(self._cls)
+        out.extend(item._copy() for item in self)
+        return out
+
+
+class _Message:
+    """Base: _fields mapeia nome -> valor padrão (ou fábrica da submensagem)."""
+
+    _fields = {}
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name, default in self._fields.items():
+            setattr(self, name, default() if callable(default) else default)
+        for name, value in fields.items():
+            if name not in self._fields:
+                raise AttributeError(f"{type(self).__name__} não tem o campo '{name}'")
+            setattr(self, name, value)
+
+    def _copy(self):
+        out = type(self).__new__(type(self))
+        for name in self._fields:
+            value = getattr(self, name)
+            setattr(out, name, value._copy() if hasattr(value, "_copy") else value)
+        return out
+
+    def CopyFrom(self, other):
+        for name in self._fields:
+            value = getattr(other, name)
+            setattr(self, name, value._copy() if hasattr(value, "_copy") else value)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, n) == getattr(other, n) for n in self._fields)
+
+    def __repr__(self):
+        body = ", ".join(f"{n}={getattr(self, n)!r}" for n in self._fields)
+        return f"{type(self).__name__}({body})"
+
+
+def _message(name, fields):
+    return type(name, (_Message,), {"_fields": fields, "__slots__": tuple(fields)})
+
+
+def _repeated(cls):
+    return lambda: _Repeated(cls)
+
+
+Time = _message("Time", {"sec": 0, "nsec": 0})
+Header = _message("Header", {"stamp": Time})
+Vector3d = _message("Vector3d", {"x": 0.0, "y": 0.0, "z": 0.0})
+Quaternion = _message("Quaternion", {"x": 0.0, "y": 0.0, "z": 0.0, "w": 1.0})
+Color = _message("Color", {"r": 0.0, "g": 0.0, "b": 0.0, "a": 1.0})
+
+Pose = _message("Pose", {
+    "header": Header, "name": "", "id": 0,
+    "position": Vector3d, "orientation": Quaternion,
+})
+Pose_V = _message("Pose_V", {"header": Header, "pose": _repeated(Pose)})
+
+Double = _message("Double", {"header": Header, "data": 0.0})
+
+Image = _message("Image", {
+    "header": Header, "width": 0, "height": 0,
+    "step": 0, "data": b"", "pixel_format_type": 0,
+})
+# gz.msgs.PixelFormatType
+Image.UNKNOWN_PIXEL_FORMAT = 0
+Image.L_INT8 = 1
+Image.RGB_INT8 = 3
+Image.RGBA_INT8 = 4
+
+Light = _message("Light", {
+    "header": Header, "name": "", "type": 0,
+    "pose": Pose, "diffuse": Color, "specular": Color,
+    "attenuation_constant": 0.0, "attenuation_linear": 0.0,
+    "attenuation_quadratic": 0.0, "direction": Vector3d,
+    "range": 0.0, "cast_shadows": False,
+    "spot_inner_angle": 0.0, "spot_outer_angle": 0.0, "spot_falloff": 0.0,
+    "id": 0, "parent_id": 0, "intensity": 1.0,
+})
+Light.POINT = 0
+Light.SPOT = 1
+Light.DIRECTIONAL = 2
+
+Axis = _message("Axis", {
+    "xyz": Vector3d, "position": 0.0, "velocity": 0.0, "force": 0.0,
+})
+Joint = _message("Joint", {
+    "header": Header, "name": "", "id": 0,
+    "parent": "", "child": "", "pose": Pose, "axis1": Axis, "axis2": Axis,
+})
+Model = _message("Model", {
+    "header": Header, "name": "", "id": 0,
+    "pose": Pose, "joint": _repeated(Joint),
+})
+
+WorldStatistics = _message("WorldStatistics", {
+    "header": Header, "sim_time": Time, "pause_time": Time, "real_time": Time,
+    "paused": False, "iterations": 0, "real_time_factor": 0.0,
+})
+
+Wrench = _message("Wrench", {
+    "header": Header, "force": Vector3d, "torque": Vector3d, "force_offset": Vector3d,
+})
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Camada de transporte plugável para os scripts do robotSim.
+
+Backends (variável de ambiente ROBOTSIM_TRANSPORT):
+- gz (padrão): gz.transport13 + gz.msgs10 (Gazebo Garden)
+- local:       barramento em processo com as mesmas chamadas usadas nos
+               scripts (Node.subscribe / Node.advertise / publish), para
+               testes e benchmarks sem Gazebo. Usa os protobufs de
+               gz.msgs10 se instalados, senão as mensagens de sim_msgs.
+
+Nos scripts:
+    try:
+        from sim_transport import Node, Image, Double
+    except ImportError:
+        print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
+        sys.exit(1)
+
+Mundo e modelo vêm de ROBOTSIM_WORLD / ROBOTSIM_MODEL (padrão: os nomes
+do SDF 01); os scripts montam os tópicos com joint_state_topic(),
+cmd_pos_topic() etc. em vez de nomes fixos. A partição do gz-transport
+segue a variável GZ_PARTITION de sempre.
+
+Com ROBOTSIM_TRANSPORT=local e ROBOTSIM_REPLAY=<fator de velocidade>, o
+primeiro Node criado inicia uma reprodução sintética de câmeras, estados
+de junta e estatísticas do mundo (ver default_replay), permitindo abrir
+as GUIs sem o Gazebo. Os quadros vêm de quad_camera_synth, que segue o
+sol publicado em light_config e a pose da placa dada pelos cmd_pos.
+
+Benchmark do barramento local:
+    python3 sim_transport.py --duration 5 --cam-rate 200 --joint-rate 1000
+"""
+
+import heapq
+import os
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+# Executado diretamente (benchmark), o padrão é o barramento local
+BACKEND = os.environ.get("ROBOTSIM_TRANSPORT",
+                         "local" if __name__ == "__main__" else "gz").strip().lower()
+
+# Mundo e modelo: parâmetros do processo (o orquestrador lança cada cópia
+# do mundo com um nome próprio); os padrões são os do SDF 01
+DEFAULT_WORLD_NAME = "three_link_with_tracker_plate_world"
+DEFAULT_MODEL_NAME = "three_link_model"
+WORLD_NAME = os.environ.get("ROBOTSIM_WORLD", "").strip() or DEFAULT_WORLD_NAME
+MODEL_NAME = os.environ.get("ROBOTSIM_MODEL", "").strip() or DEFAULT_MODEL_NAME
+QUAD_CAMERAS = ("cam_q1", "cam_q2", "cam_q3", "cam_q4")
+# Sensores force_torque do SDF (1000 Hz), por junta
+FORCE_TORQUE_SENSORS = {"joint_azimuth": "joint1_force_torque",
+                        "joint_elevation": "joint2_force_torque"}
+
+# Mensagens: protobufs do Gazebo quando disponíveis (obrigatórios no backend gz)
+try:
+    from gz.msgs10.image_pb2 import Image
+    from gz.msgs10.double_pb2 import Double
+    from gz.msgs10.pose_v_pb2 import Pose_V
+    from gz.msgs10.light_pb2 import Light
+    from gz.msgs10.model_pb2 import Model
+    from gz.msgs10.world_stats_pb2 import WorldStatistics
+    from gz.msgs10.wrench_pb2 import Wrench
+except ImportError:
+    if BACKEND == "gz":
+        raise
+    from sim_msgs import Image, Double, Pose_V, Light, Model, WorldStatistics, Wrench
+
+
+def joint_state_topic(world=WORLD_NAME, model=MODEL_NAME):
+    return f"/world/{world}/model/{model}/joint_state"
+
+
+def stats_topic(world=WORLD_NAME):
+    return f"/world/{world}/stats"
+
+
+def pose_topic(world=WORLD_NAME):
+    return f"/world/{world}/pose/info"
+
+
+def light_topic(world=WORLD_NAME):
+    return f"/world/{world}/light_config"
+
+
+def cmd_pos_topic(joint, model=MODEL_NAME):
+    return f"/model/{model}/joint/{joint}/cmd_pos"
+
+
+def cmd_force_topic(joint, model=MODEL_NAME):
+    return f"/model/{model}/joint/{joint}/cmd_force"
+
+
+def force_torque_topic(joint, world=WORLD_NAME, model=MODEL_NAME):
+    """Tópico padrão do sistema ForceTorque para o sensor da junta (Wrench)."""
+    sensor = FORCE_TORQUE_SENSORS[joint]
+    return f"/world/{world}/model/{model}/joint/{joint}/sensor/{sensor}/forcetorque"
+
+
+def camera_topic(cam_name):
+    return f"plate/{cam_name}/image"
+
+
+def _normalize(topic):
+    """O gz-transport trata 'a/b' e '/a/b' como o mesmo tópico."""
+    return "/" + topic.strip("/")
+
+
+def _copy_message(msg):
+    if hasattr(msg, "_copy"):
+        return msg._copy()
+    out = type(msg)()
+    out.CopyFrom(msg)
+    return out
+
+
+# ==============================================================================
+# BARRAMENTO LOCAL
+# ==============================================================================
+class LocalBus:
+    """
+    Barramento publish/subscribe em processo.
+
+    Assíncrono por padrão (como o gz-transport, os callbacks rodam em uma
+    thread de entrega, não na de quem publica). Com synchronous=True a
+    entrega acontece dentro de publish(), o que torna testes
+    determinísticos.
+    """
+
+    def __init__(self, synchronous=False, latency_samples=100000):
+        self.synchronous = synchronous
+        self._subs = defaultdict(list)      # tópico -> [(tipo, callback)]
+        self._types = {}                    # tópico -> tipo anunciado
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+        self._worker = None
+
+        self.published = 0
+        self.delivered = 0
+        self.errors = 0
+        self.latency = deque(maxlen=latency_samples)
+
+    # --------------------------------------------------------------
+    def subscribe(self, msg_type, topic, callback):
+        topic = _normalize(topic)
+        with self._lock:
+            self._subs[topic].append((msg_type.__name__, callback))
+        return True
+
+    def unsubscribe(self, topic, callback=None):
+        topic = _normalize(topic)
+        with self._lock:
+            if callback is None:
+                self._subs.pop(topic, None)
+            else:
+                self._subs[topic] = [s for s in self._subs[topic] if s[1] is not callback]
+        return True
+
+    def advertise(self, topic, msg_type):
+        topic = _normalize(topic)
+        with self._lock:
+            self._types.setdefault(topic, msg_type.__name__)
+        return LocalPublisher(self, topic, msg_type)
+
+    def topic_list(self):
+        with self._lock:
+            return sorted(set(self._types) | {t for t, s in self._subs.items() if s})
+
+    # --------------------------------------------------------------
+    def publish(self, topic, msg):
+        topic = _normalize(topic)
+        type_name = type(msg).__name__
+        with self._lock:
+            callbacks = [cb for t, cb in self._subs.get(topic, ()) if t == type_name]
+            self.published += 1
+            if not callbacks:
+                return True
+            if not self.synchronous:
+                self._pending += 1
+        stamp = time.perf_counter()
+
+        if self.synchronous:
+            self._deliver(callbacks, msg, stamp)
+            return True
+
+        if self._worker is None or not self._worker.is_alive():
+            self._start_worker()
+        self._queue.put((callbacks, msg, stamp))
+        return True
+
+    def _deliver(self, callbacks, msg, stamp):
+        for cb in callbacks:
+            try:
+                cb(_copy_message(msg))
+            except Exception as e:
+                self.errors += 1
+                print(f"[sim_transport] erro no callback: {e}", file=sys.stderr)
+        self.latency.append(time.perf_counter() - stamp)
+        self.delivered += len(callbacks)
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="sim_transport", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            callbacks, msg, stamp = self._queue.get()
+            self._deliver(callbacks, msg, stamp)
+            with self._lock:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Espera a fila de entrega esvaziar (útil em testes)."""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def latency_stats(self):
+        """(média, p50, p99, máx) da latência de entrega em segundos."""
+        if not self.latency:
+            return 0.0, 0.0, 0.0, 0.0
+        lat = np.fromiter(self.latency, dtype=float)
+        return float(lat.mean()), float(np.percentile(lat, 50)), \
+            float(np.percentile(lat, 99)), float(lat.max())
+
+
+class LocalPublisher:
+    """Equivalente a gz.transport13.Publisher."""
+
+    def __init__(self, bus, topic, msg_type):
+        self.bus = bus
+        self.topic = topic
+        self.msg_type = msg_type
+
+    def publish(self, msg):
+        if type(msg).__name__ != self.msg_type.__name__:
+            return False
+        return self.bus.publish(self.topic, msg)
+
+    def valid(self):
+        return True
+
+
+_BUS = None
+_REPLAY = None
+
+
+def get_bus():
+    """Barramento local compartilhado pelo processo."""
+    global _BUS
+    if _BUS is None:
+        _BUS = LocalBus()
+    return _BUS
+
+
+class LocalNode:
+    """Equivalente a gz.transport13.Node sobre o LocalBus."""
+
+    def __init__(self, bus=None):
+        self.bus = bus or get_bus()
+        self._subscribed = []
+        self._advertised = []
+        _maybe_start_replay(self)
+
+    def subscribe(self, msg_type, topic, callback, options=None):
+        self._subscribed.append((topic, callback))
+        return self.bus.subscribe(msg_type, topic, callback)
+
+    def unsubscribe(self, topic):
+        for t, cb in [s for s in self._subscribed if _normalize(s[0]) == _normalize(topic)]:
+            self.bus.unsubscribe(t, cb)
+        self._subscribed = [s for s in self._subscribed if _normalize(s[0]) != _normalize(topic)]
+        return True
+
+    def advertise(self, topic, msg_type, options=None):
+        self._advertised.append(topic)
+        return self.bus.advertise(topic, msg_type)
+
+    def subscribed_topics(self):
+        return [_normalize(t) for t, _ in self._subscribed]
+
+    def advertised_topics(self):
+        return [_normalize(t) for t in self._advertised]
+
+
+# ==============================================================================
+# FÁBRICAS DE MENSAGENS
+# ==============================================================================
+def set_time(target, t):
+    """Preenche um campo Time (sec/nsec) a partir de segundos."""
+    sec = int(t)
+    target.sec = sec
+    target.nsec = int(round((t - sec) * 1e9))
+
+
+def make_stats(t, step_size=0.001, real_time=None):
+    msg = WorldStatistics()
+    set_time(msg.header.stamp, t)
+    set_time(msg.sim_time, t)
+    set_time(msg.real_time, t if real_time is None else real_time)
+    msg.iterations = int(round(t / step_size))
+    msg.real_time_factor = 1.0
+    return msg
+
+
+def make_sun_light(azimuth_deg, elevation_deg, intensity=1.0, radius=100.0, name="sun"):
+    """
+    Light direcional do light_config como enviar_light_config (02/04): na
+    esfera de raio `radius` e apontando para a origem.
+    """
+    az, el = np.radians(azimuth_deg), np.radians(elevation_deg)
+    position = radius * np.array([np.cos(el) * np.cos(az), np.cos(el) * np.sin(az), np.sin(el)])
+    direction = -position / (np.linalg.norm(position) or 1.0)
+    msg = Light()
+    msg.name = name
+    msg.type = Light.DIRECTIONAL
+    msg.pose.position.x, msg.pose.position.y, msg.pose.position.z = (float(v) for v in position)
+    msg.pose.orientation.w = 1.0
+    msg.direction.x, msg.direction.y, msg.direction.z = (float(v) for v in direction)
+    msg.cast_shadows = True
+    msg.intensity = float(intensity)
+    msg.diffuse.r = msg.diffuse.g = msg.diffuse.b = msg.diffuse.a = 1.0
+    msg.specular.r = msg.specular.g = msg.specular.b = 0.8
+    msg.specular.a = 1.0
+    return msg
+
+
+def make_joint_state(t, positions, velocities=None, model=MODEL_NAME):
+    """Model com as juntas como publicado pelo JointStatePublisher."""
+    velocities = velocities or {}
+    msg = Model()
+    msg.name = model
+    set_time(msg.header.stamp, t)
+    for name, pos in positions.items():
+        j = msg.joint.add()
+        j.name = name
+        j.axis1.position = float(pos)
+        j.axis1.velocity = float(velocities.get(name, 0.0))
+    return msg
+
+
+def make_image(rgb, t=0.0):
+    """Image R8G8B8 a partir de um array (H, W, 3) uint8."""
+    rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+    msg = Image()
+    set_time(msg.header.stamp, t)
+    msg.height, msg.width = int(rgb.shape[0]), int(rgb.shape[1])
+    msg.step = 3 * msg.width
+    msg.pixel_format_type = 3  # RGB_INT8
+    msg.data = rgb.tobytes()
+    return msg
+
+
+def uniform_frames(levels, size=64):
+    """Quadros uniformes por câmera: levels = {cam: nível 0..255}."""
+    return {cam: np.full((size, size, 3), int(v), dtype=np.uint8) for cam, v in levels.items()}
+
+
+class JointCommandEcho:
+    """
+    "Planta" trivial: guarda o último cmd_pos de cada junta para
+    alimentar o estado de junta reproduzido.
+    """
+
+    def __init__(self, node, joints=("joint_azimuth", "joint_elevation"), model=MODEL_NAME):
+        self.lock = threading.Lock()
+        self.positions = {j: 0.0 for j in joints}
+        for j in joints:
+            node.subscribe(Double, cmd_pos_topic(j, model),
+                           lambda msg, j=j: self._on_cmd(j, msg))
+
+    def _on_cmd(self, joint, msg):
+        with self.lock:
+            self.positions[joint] = msg.data
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.positions)
+
+
+# ==============================================================================
+# REPRODUÇÃO EM TEMPO SIMULADO
+# ==============================================================================
+class Replayer:
+    """
+    Publica fontes sintéticas com taxas independentes (evento discreto).
+
+    Args:
+        node: nó usado para anunciar os tópicos
+        speed: fator sobre o tempo real (1.0 = tempo real, 0 = o mais rápido possível)
+    """
+
+    def __init__(self, node, speed=1.0):
+        self.node = node
+        self.speed = speed
+        self.sim_time = 0.0
+        self._sources = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_source(self, topic, msg_type, rate_hz, make_msg):
+        """make_msg(t) -> mensagem ou lista de mensagens (None para pular)."""
+        pub = self.node.advertise(topic, msg_type)
+        self._sources.append((1.0 / rate_hz, pub, make_msg))
+
+    def run(self, duration=None):
+        """Executa até `duration` segundos simulados (None = até stop())."""
+        heap = [(0.0, i) for i in range(len(self._sources))]
+        heapq.heapify(heap)
+        wall0 = time.perf_counter()
+        t0 = self.sim_time
+        self._stop.clear()
+
+        while heap and not self._stop.is_set():
+            t, i = heapq.heappop(heap)
+            t += t0
+            if duration is not None and t - t0 > duration:
+                break
+            if self.speed > 0:
+                delay = (t - t0) / self.speed - (time.perf_counter() - wall0)
+                if delay > 0:
+                    self._stop.wait(delay)
+            self.sim_time = t
+
+            period, pub, make_msg = self._sources[i]
+            msgs = make_msg(t)
+            if msgs is not None:
+                for msg in (msgs if isinstance(msgs, (list, tuple)) else (msgs,)):
+                    pub.publish(msg)
+            heapq.heappush(heap, (t - t0 + period, i))
+
+    def start(self, duration=None):
+        self._thread = threading.Thread(target=self.run, args=(duration,),
+                                        name="sim_replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+
+def default_replay(node, speed=1.0, cam_rate=10.0, stats_rate=5.0, joint_rate=50.0,
+                   frame_source=None):
+    """
+    Reprodução padrão: 4 câmeras do rastreador, estatísticas do mundo e
+    estado das juntas (eco dos cmd_pos).
+
+    Args:
+        frame_source: callable(t, joints) -> {cam: array (H, W, 3)};
+                      padrão: quadros uniformes cinza
+    """
+    echo = JointCommandEcho(node)
+    replay = Replayer(node, speed)
+
+    if frame_source is None:
+        gray = uniform_frames({cam: 128 for cam in QUAD_CAMERAS})
+        frame_source = lambda t, joints: gray
+
+    cache = {"t": None, "frames": None}
+
+    def camera(cam):
+        def make(t):
+            if cache["t"] != t:
+                cache["t"] = t
+                cache["frames"] = frame_source(t, echo.snapshot())
+            return make_image(cache["frames"][cam], t)
+        return make
+
+    for cam in QUAD_CAMERAS:
+        replay.add_source(camera_topic(cam), Image, cam_rate, camera(cam))
+    replay.add_source(stats_topic(), WorldStatistics, stats_rate, make_stats)
+    replay.add_source(joint_state_topic(), Model, joint_rate,
+                      lambda t: make_joint_state(t, echo.snapshot()))
+    return replay
+
+
+def _maybe_start_replay(node):
+    global _REPLAY
+    speed = os.environ.get("ROBOTSIM_REPLAY")
+    if speed is None or _REPLAY is not None:
+        return
+    # Câmeras sintéticas: sol do light_config + pose da placa pelas juntas ecoadas
+    from quad_camera_synth import SunFrameSource
+    _REPLAY = default_replay(node, speed=float(speed or 1.0),
+                             frame_source=SunFrameSource(node)).start()
+
+
+# ==============================================================================
+# SELEÇÃO DO BACKEND
+# ==============================================================================
+if BACKEND == "gz":
+    from gz.transport13 import Node
+elif BACKEND == "local":
+    Node = LocalNode
+else:
+    raise ImportError(f"ROBOTSIM_TRANSPORT desconhecido: {BACKEND!r} (use 'gz' ou 'local')")
+
+
+def _benchmark():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark do barramento local")
+    parser.add_argument("--duration", type=float, default=5.0, help="Tempo simulado (s)")
+    parser.add_argument("--cam-rate", type=float, default=10.0, help="Hz por câmera")
+    parser.add_argument("--joint-rate", type=float, default=1000.0, help="Hz do estado de junta")
+    parser.add_argument("--stats-rate", type=float, default=5.0, help="Hz das estatísticas")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Fator de tempo real (0 = o mais rápido possível)")
+    parser.add_argument("--sync", action="store_true", help="Entrega síncrona")
+    args = parser.parse_args()
+
+    bus = LocalBus(synchronous=args.sync)
+    node = LocalNode(bus)
+    lum = {}
+    counts = defaultdict(int)
+
+    # Mesmo processamento do QuadCameraReader
+    def on_image(msg, cam):
+        img = np.frombuffer(msg.data, dtype=np.uint8)[:msg.width * msg.height * 3]
+        img = img.reshape((msg.height, msg.width, 3)).astype(float)
+        lum[cam] = float((0.299 * img[..., 0] + 0.587 * img[..., 1] + 0.114 * img[..., 2]).mean())
+        counts["image"] += 1
+
+    for cam in QUAD_CAMERAS:
+        node.subscribe(Image, camera_topic(cam), lambda msg, cam=cam: on_image(msg, cam))
+    node.subscribe(Model, joint_state_topic(), lambda msg: counts.__setitem__("joint", counts["joint"] + 1))
+    node.subscribe(WorldStatistics, stats_topic(), lambda msg: counts.__setitem__("stats", counts["stats"] + 1))
+
+    replay = default_replay(node, speed=args.speed, cam_rate=args.cam_rate,
+                            stats_rate=args.stats_rate, joint_rate=args.joint_rate)
+    t0 = time.perf_counter()
+    replay.run(args.duration)
+    bus.wait_idle()
+    wall = time.perf_counter() - t0
+
+    mean, p50, p99, worst = bus.latency_stats()
+    print(f"=== Benchmark sim_transport ({'síncrono' if args.sync else 'assíncrono'}) ===")
+    print(f"Tempo simulado: {replay.sim_time:.3f} s | Tempo real: {wall:.3f} s "
+          f"| Fator: {replay.sim_time / max(wall, 1e-9):.1f}x")
+    print(f"Mensagens publicadas: {bus.published} | Entregues: {bus.delivered} "
+          f"| Taxa: {bus.delivered / max(wall, 1e-9):,.0f} msg/s")
+    print(f"Por tipo: imagens {counts['image']}, juntas {counts['joint']}, stats {counts['stats']}")
+    print(f"Latência de entrega: média {mean * 1e6:.1f} µs | p50 {p50 * 1e6:.1f} µs "
+          f"| p99 {p99 * 1e6:.1f} µs | máx {worst * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Identificação de sistema por varredura nos cilindros (FRF e coerência).
+
+Antes a resposta em frequência era levantada à mão, uma frequência por
+execução nos spin boxes do 06_torque_control_gui.py. SysIdRun faz a
+varredura inteira numa execução:
+
+- excitação: chirp logarítmico ou multisine (waveforms.py) em
+  joint_cylinder / joint_cylinder_green, publicada pelo WaveformEngine no
+  tempo simulado. Com os dois cilindros o multisine intercala as linhas e
+  o chirp do verde varre no sentido contrário, para as entradas não se
+  correlacionarem
+- gravação: as amostras exatas publicadas (listener do motor), o
+  joint_state (posição / velocidade de todas as juntas) e os sensores
+  force_torque joint1 / joint2 (Wrench a 1000 Hz), todos com carimbo de
+  tempo simulado
+- ao fim: saídas reamostradas na grade das entradas e FRF H1 = G_yx G_xx⁻¹
+  com coerência múltipla por saída (Welch; no multisine, janela
+  retangular de um período, sem vazamento, e o 1º período descartado)
+
+Uso:
+    engine = WaveformEngine(node, [Channel(cmd_force_topic(j)) for j in CMD_FORCE_JOINTS],
+                            origin=0.0)
+    run = SysIdRun(node, engine, kind="chirp", f0=0.5, f1=100.0, duration=120.0)
+    run.start()
+    ...                            # até run.done()
+    result = run.finish()          # dict: freqs, H, coherence, inputs, outputs, ...
+    save_result("sysid.npz", result)
+
+    python3 sysid.py --kind multisine --f0 0.5 --f1 100 --duration 120 --out sysid.npz
+"""
+
+import argparse
+import datetime
+import math
+import sys
+import time
+
+import numpy as np
+
+from sim_transport import (FORCE_TORQUE_SENSORS, MODEL_NAME, WORLD_NAME, Model, Node, Wrench,
+                           cmd_force_topic, force_torque_topic, joint_state_topic)
+from waveforms import CMD_FORCE_JOINTS, Channel, Chirp, Multisine, WaveformEngine, Window
+
+KINDS = ("chirp", "multisine")
+WRENCH_AXES = ("fx", "fy", "fz", "tx", "ty", "tz")
+LEAD_TIME = 0.2           # s simulados entre start() e o início da excitação
+TAIL_TIME = 0.1           # s simulados gravados depois do fim
+CHIRP_SEGMENT = 4.0       # s por segmento de Welch no chirp (0.25 Hz)
+MIN_PERIODS = 5           # multisine: 1 descartado + médias suficientes p/ a coerência
+LINE_FLOOR = 1e-3         # bins com potência < -30 dB do pico da entrada não valem
+COHERENCE_GOOD = 0.8
+
+
+def excitation(kind, joints, amp, f0, f1, duration, start, period=10.0, lines=200):
+    """{junta: Waveform} da varredura entre start e start + duration."""
+    waves = {}
+    for i, joint in enumerate(joints):
+        if kind == "multisine":
+            wave = Multisine(amp, f0, f1, lines, period, part=(i, len(joints)))
+        elif i % 2:
+            wave = Chirp(amp, f1, f0, duration)          # sentido contrário
+        else:
+            wave = Chirp(amp, f0, f1, duration)
+        waves[joint] = Window(wave, start, duration)
+    return waves
+
+
+def frf(u, y, fs, nperseg, window="hann", mimo=True):
+    """
+    (freqs, H1 (F, saídas, entradas), coerência (F, saídas), autoespectro
+    das entradas (F, entradas)) por Welch (hann: 50% de sobreposição;
+    boxcar: segmentos contíguos). mimo=True: H1 = G_yx G_xx⁻¹ e coerência
+    múltipla; mimo=False (linhas intercaladas): cada bin usa só a entrada
+    de maior potência nele.
+    """
+    if window == "hann":
+        w = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(nperseg) / nperseg)
+        step = nperseg // 2
+    else:
+        w = np.ones(nperseg)
+        step = nperseg
+    x = np.concatenate([u, y], axis=1)
+    n_seg = (len(x) - nperseg) // step + 1
+    if n_seg < 1:
+        raise ValueError(f"Registro de {len(x)} amostras menor que um segmento ({nperseg})")
+    seg = np.lib.stride_tricks.sliding_window_view(x, nperseg, axis=0)[::step][:n_seg]
+    seg = seg - seg.mean(axis=-1, keepdims=True)
+    X = np.fft.rfft(seg * w, axis=-1)                              # (S, c, F)
+    G = np.einsum('sif,sjf->fij', X.conj(), X) / n_seg
+    ni = u.shape[1]
+    Gxx = G[:, :ni, :ni]
+    Gxy = G[:, :ni, ni:]
+    power = np.real(np.diagonal(Gxx, axis1=1, axis2=2))
+    if mimo:
+        Ht = np.linalg.pinv(Gxx, rcond=1e-10) @ Gxy
+    else:
+        owner = np.argmax(power, axis=1)
+        mask = np.arange(ni)[None, :] == owner[:, None]
+        Ht = np.where(mask[:, :, None], Gxy / np.maximum(power, 1e-300)[:, :, None], 0.0)
+    Gyy = np.real(np.diagonal(G[:, ni:, ni:], axis1=1, axis2=2))
+    explained = np.real(np.einsum('fab,fab->fb', Gxy.conj(), Ht))
+    coherence = np.clip(explained / np.maximum(Gyy, 1e-300), 0.0, 1.0)
+    freqs = np.fft.rfftfreq(nperseg, 1.0 / fs)
+    return freqs, np.swapaxes(Ht, 1, 2), coherence, power
+
+
+class SysIdRun:
+    """
+    Uma varredura: configura o motor, grava e calcula a FRF.
+
+    Args:
+        node: nó de transporte (assina joint_state e os force_torque)
+        engine: WaveformEngine com os canais cmd_force dos cilindros e
+                origin=0.0 (as janelas são em tempo simulado absoluto)
+        joints: cilindros excitados
+        kind: "chirp" (logarítmico) ou "multisine"
+        amp: amplitude (Nm); f0, f1: banda (Hz); duration: s simulados
+        period: período do multisine (resolução = 1 / period)
+    """
+
+    def __init__(self, node, engine, joints=CMD_FORCE_JOINTS, kind="chirp", amp=200.0,
+                 f0=0.5, f1=100.0, duration=60.0, period=10.0, lines=200,
+                 world=WORLD_NAME, model=MODEL_NAME):
+        if engine.fixed_origin != 0.0:
+            raise ValueError("SysIdRun requer WaveformEngine(..., origin=0.0): a excitação é "
+                             "agendada em tempo simulado absoluto")
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de varredura desconhecido: {kind!r} (use {', '.join(KINDS)})")
+        if not 0 < f0 < f1 <= engine.rate / 2:
+            raise ValueError(f"Banda inválida: 0 < f0 < f1 <= {engine.rate / 2:.0f} Hz")
+        if kind == "multisine":
+            duration = max(MIN_PERIODS, math.ceil(duration / period)) * period
+        self.node, self.engine = node, engine
+        self.joints = tuple(joints)
+        self.kind, self.amp, self.f0, self.f1 = kind, amp, f0, f1
+        self.duration, self.period, self.lines = duration, period, lines
+        self.topics = {j: cmd_force_topic(j, model) for j in self.joints}
+        self.joint_topic = joint_state_topic(world, model)
+        self.wrench_topics = {j: force_torque_topic(j, world, model) for j in FORCE_TORQUE_SENSORS}
+
+        self.start_time = None
+        self.active = False
+        self.joint_names = None
+        self._inputs = []
+        self._joints = []
+        self._wrench = {j: [] for j in FORCE_TORQUE_SENSORS}
+        self._parked = {}
+
+    # -- Gravação (threads do transporte e do motor) --
+    def _on_sample(self, t, k, values):
+        if self.active and t >= self.start_time:
+            self._inputs.append((t, [values.get(topic, 0.0) for topic in self.topics.values()]))
+
+    def _on_joint_state(self, msg):
+        if not self.active:
+            return
+        if self.joint_names is None:
+            self.joint_names = [j.name for j in msg.joint]
+        state = {j.name: (j.axis1.position, j.axis1.velocity) for j in msg.joint}
+        t = msg.header.stamp.sec + msg.header.stamp.nsec * 1e-9
+        self._joints.append((t, [state.get(n, (np.nan, np.nan)) for n in self.joint_names]))
+
+    def _on_wrench(self, joint, msg):
+        if self.active:
+            t = msg.header.stamp.sec + msg.header.stamp.nsec * 1e-9
+            f, m = msg.force, msg.torque
+            self._wrench[joint].append((t, f.x, f.y, f.z, m.x, m.y, m.z))
+
+    # -- Execução --
+    def start(self):
+        now = self.engine.clock.now()
+        if now is None:
+            raise RuntimeError("Sem tempo de simulação (/stats): o Gazebo está rodando?")
+        self.start_time = now + LEAD_TIME
+        self.node.subscribe(Model, self.joint_topic, self._on_joint_state)
+        for joint, topic in self.wrench_topics.items():
+            self.node.subscribe(Wrench, topic, lambda msg, j=joint: self._on_wrench(j, msg))
+        self.engine.add_listener(self._on_sample)
+        # Canais que a varredura não comanda ficam em repouso (p.ex. as formas
+        # manuais do 06 no outro cilindro) e voltam no finish()
+        driven = set(self.topics.values())
+        self._parked = {t: c.waveform for t, c in self.engine.channels.items()
+                        if t not in driven and c.waveform is not None}
+        for topic in self._parked:
+            self.engine.set_waveform(topic, None)
+        waves = excitation(self.kind, self.joints, self.amp, self.f0, self.f1, self.duration,
+                           self.start_time, self.period, self.lines)
+        for joint, wave in waves.items():
+            self.engine.set_waveform(self.topics[joint], wave)
+        self.active = True
+        self.engine.start()
+        return self
+
+    def progress(self):
+        """Fração da varredura já executada (0..1)."""
+        now = self.engine.clock.now()
+        if self.start_time is None or now is None:
+            return 0.0
+        return min(max((now - self.start_time) / (self.duration + TAIL_TIME), 0.0), 1.0)
+
+    def done(self):
+        return self.progress() >= 1.0
+
+    def finish(self):
+        """Para a gravação e o motor, devolve os canais ao repouso e calcula a FRF."""
+        self.active = False
+        if self._on_sample in self.engine.listeners:
+            self.engine.listeners.remove(self._on_sample)
+        self.node.unsubscribe(self.joint_topic)
+        for topic in self.wrench_topics.values():
+            self.node.unsubscribe(topic)
+        for topic in self.topics.values():
+            self.engine.set_waveform(topic, None)
+        # Motor parado antes de devolver as formas estacionadas: elas só voltam
+        # a ser publicadas no próximo start() de quem as configurou
+        self.engine.stop()
+        for topic, waveform in self._parked.items():
+            self.engine.set_waveform(topic, waveform)
+        self._parked = {}
+        return self.analyse()
+
+    def recorded(self):
+        """(t_entradas, U, nomes das saídas, {nome: (t, valores)})."""
+        inputs = sorted(self._inputs)
+        t_in = np.array([s[0] for s in inputs])
+        U = np.array([s[1] for s in inputs], dtype=float).reshape(len(inputs), len(self.joints))
+        outputs = {}
+        if self._joints:
+            t = np.array([s[0] for s in self._joints])
+            data = np.array([s[1] for s in self._joints], dtype=float)        # (N, J, 2)
+            for i, name in enumerate(self.joint_names):
+                outputs[f"{name}_pos"] = (t, data[:, i, 0])
+                outputs[f"{name}_vel"] = (t, data[:, i, 1])
+        for joint, samples in self._wrench.items():
+            if samples:
+                arr = np.array(samples)
+                for a, axis in enumerate(WRENCH_AXES):
+                    outputs[f"{FORCE_TORQUE_SENSORS[joint]}_{axis}"] = (arr[:, 0], arr[:, a + 1])
+        return t_in, U, list(outputs), outputs
+
+    def analyse(self):
+        t_in, U, names, outputs = self.recorded()
+        skip = self.period if self.kind == "multisine" else 0.0
+        keep = (t_in >= self.start_time + skip) & (t_in < self.start_time + self.duration)
+        t_in, U = t_in[keep], U[keep]
+        names = [n for n in names if len(outputs[n][0]) > 1]
+        if not len(t_in) or not names:
+            raise RuntimeError("Nada gravado: sem amostras de entrada ou de resposta")
+        Y = np.stack([np.interp(t_in, *outputs[n]) for n in names], axis=-1)
+
+        fs = self.engine.rate
+        if self.kind == "multisine":
+            nperseg, window = int(round(self.period * fs)), "boxcar"
+        else:
+            nperseg, window = min(int(CHIRP_SEGMENT * fs), len(t_in)), "hann"
+        multisine = self.kind == "multisine"
+        freqs, H, coherence, power = frf(U, Y, fs, nperseg, window, mimo=not multisine)
+        band = (freqs >= self.f0) & (freqs <= self.f1)
+        valid = band[:, None] & (power > LINE_FLOOR * power.max(axis=0))     # (F, entradas)
+        if multisine:
+            valid &= power >= power.max(axis=1, keepdims=True)               # dono da linha
+        return {"freqs": freqs, "H": H, "coherence": coherence, "valid": valid,
+                "inputs": list(self.joints), "outputs": names, "kind": self.kind,
+                "band": (self.f0, self.f1), "fs": fs, "duration": self.duration,
+                "samples": len(t_in)}
+
+
+def summarize(result, good=COHERENCE_GOOD):
+    """Linhas de texto: pico de |H| com coerência >= good por par entrada/saída."""
+    lines = []
+    freqs, H, coh = result["freqs"], result["H"], result["coherence"]
+    for i, name_in in enumerate(result["inputs"]):
+        for o, name_out in enumerate(result["outputs"]):
+            ok = result["valid"][:, i] & (coh[:, o] >= good)
+            if not ok.any():
+                continue
+            mag = np.where(ok, np.abs(H[:, o, i]), 0.0)
+            k = int(np.argmax(mag))
+            lines.append(f"{name_in} -> {name_out}: pico {20 * np.log10(mag[k]):.1f} dB "
+                         f"@ {freqs[k]:.2f} Hz (coerência {coh[k, o]:.2f}, "
+                         f"{ok.sum()} bins >= {good})")
+    return lines
+
+
+def save_result(path, result):
+    np.savez(path, freqs=result["freqs"], H=result["H"], coherence=result["coherence"],
+             valid=result["valid"], inputs=np.array(result["inputs"]),
+             outputs=np.array(result["outputs"]), kind=result["kind"],
+             band=np.array(result["band"]), fs=result["fs"], duration=result["duration"])
+
+
+def default_path():
+    return f"sysid_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.npz"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de identificação nos cilindros")
+    parser.add_argument("--kind", choices=KINDS, default="chirp")
+    parser.add_argument("--joints", nargs="+", default=list(CMD_FORCE_JOINTS),
+                        choices=CMD_FORCE_JOINTS)
+    parser.add_argument("--amp", type=float, default=200.0, help="Amplitude (Nm)")
+    parser.add_argument("--f0", type=float, default=0.5)
+    parser.add_argument("--f1", type=float, default=100.0)
+    parser.add_argument("--duration", type=float, default=120.0, help="s de simulação")
+    parser.add_argument("--period", type=float, default=10.0, help="Período do multisine (s)")
+    parser.add_argument("--out", default=None, help="Arquivo .npz do resultado")
+    args = parser.parse_args()
+
+    node = Node()
+    engine = WaveformEngine(node, [Channel(cmd_force_topic(j)) for j in args.joints], origin=0.0)
+    engine.start()
+    print("⏳ Aguardando /stats...")
+    while engine.clock.now() is None:
+        time.sleep(0.1)
+    run = SysIdRun(node, engine, args.joints, args.kind, args.amp, args.f0, args.f1,
+                   args.duration, args.period).start()
+    print(f"🌊 {args.kind} {args.f0:g}-{args.f1:g} Hz, {args.amp:g} Nm em "
+          f"{', '.join(args.joints)} por {run.duration:.0f} s simulados")
+    try:
+        while not run.done():
+            time.sleep(1.0)
+            print(f"   {run.progress() * 100:5.1f}% | puladas {engine.skipped}", end="\r")
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrompido: FRF com o que foi gravado")
+    result = run.finish()    # também para o motor
+    print(f"\n✅ {result['samples']} amostras, {len(result['outputs'])} saídas")
+    for line in summarize(result):
+        print("   " + line)
+    path = args.out or default_path()
+    save_result(path, result)
+    print(f"💾 {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
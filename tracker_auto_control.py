@@ -6,9 +6,7 @@ import numpy as np
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.image_pb2 import Image
-    from gz.msgs10.double_pb2 import Double
+    from sim_transport import Node, Image, Double, cmd_pos_topic
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
@@ -69,8 +67,8 @@ class TrackerController:
         self.cam_reader = QuadCameraReader(self.node)
 
         # Publishers para comandos de junta
-        self.pub_joint1 = self.node.advertise("/model/three_link_model/joint/joint_azimuth/cmd_pos", Double)
-        self.pub_joint2 = self.node.advertise("/model/three_link_model/joint/joint_elevation/cmd_pos", Double)
+        self.pub_joint1 = self.node.advertise(cmd_pos_topic("joint_azimuth"), Double)
+        self.pub_joint2 = self.node.advertise(cmd_pos_topic("joint_elevation"), Double)
 
         # Estimativa de posição atual das juntas (somente no script)
         self.joint1_pos = 0.0  # rad
@@ -7,19 +7,21 @@ import subprocess
 
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QGroupBox, QGridLayout, QPushButton, QTextEdit
+    QLabel, QGroupBox, QGridLayout, QPushButton, QTextEdit, QComboBox
 )
 from PyQt5.QtCore import QTimer, Qt
 
 # Gazebo Transport
 try:
-    from gz.transport13 import Node
-    from gz.msgs10.image_pb2 import Image
-    from gz.msgs10.double_pb2 import Double
+    from sim_transport import Node, Image, Double, cmd_pos_topic, joint_state_topic
 except ImportError:
     print("ERRO: Instale: sudo apt install python3-gz-transport13 python3-gz-msgs10")
     sys.exit(1)
 
+from tracker_config import load_step_params
+from tracker_control import CONTROL_MODES, PITrackingLaw
+from ui_model import UIModel
+
 
 class QuadCameraReader:
     def __init__(self, node: Node):
@@ -78,7 +80,7 @@ class JointStateReader:
         try:
             # Comando direto, mais simples
             cmd = (
-                f'gz topic -e -t /world/three_link_with_tracker_plate_world/model/three_link_model/joint_state '
+                f'gz topic -e -t {joint_state_topic()} '
                 f'| awk \'/name: "{joint_name}"/ {{flag=1}} flag && /position:/ {{print $2; flag=0}}\' '
                 f'| head -n 1'
             )
@@ -148,11 +150,22 @@ class TrackerAutoGUI(QWidget):
         # Banda morta
         self.eps = 0.00001          # ← Aumentar = menos sensível a pequenas diferenças
 
+        # Tabela ajustada offline (tracker_tuning.py), se existir
+        for name, value in load_step_params().items():
+            setattr(self, name, value)
+
         # Frequência de correção (Hz). Ajuste aqui para mudar a taxa de controle.
         self.control_freq_hz = 40.0  # padrão: 10 Hz
 
+        # Lei de rastreamento: "stepped" (tabela acima) ou "pi" (tracker_control)
+        self.control_mode = "stepped"
+        self.pi_law = PITrackingLaw(dt=1.0 / self.control_freq_hz)
+
         self.init_ui()
 
+        # Rótulos: o controle grava, o timer de exibição aplica o que mudou
+        self.ui = UIModel(parent=self)
+
         # Timer de controle (usando control_freq_hz para calcular intervalo)
         self.timer = QTimer()
         self.timer.timeout.connect(self.control_step)
@@ -199,6 +212,15 @@ class TrackerAutoGUI(QWidget):
         grid_diff.addWidget(self.lbl_step1, 3, 0)
         grid_diff.addWidget(self.lbl_step2, 3, 1)
 
+        self.combo_mode = QComboBox()
+        for mode, label in CONTROL_MODES:
+            self.combo_mode.addItem(label, mode)
+        self.combo_mode.currentIndexChanged.connect(self.on_mode_changed)
+        self.lbl_err = QLabel("Erro normalizado (az, el): ---")
+        grid_diff.addWidget(QLabel("Lei:"), 4, 0)
+        grid_diff.addWidget(self.combo_mode, 4, 1)
+        grid_diff.addWidget(self.lbl_err, 5, 0, 1, 2)
+
         group_diff.setLayout(grid_diff)
         layout.addWidget(group_diff)
 
@@ -292,19 +314,20 @@ class TrackerAutoGUI(QWidget):
             self.joint1_initial = j1_atual
             self.joint2_initial = j2_atual
             
-            self.lbl_j1_init.setText(f"joint1 inicial (rad): {self.joint1_initial:.4f}")
-            self.lbl_j2_init.setText(f"joint2 inicial (rad): {self.joint2_initial:.4f}")
+            self.ui.set_text(self.lbl_j1_init, f"joint1 inicial (rad): {self.joint1_initial:.4f}")
+            self.ui.set_text(self.lbl_j2_init, f"joint2 inicial (rad): {self.joint2_initial:.4f}")
             
             # Reseta os offsets para zero
             self.joint1_offset = 0.0
             self.joint2_offset = 0.0
+            self.pi_law.reset()
             
             # Cria os publishers
             self.pub_joint1 = self.node.advertise(
-                "/model/three_link_model/joint/joint_azimuth/cmd_pos", Double
+                cmd_pos_topic("joint_azimuth"), Double
             )
             self.pub_joint2 = self.node.advertise(
-                "/model/three_link_model/joint/joint_elevation/cmd_pos", Double
+                cmd_pos_topic("joint_elevation"), Double
             )
             
             # Ativa o tracking
@@ -354,11 +377,17 @@ class TrackerAutoGUI(QWidget):
         if hz <= 0:
             return
         self.control_freq_hz = float(hz)
+        self.pi_law.dt = 1.0 / self.control_freq_hz
         if hasattr(self, "timer") and self.timer is not None:
             interval_ms = max(1, int(1000.0 / self.control_freq_hz))
             self.timer.start(interval_ms)
             self.log_debug(f"Frequência de correção ajustada para {self.control_freq_hz:.2f} Hz (intervalo {interval_ms} ms)")
 
+    def on_mode_changed(self, index):
+        self.control_mode = self.combo_mode.itemData(index)
+        self.pi_law.reset()
+        self.log_debug(f"Lei de rastreamento: {self.combo_mode.currentText()}")
+
     def control_step(self):
         """Executa o controle."""
         if not self.tracking_active:
@@ -375,10 +404,10 @@ class TrackerAutoGUI(QWidget):
         def fmt(v):
             return "---" if v is None else f"{v:.4f}"
 
-        self.lbl_q1.setText(f"Q1 (vermelho): {fmt(q1)}")
-        self.lbl_q2.setText(f"Q2 (verde escuro): {fmt(q2)}")
-        self.lbl_q3.setText(f"Q3 (azul): {fmt(q3)}")
-        self.lbl_q4.setText(f"Q4 (amarelo escuro): {fmt(q4)}")
+        self.ui.set_text(self.lbl_q1, f"Q1 (vermelho): {fmt(q1)}")
+        self.ui.set_text(self.lbl_q2, f"Q2 (verde escuro): {fmt(q2)}")
+        self.ui.set_text(self.lbl_q3, f"Q3 (azul): {fmt(q3)}")
+        self.ui.set_text(self.lbl_q4, f"Q4 (amarelo escuro): {fmt(q4)}")
 
         if None in (q1, q2, q3, q4):
             return
@@ -388,10 +417,15 @@ class TrackerAutoGUI(QWidget):
         d14 = q1 - q4
         d32 = q3 - q2
         d34 = q3 - q4
-        self.lbl_d12.setText(f"Δ12 = Q1 - Q2: {d12:.5f}")
-        self.lbl_d14.setText(f"Δ14 = Q1 - Q4: {d14:.5f}")
-        self.lbl_d32.setText(f"Δ32 = Q3 - Q2: {d32:.5f}")
-        self.lbl_d34.setText(f"Δ34 = Q3 - Q4: {d34:.5f}")
+        self.ui.set_text(self.lbl_d12, f"Δ12 = Q1 - Q2: {d12:.5f}")
+        self.ui.set_text(self.lbl_d14, f"Δ14 = Q1 - Q4: {d14:.5f}")
+        self.ui.set_text(self.lbl_d32, f"Δ32 = Q3 - Q2: {d32:.5f}")
+        self.ui.set_text(self.lbl_d34, f"Δ34 = Q3 - Q4: {d34:.5f}")
+
+        if self.control_mode == "pi":
+            self.pi_step(q1, q2, q3, q4)
+            self.publish_offsets()
+            return
 
         # Função local para escolher passo
         def get_step(diff):
@@ -411,7 +445,7 @@ class TrackerAutoGUI(QWidget):
         if sum_q1_q4 > sum_q2_q3:
             # Regra atual (usa d14)
             step1 = get_step(d14)
-            self.lbl_comp.setText(f"(Q1+Q4)={(sum_q1_q4):.2f} > (Q2+Q3)={(sum_q2_q3):.2f} → Modo 1 (d14)")
+            self.ui.set_text(self.lbl_comp, f"(Q1+Q4)={(sum_q1_q4):.2f} > (Q2+Q3)={(sum_q2_q3):.2f} → Modo 1 (d14)")
             
             if d14 > self.eps:
                 self.joint1_offset += step1
@@ -420,15 +454,15 @@ class TrackerAutoGUI(QWidget):
         else:
             # Nova regra (usa Q2 vs Q3)
             step1 = get_step(d32)
-            self.lbl_comp.setText(f"(Q1+Q4)={(sum_q1_q4):.2f} ≤ (Q2+Q3)={(sum_q2_q3):.2f} → Modo 2 (Q2 vs Q3)")
+            self.ui.set_text(self.lbl_comp, f"(Q1+Q4)={(sum_q1_q4):.2f} ≤ (Q2+Q3)={(sum_q2_q3):.2f} → Modo 2 (Q2 vs Q3)")
             
             if q2 > q3 + self.eps:
                 self.joint1_offset += step1
             elif q2 < q3 - self.eps:
                 self.joint1_offset -= step1
 
-        self.lbl_step1.setText(f"step joint1: {step1:.4f}")
-        self.lbl_step2.setText(f"step joint2: {step2:.4f}")
+        self.ui.set_text(self.lbl_step1, f"step joint1: {step1:.4f}")
+        self.ui.set_text(self.lbl_step2, f"step joint2: {step2:.4f}")
 
         # Controle joint2 (mantém regra atual)
         if d12 > self.eps:
@@ -436,15 +470,32 @@ class TrackerAutoGUI(QWidget):
         elif d12 < -self.eps:
             self.joint2_offset -= step2
 
+        self.publish_offsets()
+
+    def pi_step(self, q1, q2, q3, q4):
+        """Lei PI contínua sobre o erro normalizado dos quadrantes."""
+        offsets = np.array([[self.joint1_offset, self.joint2_offset]])
+        self.pi_law(np.array([[q1, q2, q3, q4]]), offsets)
+        self.joint1_offset, self.joint2_offset = (float(v) for v in offsets[0])
+
+        err_az, err_el = self.pi_law.last_error[0]
+        step1, step2 = self.pi_law.last_rate[0] * self.pi_law.dt
+        self.ui.set_text(self.lbl_err, f"Erro normalizado (az, el): {err_az:+.5f}, {err_el:+.5f}")
+        self.ui.set_text(self.lbl_comp, f"PI: kp={self.pi_law.params['kp']:g}, ki={self.pi_law.params['ki']:g}")
+        self.ui.set_text(self.lbl_step1, f"step joint1: {step1:+.5f}")
+        self.ui.set_text(self.lbl_step2, f"step joint2: {step2:+.5f}")
+
+    def publish_offsets(self):
+        """Envia posição inicial + offsets às juntas e atualiza os rótulos."""
         # Posições reais
         joint1_cmd = self.joint1_initial + self.joint1_offset
         joint2_cmd = self.joint2_initial + self.joint2_offset
 
         # Atualiza visual
-        self.lbl_j1.setText(f"joint1 offset (rad): {self.joint1_offset:.4f}")
-        self.lbl_j2.setText(f"joint2 offset (rad): {self.joint2_offset:.4f}")
-        self.lbl_j1_real.setText(f"joint1 comando (rad): {joint1_cmd:.4f}")
-        self.lbl_j2_real.setText(f"joint2 comando (rad): {joint2_cmd:.4f}")
+        self.ui.set_text(self.lbl_j1, f"joint1 offset (rad): {self.joint1_offset:.4f}")
+        self.ui.set_text(self.lbl_j2, f"joint2 offset (rad): {self.joint2_offset:.4f}")
+        self.ui.set_text(self.lbl_j1_real, f"joint1 comando (rad): {joint1_cmd:.4f}")
+        self.ui.set_text(self.lbl_j2_real, f"joint2 comando (rad): {joint2_cmd:.4f}")
 
         # Envia comando
         self.send_joint("joint_azimuth", joint1_cmd)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tabela de passos da lei de rastreamento (control_step) compartilhada entre
+as GUIs, o simulador substituto e o ajuste offline.
+
+As GUIs mantêm seus valores ajustados à mão como padrão e, ao iniciar,
+sobrescrevem com o que estiver em tracker_params.json (gerado por
+tracker_tuning.py). Sem o arquivo nada muda.
+
+    for name, value in load_step_params().items():
+        setattr(self, name, value)
+"""
+
+import json
+import os
+import time
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracker_params.json")
+
+STEP_PARAMS = ("step_1", "step_2", "step_3", "step_4",
+               "thresh_1", "thresh_2", "thresh_3", "eps")
+
+# Valores de UnifiedControlGUI (02_unified_control_gui.py)
+DEFAULT_STEP_PARAMS = {
+    "step_1": 0.0001, "step_2": 0.001, "step_3": 0.01, "step_4": 0.003,
+    "thresh_1": 1.0, "thresh_2": 15.0, "thresh_3": 25.0, "eps": 0.00001,
+}
+
+
+def validate_step_params(params):
+    """Lança ValueError se a tabela estiver incompleta ou incoerente."""
+    missing = [name for name in STEP_PARAMS if name not in params]
+    if missing:
+        raise ValueError(f"parâmetros ausentes: {', '.join(missing)}")
+    values = {name: float(params[name]) for name in STEP_PARAMS}
+    if any(v < 0 for v in values.values()):
+        raise ValueError("passos, limiares e eps devem ser não negativos")
+    if not values["thresh_1"] <= values["thresh_2"] <= values["thresh_3"]:
+        raise ValueError("limiares devem ser crescentes (thresh_1 <= thresh_2 <= thresh_3)")
+    return values
+
+
+def load_step_params(path=None):
+    """
+    Tabela salva por tracker_tuning.py, ou {} se não houver arquivo (ou se
+    ele for inválido, com aviso). Retorna só os parâmetros da lei.
+    """
+    path = path or CONFIG_FILE
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            params = validate_step_params(json.load(f)["step_params"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️  Ignorando {os.path.basename(path)}: {e}")
+        return {}
+    print(f"📄 Tabela de passos carregada de {os.path.basename(path)}")
+    return params
+
+
+def save_step_params(params, path=None, **metadata):
+    """Grava a tabela (validada) com metadados do ajuste (objetivos, busca...)."""
+    path = path or CONFIG_FILE
+    content = {
+        "step_params": validate_step_params(params),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    content.update(metadata)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(content, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return path
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Leis de rastreamento da placa de 4 quadrantes, vetorizadas sobre N
+execuções (N = 1 nas GUIs, N grande no simulador substituto).
+
+Modos:
+- stepped: a lei de passos de control_step (4 níveis por limiar de
+           |ΔQ|, decide só pelo sinal das diferenças)
+- pi:      PI contínuo sobre o erro normalizado dos quadrantes, com
+           anti-windup por integração condicional e limite de taxa
+
+Ambas atualizam no lugar os offsets (N, 2) = (joint1 / azimute,
+joint2 / elevação), como joint1_offset / joint2_offset das GUIs.
+
+Com feed-forward, a base dos offsets deixa de ser a posição inicial das
+juntas e passa a ser sun_to_joints(sol): a cinemática inversa leva a
+placa até o sol calculado e a câmera só corrige o resíduo.
+"""
+
+import numpy as np
+
+from kinematics import default_arm
+from tracker_config import DEFAULT_STEP_PARAMS, STEP_PARAMS
+
+# (identificador, rótulo na GUI)
+CONTROL_MODES = (
+    ("stepped", "Passos (4 níveis)"),
+    ("pi", "PI contínuo (erro normalizado)"),
+)
+
+# kp em rad/s por unidade de erro normalizado, ki em rad/s² e
+# rate_limit em rad/s (0.2 rad/s = 0.005 rad por passo a 40 Hz).
+# O contraste é baixo (|e| < 0.002 a 10° do sol), daí o kp alto; ki
+# pequeno porque a quantização de 8 bits cria uma zona morta de ~0.9°
+# onde o integrador só alimenta oscilação (ajustado com tracker_sim.py)
+PI_PARAMS = ("kp", "ki", "rate_limit", "deadband")
+DEFAULT_PI_PARAMS = {"kp": 640.0, "ki": 2.0, "rate_limit": 0.2, "deadband": 0.0}
+
+# Velocidade máxima (rad/s) da base do feed-forward: um degrau direto no
+# alvo da cinemática inversa excita a elevação (P=1e6, D=0 no SDF), que
+# fica oscilando sem amortecimento
+FEEDFORWARD_RATE = 0.2
+
+
+# ==============================================================================
+# LEI DE PASSOS
+# ==============================================================================
+def broadcast_params(params, n, names=STEP_PARAMS, defaults=DEFAULT_STEP_PARAMS):
+    """dict de parâmetros (escalares ou (N,)) -> dict de arrays (N,), com padrões da GUI."""
+    out = {}
+    for name in names:
+        value = params.get(name, defaults[name]) if params else defaults[name]
+        out[name] = np.broadcast_to(np.asarray(value, dtype=float), (n,))
+    return out
+
+
+def _select_step(diff, p):
+    ad = np.abs(diff)
+    return np.where(ad < p["thresh_1"], p["step_1"],
+                    np.where(ad < p["thresh_2"], p["step_2"],
+                             np.where(ad < p["thresh_3"], p["step_3"], p["step_4"])))
+
+
+def _signed(diff, eps):
+    return (diff > eps).astype(float) - (diff < -eps)
+
+
+def stepped_law(lum, offsets, params):
+    """
+    Um passo de UnifiedControlGUI.control_step para N execuções.
+
+    Args:
+        lum: (N, 4) luminâncias Q1..Q4
+        offsets: (N, 2) joint1_offset / joint2_offset (atualizado no lugar)
+        params: dict de arrays (N,) (ver broadcast_params)
+    """
+    q1, q2, q3, q4 = lum.T
+    d12 = q1 - q2
+    d14 = q1 - q4
+    d32 = q3 - q2
+    eps = params["eps"]
+
+    step2 = _select_step(d12, params)
+    mode1 = (q1 + q4) > (q2 + q3)
+    step1 = np.where(mode1, _select_step(d14, params), _select_step(d32, params))
+    dir1 = np.where(mode1, _signed(d14, eps), _signed(q2 - q3, eps))
+
+    offsets[:, 0] += dir1 * step1
+    offsets[:, 1] += _signed(d12, eps) * step2
+    return offsets
+
+
+# ==============================================================================
+# LEI PI CONTÍNUA
+# ==============================================================================
+def normalized_errors(lum):
+    """
+    Erros normalizados (N, 2) na ordem das juntas:
+    coluna 0 (azimute)  = err_y = (topo - base) / (topo + base)
+    coluna 1 (elevação) = err_x = (direita - esquerda) / (direita + esquerda)
+    com as médias de compute_error (plate_light_gui_images.py).
+    """
+    q1, q2, q3, q4 = np.atleast_2d(lum).T
+    right, left = (q1 + q4) / 2.0, (q2 + q3) / 2.0
+    top, bottom = (q1 + q2) / 2.0, (q3 + q4) / 2.0
+    err_x = (right - left) / np.maximum(right + left, 1e-9)
+    err_y = (top - bottom) / np.maximum(top + bottom, 1e-9)
+    return np.stack([err_y, err_x], axis=-1)
+
+
+class PITrackingLaw:
+    """
+    u = kp e + ki ∫e  (rad/s), saturado em ±rate_limit e integrado nos
+    offsets a cada passo. O integrador só acumula quando a saída não está
+    saturada ou quando o erro a tira da saturação (anti-windup).
+
+    Mesma assinatura de stepped_law: law(lum, offsets, params). Os ganhos
+    vêm de self.params (escalares ou arrays (N,)); o argumento params só
+    existe para compatibilidade e é ignorado.
+    """
+
+    def __init__(self, dt=1.0 / 40.0, params=None):
+        self.dt = dt
+        self.params = dict(DEFAULT_PI_PARAMS)
+        if params:
+            self.params.update(params)
+        self.integral = None
+        self.last_error = None
+        self.last_rate = None
+
+    def reset(self):
+        self.integral = None
+        self.last_error = None
+        self.last_rate = None
+
+    def __call__(self, lum, offsets, params=None, dt=None):
+        dt = self.dt if dt is None else dt
+        p = broadcast_params(self.params, len(offsets), PI_PARAMS, DEFAULT_PI_PARAMS)
+        kp, ki = p["kp"][:, None], p["ki"][:, None]
+        rate = p["rate_limit"][:, None]
+
+        err = normalized_errors(lum)
+        e = np.where(np.abs(err) < p["deadband"][:, None], 0.0, err)
+        if self.integral is None or self.integral.shape != e.shape:
+            self.integral = np.zeros_like(e)
+
+        candidate = self.integral + e * dt
+        u = kp * e + ki * candidate
+        winding = (np.abs(u) > rate) & (np.sign(u) == np.sign(e))
+        self.integral = np.where(winding, self.integral, candidate)
+        u = np.clip(kp * e + ki * self.integral, -rate, rate)
+
+        offsets += u * dt
+        self.last_error = err
+        self.last_rate = u
+        return offsets
+
+
+# ==============================================================================
+# FEED-FORWARD (efeméride do sol -> juntas)
+# ==============================================================================
+def sun_to_joints(sun_world, reference=None):
+    """
+    Cinemática inversa da placa (kinematics.default_arm): ângulos (N, 2)
+    (azimute, elevação) que alinham a normal com o vetor para o sol, na
+    solução mais próxima de reference (posição atual ou alvo anterior).
+    """
+    return default_arm().inverse(sun_world, reference)
+
+
+def feedforward_step(base, sun_world, dt, rate=FEEDFORWARD_RATE):
+    """
+    Move a base (N, 2) em direção a sun_to_joints(sol) a no máximo rate
+    rad/s. Retorna (base, settled): settled (N,) indica que a base chegou
+    ao alvo; enquanto ela anda, a câmera vê só o atraso da rampa e a
+    correção do resíduo deve esperar.
+    """
+    delta = sun_to_joints(sun_world, base) - base
+    step = np.clip(delta, -rate * dt, rate * dt)
+    return base + step, np.all(step == delta, axis=-1)
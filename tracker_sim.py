@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Simulador substituto (surrogate) do rastreamento em malha fechada.
+
+Reproduz, sem o Gazebo, o laço do 02_unified_control_gui.py:
+- juntas joint_azimuth / joint_elevation como rotores rígidos com a
+  inércia composta, o momento gravitacional, o amortecimento e o limite de
+  esforço lidos do SDF, integrados no passo de física do SDF (1 ms);
+- JointPositionController com os ganhos do SDF, mesma atualização do
+  gz::math::PID (erro = posição - alvo, chute derivativo incluso);
+- câmeras a 10 Hz pelo modelo de luminância de quad_camera_synth (tabela
+  pré-calculada ou traçado de raios exato) e a lei de passos de
+  control_step a 40 Hz, segurando a última luminância entre quadros.
+
+Tudo é vetorizado sobre N execuções: cada execução tem seu próprio
+conjunto de parâmetros da lei, sol e posição inicial, o que permite
+avaliar muitos conjuntos em paralelo para ajustar a tabela de passos.
+
+Simplificações: juntas desacopladas (inércia na configuração nominal),
+sem atrito de Coulomb e sem limite de velocidade. O SDF atual declara
+joint_azimuth como "fixed"; por padrão o substituto a trata como
+revoluta comandada (lock_fixed=True congela as juntas fixas).
+
+Uso:
+    from tracker_sim import TrackerSurrogate, DEFAULT_STEP_PARAMS
+
+    sim = TrackerSurrogate()
+    result = sim.run(params, sun_world, duration=60.0)   # dict de arrays (N,)
+
+    python3 tracker_sim.py --runs 256 --duration 60
+"""
+
+import functools
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from kinematics import default_arm, rpy_matrix
+from quad_camera_synth import QuadCameraSynth, plate_rotation, sun_in_plate, sun_vector
+from tracker_config import DEFAULT_STEP_PARAMS
+from tracker_control import (CONTROL_MODES, PITrackingLaw, broadcast_params, stepped_law,
+                             feedforward_step)
+
+SDF_FILE = "01_three_link_with_tracker_plate.sdf"
+MODEL_NAME = "three_link_model"
+TRACKED_JOINTS = ("joint_azimuth", "joint_elevation")
+GRAVITY = np.array([0.0, 0.0, -9.8])
+
+# Temporização do 02_unified_control_gui.py (QTimer de 25 ms) e das câmeras
+CONTROL_RATE = 40.0
+CAMERA_RATE = 10.0
+
+# Erro de apontamento abaixo do qual o rastreador é considerado travado
+LOCK_DEG = 1.0
+# Fração final da simulação usada para o erro em regime
+SETTLE_FRACTION = 0.25
+
+
+# ==============================================================================
+# MODELO DAS JUNTAS A PARTIR DO SDF
+# ==============================================================================
+def _floats(text, n, default=0.0):
+    if text is None:
+        return np.full(n, default, dtype=float)
+    return np.array([float(v) for v in text.split()], dtype=float)
+
+
+class JointModel:
+    """Rotor rígido equivalente de uma junta comandada por JointPositionController."""
+
+    def __init__(self, name, joint_type, inertia, gravity_terms, damping, effort,
+                 p_gain, i_gain, d_gain, i_min, i_max):
+        self.name = name
+        self.joint_type = joint_type
+        self.inertia = inertia
+        # Torque gravitacional: c0 + c1 cos(q) + c2 sin(q)
+        self.gravity_terms = gravity_terms
+        self.damping = damping
+        self.effort = effort
+        self.p_gain = p_gain
+        self.i_gain = i_gain
+        self.d_gain = d_gain
+        self.i_min = i_min
+        self.i_max = i_max
+
+    @property
+    def fixed(self):
+        return self.joint_type == "fixed"
+
+    def __repr__(self):
+        return (f"JointModel({self.name}, {self.joint_type}, J={self.inertia:.2f} kg·m², "
+                f"P={self.p_gain:g} I={self.i_gain:g} D={self.d_gain:g}, "
+                f"esforço ±{self.effort:g} N·m)")
+
+
+def load_joint_models(sdf_path=SDF_FILE, model_name=MODEL_NAME, joints=TRACKED_JOINTS):
+    """
+    Monta JointModel das juntas pedidas a partir do SDF.
+
+    Returns:
+        (dict nome -> JointModel, passo de física em segundos)
+    """
+    root = ET.parse(sdf_path).getroot()
+    model = next(m for m in root.iter('model') if m.get('name') == model_name)
+    step = float(root.findtext('.//physics/max_step_size', '0.001'))
+
+    links = {}
+    for link in model.findall('link'):
+        pose = _floats(link.findtext('pose'), 6)
+        rot = rpy_matrix(*pose[3:])
+        inertial = link.find('inertial')
+        if inertial is None:
+            continue
+        ipose = _floats(inertial.findtext('pose'), 6)
+        tensor = inertial.find('inertia')
+        get = lambda tag: float(tensor.findtext(tag, '0'))
+        local = np.array([[get('ixx'), get('ixy'), get('ixz')],
+                          [get('ixy'), get('iyy'), get('iyz')],
+                          [get('ixz'), get('iyz'), get('izz')]])
+        rot_c = rot @ rpy_matrix(*ipose[3:])
+        links[link.get('name')] = (
+            float(inertial.findtext('mass', '0')),
+            pose[:3] + rot @ ipose[:3],
+            rot_c @ local @ rot_c.T,
+        )
+
+    children = {}
+    joint_elems = {}
+    for joint in model.findall('joint'):
+        children.setdefault(joint.findtext('parent'), []).append(joint.findtext('child'))
+        joint_elems[joint.get('name')] = joint
+
+    def subtree(link):
+        out = [link]
+        for child in children.get(link, []):
+            out.extend(subtree(child))
+        return out
+
+    controllers = {}
+    for plugin in model.findall('plugin'):
+        if plugin.get('name', '').endswith('JointPositionController'):
+            controllers[plugin.findtext('joint_name')] = plugin
+
+    result = {}
+    for name in joints:
+        joint = joint_elems[name]
+        child = joint.findtext('child')
+        child_pose = _floats(model.find(f"link[@name='{child}']").findtext('pose'), 6)
+        jpose = _floats(joint.findtext('pose'), 6)
+        child_rot = rpy_matrix(*child_pose[3:])
+        anchor = child_pose[:3] + child_rot @ jpose[:3]
+        axis = child_rot @ rpy_matrix(*jpose[3:]) @ _floats(joint.findtext('axis/xyz'), 3, 0.0)
+        axis /= np.linalg.norm(axis)
+
+        inertia = 0.0
+        moment = np.zeros(3)
+        for link in subtree(child):
+            if link not in links:
+                continue
+            mass, com, tensor = links[link]
+            r = com - anchor
+            r_perp = r - (r @ axis) * axis
+            inertia += axis @ tensor @ axis + mass * (r_perp @ r_perp)
+            moment += mass * r
+
+        m_par = (moment @ axis) * axis
+        m_perp = moment - m_par
+        gravity_terms = (axis @ np.cross(m_par, GRAVITY),
+                         axis @ np.cross(m_perp, GRAVITY),
+                         axis @ np.cross(np.cross(axis, m_perp), GRAVITY))
+
+        plugin = controllers.get(name)
+        gain = lambda tag, default=0.0: float(plugin.findtext(tag, str(default))) if plugin is not None else default
+        result[name] = JointModel(
+            name=name,
+            joint_type=joint.get('type'),
+            inertia=inertia,
+            gravity_terms=np.array(gravity_terms),
+            damping=float(joint.findtext('axis/dynamics/damping', '0')),
+            effort=float(joint.findtext('axis/limit/effort', 'inf')),
+            p_gain=gain('p_gain'), i_gain=gain('i_gain'), d_gain=gain('d_gain'),
+            i_min=gain('i_min', -np.inf), i_max=gain('i_max', np.inf),
+        )
+    return result, step
+
+
+# ==============================================================================
+# MODELO DE LUMINÂNCIA
+# ==============================================================================
+def _table_axis(fine_deg, fine_range, mid_deg, mid_range, coarse_deg, max_deg):
+    """Ângulos (rad) simétricos: passo fino perto do travamento, grosso longe."""
+    pos = np.concatenate([
+        np.arange(0.0, fine_range, fine_deg),
+        np.arange(fine_range, mid_range, mid_deg),
+        np.arange(mid_range, max_deg, coarse_deg),
+        [max_deg],
+    ])
+    return np.radians(np.concatenate([-pos[:0:-1], pos]))
+
+
+class LuminanceTable:
+    """
+    Luminâncias das 4 câmeras tabeladas pela direção do sol no referencial
+    da placa, parametrizada por α = atan2(Lx, Lz) e β = atan2(Ly, Lz), com
+    interpolação bilinear. Os nós são avaliados pelo traçado de raios
+    exato; o passo fino (0.1°) perto do travamento preserva a zona morta
+    causada pela quantização em 8 bits.
+
+    Montar a tabela padrão leva alguns segundos (~35 mil direções).
+    """
+
+    def __init__(self, synth=None, fine_deg=0.1, fine_range=3.0, mid_deg=0.5, mid_range=15.0,
+                 coarse_deg=2.0, max_deg=88.0):
+        synth = synth or QuadCameraSynth()
+        self.axis = _table_axis(fine_deg, fine_range, mid_deg, mid_range, coarse_deg, max_deg)
+        a, b = np.meshgrid(self.axis, self.axis, indexing='ij')
+        directions = np.stack([np.tan(a), np.tan(b), np.ones_like(a)], axis=-1).reshape(-1, 3)
+        self.values = synth.luminances(directions).reshape(len(self.axis), len(self.axis), 4)
+        self.dark = synth.luminances([0.0, 0.0, -1.0])[0]
+
+    def _locate(self, angle):
+        angle = np.clip(angle, self.axis[0], self.axis[-1])
+        i = np.clip(np.searchsorted(self.axis, angle) - 1, 0, len(self.axis) - 2)
+        frac = (angle - self.axis[i]) / (self.axis[i + 1] - self.axis[i])
+        return i, frac[:, None]
+
+    def __call__(self, sun_plate):
+        sun = np.atleast_2d(np.asarray(sun_plate, dtype=float))
+        i, fa = self._locate(np.arctan2(sun[:, 0], sun[:, 2]))
+        j, fb = self._locate(np.arctan2(sun[:, 1], sun[:, 2]))
+        v = self.values
+        lum = ((1 - fa) * ((1 - fb) * v[i, j] + fb * v[i, j + 1])
+               + fa * ((1 - fb) * v[i + 1, j] + fb * v[i + 1, j + 1]))
+        return np.where((sun[:, 2] > 0.0)[:, None], lum, self.dark)
+
+
+@functools.lru_cache(maxsize=None)
+def default_luminance_table():
+    """LuminanceTable padrão, montada uma vez por processo."""
+    return LuminanceTable()
+
+
+# ==============================================================================
+# SIMULAÇÃO
+# ==============================================================================
+def plate_normal(q):
+    """Normal da placa no mundo para (N, 2) ângulos (azimute, elevação)."""
+    return default_arm().normal(q)
+
+
+def random_scenarios(n, seed=0, azimuth_range=(-180.0, 180.0), elevation_range=(20.0, 85.0)):
+    """Direções do sol (n, 3) sorteadas para avaliar a lei em vários casos."""
+    rng = np.random.default_rng(seed)
+    return sun_vector(rng.uniform(*azimuth_range, n), rng.uniform(*elevation_range, n))
+
+
+def moving_sun(n, azimuth_rate=5.0, seed=0, azimuth_range=(-180.0, 180.0),
+               elevation_range=(20.0, 85.0)):
+    """Sol girando em azimute a azimuth_rate °/s: callable(t) -> (n, 3) para run()."""
+    rng = np.random.default_rng(seed)
+    az0 = rng.uniform(*azimuth_range, n)
+    el = rng.uniform(*elevation_range, n)
+    return lambda t: sun_vector(az0 + azimuth_rate * t, el)
+
+
+class TrackerSurrogate:
+    """
+    Laço fechado câmera -> control_step -> JointPositionController -> juntas.
+
+    Args:
+        sdf_path: SDF de onde saem ganhos, inércias e passo de física
+        luminance_model: callable(sun_plate (N, 3)) -> (N, 4); padrão:
+                         tabela (default_luminance_table); "exact" usa o
+                         traçado de raios a cada quadro
+        control_rate / camera_rate: Hz do QTimer da GUI e das câmeras
+        lock_fixed: mantém paradas as juntas declaradas "fixed" no SDF
+        law: lei de rastreamento (stepped_law ou PITrackingLaw, tracker_control)
+    """
+
+    def __init__(self, sdf_path=SDF_FILE, luminance_model=None, control_rate=CONTROL_RATE,
+                 camera_rate=CAMERA_RATE, lock_fixed=False, law=stepped_law):
+        self.joints, self.physics_dt = load_joint_models(sdf_path)
+        models = [self.joints[j] for j in TRACKED_JOINTS]
+        attr = lambda name: np.array([getattr(m, name) for m in models], dtype=float)
+        self.inertia = attr("inertia")
+        self.damping = attr("damping")
+        self.effort = attr("effort")
+        self.kp, self.ki, self.kd = attr("p_gain"), attr("i_gain"), attr("d_gain")
+        self.i_min, self.i_max = attr("i_min"), attr("i_max")
+        self.gravity = np.stack([m.gravity_terms for m in models])
+        self.movable = np.array([not (lock_fixed and m.fixed) for m in models], dtype=float)
+
+        if luminance_model == "exact":
+            luminance_model = QuadCameraSynth().luminances
+        self.luminance_model = luminance_model or default_luminance_table()
+        self.control_every = max(1, int(round(1.0 / (control_rate * self.physics_dt))))
+        self.camera_every = max(1, int(round(1.0 / (camera_rate * self.physics_dt))))
+        self.law = law
+
+    def run(self, params=None, sun_world=None, duration=30.0, initial=None,
+            lock_deg=LOCK_DEG, settle_fraction=SETTLE_FRACTION, feedforward=False,
+            record=False):
+        """
+        Simula N execuções em paralelo.
+
+        Args:
+            params: dict de parâmetros da lei (escalares ou (N,))
+            sun_world: (3,) ou (N, 3) vetor para o sol, ou callable(t) -> (N, 3)
+            initial: (N, 2) posição inicial das juntas (rad); padrão zero
+            feedforward: alvo = base + offsets, com a base levada de initial
+                         até sun_to_joints(sol) por feedforward_step (a lei só
+                         corrige o resíduo), em vez de posição inicial + offsets
+            record: inclui as séries no ritmo do controle em result["trace"]
+
+        Returns:
+            dict de arrays (N,): time_to_lock (inf se não travou), rms_error_deg
+            (regime), rms_error_all_deg, final_error_deg, max_error_deg,
+            travel (N, 2) em rad, command_travel (N, 2), corrections (passos em
+            que a lei mexeu nos offsets), control_steps
+        """
+        sizes = [np.shape(v)[0] for v in (params or {}).values() if np.ndim(v) > 0]
+        if callable(sun_world):
+            sizes.append(len(np.atleast_2d(sun_world(0.0))))
+        elif sun_world is not None and np.ndim(sun_world) == 2:
+            sizes.append(len(sun_world))
+        if initial is not None:
+            sizes.append(len(initial))
+        n = max(sizes) if sizes else 1
+
+        p = broadcast_params(params, n)
+        sun_fn = sun_world if callable(sun_world) else None
+        if sun_fn is None:
+            sun = sun_vector(-45.0, 45.0) if sun_world is None else np.asarray(sun_world, dtype=float)
+            sun = np.broadcast_to(sun, (n, 3))
+
+        dt = self.physics_dt
+        q = np.zeros((n, 2)) if initial is None else np.array(initial, dtype=float)
+        qd = np.zeros((n, 2))
+        start = q.copy()
+        offsets = np.zeros((n, 2))
+        if hasattr(self.law, "reset"):
+            self.law.reset()
+        base = start.copy()
+        target = base + offsets
+        i_err = np.zeros((n, 2))
+        e_last = q - target
+        lum = None
+
+        n_steps = int(round(duration / dt))
+        settle_from = int(n_steps * (1.0 - settle_fraction))
+        cos_lock = np.cos(np.radians(lock_deg))
+        last_unlocked = np.zeros(n)
+        travel = np.zeros((n, 2))
+        command_travel = np.zeros((n, 2))
+        corrections = np.zeros(n, dtype=int)
+        sq_settle = np.zeros(n)
+        sq_all = np.zeros(n)
+        max_err = np.zeros(n)
+        count_settle = 0
+        count_all = 0
+        trace = [] if record else None
+
+        for k in range(n_steps):
+            t = k * dt
+            if sun_fn is not None and k % self.control_every == 0:
+                sun = sun_fn(t)
+
+            if k % self.camera_every == 0:
+                lum = self.luminance_model(sun_in_plate(sun, plate_rotation(q[:, 0], q[:, 1])))
+
+            if k % self.control_every == 0:
+                previous, previous_offsets = target, offsets.copy()
+                if feedforward:
+                    base, settled = feedforward_step(base, sun, self.control_every * dt)
+                self.law(lum, offsets, p)
+                if feedforward:
+                    offsets[~settled] = previous_offsets[~settled]
+                corrections += np.any(offsets != previous_offsets, axis=1)
+                target = base + offsets
+                command_travel += np.abs(target - previous)
+
+                cos_err = np.clip(np.einsum('ij,ij->i', plate_normal(q), sun), -1.0, 1.0)
+                err = np.degrees(np.arccos(cos_err))
+                last_unlocked = np.where(cos_err < cos_lock, t, last_unlocked)
+                sq_all += err ** 2
+                count_all += 1
+                max_err = np.maximum(max_err, err)
+                if k >= settle_from:
+                    sq_settle += err ** 2
+                    count_settle += 1
+                if record:
+                    trace.append((t, q.copy(), target.copy(), lum.copy(), err))
+
+            # gz::math::PID (erro = posição - alvo), como o JointPositionController
+            e = q - target
+            i_err = np.clip(i_err + self.ki * dt * e, self.i_min, self.i_max)
+            d_err = (e - e_last) / dt
+            e_last = e
+            tau = np.clip(-self.kp * e - i_err - self.kd * d_err, -self.effort, self.effort)
+            g = self.gravity
+            tau += g[:, 0] + g[:, 1] * np.cos(q) + g[:, 2] * np.sin(q) - self.damping * qd
+
+            # Euler semi-implícito, como os motores de física
+            qd += (tau / self.inertia) * dt * self.movable
+            step = qd * dt
+            q += step
+            travel += np.abs(step)
+
+        final_cos = np.clip(np.einsum('ij,ij->i', plate_normal(q), sun), -1.0, 1.0)
+        locked = final_cos >= cos_lock
+        result = {
+            "time_to_lock": np.where(locked, last_unlocked + self.control_every * dt, np.inf),
+            "rms_error_deg": np.sqrt(sq_settle / max(count_settle, 1)),
+            "rms_error_all_deg": np.sqrt(sq_all / max(count_all, 1)),
+            "final_error_deg": np.degrees(np.arccos(final_cos)),
+            "max_error_deg": max_err,
+            "travel": travel,
+            "command_travel": command_travel,
+            "corrections": corrections,
+            "control_steps": count_all,
+        }
+        if record:
+            result["trace"] = {
+                "t": np.array([r[0] for r in trace]),
+                "q": np.stack([r[1] for r in trace]),
+                "target": np.stack([r[2] for r in trace]),
+                "lum": np.stack([r[3] for r in trace]),
+                "error_deg": np.stack([r[4] for r in trace]),
+            }
+        return result
+
+
+def _benchmark():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulador substituto do rastreador")
+    parser.add_argument("--runs", type=int, default=256, help="Execuções em paralelo")
+    parser.add_argument("--duration", type=float, default=60.0, help="Tempo simulado (s)")
+    parser.add_argument("--exact", action="store_true",
+                        help="Traçado de raios a cada quadro em vez da tabela")
+    parser.add_argument("--lock-fixed", action="store_true",
+                        help="Congela as juntas declaradas fixed no SDF")
+    parser.add_argument("--law", choices=[mode for mode, _ in CONTROL_MODES], default="stepped",
+                        help="Lei de rastreamento")
+    parser.add_argument("--feedforward", action="store_true",
+                        help="Alvo pela cinemática inversa do sol; a câmera só corrige o resíduo")
+    parser.add_argument("--sun-rate", type=float, default=0.0,
+                        help="Sol girando em azimute (°/s); 0 = parado")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    sim = TrackerSurrogate(luminance_model="exact" if args.exact else None,
+                           lock_fixed=args.lock_fixed,
+                           law=PITrackingLaw(1.0 / CONTROL_RATE) if args.law == "pi" else stepped_law)
+    print(f"🔧 Modelo pronto em {time.perf_counter() - t0:.1f} s "
+          f"(física {sim.physics_dt * 1e3:g} ms, controle a cada {sim.control_every}, "
+          f"câmera a cada {sim.camera_every} passos)")
+    for model in sim.joints.values():
+        print(f"   {model}")
+        if model.fixed and not args.lock_fixed:
+            print(f"   ⚠️  {model.name} é 'fixed' no SDF; simulada como revoluta")
+
+    if args.sun_rate:
+        sun = moving_sun(args.runs, args.sun_rate)
+    else:
+        sun = random_scenarios(args.runs)
+    t0 = time.perf_counter()
+    result = sim.run(DEFAULT_STEP_PARAMS, sun, duration=args.duration,
+                     feedforward=args.feedforward)
+    wall = time.perf_counter() - t0
+
+    locked = np.isfinite(result["time_to_lock"])
+    print(f"\n📦 {args.runs} execuções x {args.duration:g} s em {wall:.2f} s "
+          f"({args.runs * args.duration / wall:,.0f} s simulados por segundo)")
+    print(f"   travaram (< {LOCK_DEG:g}°): {locked.sum()}/{args.runs}")
+    if locked.any():
+        print(f"   tempo até travar: mediana {np.median(result['time_to_lock'][locked]):.2f} s")
+    print(f"   erro RMS em regime: mediana {np.median(result['rms_error_deg']):.3f}°")
+    print(f"   curso médio das juntas: {np.degrees(result['travel'].mean(axis=0)).round(1)}°")
+    print(f"   correções da câmera: mediana {np.median(result['corrections']):.0f}"
+          f" de {result['control_steps']} passos")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Ajuste offline da tabela de passos de control_step no simulador substituto.
+
+Cada candidato (step_1..4, thresh_1..3, eps) é avaliado em vários sóis
+(tracker_sim.random_scenarios) e pontuado por:
+- tempo até travar (falha conta como FAIL_PENALTY x duração)
+- erro RMS de apontamento em regime (ângulo entre normal da placa e sol,
+  a mesma métrica do produto escalar de on_pose)
+- curso dos atuadores (soma dos deslocamentos das duas juntas)
+
+    score = t_lock / duração + w_erro * erro_rms[°] + w_curso * curso[rad]
+
+Buscas: grade, aleatória ou CMA-ES, com os candidatos repartidos entre
+processos (cada processo avalia seu bloco vetorizado no substituto).
+O melhor conjunto vai para tracker_params.json, carregado pelas GUIs.
+
+Uso:
+    python3 tracker_tuning.py --method cmaes --generations 20 --workers 8
+    python3 tracker_tuning.py --method random --samples 512 --csv avaliacoes.csv
+    python3 tracker_tuning.py --method grid --levels 2 --no-save
+"""
+
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tracker_config import (CONFIG_FILE, DEFAULT_STEP_PARAMS, STEP_PARAMS, load_step_params,
+                            save_step_params)
+from tracker_sim import TrackerSurrogate, default_luminance_table, random_scenarios
+
+# Espaço de busca em log10: passos, thresh_1, folgas thresh_2-thresh_1 e
+# thresh_3-thresh_2 (garante limiares crescentes) e eps
+SEARCH_NAMES = ("step_1", "step_2", "step_3", "step_4",
+                "thresh_1", "gap_2", "gap_3", "eps")
+SEARCH_BOUNDS = np.array([
+    [-5.0, -1.5], [-5.0, -1.5], [-5.0, -1.5], [-5.0, -1.5],
+    [-1.5, 1.0], [-1.5, 1.5], [-1.5, 1.5], [-6.0, -0.5],
+])
+
+FAIL_PENALTY = 2.0
+ERROR_WEIGHT = 1.0
+TRAVEL_WEIGHT = 0.1
+
+_WORKER = {}
+
+
+# ==============================================================================
+# CODIFICAÇÃO
+# ==============================================================================
+def decode(x):
+    """(P, 8) em log10 -> dict de arrays (P,) dos parâmetros da lei."""
+    v = 10.0 ** np.atleast_2d(x)
+    t1 = v[:, 4]
+    t2 = t1 + v[:, 5]
+    return {
+        "step_1": v[:, 0], "step_2": v[:, 1], "step_3": v[:, 2], "step_4": v[:, 3],
+        "thresh_1": t1, "thresh_2": t2, "thresh_3": t2 + v[:, 6], "eps": v[:, 7],
+    }
+
+
+def encode(params):
+    """dict de parâmetros (escalares) -> vetor (8,) em log10."""
+    p = {k: float(params[k]) for k in STEP_PARAMS}
+    gaps = (p["thresh_2"] - p["thresh_1"], p["thresh_3"] - p["thresh_2"])
+    values = [p["step_1"], p["step_2"], p["step_3"], p["step_4"],
+              p["thresh_1"], gaps[0], gaps[1], p["eps"]]
+    return np.log10(np.maximum(values, 1e-12))
+
+
+# ==============================================================================
+# AVALIAÇÃO (processos)
+# ==============================================================================
+def _init_worker(table, scenarios, duration, lock_fixed):
+    _WORKER["sim"] = TrackerSurrogate(luminance_model=table, lock_fixed=lock_fixed)
+    _WORKER["scenarios"] = scenarios
+    _WORKER["duration"] = duration
+
+
+def _evaluate_block(x):
+    """Avalia (P, 8) candidatos em todos os cenários numa chamada vetorizada."""
+    sim = _WORKER["sim"]
+    scenarios = _WORKER["scenarios"]
+    duration = _WORKER["duration"]
+    n_cand, n_scen = len(x), len(scenarios)
+
+    params = {k: np.repeat(v, n_scen) for k, v in decode(x).items()}
+    sun = np.tile(scenarios, (n_cand, 1))
+    result = sim.run(params, sun, duration=duration)
+
+    shape = (n_cand, n_scen)
+    t_lock = np.minimum(result["time_to_lock"], FAIL_PENALTY * duration).reshape(shape)
+    return {
+        "time_to_lock": t_lock.mean(axis=1),
+        "lock_rate": np.isfinite(result["time_to_lock"]).reshape(shape).mean(axis=1),
+        "rms_error_deg": result["rms_error_deg"].reshape(shape).mean(axis=1),
+        "travel": result["travel"].sum(axis=1).reshape(shape).mean(axis=1),
+    }
+
+
+class Evaluator:
+    """Reparte blocos de candidatos entre processos e acumula o histórico."""
+
+    def __init__(self, scenarios, duration, workers, lock_fixed=False,
+                 error_weight=ERROR_WEIGHT, travel_weight=TRAVEL_WEIGHT):
+        self.duration = duration
+        self.workers = max(1, workers)
+        self.error_weight = error_weight
+        self.travel_weight = travel_weight
+        self.history_x = []
+        self.history = []
+        init_args = (default_luminance_table(), scenarios, duration, lock_fixed)
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=init_args)
+        else:
+            self.pool = None
+            _init_worker(*init_args)
+
+    def score(self, metrics):
+        return (metrics["time_to_lock"] / self.duration
+                + self.error_weight * metrics["rms_error_deg"]
+                + self.travel_weight * metrics["travel"])
+
+    def __call__(self, x):
+        x = np.atleast_2d(x)
+        blocks = np.array_split(x, min(self.workers, len(x)))
+        if self.pool is None:
+            parts = [_evaluate_block(b) for b in blocks]
+        else:
+            parts = list(self.pool.map(_evaluate_block, blocks))
+        metrics = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+        metrics["score"] = self.score(metrics)
+        self.history_x.append(x)
+        self.history.append(metrics)
+        return metrics["score"]
+
+    def results(self):
+        x = np.concatenate(self.history_x)
+        metrics = {k: np.concatenate([h[k] for h in self.history]) for k in self.history[0]}
+        return x, metrics
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+# ==============================================================================
+# BUSCAS
+# ==============================================================================
+def grid_search(evaluate, levels, chunk=256):
+    axes = [np.linspace(lo, hi, levels) for lo, hi in SEARCH_BOUNDS]
+    points = itertools.product(*axes)
+    total = levels ** len(SEARCH_BOUNDS)
+    done = 0
+    while True:
+        block = np.array(list(itertools.islice(points, chunk)))
+        if len(block) == 0:
+            break
+        evaluate(block)
+        done += len(block)
+        print(f"   grade: {done}/{total}")
+
+
+def random_search(evaluate, samples, seed=0, chunk=256):
+    rng = np.random.default_rng(seed)
+    lo, hi = SEARCH_BOUNDS[:, 0], SEARCH_BOUNDS[:, 1]
+    x = rng.uniform(lo, hi, (samples, len(lo)))
+    for start in range(0, samples, chunk):
+        evaluate(x[start:start + chunk])
+        print(f"   aleatória: {min(start + chunk, samples)}/{samples}")
+
+
+def cmaes_search(evaluate, generations, popsize=None, sigma=0.3, seed=0, start=None):
+    """
+    CMA-ES (mu/mu_w, lambda) com adaptação do passo por caminho de evolução,
+    partindo da tabela start (padrão: a default). sigma é relativo à largura
+    dos limites.
+    Amostras fora dos limites são projetadas neles antes de avaliar.
+    """
+    rng = np.random.default_rng(seed)
+    lo, hi = SEARCH_BOUNDS[:, 0], SEARCH_BOUNDS[:, 1]
+    width = hi - lo
+    n = len(lo)
+    lam = popsize or 4 + int(3 * np.log(n))
+    mu = lam // 2
+    w = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    w /= w.sum()
+    mu_eff = 1.0 / np.sum(w ** 2)
+
+    c_sigma = (mu_eff + 2) / (n + mu_eff + 5)
+    d_sigma = 1 + 2 * max(0.0, np.sqrt((mu_eff - 1) / (n + 1)) - 1) + c_sigma
+    c_c = (4 + mu_eff / n) / (n + 4 + 2 * mu_eff / n)
+    c_1 = 2 / ((n + 1.3) ** 2 + mu_eff)
+    c_mu = min(1 - c_1, 2 * (mu_eff - 2 + 1 / mu_eff) / ((n + 2) ** 2 + mu_eff))
+    chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+    # Busca em coordenadas normalizadas (limites -> [0, 1])
+    mean = (np.clip(encode(start or DEFAULT_STEP_PARAMS), lo, hi) - lo) / width
+    cov = np.eye(n)
+    p_sigma = np.zeros(n)
+    p_c = np.zeros(n)
+
+    for gen in range(generations):
+        eigval, eigvec = np.linalg.eigh(cov)
+        eigval = np.maximum(eigval, 1e-20)
+        sqrt_cov = eigvec * np.sqrt(eigval)
+        inv_sqrt = eigvec @ np.diag(1 / np.sqrt(eigval)) @ eigvec.T
+
+        z = rng.standard_normal((lam, n))
+        y = z @ sqrt_cov.T
+        u = np.clip(mean + sigma * y, 0.0, 1.0)
+        y = (u - mean) / sigma
+        scores = evaluate(lo + u * width)
+
+        order = np.argsort(scores)
+        y_w = w @ y[order[:mu]]
+        mean = mean + sigma * y_w
+
+        p_sigma = (1 - c_sigma) * p_sigma + np.sqrt(c_sigma * (2 - c_sigma) * mu_eff) * (inv_sqrt @ y_w)
+        h_sigma = (np.linalg.norm(p_sigma) / np.sqrt(1 - (1 - c_sigma) ** (2 * (gen + 1)))
+                   < (1.4 + 2 / (n + 1)) * chi_n)
+        p_c = (1 - c_c) * p_c + h_sigma * np.sqrt(c_c * (2 - c_c) * mu_eff) * y_w
+        rank_mu = (y[order[:mu]].T * w) @ y[order[:mu]]
+        cov = ((1 - c_1 - c_mu) * cov + c_1 * (np.outer(p_c, p_c)
+               + (1 - h_sigma) * c_c * (2 - c_c) * cov) + c_mu * rank_mu)
+        sigma *= np.exp((c_sigma / d_sigma) * (np.linalg.norm(p_sigma) / chi_n - 1))
+
+        print(f"   CMA-ES geração {gen + 1}/{generations}: melhor {scores[order[0]]:.4f}, "
+              f"sigma {sigma:.3f}")
+
+
+# ==============================================================================
+# SAÍDA
+# ==============================================================================
+def params_at(x, i):
+    return {k: float(v[i]) for k, v in decode(x).items()}
+
+
+def write_csv(path, x, metrics):
+    decoded = decode(x)
+    columns = list(STEP_PARAMS) + ["score", "time_to_lock", "lock_rate", "rms_error_deg", "travel"]
+    table = np.column_stack([decoded[k] for k in STEP_PARAMS]
+                            + [metrics[k] for k in columns[len(STEP_PARAMS):]])
+    np.savetxt(path, table, delimiter=",", header=",".join(columns), comments="", fmt="%.6g")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste da tabela de passos do rastreador")
+    parser.add_argument("--method", choices=["grid", "random", "cmaes"], default="cmaes")
+    parser.add_argument("--levels", type=int, default=2, help="Níveis por parâmetro (grade)")
+    parser.add_argument("--samples", type=int, default=256, help="Amostras (aleatória)")
+    parser.add_argument("--generations", type=int, default=15, help="Gerações (CMA-ES)")
+    parser.add_argument("--popsize", type=int, default=None, help="População (CMA-ES)")
+    parser.add_argument("--scenarios", type=int, default=16, help="Sóis por candidato")
+    parser.add_argument("--duration", type=float, default=60.0, help="Tempo simulado (s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos")
+    parser.add_argument("--error-weight", type=float, default=ERROR_WEIGHT,
+                        help="Peso do erro RMS em regime (por grau)")
+    parser.add_argument("--travel-weight", type=float, default=TRAVEL_WEIGHT,
+                        help="Peso do curso das juntas (por rad)")
+    parser.add_argument("--lock-fixed", action="store_true",
+                        help="Congela as juntas declaradas fixed no SDF")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="Grava todas as avaliações neste CSV")
+    parser.add_argument("--output", default=CONFIG_FILE, help="Arquivo de configuração")
+    parser.add_argument("--no-save", action="store_true", help="Não grava a configuração")
+    args = parser.parse_args()
+
+    print("🔧 Ajuste da tabela de passos (simulador substituto)")
+    print(f"   método={args.method}  cenários={args.scenarios}  duração={args.duration:g} s  "
+          f"processos={args.workers}")
+    t0 = time.perf_counter()
+    scenarios = random_scenarios(args.scenarios, seed=args.seed)
+    evaluate = Evaluator(scenarios, args.duration, args.workers, lock_fixed=args.lock_fixed,
+                         error_weight=args.error_weight, travel_weight=args.travel_weight)
+    # Referência: a tabela já gravada em --output (senão a default), para não
+    # sobrescrever uma configuração melhor que a default
+    current = {**DEFAULT_STEP_PARAMS, **load_step_params(args.output)}
+    try:
+        baseline = evaluate(encode(current))[0]
+        print(f"   tabela atual: score {baseline:.4f}")
+        if args.method == "grid":
+            grid_search(evaluate, args.levels)
+        elif args.method == "random":
+            random_search(evaluate, args.samples, seed=args.seed)
+        else:
+            cmaes_search(evaluate, args.generations, args.popsize, seed=args.seed, start=current)
+    finally:
+        evaluate.close()
+
+    x, metrics = evaluate.results()
+    wall = time.perf_counter() - t0
+    simulated = len(x) * args.scenarios * args.duration
+    print(f"\n📦 {len(x)} candidatos em {wall:.1f} s ({simulated / wall:,.0f} s simulados por segundo)")
+
+    order = np.argsort(metrics["score"])
+    print("\n🏆 Melhores conjuntos:")
+    print(f"   {'score':>8} {'t_lock':>7} {'trava':>6} {'erro°':>7} {'curso':>6}  parâmetros")
+    for i in order[:5]:
+        p = params_at(x, i)
+        body = " ".join(f"{k}={v:.3g}" for k, v in p.items())
+        print(f"   {metrics['score'][i]:8.4f} {metrics['time_to_lock'][i]:7.2f} "
+              f"{metrics['lock_rate'][i]:6.0%} {metrics['rms_error_deg'][i]:7.3f} "
+              f"{metrics['travel'][i]:6.2f}  {body}")
+
+    if args.csv:
+        write_csv(args.csv, x, metrics)
+        print(f"\n💾 Avaliações: {args.csv}")
+
+    best = order[0]
+    if args.no_save:
+        return
+    if metrics["score"][best] >= baseline:
+        print("\n⚠️  Nenhum candidato superou a tabela atual; configuração não gravada")
+        return
+    objectives = {k: float(metrics[k][best])
+                  for k in ("score", "time_to_lock", "lock_rate", "rms_error_deg", "travel")}
+    path = save_step_params(
+        params_at(x, best), args.output,
+        objectives=objectives,
+        baseline_score=float(baseline),
+        search={"method": args.method, "candidates": int(len(x)),
+                "scenarios": args.scenarios, "duration": args.duration, "seed": args.seed,
+                "error_weight": args.error_weight, "travel_weight": args.travel_weight},
+    )
+    print(f"\n💾 Configuração gravada: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Camada de atualização da interface: as threads de dados (callbacks do
+transporte, timer de controle) só gravam o último valor de cada item e um
+único QTimer de exibição aplica, na taxa de tela, apenas o que mudou.
+
+Evita o repintar na taxa das mensagens (sinais Qt por quadro de câmera,
+setText a cada stats de 1 kHz...), que ocupa a thread do Qt e atrasa o
+tratamento das próprias mensagens.
+
+A gravação é uma atribuição em dict (atômica no CPython), sem trava: um
+valor intermediário pode ser sobrescrito antes de aparecer, o que é o
+comportamento desejado para um painel.
+
+Uso:
+    self.ui = UIModel(parent=self)
+    self.ui.bind("math", self.update_math_ui)       # callback(valor) na thread do Qt
+
+    # de qualquer thread:
+    self.ui.set_text(self.lbl_time, f"Sim Time: {t:.3f} s")
+    self.ui.set("math", dot)
+"""
+
+from PyQt5.QtCore import QTimer
+
+# Taxa de atualização dos rótulos, barras e imagens (Hz)
+DISPLAY_RATE_HZ = 30.0
+
+_MISSING = object()
+
+
+class UIModel:
+    """
+    Instantâneo dos últimos valores + QTimer que os aplica quando mudam.
+
+    Chaves:
+        (widget, "método"): aplica widget.método(valor) (set_text, set_value...)
+        nome ligado com bind(): chama callback(valor)
+    """
+
+    def __init__(self, rate_hz=DISPLAY_RATE_HZ, parent=None):
+        self.latest = {}
+        self.shown = {}
+        self.callbacks = {}
+        self.refreshes = 0
+        self.timer = QTimer(parent)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(max(1, int(1000.0 / rate_hz)))
+
+    def bind(self, key, callback):
+        self.callbacks[key] = callback
+
+    def set(self, key, value):
+        self.latest[key] = value
+
+    def set_text(self, widget, text):
+        self.latest[(widget, "setText")] = text
+
+    def set_value(self, widget, value):
+        self.latest[(widget, "setValue")] = value
+
+    def set_format(self, widget, text):
+        self.latest[(widget, "setFormat")] = text
+
+    def refresh(self):
+        """Aplica os valores que mudaram desde a última exibição (thread do Qt)."""
+        self.refreshes += 1
+        for key, value in dict(self.latest).items():
+            if self.shown.get(key, _MISSING) == value:
+                continue
+            self.shown[key] = value
+            callback = self.callbacks.get(key)
+            if callback is not None:
+                callback(value)
+            else:
+                widget, method = key
+                getattr(widget, method)(value)
+
+    def forget(self, key):
+        """Força a reaplicação de key no próximo refresh."""
+        self.shown.pop(key, None)
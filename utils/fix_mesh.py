@@ -1,61 +1,42 @@
 #!/usr/bin/env python3
 """
-Blender script to clean and repair the Espelho.dae mesh
-This script removes degenerate faces and exports to STL format
+Limpa e repara a malha Espelho.dae (sem Blender)
+Une vértices próximos, remove faces degeneradas/duplicadas, torna as
+normais consistentes (para fora) e exporta em STL
+
+Uso (a partir da raiz do projeto):
+    python3 utils/fix_mesh.py [entrada] [saida]
 """
-import bpy
 import sys
 
-# Clear all existing objects
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
+from mesh_io import load_mesh, write_mesh
+from mesh_simplify import clean_mesh, orient_faces
 
-# Import the DAE file
-input_file = "/home/lhmt-jhoni/Gazebo/robotSim2/formas/Espelho.dae"
-output_file = "/home/lhmt-jhoni/Gazebo/robotSim2/formas/Espelho_fixed.stl"
+input_file = sys.argv[1] if len(sys.argv) > 1 else "formas/Espelho.dae"
+output_file = sys.argv[2] if len(sys.argv) > 2 else "formas/Espelho_fixed.stl"
 
 print(f"Importing {input_file}...")
-bpy.ops.wm.collada_import(filepath=input_file)
-
-# Select all imported objects
-bpy.ops.object.select_all(action='SELECT')
-
-# Join all objects into one
-if len(bpy.context.selected_objects) > 1:
-    bpy.ops.object.join()
-
-# Get the active object
-obj = bpy.context.active_object
-
-if obj and obj.type == 'MESH':
-    # Enter edit mode
-    bpy.ops.object.mode_set(mode='EDIT')
-    
-    # Select all
-    bpy.ops.mesh.select_all(action='SELECT')
-    
-    # Remove doubles (merge vertices that are very close)
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
-    
-    # Delete degenerate faces
-    bpy.ops.mesh.delete_loose()
-    
-    # Recalculate normals
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    
-    # Return to object mode
-    bpy.ops.object.mode_set(mode='OBJECT')
-    
-    # Export as STL
-    print(f"Exporting to {output_file}...")
-    bpy.ops.export_mesh.stl(
-        filepath=output_file,
-        use_selection=False,
-        global_scale=1.0,
-        use_mesh_modifiers=True
-    )
-    
-    print("Mesh cleaned and exported successfully!")
-else:
-    print("ERROR: No mesh object found!")
+try:
+    vertices, faces = load_mesh(input_file)
+except (OSError, ValueError) as e:
+    print(f"ERROR: {e}")
+    sys.exit(1)
+
+print(f"Original mesh: {len(vertices)} vertices, {len(faces)} faces")
+
+# Merge vertices that are very close + delete degenerate/duplicate faces
+vertices, faces = clean_mesh(vertices, faces, tolerance=0.0001)
+
+if len(faces) == 0:
+    print(f"ERROR: {input_file} has no faces (empty file or Git LFS pointer?)")
     sys.exit(1)
+
+print(f"Cleaned mesh: {len(vertices)} vertices, {len(faces)} faces")
+
+# Recalculate normals (consistent, pointing outside)
+faces = orient_faces(vertices, faces)
+
+print(f"Exporting to {output_file}...")
+write_mesh(output_file, vertices, faces, name="Espelho")
+
+print("Mesh cleaned and exported successfully!")
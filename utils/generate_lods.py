@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Gera a família de níveis de detalhe (LOD) das malhas do SDF e reescreve
+as referências de <visual> / <collision>.
+
+Para cada malha referenciada em um <visual> do SDF:
+- full:       malha original (inalterada)
+- reduced:    <nome>_lod1.<ext>, decimada com mesh_simplify
+- collision:  <nome>_hull.stl (fecho convexo) ou caixa ajustada à malha
+
+Os <visual> passam a apontar para o nível escolhido (--level) e, se
+pedido (--collision hull|box), o <collision> do mesmo link é trocado
+pelo proxy. Links sem <collision> (ex.: prato e costelas) continuam sem.
+A edição é textual, preservando comentários e formatação do SDF.
+
+Uso (a partir da raiz do projeto):
+    python3 utils/generate_lods.py
+    python3 utils/generate_lods.py --ratio 0.1 --collision hull
+    python3 utils/generate_lods.py --level full      # volta às malhas originais
+"""
+
+import argparse
+import os
+import re
+
+import numpy as np
+
+from mesh_io import (load_mesh, read_node_matrix, read_up_axis, transform_points,
+                     write_stl)
+from mesh_simplify import clean_mesh, decimate, simplify_file
+
+try:
+    from scipy.spatial import ConvexHull
+except ImportError:
+    ConvexHull = None
+
+SDF_FILE = "01_three_link_with_tracker_plate.sdf"
+# Fração de triângulos mantida no nível reduzido
+LOD_RATIO = 0.2
+# Malhas menores que isso não ganham nível reduzido (ex.: lens_mask.obj)
+LOD_MIN_FACES = 5000
+
+LOD_SUFFIX = "_lod1"
+HULL_SUFFIX = "_hull"
+
+VISUAL_RE = re.compile(r'<visual\b[^>]*>.*?</visual>', re.S)
+COLLISION_RE = re.compile(r'<collision\b[^>]*>.*?</collision>', re.S)
+LINK_RE = re.compile(r'<link\b[^>]*>.*?</link>', re.S)
+MESH_URI_RE = re.compile(r'<uri>\s*file://([^<\s]+)\s*</uri>')
+SCALE_RE = re.compile(r'<scale>([^<]+)</scale>')
+POSE_RE = re.compile(r'<pose>([^<]+)</pose>')
+GEOMETRY_RE = re.compile(r'<geometry>.*?</geometry>', re.S)
+
+
+def is_lfs_pointer(path):
+    """Arquivo ainda não baixado do Git LFS (só o ponteiro de texto)."""
+    with open(path, 'rb') as f:
+        return f.read(40).startswith(b"version https://git-lfs")
+
+
+def base_mesh_path(path):
+    """Caminho da malha original para qualquer nível (remove sufixos de LOD)."""
+    stem, ext = os.path.splitext(path)
+    for suffix in (LOD_SUFFIX, HULL_SUFFIX):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            if suffix == HULL_SUFFIX:
+                return None
+    return stem + ext
+
+
+def lod_path(path):
+    stem, ext = os.path.splitext(path)
+    return stem + LOD_SUFFIX + ext
+
+
+def hull_path(path):
+    return os.path.splitext(path)[0] + HULL_SUFFIX + ".stl"
+
+
+def is_stale(target, source):
+    return not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(source)
+
+
+def scene_points(path):
+    """
+    Vértices no referencial em que o Gazebo posiciona a malha (aplica a
+    matriz do nó e a conversão Y_UP -> Z_UP em DAE).
+    """
+    vertices, faces = load_mesh(path)
+    if path.lower().endswith('.dae'):
+        vertices = transform_points(vertices, read_node_matrix(path))
+        if read_up_axis(path) == 'Y_UP':
+            vertices = vertices[:, [0, 2, 1]] * [1.0, -1.0, 1.0]
+    return vertices, faces
+
+
+def convex_hull(points):
+    """Fecho convexo (vertices, faces) com normais para fora."""
+    hull = ConvexHull(points)
+    used, inverse = np.unique(hull.simplices, return_inverse=True)
+    vertices = points[used]
+    faces = inverse.reshape(-1, 3)
+    tris = vertices[faces]
+    n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    inward = np.sum(n * (tris.mean(axis=1) - vertices.mean(axis=0)), axis=1) < 0
+    faces[inward] = faces[inward][:, ::-1]
+    return vertices, faces
+
+
+def rpy_matrix(roll, pitch, yaw):
+    """Rotação R = Rz(yaw) Ry(pitch) Rx(roll), convenção do SDF."""
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    return np.array([
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ])
+
+
+def fmt(values):
+    return " ".join(f"{v:.6g}" for v in values)
+
+
+# ==============================================================================
+# GERAÇÃO DOS ARQUIVOS
+# ==============================================================================
+def build_lods(mesh_path, ratio, collision, dry_run=False):
+    """
+    Gera os arquivos da família de LOD de uma malha. Com dry_run, calcula
+    e reporta o nível reduzido e o fecho sem gravar nenhum arquivo.
+
+    Returns:
+        dict com 'reduced' (caminho ou None), 'hull' (caminho ou None) e
+        'box' ((centro, tamanho) no referencial da malha ou None)
+    """
+    result = {"reduced": None, "hull": None, "box": None}
+
+    vertices, faces = load_mesh(mesh_path)
+    n_faces = len(faces)
+
+    if n_faces >= LOD_MIN_FACES:
+        target = lod_path(mesh_path)
+        if dry_run:
+            _, reduced, _ = decimate(*clean_mesh(vertices, faces), ratio=ratio)
+            print(f"  🔧 (dry-run) {os.path.basename(target)}: {n_faces:,} -> {len(reduced):,} triângulos")
+        elif is_stale(target, mesh_path):
+            print(f"  🔧 {os.path.basename(target)} ({ratio * 100:.0f}% de {n_faces:,} triângulos)")
+            simplify_file(mesh_path, target, ratio, verbose=False)
+        result["reduced"] = target
+    else:
+        print(f"  ⏭️  {os.path.basename(mesh_path)}: {n_faces:,} triângulos, mantém apenas full")
+
+    if collision == "keep":
+        return result
+
+    points, _ = scene_points(mesh_path)
+    flat = np.linalg.matrix_rank(points - points.mean(axis=0), tol=1e-9) < 3
+    if collision == "box" or ConvexHull is None or flat:
+        if collision == "hull" and ConvexHull is None:
+            print("  ⚠️  scipy não instalado: usando caixa no lugar do fecho convexo")
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        result["box"] = (0.5 * (lo + hi), np.maximum(hi - lo, 1e-3))
+    else:
+        target = hull_path(mesh_path)
+        if dry_run or is_stale(target, mesh_path):
+            hv, hf = convex_hull(clean_mesh(points, faces)[0])
+            if not dry_run:
+                write_stl(target, hv, hf, name=os.path.basename(target))
+            print(f"  🧱 {'(dry-run) ' if dry_run else ''}{os.path.basename(target)} ({len(hf)} triângulos)")
+        result["hull"] = target
+    return result
+
+
+# ==============================================================================
+# REESCRITA DO SDF
+# ==============================================================================
+def rewrite_link(link, lods, level, collision):
+    """Reescreve os <visual>/<collision> de um bloco <link>. Retorna (texto, mudanças)."""
+    changes = []
+    mesh_visuals = []
+
+    def visual_sub(match):
+        block = match.group(0)
+        uri = MESH_URI_RE.search(block)
+        if not uri:
+            return block
+        base = base_mesh_path(uri.group(1))
+        if base is None or base not in lods:
+            return block
+        info = lods[base]
+        mesh_visuals.append((block, base))
+        wanted = info["reduced"] if level == "reduced" and info["reduced"] else base
+        if uri.group(1) == wanted:
+            return block
+        changes.append(f"visual {os.path.basename(uri.group(1))} → {os.path.basename(wanted)}")
+        return block.replace(uri.group(0), f"<uri>file://{wanted}</uri>")
+
+    link = VISUAL_RE.sub(visual_sub, link)
+
+    # Proxy de colisão só quando o link tem exatamente uma malha visual e um <collision>
+    collisions = COLLISION_RE.findall(link)
+    if collision == "keep" or len(mesh_visuals) != 1 or len(collisions) != 1:
+        return link, changes
+
+    visual, base = mesh_visuals[0]
+    info = lods[base]
+    scale = np.array([float(v) for v in SCALE_RE.search(visual).group(1).split()]) \
+        if SCALE_RE.search(visual) else np.ones(3)
+    pose = np.array([float(v) for v in POSE_RE.search(visual).group(1).split()]) \
+        if POSE_RE.search(visual) else np.zeros(6)
+
+    if info["hull"]:
+        geometry = (f"<geometry>\n            <mesh>\n"
+                    f"              <uri>file://{info['hull']}</uri>\n"
+                    f"              <scale>{fmt(scale)}</scale>\n"
+                    f"            </mesh>\n          </geometry>")
+        new_pose = pose
+        label = os.path.basename(info["hull"])
+    elif info["box"]:
+        center, size = info["box"]
+        geometry = f"<geometry>\n            <box><size>{fmt(size * np.abs(scale))}</size></box>\n          </geometry>"
+        new_pose = pose.copy()
+        new_pose[:3] += rpy_matrix(*pose[3:]) @ (center * scale)
+        label = f"caixa {fmt(size * np.abs(scale))}"
+    else:
+        return link, changes
+
+    old = collisions[0]
+    new = GEOMETRY_RE.sub(lambda m: geometry, old, count=1)
+    if POSE_RE.search(new):
+        new = POSE_RE.sub(lambda m: f"<pose>{fmt(new_pose)}</pose>", new, count=1)
+    else:
+        new = re.sub(r'(<collision\b[^>]*>)', lambda m: f"{m.group(1)}\n          <pose>{fmt(new_pose)}</pose>",
+                     new, count=1)
+    if new != old:
+        link = link.replace(old, new)
+        changes.append(f"collision → {label}")
+    return link, changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera LODs das malhas e atualiza o SDF")
+    parser.add_argument("--sdf", default=SDF_FILE, help="Arquivo SDF")
+    parser.add_argument("--ratio", type=float, default=LOD_RATIO,
+                        help="Fração de triângulos do nível reduzido")
+    parser.add_argument("--level", choices=["reduced", "full"], default="reduced",
+                        help="Nível usado nos <visual>")
+    parser.add_argument("--collision", choices=["keep", "hull", "box"], default="keep",
+                        help="Proxy de colisão (keep mantém os <collision> atuais)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Só calcula e reporta: não grava malhas nem o SDF")
+    args = parser.parse_args()
+
+    print("🔧 Gerando LODs das malhas do SDF...")
+    print(f"📄 Arquivo: {args.sdf}")
+
+    with open(args.sdf, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # O Gazebo resolve file:// em relação ao diretório de execução (raiz do projeto)
+    root = os.getcwd()
+    lods = {}
+    for visual in VISUAL_RE.findall(content):
+        uri = MESH_URI_RE.search(visual)
+        if not uri:
+            continue
+        base = base_mesh_path(uri.group(1))
+        if base is None or base in lods:
+            continue
+        path = os.path.join(root, base)
+        print(f"\n📦 {base}")
+        if not os.path.exists(path):
+            print("  ❌ Arquivo não encontrado")
+            continue
+        if is_lfs_pointer(path):
+            print("  ⚠️  Ponteiro Git LFS (rode 'git lfs pull'); ignorado")
+            continue
+        info = build_lods(path, args.ratio, args.collision, args.dry_run)
+        # Caminhos relativos à raiz, como no SDF
+        for key in ("reduced", "hull"):
+            if info[key]:
+                info[key] = os.path.relpath(info[key], root)
+        lods[base] = info
+
+    total = []
+
+    def link_sub(match):
+        text, changes = rewrite_link(match.group(0), lods, args.level, args.collision)
+        name = re.search(r'name="([^"]+)"', match.group(0)).group(1)
+        total.extend(f"{name}: {c}" for c in changes)
+        return text
+
+    content = LINK_RE.sub(link_sub, content)
+
+    print()
+    for change in total:
+        print(f"  ✅ {change}")
+
+    if args.dry_run:
+        print(f"\n(dry-run) {len(total)} alteração(ões) não gravada(s)")
+        return
+    with open(args.sdf, 'w', encoding='utf-8') as f:
+        f.write(content)
+    print(f"\n✅ Total de alterações: {len(total)}")
+    print(f"💾 Arquivo atualizado: {args.sdf}")
+
+
+if __name__ == "__main__":
+    main()
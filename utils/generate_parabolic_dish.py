@@ -1,191 +1,364 @@
 #!/usr/bin/env python3
 """
 Gerador de Prato Parabólico para Gazebo
-Especificações:
+Especificações (padrão):
 - Diâmetro: 3 m
 - Distância focal: 1.8 m
 - Área de cada segmento: < 4 cm²
 - Orientação: côncava para cima (+Z)
 - Espessura: 1 cm
+
+A malha (vértices, índices de faces e normais) é montada com broadcasting
+NumPy e gravada em STL binário (ou OBJ) com uma única escrita de buffer.
+
+Modos de malha:
+- uniforme (padrão): divisões radiais e angulares constantes
+- adaptativo (--adaptive): espaçamento definido pela tolerância de flecha
+  (sag) em função da curvatura local, limitado pela área máxima de faceta;
+  o número de divisões angulares varia de anel para anel.
+
+Nos dois modos é reportado o desvio geométrico máximo entre as facetas e
+o paraboloide analítico.
+
+Uso:
+    python3 utils/generate_parabolic_dish.py
+    python3 utils/generate_parabolic_dish.py --diameter 3.0 --focal-length 1.8 \\
+        --thickness 0.01 --max-area 4e-4 --output formas/parabolic_dish.stl
+    python3 utils/generate_parabolic_dish.py --adaptive --tolerance 1e-4
 """
 
-import numpy as np
+import argparse
 import math
+import sys
+
+import numpy as np
+
+from mesh_io import face_normals, write_mesh
 
 # ============================================================================
-# PARÂMETROS DO PRATO PARABÓLICO
+# PARÂMETROS DO PRATO PARABÓLICO (padrões)
 # ============================================================================
 DIAMETER = 3.0          # metros
 FOCAL_LENGTH = 1.8      # metros
 MAX_SEGMENT_AREA = 4e-4 # 4 cm² em m²
 THICKNESS = 0.01        # 1 cm em metros
+SAG_TOLERANCE = 1e-4    # 0.1 mm (modo adaptativo)
+MAX_REFINE_PASSES = 200 # limite de refinamentos do modo adaptativo
 OUTPUT_FILE = "formas/parabolic_dish.stl"
 
-# ============================================================================
-# CÁLCULO DO NÚMERO DE SEGMENTOS
-# ============================================================================
-radius = DIAMETER / 2.0
-
-# Para um paraboloide, a = 1/(4*f) onde f é a distância focal
-a = 1.0 / (4.0 * FOCAL_LENGTH)
-
-# Profundidade do prato no raio máximo: z = a * r²
-depth = a * radius**2
-
-print(f"=== Especificações do Prato Parabólico ===")
-print(f"Diâmetro: {DIAMETER} m")
-print(f"Raio: {radius} m")
-print(f"Distância focal: {FOCAL_LENGTH} m")
-print(f"Profundidade: {depth:.4f} m")
-print(f"Espessura: {THICKNESS} m")
-print(f"Coeficiente parabólico (a): {a:.6f}")
-
-# Estimar número de segmentos necessários
-# Área aproximada de cada segmento triangular em uma malha circular
-# Área total da superfície ≈ π * r²
-surface_area = math.pi * radius**2
-min_segments = int(surface_area / MAX_SEGMENT_AREA)
-
-# Para uma malha circular, usamos segmentos radiais e angulares
-# Número de divisões angulares (theta)
-n_theta = int(math.sqrt(min_segments * 2))
-# Número de divisões radiais
-n_radial = int(min_segments / n_theta)
-
-# Ajustar para garantir que a área seja menor que o máximo
-n_theta = max(n_theta, 50)
-n_radial = max(n_radial, 30)
-
-print(f"\n=== Malha ===")
-print(f"Segmentos angulares: {n_theta}")
-print(f"Segmentos radiais: {n_radial}")
-print(f"Total de faces (aproximado): {n_theta * n_radial * 2}")
 
-# ============================================================================
-# GERAÇÃO DA GEOMETRIA
-# ============================================================================
+def uniform_mesh_size(diameter, focal_length, max_segment_area):
+    """
+    Número de divisões (n_radial, n_theta) para a malha uniforme.
 
-def parabola_z(r):
-    """Calcula a altura Z para um dado raio r"""
-    return a * r**2
-
-# Listas para armazenar vértices e faces
-vertices = []
-faces = []
-
-# Gerar superfície superior (côncava para cima)
-print("\nGerando superfície superior...")
-for i in range(n_radial + 1):
-    r = (i / n_radial) * radius
-    z = parabola_z(r)
-    
-    for j in range(n_theta):
-        theta = (j / n_theta) * 2 * math.pi
-        x = r * math.cos(theta)
-        y = r * math.sin(theta)
-        vertices.append([x, y, z])
-
-# Gerar superfície inferior (offset pela espessura)
-print("Gerando superfície inferior...")
-for i in range(n_radial + 1):
-    r = (i / n_radial) * radius
-    z = parabola_z(r) - THICKNESS
-    
-    for j in range(n_theta):
-        theta = (j / n_theta) * 2 * math.pi
-        x = r * math.cos(theta)
-        y = r * math.sin(theta)
-        vertices.append([x, y, z])
-
-n_vertices_per_surface = (n_radial + 1) * n_theta
-
-# Gerar faces da superfície superior
-print("Gerando faces da superfície superior...")
-for i in range(n_radial):
-    for j in range(n_theta):
-        # Índices dos vértices
-        v1 = i * n_theta + j
-        v2 = i * n_theta + (j + 1) % n_theta
-        v3 = (i + 1) * n_theta + j
-        v4 = (i + 1) * n_theta + (j + 1) % n_theta
-        
-        # Dois triângulos por quad (normal apontando para cima/fora)
-        faces.append([v1, v3, v2])
-        faces.append([v2, v3, v4])
-
-# Gerar faces da superfície inferior
-print("Gerando faces da superfície inferior...")
-for i in range(n_radial):
-    for j in range(n_theta):
-        # Índices dos vértices (offset para a superfície inferior)
-        offset = n_vertices_per_surface
-        v1 = offset + i * n_theta + j
-        v2 = offset + i * n_theta + (j + 1) % n_theta
-        v3 = offset + (i + 1) * n_theta + j
-        v4 = offset + (i + 1) * n_theta + (j + 1) % n_theta
-        
-        # Dois triângulos por quad (normal apontando para baixo/dentro)
-        faces.append([v1, v2, v3])
-        faces.append([v2, v4, v3])
-
-# Gerar faces da borda (conectando superior e inferior)
-print("Gerando faces da borda...")
-i = n_radial  # Última linha radial (borda externa)
-for j in range(n_theta):
-    # Vértices da borda superior
-    v1_top = i * n_theta + j
-    v2_top = i * n_theta + (j + 1) % n_theta
-    
-    # Vértices da borda inferior
-    v1_bot = n_vertices_per_surface + i * n_theta + j
-    v2_bot = n_vertices_per_surface + i * n_theta + (j + 1) % n_theta
-    
-    # Dois triângulos para fechar a borda
-    faces.append([v1_top, v1_bot, v2_top])
-    faces.append([v2_top, v1_bot, v2_bot])
+    Área total da superfície ≈ π * r²; a malha circular usa segmentos
+    radiais e angulares com no mínimo 30 x 50 divisões. Em seguida as
+    divisões são refinadas até que o maior triângulo (na borda, onde a
+    inclinação é máxima) fique abaixo de max_segment_area.
+    """
+    if max_segment_area <= 0:
+        raise ValueError("max_segment_area deve ser > 0")
+    radius = diameter / 2.0
+    surface_area = math.pi * radius**2
+    min_segments = int(surface_area / max_segment_area)
 
-# ============================================================================
-# EXPORTAR PARA STL (ASCII)
-# ============================================================================
-print(f"\nExportando para {OUTPUT_FILE}...")
-
-vertices = np.array(vertices)
-faces = np.array(faces)
-
-with open(OUTPUT_FILE, 'w') as f:
-    f.write(f"solid parabolic_dish\n")
-    
-    for face in faces:
-        # Calcular normal da face
-        v0 = vertices[face[0]]
-        v1 = vertices[face[1]]
-        v2 = vertices[face[2]]
-        
-        edge1 = v1 - v0
-        edge2 = v2 - v0
-        normal = np.cross(edge1, edge2)
-        
-        # Normalizar
-        norm_length = np.linalg.norm(normal)
-        if norm_length > 0:
-            normal = normal / norm_length
-        
-        # Escrever faceta
-        f.write(f"  facet normal {normal[0]:.6e} {normal[1]:.6e} {normal[2]:.6e}\n")
-        f.write(f"    outer loop\n")
-        f.write(f"      vertex {v0[0]:.6e} {v0[1]:.6e} {v0[2]:.6e}\n")
-        f.write(f"      vertex {v1[0]:.6e} {v1[1]:.6e} {v1[2]:.6e}\n")
-        f.write(f"      vertex {v2[0]:.6e} {v2[1]:.6e} {v2[2]:.6e}\n")
-        f.write(f"    endloop\n")
-        f.write(f"  endfacet\n")
-    
-    f.write(f"endsolid parabolic_dish\n")
-
-print(f"\n✅ Prato parabólico gerado com sucesso!")
-print(f"   Arquivo: {OUTPUT_FILE}")
-print(f"   Vértices: {len(vertices)}")
-print(f"   Faces: {len(faces)}")
-print(f"\nPróximos passos:")
-print(f"1. Execute este script: python3 generate_parabolic_dish.py")
-print(f"2. O arquivo STL será criado em: {OUTPUT_FILE}")
-print(f"3. Atualize o SDF para usar este arquivo")
+    n_theta = max(int(math.sqrt(min_segments * 2)), 50)
+    n_radial = max(int(min_segments / n_theta), 30)
+
+    # Maior triângulo: metade do quad da borda, corrigido pela inclinação
+    slope = math.sqrt(1.0 + (radius / (2.0 * focal_length))**2)
+    max_area = 0.5 * (radius / n_radial) * (2 * math.pi * radius / n_theta) * slope
+    factor = math.sqrt(max_area / max_segment_area)
+    if factor > 1.0:
+        n_radial = math.ceil(n_radial * factor)
+        n_theta = math.ceil(n_theta * factor)
+
+    return n_radial, n_theta
+
+
+def ring_faces(ring_start, ring_count):
+    """
+    Faces entre anéis consecutivos, com número de vértices possivelmente
+    diferente em cada anel ("zíper" angular, vetorizado para todos os pares).
+
+    Para cada par (interno, externo) os vértices são percorridos em ordem
+    de ângulo; cada passo avança um dos dois anéis e gera um triângulo.
+    Com o mesmo número de vértices nos dois anéis o resultado é o par de
+    triângulos por quad da malha uniforme.
+
+    Args:
+        ring_start: índice do 1º vértice de cada anel, shape (K,)
+        ring_count: número de vértices de cada anel, shape (K,)
+
+    Returns:
+        faces (M, 3), normal apontando para +Z
+    """
+    ring_start = np.asarray(ring_start, dtype=np.int64)
+    ring_count = np.asarray(ring_count, dtype=np.int64)
+    if len(ring_start) < 2:
+        return np.zeros((0, 3), dtype=np.int64)
+
+    s_in, n_in = ring_start[:-1], ring_count[:-1]
+    s_out, n_out = ring_start[1:], ring_count[1:]
+    n_pairs = len(n_in)
+
+    def local_index(counts):
+        owner = np.repeat(np.arange(n_pairs), counts)
+        return owner, np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    p_in, i_in = local_index(n_in)
+    p_out, j_out = local_index(n_out)
+
+    # Evento = ângulo (fração de volta) do próximo vértice de cada anel
+    ev_pair = np.concatenate([p_in, p_out])
+    ev_frac = np.concatenate([(i_in + 1) / n_in[p_in], (j_out + 1) / n_out[p_out]])
+    ev_outer = np.concatenate([np.zeros(len(p_in), bool), np.ones(len(p_out), bool)])
+
+    order = np.lexsort((ev_outer, ev_frac, ev_pair))
+    pair = ev_pair[order]
+    outer = ev_outer[order]
+
+    # Quantos passos de cada anel já foram dados dentro do par
+    pair_first = np.concatenate([[0], np.cumsum(n_in + n_out)[:-1]])
+    done_in = np.cumsum(~outer) - (~outer)
+    done_out = np.cumsum(outer) - outer
+    i = done_in - done_in[pair_first][pair]
+    j = done_out - done_out[pair_first][pair]
+
+    vi = s_in[pair] + i % n_in[pair]
+    vo = s_out[pair] + j % n_out[pair]
+    vi_next = s_in[pair] + (i + 1) % n_in[pair]
+    vo_next = s_out[pair] + (j + 1) % n_out[pair]
+
+    third = np.where(outer, vo_next, vi_next)
+    return np.stack([vi, vo, third], axis=-1)
+
+
+def build_dish_mesh(ring_radii, n_theta, focal_length, thickness):
+    """
+    Monta a malha fechada do prato (superfície superior, inferior e borda).
+
+    Args:
+        ring_radii: raios dos anéis (> 0, crescentes); o centro é um vértice único
+        n_theta: divisões angulares (escalar ou uma por anel)
+        focal_length: distância focal (z = r² / 4f)
+        thickness: espessura (superfície inferior deslocada em -Z)
+
+    Returns:
+        vertices (N, 3), faces (M, 3)
+    """
+    ring_radii = np.asarray(ring_radii, dtype=float)
+    n_rings = len(ring_radii)
+    counts = np.broadcast_to(np.asarray(n_theta, dtype=np.int64), (n_rings,))
+    a = 1.0 / (4.0 * focal_length)
+
+    ring_of = np.repeat(np.arange(n_rings), counts)
+    ring_start = 1 + np.concatenate([[0], np.cumsum(counts)[:-1]])
+    j_local = np.arange(counts.sum()) - (ring_start - 1)[ring_of]
+    theta = j_local * (2.0 * math.pi) / counts[ring_of]
+    r = ring_radii[ring_of]
+
+    top = np.concatenate([[[0.0, 0.0, 0.0]],
+                          np.stack([r * np.cos(theta), r * np.sin(theta), a * r**2], axis=-1)])
+    bottom = top - [0.0, 0.0, thickness]
+    n_surf = len(top)
+    vertices = np.vstack([top, bottom])
+
+    # Superfície superior: leque central + faixas entre anéis
+    n0 = counts[0]
+    j = np.arange(n0)
+    fan = np.stack([np.zeros(n0, dtype=np.int64), 1 + j, 1 + (j + 1) % n0], axis=-1)
+    top_faces = np.vstack([fan, ring_faces(ring_start, counts)])
+
+    # Superfície inferior: mesmas faces com orientação invertida
+    bottom_faces = top_faces[:, ::-1] + n_surf
+
+    # Borda externa ligando as duas superfícies
+    n_rim = counts[-1]
+    j = np.arange(n_rim)
+    v1_top = ring_start[-1] + j
+    v2_top = ring_start[-1] + (j + 1) % n_rim
+    v1_bot = v1_top + n_surf
+    v2_bot = v2_top + n_surf
+    rim = np.concatenate([
+        np.stack([v1_top, v1_bot, v2_top], axis=-1),
+        np.stack([v2_top, v1_bot, v2_bot], axis=-1),
+    ])
+
+    faces = np.vstack([top_faces, bottom_faces, rim]).astype(np.int64)
+    return vertices, faces, len(top_faces)
+
+
+def generate_dish(diameter=DIAMETER, focal_length=FOCAL_LENGTH,
+                  thickness=THICKNESS, max_segment_area=MAX_SEGMENT_AREA):
+    """
+    Prato com malha uniforme em r e θ.
+
+    Returns:
+        vertices, faces, n_top (as n_top primeiras faces são a superfície refletora)
+    """
+    n_radial, n_theta = uniform_mesh_size(diameter, focal_length, max_segment_area)
+    radius = diameter / 2.0
+    ring_radii = np.arange(1, n_radial + 1) * (radius / n_radial)
+    return build_dish_mesh(ring_radii, n_theta, focal_length, thickness)
+
+
+def adaptive_rings(diameter, focal_length, tolerance, max_segment_area=None):
+    """
+    Raios dos anéis e divisões angulares pelo critério de flecha.
+
+    Interpolando linearmente z = a r² em um triângulo, o erro máximo é
+    a R², com R o raio circunscrito; para o par de triângulos retângulos
+    de catetos h isso dá κ h² / 4 (κ = 2a). No paraboloide:
+        κ_meridiano  = 2a / (1 + 4a²r²)^(3/2)
+        κ_circunfer. = 2a / (1 + 4a²r²)^(1/2)
+    O comprimento de aresta admissível em cada direção é sqrt(4 tol / κ),
+    limitado por sqrt(2 * área máxima) para equilibrar a área dos elementos.
+    Os dois limites são refinados até que a malha resultante respeite a
+    tolerância e a área máxima (no máximo MAX_REFINE_PASSES vezes;
+    RuntimeError se não convergir).
+
+    Returns:
+        ring_radii (K,), n_theta (K,)
+    """
+    radius = diameter / 2.0
+    a = 1.0 / (4.0 * focal_length)
+    h_area = math.sqrt(2.0 * max_segment_area) if max_segment_area else np.inf
+    sag_scale = 1.0
+
+    for _ in range(MAX_REFINE_PASSES):
+        # Espaçamento radial: integra dn = ds / h_m(r) em uma grade fina
+        r_fine = np.linspace(0.0, radius, 4097)
+        slope2 = 1.0 + 4.0 * a**2 * r_fine**2
+        h_m = np.minimum(sag_scale * np.sqrt(4.0 * tolerance * slope2**1.5 / (2.0 * a)), h_area)
+        dn_dr = np.sqrt(slope2) / h_m
+        n_cum = np.concatenate([[0.0], np.cumsum(0.5 * (dn_dr[1:] + dn_dr[:-1]) * np.diff(r_fine))])
+        n_rings = max(int(math.ceil(n_cum[-1])), 2)
+        ring_radii = np.interp(np.linspace(0.0, n_cum[-1], n_rings + 1)[1:], n_cum, r_fine)
+
+        # Divisões angulares por anel (monotônicas para não criar faixas invertidas)
+        slope2 = 1.0 + 4.0 * a**2 * ring_radii**2
+        h_c = np.minimum(sag_scale * np.sqrt(4.0 * tolerance * np.sqrt(slope2) / (2.0 * a)), h_area)
+        n_theta = np.maximum(np.ceil(2.0 * math.pi * ring_radii / h_c), 6).astype(np.int64)
+        n_theta = np.maximum.accumulate(n_theta)
+
+        # Triângulos do "zíper" entre anéis diferentes podem passar dos alvos
+        vertices, faces, n_top = build_dish_mesh(ring_radii, n_theta, focal_length, 0.0)
+        deviation = max_deviation(vertices, faces[:n_top], focal_length)
+        worst_area = face_areas(vertices, faces[:n_top]).max()
+
+        done = True
+        if deviation > tolerance:
+            sag_scale *= 0.98 * math.sqrt(tolerance / deviation)
+            done = False
+        if max_segment_area and worst_area > max_segment_area:
+            h_area *= 0.98 * math.sqrt(max_segment_area / worst_area)
+            done = False
+        if done:
+            return ring_radii, n_theta
+    raise RuntimeError(f"malha adaptativa não convergiu em {MAX_REFINE_PASSES} refinamentos "
+                       f"(flecha {deviation * 1000:.4f} mm, maior faceta {worst_area * 1e4:.3f} cm²)")
+
+
+def generate_dish_adaptive(diameter=DIAMETER, focal_length=FOCAL_LENGTH,
+                           thickness=THICKNESS, tolerance=SAG_TOLERANCE,
+                           max_segment_area=MAX_SEGMENT_AREA):
+    """Prato com malha adaptativa à curvatura. Retorna (vertices, faces, n_top)."""
+    ring_radii, n_theta = adaptive_rings(diameter, focal_length, tolerance, max_segment_area)
+    return build_dish_mesh(ring_radii, n_theta, focal_length, thickness)
+
+
+def max_deviation(vertices, faces, focal_length, order=6, chunk=200000):
+    """
+    Desvio máximo (normal à superfície) entre as facetas e o paraboloide.
+
+    Avalia cada triângulo em uma grade baricêntrica de ordem `order`.
+    """
+    a = 1.0 / (4.0 * focal_length)
+    lam = np.array([(i, j, order - i - j) for i in range(order + 1)
+                    for j in range(order + 1 - i)], dtype=float) / order
+
+    worst = 0.0
+    for s in range(0, len(faces), chunk):
+        tris = vertices[faces[s:s + chunk]]
+        pts = np.einsum('kv,fvc->fkc', lam, tris)
+        r2 = pts[..., 0]**2 + pts[..., 1]**2
+        dz = np.abs(pts[..., 2] - a * r2)
+        # Distância vertical -> normal: cos da inclinação local
+        worst = max(worst, float(np.max(dz / np.sqrt(1.0 + 4.0 * a**2 * r2))))
+    return worst
+
+
+def face_areas(vertices, faces):
+    tris = vertices[faces]
+    return 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de prato parabólico (STL binário / OBJ)")
+    parser.add_argument("--diameter", type=float, default=DIAMETER, help="Diâmetro (m)")
+    parser.add_argument("--focal-length", type=float, default=FOCAL_LENGTH, help="Distância focal (m)")
+    parser.add_argument("--thickness", type=float, default=THICKNESS, help="Espessura (m)")
+    parser.add_argument("--max-area", type=float, default=MAX_SEGMENT_AREA,
+                        help="Área máxima por faceta (m²); 0 desativa o limite no modo adaptativo")
+    parser.add_argument("--adaptive", action="store_true", help="Malha adaptativa à curvatura")
+    parser.add_argument("--tolerance", type=float, default=SAG_TOLERANCE,
+                        help="Flecha máxima admissível no modo adaptativo (m)")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="Arquivo de saída (.stl ou .obj)")
+    args = parser.parse_args()
+    if args.max_area < 0 or (args.max_area == 0 and not args.adaptive):
+        parser.error("--max-area deve ser > 0 (0 só desativa o limite com --adaptive)")
+    if args.adaptive and args.tolerance <= 0:
+        parser.error("--tolerance deve ser > 0")
+
+    radius = args.diameter / 2.0
+    a = 1.0 / (4.0 * args.focal_length)
+    depth = a * radius**2
+
+    print(f"=== Especificações do Prato Parabólico ===")
+    print(f"Diâmetro: {args.diameter} m")
+    print(f"Raio: {radius} m")
+    print(f"Distância focal: {args.focal_length} m")
+    print(f"Profundidade: {depth:.4f} m")
+    print(f"Espessura: {args.thickness} m")
+    print(f"Coeficiente parabólico (a): {a:.6f}")
+
+    print(f"\n=== Malha ===")
+    if args.adaptive:
+        try:
+            ring_radii, n_theta = adaptive_rings(args.diameter, args.focal_length,
+                                                 args.tolerance, args.max_area or None)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"Modo: adaptativo (flecha ≤ {args.tolerance * 1000:.3f} mm)")
+        print(f"Anéis: {len(ring_radii)}")
+        print(f"Segmentos angulares: {n_theta[0]} (centro) a {n_theta[-1]} (borda)")
+        vertices, faces, n_top = build_dish_mesh(ring_radii, n_theta,
+                                                 args.focal_length, args.thickness)
+    else:
+        n_radial, n_theta = uniform_mesh_size(args.diameter, args.focal_length, args.max_area)
+        print(f"Modo: uniforme")
+        print(f"Segmentos angulares: {n_theta}")
+        print(f"Segmentos radiais: {n_radial}")
+        vertices, faces, n_top = generate_dish(args.diameter, args.focal_length,
+                                               args.thickness, args.max_area)
+
+    areas = face_areas(vertices, faces[:n_top])
+    normals = face_normals(vertices, faces[:n_top])
+    print(f"Área de faceta: mín {areas.min() * 1e4:.3f} cm², máx {areas.max() * 1e4:.3f} cm²")
+    print(f"Normais da superfície superior com +Z: {np.all(normals[:, 2] > 0)}")
+    deviation = max_deviation(vertices, faces[:n_top], args.focal_length)
+    print(f"Desvio máximo do paraboloide analítico: {deviation * 1000:.4f} mm")
+
+    print(f"\nExportando para {args.output}...")
+    write_mesh(args.output, vertices, faces, name="parabolic_dish")
+
+    print(f"\n✅ Prato parabólico gerado com sucesso!")
+    print(f"   Arquivo: {args.output}")
+    print(f"   Vértices: {len(vertices)}")
+    print(f"   Faces: {len(faces)}")
+
+
+if __name__ == "__main__":
+    main()
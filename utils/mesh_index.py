@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Índice espacial sobre os vértices de uma malha (DAE/STL/OBJ).
+
+Substitui as varreduras com máscara booleana sobre todos os vértices
+(ex.: analyze_dae) por consultas em uma grade uniforme construída uma
+única vez por malha carregada:
+- query_box:      vértices dentro de uma caixa alinhada aos eixos
+- query_radius:   vértices dentro de uma esfera
+- nearest:        vértice mais próximo de cada ponto (em lote)
+- max_in_box:     sondas do tipo "Z máximo dentro da região"
+
+get_mesh_index() mantém um cache por (arquivo, data de modificação,
+transformação), de modo que centenas de sondas de folga / pontos de
+fixação não recarregam nem reindexam a malha.
+
+Uso:
+    python3 utils/mesh_index.py models/catia/3_BracoH.dae
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from mesh_io import load_mesh, transform_points
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Número médio de vértices desejado por célula da grade
+POINTS_PER_CELL = 8
+# Limite de células por eixo (evita grades gigantes em malhas achatadas)
+MAX_CELLS_PER_AXIS = 256
+
+
+class MeshIndex:
+    """Grade uniforme (hash de células ordenado) sobre pontos 3D."""
+
+    def __init__(self, points, faces=None, cell_size=None):
+        self.points = np.ascontiguousarray(points, dtype=float).reshape(-1, 3)
+        self.faces = faces
+        if len(self.points) == 0:
+            raise ValueError("MeshIndex requer ao menos um ponto")
+
+        self.bounds_min = self.points.min(axis=0)
+        self.bounds_max = self.points.max(axis=0)
+        extent = np.maximum(self.bounds_max - self.bounds_min, 1e-9)
+
+        if cell_size is None:
+            volume_per_cell = np.prod(extent) * POINTS_PER_CELL / len(self.points)
+            cell_size = max(volume_per_cell ** (1.0 / 3.0),
+                            extent.max() / MAX_CELLS_PER_AXIS)
+        self.cell_size = float(cell_size)
+        self.shape = np.minimum(np.floor(extent / self.cell_size).astype(np.int64) + 1,
+                                MAX_CELLS_PER_AXIS)
+
+        keys = self._cell_keys(self._cell_coords(self.points))
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+        self._kdtree = None
+
+    # ------------------------------------------------------------------
+    # Grade
+    # ------------------------------------------------------------------
+    def _cell_coords(self, pts):
+        ijk = np.floor((pts - self.bounds_min) / self.cell_size).astype(np.int64)
+        return np.clip(ijk, 0, self.shape - 1)
+
+    def _cell_keys(self, ijk):
+        return np.ravel_multi_index(ijk.T, self.shape)
+
+    def _candidates(self, lo, hi):
+        """Índices dos pontos nas células que tocam a caixa [lo, hi]."""
+        lo = np.maximum(np.asarray(lo, dtype=float), self.bounds_min)
+        hi = np.minimum(np.asarray(hi, dtype=float), self.bounds_max)
+        if np.any(lo > hi):
+            return np.zeros(0, dtype=np.int64)
+
+        c_lo = self._cell_coords(lo[None])[0]
+        c_hi = self._cell_coords(hi[None])[0]
+        n_cells = np.prod(c_hi - c_lo + 1)
+
+        # Caixa cobrindo boa parte da malha: varredura direta é mais barata
+        if n_cells * POINTS_PER_CELL > len(self.points):
+            return np.arange(len(self.points))
+
+        axes = [np.arange(a, b + 1) for a, b in zip(c_lo, c_hi)]
+        grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+        keys = self._cell_keys(grid)
+
+        start = np.searchsorted(self.sorted_keys, keys, side='left')
+        stop = np.searchsorted(self.sorted_keys, keys, side='right')
+        counts = stop - start
+        total = counts.sum()
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # Concatena os intervalos [start, stop) sem laço Python
+        run_offsets = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        return self.order[np.arange(total) + run_offsets]
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def query_box(self, lo, hi):
+        """Índices dos vértices com lo <= p <= hi (use ±inf para eixos livres)."""
+        lo = np.asarray(lo, dtype=float)
+        hi = np.asarray(hi, dtype=float)
+        idx = self._candidates(lo, hi)
+        p = self.points[idx]
+        inside = np.all((p >= lo) & (p <= hi), axis=1)
+        return idx[inside]
+
+    def query_radius(self, center, radius):
+        """Índices dos vértices a até `radius` de `center`."""
+        center = np.asarray(center, dtype=float)
+        idx = self._candidates(center - radius, center + radius)
+        d2 = np.sum((self.points[idx] - center) ** 2, axis=1)
+        return idx[d2 <= radius * radius]
+
+    def nearest(self, query):
+        """
+        Vértice mais próximo de cada ponto de consulta.
+
+        Args:
+            query: (3,) ou (K, 3)
+
+        Returns:
+            (distâncias, índices) com shape (K,) (ou escalares para (3,))
+        """
+        q = np.asarray(query, dtype=float)
+        single = q.ndim == 1
+        q = q.reshape(-1, 3)
+
+        if cKDTree is not None:
+            if self._kdtree is None:
+                self._kdtree = cKDTree(self.points)
+            dist, idx = self._kdtree.query(q)
+        else:
+            # Força bruta vetorizada em blocos (sem scipy)
+            dist = np.empty(len(q))
+            idx = np.empty(len(q), dtype=np.int64)
+            block = max(1, 2_000_000 // len(self.points))
+            for s in range(0, len(q), block):
+                d2 = np.sum((q[s:s + block, None, :] - self.points[None]) ** 2, axis=2)
+                idx[s:s + block] = d2.argmin(axis=1)
+                dist[s:s + block] = np.sqrt(d2[np.arange(len(d2)), idx[s:s + block]])
+
+        if single:
+            return float(dist[0]), int(idx[0])
+        return dist, idx
+
+    def max_in_box(self, lo, hi, axis=2):
+        """
+        Valor máximo da coordenada `axis` dentro da caixa.
+
+        Returns:
+            (valor, ponto) ou (None, None) se a região estiver vazia
+        """
+        idx = self.query_box(lo, hi)
+        if len(idx) == 0:
+            return None, None
+        best = idx[np.argmax(self.points[idx, axis])]
+        return float(self.points[best, axis]), self.points[best].copy()
+
+    def min_in_box(self, lo, hi, axis=2):
+        """Análogo a max_in_box para o valor mínimo."""
+        idx = self.query_box(lo, hi)
+        if len(idx) == 0:
+            return None, None
+        best = idx[np.argmin(self.points[idx, axis])]
+        return float(self.points[best, axis]), self.points[best].copy()
+
+    def clearance(self, points):
+        """Folga (distância ao vértice mais próximo) para um lote de pontos."""
+        dist, _ = self.nearest(np.asarray(points, dtype=float).reshape(-1, 3))
+        return dist
+
+
+# ==============================================================================
+# CACHE POR MALHA
+# ==============================================================================
+_INDEX_CACHE = {}
+
+
+def get_mesh_index(filepath, transform=None):
+    """
+    Carrega a malha e retorna seu MeshIndex, reutilizando o cache.
+
+    Args:
+        filepath: arquivo .dae/.stl/.obj
+        transform: matriz homogênea 4x4 opcional aplicada aos vértices
+    """
+    path = os.path.abspath(filepath)
+    t_key = None if transform is None else np.asarray(transform, dtype=float).tobytes()
+    key = (path, os.path.getmtime(path), t_key)
+
+    index = _INDEX_CACHE.get(key)
+    if index is None:
+        vertices, faces = load_mesh(path)
+        if transform is not None:
+            vertices = transform_points(vertices, transform)
+        index = MeshIndex(vertices, faces)
+        _INDEX_CACHE[key] = index
+    return index
+
+
+def clear_cache():
+    _INDEX_CACHE.clear()
+
+
+if __name__ == "__main__":
+    mesh_file = sys.argv[1] if len(sys.argv) > 1 else "models/catia/3_BracoH.dae"
+    idx = get_mesh_index(mesh_file)
+    print(f"Malha: {mesh_file}")
+    print(f"Vértices: {len(idx.points)}  |  Células: {idx.shape.tolist()}  |  Tamanho célula: {idx.cell_size:.4f}")
+    print(f"Bounds min: {idx.bounds_min}")
+    print(f"Bounds max: {idx.bounds_max}")
+    center = 0.5 * (idx.bounds_min + idx.bounds_max)
+    dist, i = idx.nearest(center)
+    print(f"Vértice mais próximo do centro: {idx.points[i]} (d = {dist:.4f})")
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Leitura e escrita de malhas (DAE / STL / OBJ / PLY) com NumPy.
+
+Funções compartilhadas pelos utilitários de malha e pelos scripts de análise:
+- load_dae / load_stl / load_obj / load_ply / load_mesh: retornam (vertices, faces)
+  com vertices (N, 3) float64 e faces (M, 3) int64 (somente triângulos).
+- write_stl / write_obj / write_dae / write_mesh: gravam a malha com uma
+  única escrita de buffer (STL binário por padrão).
+
+Não depende de Blender nem de trimesh.
+"""
+
+import io
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# Registro de um triângulo no STL binário (50 bytes)
+STL_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+# Tipos escalares do cabeçalho PLY
+PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+
+
+def _tag(elem):
+    """Nome da tag sem namespace."""
+    return elem.tag.split('}')[-1]
+
+
+def _floats(text):
+    return np.array(text.split(), dtype=float) if text else np.zeros(0)
+
+
+def _ints(text):
+    return np.array(text.split(), dtype=np.int64) if text else np.zeros(0, dtype=np.int64)
+
+
+def fan_triangulate(vcount, indices):
+    """
+    Triangula polígonos (polylist) em leque, de forma vetorizada.
+
+    Args:
+        vcount: número de vértices de cada polígono
+        indices: índices de vértice concatenados de todos os polígonos
+
+    Returns:
+        faces (M, 3)
+    """
+    vcount = np.asarray(vcount, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(vcount)[:-1]])
+    n_tris = np.maximum(vcount - 2, 0)
+    if n_tris.sum() == 0:
+        return np.zeros((0, 3), dtype=np.int64)
+    poly_start = np.repeat(starts, n_tris)
+    # k = 1..n-2 dentro de cada polígono
+    k = np.arange(n_tris.sum()) - np.repeat(np.cumsum(n_tris) - n_tris, n_tris) + 1
+    return np.stack([
+        indices[poly_start],
+        indices[poly_start + k],
+        indices[poly_start + k + 1],
+    ], axis=1)
+
+
+def read_up_axis(filepath):
+    """Retorna o up_axis declarado no DAE (padrão Z_UP)."""
+    for _, elem in ET.iterparse(filepath):
+        if _tag(elem) == 'up_axis':
+            return (elem.text or "Z_UP").strip()
+    return "Z_UP"
+
+
+def read_node_matrix(filepath):
+    """
+    Matriz 4x4 do primeiro <node> que instancia uma geometria (identidade
+    se não houver). Usada para regravar o DAE na mesma pose da cena.
+    """
+    root = ET.parse(filepath).getroot()
+    for node in root.iter():
+        if _tag(node) != 'node':
+            continue
+        if not any(_tag(c) == 'instance_geometry' for c in node):
+            continue
+        for c in node:
+            if _tag(c) == 'matrix':
+                return _floats(c.text).reshape(4, 4)
+        break
+    return np.eye(4)
+
+
+def load_dae(filepath):
+    """
+    Lê todas as geometrias de um arquivo Collada (.dae).
+
+    Considera <triangles> e <polylist> (triangulado em leque). As
+    geometrias são concatenadas sem aplicar as matrizes da cena visual.
+
+    Returns:
+        vertices (N, 3), faces (M, 3)
+    """
+    root = ET.parse(filepath).getroot()
+
+    all_vertices = []
+    all_faces = []
+    offset = 0
+
+    for mesh in root.iter():
+        if _tag(mesh) != 'mesh':
+            continue
+
+        # Mapas id -> source (float_array) e id -> <vertices>
+        sources = {}
+        for src in mesh:
+            if _tag(src) != 'source':
+                continue
+            for child in src.iter():
+                if _tag(child) == 'float_array':
+                    sources[src.get('id')] = _floats(child.text)
+        vertices_src = {}
+        for vert in mesh:
+            if _tag(vert) != 'vertices':
+                continue
+            for inp in vert:
+                if _tag(inp) == 'input' and inp.get('semantic') == 'POSITION':
+                    vertices_src[vert.get('id')] = inp.get('source', '').lstrip('#')
+
+        positions = None
+        for prim in mesh:
+            kind = _tag(prim)
+            if kind not in ('triangles', 'polylist'):
+                continue
+
+            inputs = [i for i in prim if _tag(i) == 'input']
+            stride = max(int(i.get('offset', 0)) for i in inputs) + 1
+            vtx_input = next((i for i in inputs if i.get('semantic') == 'VERTEX'), None)
+            if vtx_input is None:
+                continue
+            pos_id = vertices_src.get(vtx_input.get('source', '').lstrip('#'))
+            if pos_id is None or pos_id not in sources:
+                continue
+            if positions is None:
+                positions = sources[pos_id].reshape(-1, 3)
+
+            p_elem = next((c for c in prim if _tag(c) == 'p'), None)
+            if p_elem is None:
+                continue
+            idx = _ints(p_elem.text).reshape(-1, stride)[:, int(vtx_input.get('offset', 0))]
+
+            if kind == 'triangles':
+                faces = idx.reshape(-1, 3)
+            else:
+                vc_elem = next((c for c in prim if _tag(c) == 'vcount'), None)
+                faces = fan_triangulate(_ints(vc_elem.text), idx)
+
+            all_faces.append(faces + offset)
+
+        if positions is not None:
+            all_vertices.append(positions)
+            offset += len(positions)
+
+    if not all_vertices:
+        raise ValueError(f"Nenhuma geometria encontrada em {filepath}")
+
+    vertices = np.vstack(all_vertices)
+    faces = np.vstack(all_faces) if all_faces else np.zeros((0, 3), dtype=np.int64)
+    return vertices, faces
+
+
+def load_stl(filepath):
+    """
+    Lê um STL (binário ou ASCII).
+
+    Os vértices NÃO são soldados: cada face tem seus 3 vértices próprios
+    (use weld_vertices se precisar de topologia compartilhada).
+
+    Returns:
+        vertices (3M, 3), faces (M, 3)
+    """
+    size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        header = f.read(84)
+
+    is_binary = False
+    if len(header) == 84:
+        n_tri = int(np.frombuffer(header[80:84], dtype='<u4')[0])
+        is_binary = (84 + n_tri * STL_DTYPE.itemsize == size)
+
+    if is_binary:
+        data = np.fromfile(filepath, dtype=STL_DTYPE, count=n_tri, offset=84)
+        tris = data['vertices'].astype(float)
+    else:
+        with open(filepath, 'r', errors='ignore') as f:
+            text = f.read()
+        nums = re.findall(r'vertex\s+(\S+)\s+(\S+)\s+(\S+)', text)
+        tris = np.array(nums, dtype=float).reshape(-1, 3, 3)
+
+    vertices = tris.reshape(-1, 3)
+    faces = np.arange(len(vertices), dtype=np.int64).reshape(-1, 3)
+    return vertices, faces
+
+
+def load_obj(filepath):
+    """Lê um OBJ (v / f), triangulando faces com mais de 3 vértices."""
+    verts = []
+    vcount = []
+    indices = []
+    with open(filepath, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == 'v':
+                verts.append([float(p) for p in parts[1:4]])
+            elif parts[0] == 'f':
+                poly = [int(p.split('/')[0]) for p in parts[1:]]
+                # Índices negativos são relativos ao fim da lista
+                poly = [p - 1 if p > 0 else len(verts) + p for p in poly]
+                vcount.append(len(poly))
+                indices.extend(poly)
+    vertices = np.array(verts, dtype=float).reshape(-1, 3)
+    faces = fan_triangulate(vcount, np.array(indices, dtype=np.int64))
+    return vertices, faces
+
+
+def _ply_header(f, filepath):
+    """Formato e elementos [(nome, quantidade, [propriedade...])] do cabeçalho PLY."""
+    if f.readline().strip() != b'ply':
+        raise ValueError(f"{filepath}: não é um PLY")
+    fmt, elements = None, []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError(f"{filepath}: cabeçalho PLY incompleto")
+        parts = line.decode('ascii', errors='ignore').split()
+        if not parts:
+            continue
+        if parts[0] == 'format':
+            fmt = parts[1]
+        elif parts[0] == 'element':
+            elements.append((parts[1], int(parts[2]), []))
+        elif parts[0] == 'property':
+            elements[-1][2].append(parts[1:])
+        elif parts[0] == 'end_header':
+            return fmt, elements
+
+
+def _ply_rows(data, offset, count, props, endian):
+    """Lê `count` linhas binárias com listas de tamanho variável (caminho lento)."""
+    rows = []
+    for _ in range(count):
+        row = []
+        for prop in props:
+            if prop[0] == 'list':
+                size_t = np.dtype(endian + PLY_TYPES[prop[1]])
+                item_t = np.dtype(endian + PLY_TYPES[prop[2]])
+                n = int(np.frombuffer(data, size_t, 1, offset)[0])
+                offset += size_t.itemsize
+                row.append(np.frombuffer(data, item_t, n, offset))
+                offset += n * item_t.itemsize
+            else:
+                t = np.dtype(endian + PLY_TYPES[prop[0]])
+                row.append(np.frombuffer(data, t, 1, offset)[0])
+                offset += t.itemsize
+        rows.append(row)
+    return rows, offset
+
+
+def _ply_element(data, offset, count, props, endian):
+    """Elemento binário como {propriedade: valores}; listas viram lista de arrays."""
+    scalar = [p for p in props if p[0] != 'list']
+    lists = [p for p in props if p[0] == 'list']
+    if not lists:
+        dtype = np.dtype([(p[1], endian + PLY_TYPES[p[0]]) for p in props])
+        table = np.frombuffer(data, dtype, count, offset)
+        return {p[1]: table[p[1]] for p in props}, offset + count * dtype.itemsize
+    if len(lists) == 1 and count:
+        # Caminho rápido: todas as listas do tamanho da primeira (p.ex. só triângulos)
+        before = props[:props.index(lists[0])]
+        size_t = np.dtype(endian + PLY_TYPES[lists[0][1]])
+        first = int(np.frombuffer(data, size_t, 1, offset + sum(
+            np.dtype(PLY_TYPES[p[0]]).itemsize for p in before))[0])
+        fields = []
+        for p in props:
+            if p[0] == 'list':
+                fields += [("_n", size_t), (p[3], endian + PLY_TYPES[p[2]], (first,))]
+            else:
+                fields.append((p[1], endian + PLY_TYPES[p[0]]))
+        dtype = np.dtype(fields)
+        if offset + count * dtype.itemsize <= len(data):
+            table = np.frombuffer(data, dtype, count, offset)
+            if np.all(table["_n"] == first):
+                out = {p[1]: table[p[1]] for p in scalar}
+                out[lists[0][3]] = table[lists[0][3]]
+                return out, offset + count * dtype.itemsize
+    rows, offset = _ply_rows(data, offset, count, props, endian)
+    return {p[-1]: [row[i] for row in rows] for i, p in enumerate(props)}, offset
+
+
+def load_ply(filepath):
+    """Lê um PLY (ASCII ou binário), triangulando faces com mais de 3 vértices."""
+    with open(filepath, 'rb') as f:
+        fmt, elements = _ply_header(f, filepath)
+        data = f.read()
+    values = {}
+    if fmt == 'ascii':
+        tokens = iter(data.split())
+        for name, count, props in elements:
+            columns = {p[-1]: [] for p in props}
+            for _ in range(count):
+                for p in props:
+                    if p[0] == 'list':
+                        n = int(next(tokens))
+                        columns[p[-1]].append(np.array([float(next(tokens)) for _ in range(n)]))
+                    else:
+                        columns[p[-1]].append(float(next(tokens)))
+            values[name] = columns
+    elif fmt in ('binary_little_endian', 'binary_big_endian'):
+        endian = '<' if fmt == 'binary_little_endian' else '>'
+        offset = 0
+        for name, count, props in elements:
+            values[name], offset = _ply_element(data, offset, count, props, endian)
+    else:
+        raise ValueError(f"{filepath}: formato PLY não suportado ({fmt})")
+
+    vertex = values.get('vertex', {})
+    if not all(k in vertex for k in ('x', 'y', 'z')):
+        raise ValueError(f"{filepath}: PLY sem vértices x/y/z")
+    vertices = np.stack([np.asarray(vertex[k], dtype=float) for k in ('x', 'y', 'z')], axis=1)
+    face = values.get('face', {})
+    polys = face.get('vertex_indices', face.get('vertex_index', []))
+    if isinstance(polys, np.ndarray):    # (M, k) do caminho rápido
+        vcount = np.full(len(polys), polys.shape[1])
+        indices = polys.reshape(-1).astype(np.int64)
+    else:
+        vcount = [len(poly) for poly in polys]
+        indices = (np.concatenate([np.asarray(poly) for poly in polys]).astype(np.int64)
+                   if vcount else np.zeros(0, dtype=np.int64))
+    return vertices.reshape(-1, 3), fan_triangulate(vcount, indices)
+
+
+def load_mesh(filepath):
+    """Lê DAE, STL, OBJ ou PLY conforme a extensão."""
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == '.dae':
+        return load_dae(filepath)
+    if ext == '.stl':
+        return load_stl(filepath)
+    if ext == '.obj':
+        return load_obj(filepath)
+    if ext == '.ply':
+        return load_ply(filepath)
+    raise ValueError(f"Formato não suportado: {filepath}")
+
+
+def transform_points(points, matrix):
+    """Aplica uma matriz homogênea 4x4 a pontos (N, 3)."""
+    matrix = np.asarray(matrix, dtype=float)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def face_normals(vertices, faces):
+    """Normais unitárias de todas as faces em uma única operação."""
+    tris = vertices[faces]
+    n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    length = np.linalg.norm(n, axis=1, keepdims=True)
+    np.divide(n, length, out=n, where=length > 0)
+    return n
+
+
+def write_stl(filepath, vertices, faces, name="mesh"):
+    """Grava STL binário com uma única escrita de buffer."""
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces, dtype=np.int64)
+
+    data = np.zeros(len(faces), dtype=STL_DTYPE)
+    data['normal'] = face_normals(vertices, faces)
+    data['vertices'] = vertices[faces]
+
+    header = np.zeros(80, dtype=np.uint8)
+    label = f"binary STL {name}".encode('ascii', 'replace')[:80]
+    header[:len(label)] = np.frombuffer(label, dtype=np.uint8)
+
+    buf = header.tobytes() + np.uint32(len(faces)).tobytes() + data.tobytes()
+    with open(filepath, 'wb') as f:
+        f.write(buf)
+
+
+def write_obj(filepath, vertices, faces, name="mesh"):
+    """Grava OBJ (índices 1-based) com uma única escrita."""
+    out = io.StringIO()
+    out.write(f"# {name}\n")
+    np.savetxt(out, np.asarray(vertices, dtype=float), fmt="v %.6f %.6f %.6f")
+    np.savetxt(out, np.asarray(faces, dtype=np.int64) + 1, fmt="f %d %d %d")
+    with open(filepath, 'w') as f:
+        f.write(out.getvalue())
+
+
+def vertex_normals(vertices, faces):
+    """Normais por vértice (média das faces ponderada pela área)."""
+    tris = vertices[faces]
+    n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    normals = np.zeros_like(vertices, dtype=float)
+    for k in range(3):
+        for axis in range(3):
+            normals[:, axis] += np.bincount(faces[:, k], weights=n[:, axis],
+                                            minlength=len(vertices))
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, length, out=normals, where=length > 0)
+    return normals
+
+
+def _join(values, fmt):
+    out = io.StringIO()
+    np.savetxt(out, values, fmt=fmt, newline=" ")
+    return out.getvalue().strip()
+
+
+def write_dae(filepath, vertices, faces, name="mesh", up_axis="Z_UP", matrix=None):
+    """
+    Grava um Collada 1.4.1 mínimo (uma geometria, posições e normais).
+
+    Args:
+        up_axis: eixo vertical declarado (preserve o do arquivo de origem)
+        matrix: matriz 4x4 do nó da cena (ver read_node_matrix)
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces, dtype=np.int64)
+    matrix = np.eye(4) if matrix is None else np.asarray(matrix, dtype=float)
+    normals = vertex_normals(vertices, faces)
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    n = len(vertices)
+
+    def source(kind, values):
+        return (f'        <source id="{name}-{kind}">\n'
+                f'          <float_array id="{name}-{kind}-array" count="{3 * n}">'
+                f'{_join(values, "%.7g")}</float_array>\n'
+                f'          <technique_common>\n'
+                f'            <accessor source="#{name}-{kind}-array" count="{n}" stride="3">\n'
+                f'              <param name="X" type="float"/>\n'
+                f'              <param name="Y" type="float"/>\n'
+                f'              <param name="Z" type="float"/>\n'
+                f'            </accessor>\n'
+                f'          </technique_common>\n'
+                f'        </source>\n')
+
+    text = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<COLLADA xmlns="http://www.collada.org/2005/11/COLLADASchema" version="1.4.1">\n'
+        '  <asset>\n'
+        '    <contributor><authoring_tool>robotSim mesh_io</authoring_tool></contributor>\n'
+        f'    <created>{stamp}</created>\n'
+        f'    <modified>{stamp}</modified>\n'
+        '    <unit name="meter" meter="1"/>\n'
+        f'    <up_axis>{up_axis}</up_axis>\n'
+        '  </asset>\n'
+        '  <library_geometries>\n'
+        f'    <geometry id="{name}-mesh" name="{name}">\n'
+        '      <mesh>\n'
+        + source("positions", vertices)
+        + source("normals", normals)
+        + f'        <vertices id="{name}-vertices">\n'
+        f'          <input semantic="POSITION" source="#{name}-positions"/>\n'
+        f'          <input semantic="NORMAL" source="#{name}-normals"/>\n'
+        '        </vertices>\n'
+        f'        <triangles count="{len(faces)}">\n'
+        f'          <input semantic="VERTEX" source="#{name}-vertices" offset="0"/>\n'
+        f'          <p>{_join(faces, "%d")}</p>\n'
+        '        </triangles>\n'
+        '      </mesh>\n'
+        '    </geometry>\n'
+        '  </library_geometries>\n'
+        '  <library_visual_scenes>\n'
+        '    <visual_scene id="Scene" name="Scene">\n'
+        f'      <node id="{name}" name="{name}" type="NODE">\n'
+        f'        <matrix sid="transform">{_join(matrix.reshape(1, -1), "%.9g")}</matrix>\n'
+        f'        <instance_geometry url="#{name}-mesh" name="{name}"/>\n'
+        '      </node>\n'
+        '    </visual_scene>\n'
+        '  </library_visual_scenes>\n'
+        '  <scene>\n'
+        '    <instance_visual_scene url="#Scene"/>\n'
+        '  </scene>\n'
+        '</COLLADA>\n'
+    )
+    with open(filepath, 'w') as f:
+        f.write(text)
+
+
+def write_mesh(filepath, vertices, faces, name="mesh", **dae_options):
+    """Grava STL, OBJ ou DAE conforme a extensão (opções extras só para DAE)."""
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == '.stl':
+        write_stl(filepath, vertices, faces, name)
+    elif ext == '.obj':
+        write_obj(filepath, vertices, faces, name)
+    elif ext == '.dae':
+        write_dae(filepath, vertices, faces, name, **dae_options)
+    else:
+        raise ValueError(f"Formato de saída não suportado: {filepath}")
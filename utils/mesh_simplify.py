@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Limpeza e simplificação de malhas sem Blender (somente NumPy).
+
+Etapas:
+- weld_vertices:            une vértices coincidentes (tolerância em metros)
+- remove_degenerate_faces:  remove faces com vértices repetidos ou área nula
+- remove_duplicate_faces:   remove faces repetidas (mesmos 3 vértices)
+- orient_faces:             normais consistentes e para fora
+                            (normals_make_consistent do Blender)
+- decimate:                 colapso de arestas por métrica quádrica
+                            (Garland & Heckbert) até a fração desejada
+- surface_deviation:        desvio entre a malha original e a simplificada
+
+A decimação é feita em lotes: a cada passo são colapsadas, de uma vez, as
+arestas de menor custo que são mínimas em sua vizinhança (nenhuma outra
+aresta colapsada toca as mesmas faces), o que permite vetorizar tanto o
+cálculo de custos quanto as verificações de topologia e de inversão de
+normais.
+
+Uso:
+    python3 utils/mesh_simplify.py models/catia/3_BracoH.dae /tmp/braco.dae --ratio 0.15
+"""
+
+import argparse
+import os
+import sys
+from collections import deque
+
+import numpy as np
+
+from mesh_io import load_mesh, read_node_matrix, read_up_axis, write_mesh
+
+# Tolerância padrão para unir vértices (equivale ao remove_doubles do Blender)
+WELD_TOLERANCE = 1e-4
+# Peso dos planos de restrição nas bordas abertas
+BOUNDARY_WEIGHT = 1e3
+# Fração das arestas (as mais baratas) candidatas a colapso em cada passo
+POOL_FRACTION = 0.1
+# Cosseno mínimo entre a normal antes e depois do colapso
+MIN_NORMAL_DOT = 0.2
+
+
+# ==============================================================================
+# LIMPEZA
+# ==============================================================================
+def weld_vertices(vertices, faces, tolerance=WELD_TOLERANCE):
+    """Une vértices que caem na mesma célula de tamanho `tolerance`."""
+    keys = np.round(vertices / tolerance).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    return vertices[first], inverse.reshape(-1)[faces]
+
+
+def remove_degenerate_faces(vertices, faces, min_area=1e-12):
+    """Remove faces com índices repetidos ou área menor que `min_area`."""
+    distinct = ((faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2])
+                & (faces[:, 2] != faces[:, 0]))
+    tris = vertices[faces]
+    area = 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+    return faces[distinct & (area > min_area)]
+
+
+def remove_duplicate_faces(faces):
+    """Remove faces com o mesmo conjunto de vértices (mantém a primeira)."""
+    _, first = np.unique(np.sort(faces, axis=1), axis=0, return_index=True)
+    return faces[np.sort(first)]
+
+
+def remove_unused_vertices(vertices, faces):
+    """Descarta vértices não referenciados e reindexa as faces."""
+    used, inverse = np.unique(faces, return_inverse=True)
+    return vertices[used], inverse.reshape(faces.shape)
+
+
+def clean_mesh(vertices, faces, tolerance=WELD_TOLERANCE):
+    """Solda, remove degeneradas/duplicadas e vértices soltos."""
+    vertices, faces = weld_vertices(vertices, faces, tolerance)
+    faces = remove_degenerate_faces(vertices, faces)
+    faces = remove_duplicate_faces(faces)
+    return remove_unused_vertices(vertices, faces)
+
+
+def orient_faces(vertices, faces):
+    """
+    Orientação consistente: propaga a ordem dos vértices entre faces que
+    dividem uma aresta (arestas com exatamente 2 faces) e vira cada
+    componente conexa cujo volume com sinal é negativo (normais para fora).
+    """
+    faces = np.array(faces, dtype=np.int64)
+    m = len(faces)
+    if m == 0:
+        return faces
+    e = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    keys, _ = _edge_keys(faces)
+    order = np.argsort(keys, kind='stable')
+    _, start, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    a, b = order[start[counts == 2]], order[start[counts == 2] + 1]
+    fa, fb = a // 3, b // 3
+    # Aresta percorrida no mesmo sentido pelas duas faces: orientações opostas
+    same = e[a, 0] == e[b, 0]
+    src = np.concatenate([fa, fb])
+    dst = np.concatenate([fb, fa])
+    rel = np.concatenate([same, same])
+    adj_order, offsets = _csr(src, m)
+
+    flip = np.zeros(m, dtype=bool)
+    component = np.full(m, -1, dtype=np.int64)
+    n_comp = 0
+    for seed in range(m):
+        if component[seed] >= 0:
+            continue
+        component[seed] = n_comp
+        queue = deque([seed])
+        while queue:
+            f = queue.popleft()
+            for k in adj_order[offsets[f]:offsets[f + 1]]:
+                g = dst[k]
+                if component[g] < 0:
+                    component[g] = n_comp
+                    flip[g] = flip[f] ^ rel[k]
+                    queue.append(g)
+        n_comp += 1
+    faces[flip] = faces[flip][:, [0, 2, 1]]
+
+    tris = vertices[faces]
+    volume = np.einsum('ij,ij->i', tris[:, 0], np.cross(tris[:, 1], tris[:, 2]))
+    inward = np.bincount(component, weights=volume, minlength=n_comp) < 0
+    faces[inward[component]] = faces[inward[component]][:, [0, 2, 1]]
+    return faces
+
+
+# ==============================================================================
+# DECIMAÇÃO POR MÉTRICA QUÁDRICA
+# ==============================================================================
+def _csr(keys, n):
+    """Agrupa índices por chave: retorna (ordem, offsets) no formato CSR."""
+    order = np.argsort(keys, kind='stable')
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=n))])
+    return order, offsets
+
+
+def _gather(offsets, order, rows):
+    """Para cada linha pedida, lista os itens do CSR: retorna (dono, item)."""
+    counts = offsets[rows + 1] - offsets[rows]
+    owner = np.repeat(np.arange(len(rows)), counts)
+    run = np.repeat(offsets[rows] - (np.cumsum(counts) - counts), counts)
+    return owner, order[np.arange(counts.sum()) + run]
+
+
+def _edge_keys(faces):
+    """Chave inteira a * n + b (a < b) de cada aresta das faces, (3M,)."""
+    e = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    n = np.int64(faces.max()) + 1
+    return np.minimum(e[:, 0], e[:, 1]) * n + np.maximum(e[:, 0], e[:, 1]), n
+
+
+def _unique_edges(faces):
+    """Arestas únicas (E, 2) com a < b e número de faces de cada aresta."""
+    keys, n = _edge_keys(faces)
+    keys, counts = np.unique(keys, return_counts=True)
+    return np.stack([keys // n, keys % n], axis=1), counts
+
+
+def _vertex_quadrics(vertices, faces):
+    """Quádricas 4x4 por vértice (planos das faces + restrição de borda)."""
+    tris = vertices[faces]
+    n = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    double_area = np.linalg.norm(n, axis=1)
+    n = n / np.maximum(double_area, 1e-30)[:, None]
+    planes = np.concatenate([n, -np.sum(n * tris[:, 0], axis=1, keepdims=True)], axis=1)
+    K = 0.5 * double_area[:, None, None] * planes[:, :, None] * planes[:, None, :]
+
+    owners = [faces[:, 0], faces[:, 1], faces[:, 2]]
+    values = [K, K, K]
+
+    # Bordas abertas: plano perpendicular à face contendo a aresta
+    e = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    keys, _ = _edge_keys(faces)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    boundary = counts[inverse] == 1
+    if np.any(boundary):
+        be = e[boundary]
+        face_n = np.repeat(n, 3, axis=0)[boundary]
+        d = vertices[be[:, 1]] - vertices[be[:, 0]]
+        m = np.cross(d, face_n)
+        m /= np.maximum(np.linalg.norm(m, axis=1, keepdims=True), 1e-30)
+        bp = np.concatenate([m, -np.sum(m * vertices[be[:, 0]], axis=1, keepdims=True)], axis=1)
+        w = BOUNDARY_WEIGHT * np.sum(d * d, axis=1)
+        Kb = w[:, None, None] * bp[:, :, None] * bp[:, None, :]
+        owners += [be[:, 0], be[:, 1]]
+        values += [Kb, Kb]
+
+    owner = np.concatenate(owners)
+    value = np.concatenate(values).reshape(-1, 16)
+    Q = np.empty((len(vertices), 16))
+    for i in range(16):
+        Q[:, i] = np.bincount(owner, weights=value[:, i], minlength=len(vertices))
+    return Q.reshape(-1, 4, 4)
+
+
+def _quadric_cost(Q, points):
+    h = np.concatenate([points, np.ones((len(points), 1))], axis=1)
+    return np.einsum('ei,eij,ej->e', h, Q, h)
+
+
+def _collapse_targets(vertices, Q, edges):
+    """Posição ótima e custo do colapso de cada aresta."""
+    a, b = edges[:, 0], edges[:, 1]
+    Qe = Q[a] + Q[b]
+    pa, pb = vertices[a], vertices[b]
+    mid = 0.5 * (pa + pb)
+
+    candidates = [pa, pb, mid]
+    A = Qe[:, :3, :3]
+    det = np.linalg.det(A)
+    scale = np.einsum('eii->e', A) ** 3
+    ok = np.abs(det) > 1e-9 * np.maximum(scale, 1e-300)
+    opt = mid.copy()
+    if np.any(ok):
+        opt[ok] = np.linalg.solve(A[ok], -Qe[ok, :3, 3:4])[..., 0]
+        # Ótimo muito longe da aresta: quádrica mal condicionada
+        far = np.linalg.norm(opt - mid, axis=1) > np.linalg.norm(pb - pa, axis=1)
+        opt[far] = mid[far]
+    candidates.append(opt)
+
+    costs = np.stack([_quadric_cost(Qe, c) for c in candidates], axis=1)
+    best = np.argmin(costs, axis=1)
+    target = np.stack(candidates, axis=1)[np.arange(len(edges)), best]
+    return target, costs[np.arange(len(edges)), best]
+
+
+def _independent_edges(edges, cost, faces, n_vertices, rounds=4):
+    """
+    Arestas que podem ser colapsadas ao mesmo tempo: nenhum vértice de uma
+    aresta escolhida pertence a uma face incidente a outra aresta escolhida.
+
+    Cada rodada escolhe as arestas de custo mínimo em sua vizinhança entre
+    as ainda livres e trava a vizinhança das escolhidas.
+    """
+    big = len(edges)
+    base_rank = np.empty(big, dtype=np.int64)
+    base_rank[np.argsort(cost, kind='stable')] = np.arange(big)
+    base_rank[~np.isfinite(cost)] = big
+
+    a, b = edges[:, 0], edges[:, 1]
+    locked = np.zeros(n_vertices, dtype=bool)
+    chosen = []
+    for _ in range(rounds):
+        rank = np.where(locked[a] | locked[b], big, base_rank)
+        vmin = np.full(n_vertices, big, dtype=np.int64)
+        np.minimum.at(vmin, a, rank)
+        np.minimum.at(vmin, b, rank)
+        fmin = vmin[faces].min(axis=1)
+        vmin2 = np.full(n_vertices, big, dtype=np.int64)
+        np.minimum.at(vmin2, faces.reshape(-1), np.repeat(fmin, 3))
+
+        sel = np.nonzero((rank < big) & (rank == vmin2[a]) & (rank == vmin2[b]))[0]
+        if len(sel) == 0:
+            break
+        chosen.append(sel)
+
+        touched = np.zeros(n_vertices, dtype=bool)
+        touched[edges[sel].reshape(-1)] = True
+        locked[faces[touched[faces].any(axis=1)].reshape(-1)] = True
+
+    if not chosen:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(chosen)
+
+
+def _valid_collapses(vertices, faces, edges, edge_faces, targets, boundary_vertex):
+    """Condição de link (manifold) e verificação de inversão de normais."""
+    n_v = len(vertices)
+    a, b = edges[:, 0], edges[:, 1]
+    n_sel = len(edges)
+
+    # Link: vizinhos comuns de a e b devem ser exatamente os opostos da aresta
+    all_edges, _ = _unique_edges(faces)
+    nbr_keys = np.concatenate([all_edges[:, 0], all_edges[:, 1]])
+    nbr_vals = np.concatenate([all_edges[:, 1], all_edges[:, 0]])
+    order, offsets = _csr(nbr_keys, n_v)
+    order = nbr_vals[order]
+    sa, na = _gather(offsets, order, a)
+    sb, nb = _gather(offsets, order, b)
+    common = np.intersect1d(sa * n_v + na, sb * n_v + nb, assume_unique=True) // n_v
+    link_ok = np.bincount(common, minlength=n_sel) == edge_faces
+
+    # Aresta interna ligando dois vértices de borda estrangularia a malha
+    link_ok &= ~(boundary_vertex[a] & boundary_vertex[b] & (edge_faces > 1))
+
+    # Normais das faces que permanecem após mover a e b para o alvo
+    order, offsets = _csr(faces.reshape(-1), n_v)
+    order = order // 3
+    fa_owner, fa = _gather(offsets, order, a)
+    fb_owner, fb = _gather(offsets, order, b)
+    owner = np.concatenate([fa_owner, fb_owner])
+    fid = np.concatenate([fa, fb])
+    tri = faces[fid]
+    has_a = np.any(tri == a[owner, None], axis=1)
+    has_b = np.any(tri == b[owner, None], axis=1)
+    keep = ~(has_a & has_b)
+    owner, tri = owner[keep], tri[keep]
+
+    old = vertices[tri]
+    new = old.copy()
+    moved = (tri == a[owner, None]) | (tri == b[owner, None])
+    new[moved] = np.repeat(targets[owner], 3, axis=0).reshape(-1, 3, 3)[moved]
+    n_old = np.cross(old[:, 1] - old[:, 0], old[:, 2] - old[:, 0])
+    n_new = np.cross(new[:, 1] - new[:, 0], new[:, 2] - new[:, 0])
+    len_old = np.linalg.norm(n_old, axis=1)
+    len_new = np.linalg.norm(n_new, axis=1)
+    flipped = np.sum(n_old * n_new, axis=1) < MIN_NORMAL_DOT * len_old * len_new
+    flipped |= len_new <= 1e-12 * np.maximum(len_old, 1e-30)
+    normal_ok = np.bincount(owner, weights=flipped, minlength=n_sel) == 0
+
+    return link_ok & normal_ok
+
+
+def decimate(vertices, faces, ratio=0.15, target_faces=None, verbose=False):
+    """
+    Simplifica a malha por colapso de arestas (métrica quádrica).
+
+    Args:
+        vertices, faces: malha já limpa (ver clean_mesh)
+        ratio: fração de faces a manter
+        target_faces: número de faces desejado (tem prioridade sobre ratio)
+
+    Returns:
+        vertices, faces, representative
+        representative[i] é o vértice da malha simplificada que absorveu o
+        vértice i da malha de entrada.
+    """
+    vertices = np.array(vertices, dtype=float)
+    faces = np.array(faces, dtype=np.int64)
+    if len(faces) == 0:
+        raise ValueError("malha sem triângulos para decimar")
+    if target_faces is None:
+        target_faces = int(round(len(faces) * ratio))
+    target_faces = max(target_faces, 4)
+
+    n_v = len(vertices)
+    Q = _vertex_quadrics(vertices, faces)
+    representative = np.arange(n_v)
+    blocked = np.zeros(0, dtype=np.int64)
+
+    passes = 0
+    while len(faces) > target_faces:
+        passes += 1
+        edges, edge_faces = _unique_edges(faces)
+        boundary_vertex = np.zeros(n_v, dtype=bool)
+        boundary_vertex[edges[edge_faces == 1].reshape(-1)] = True
+
+        targets, cost = _collapse_targets(vertices, Q, edges)
+        keys = edges[:, 0] * n_v + edges[:, 1]
+        cost[np.isin(keys, blocked)] = np.inf
+
+        # Só as arestas globalmente mais baratas concorrem neste passo; um
+        # mínimo local caro esperaria o passo em que ele fosse o mais barato
+        needed = max((len(faces) - target_faces + 1) // 2, 1)
+        pool = max(min(needed, int(len(edges) * POOL_FRACTION)), 1)
+        if pool < len(edges):
+            cutoff = np.partition(cost, pool - 1)[pool - 1]
+            cost[cost > cutoff] = np.inf
+
+        sel = _independent_edges(edges, cost, faces, n_v)
+        if len(sel) == 0:
+            break
+        # Não passa muito do alvo: cada colapso interno remove 2 faces
+        sel = sel[np.argsort(cost[sel], kind='stable')][:needed]
+
+        valid = _valid_collapses(vertices, faces, edges[sel], edge_faces[sel],
+                                 targets[sel], boundary_vertex)
+        blocked = np.union1d(blocked, keys[sel[~valid]])
+        sel = sel[valid]
+        if len(sel) == 0:
+            continue
+
+        a, b = edges[sel, 0], edges[sel, 1]
+        vertices[a] = targets[sel]
+        Q[a] += Q[b]
+
+        remap = np.arange(n_v)
+        remap[b] = a
+        representative = remap[representative]
+        faces = remap[faces]
+        faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2])
+                      & (faces[:, 2] != faces[:, 0])]
+
+        if verbose:
+            print(f"   passo {passes:3d}: {len(sel):6d} colapsos -> {len(faces):,} faces")
+
+    used, inverse = np.unique(faces, return_inverse=True)
+    lookup = np.full(n_v, -1, dtype=np.int64)
+    lookup[used] = np.arange(len(used))
+    return vertices[used], inverse.reshape(faces.shape), lookup[representative]
+
+
+# ==============================================================================
+# DESVIO
+# ==============================================================================
+def point_triangle_distance(p, a, b, c):
+    """Distância (vetorizada) de pontos p aos triângulos (a, b, c)."""
+    ab, ac = b - a, c - a
+    ap, bp, cp = p - a, p - b, p - c
+    d1 = np.sum(ab * ap, axis=1)
+    d2 = np.sum(ac * ap, axis=1)
+    d3 = np.sum(ab * bp, axis=1)
+    d4 = np.sum(ac * bp, axis=1)
+    d5 = np.sum(ab * cp, axis=1)
+    d6 = np.sum(ac * cp, axis=1)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = va + vb + vc
+        inside = a + ab * (vb / denom)[:, None] + ac * (vc / denom)[:, None]
+        on_ab = a + ab * (d1 / (d1 - d3))[:, None]
+        on_ac = a + ac * (d2 / (d2 - d6))[:, None]
+        on_bc = b + (c - b) * ((d4 - d3) / ((d4 - d3) + (d5 - d6)))[:, None]
+
+    closest = np.select(
+        [((d1 <= 0) & (d2 <= 0))[:, None],
+         ((d3 >= 0) & (d4 <= d3))[:, None],
+         ((vc <= 0) & (d1 >= 0) & (d3 <= 0))[:, None],
+         ((d6 >= 0) & (d5 <= d6))[:, None],
+         ((vb <= 0) & (d2 >= 0) & (d6 <= 0))[:, None],
+         ((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0))[:, None]],
+        [a, b, on_ab, c, on_ac, on_bc],
+        default=inside)
+    return np.linalg.norm(p - closest, axis=1)
+
+
+def surface_deviation(points, vertices, faces, representative):
+    """
+    Distância de cada ponto original à malha simplificada.
+
+    Avalia as faces incidentes ao vértice que absorveu cada ponto: é um
+    limite superior da distância à superfície (exato quando a face mais
+    próxima é vizinha do representante, o caso usual).
+    """
+    order, offsets = _csr(faces.reshape(-1), len(vertices))
+    owner, fid = _gather(offsets, order // 3, representative)
+    tri = vertices[faces[fid]]
+    d = point_triangle_distance(points[owner], tri[:, 0], tri[:, 1], tri[:, 2])
+    dist = np.full(len(points), np.inf)
+    np.minimum.at(dist, owner, d)
+    return dist
+
+
+# ==============================================================================
+# PIPELINE
+# ==============================================================================
+def simplify_file(input_file, output_file, ratio=0.15, tolerance=WELD_TOLERANCE,
+                  verbose=True):
+    """
+    Carrega, limpa, decima e grava a malha, reportando contagens e desvio.
+
+    DAE de entrada e saída preservam o up_axis e a matriz do nó da cena.
+
+    Returns:
+        dict com as estatísticas
+    """
+    vertices, faces = load_mesh(input_file)
+    if len(faces) == 0:
+        raise ValueError(f"{input_file}: nenhum triângulo lido (arquivo vazio ou ponteiro do Git LFS?)")
+    stats = {"faces_in": len(faces), "vertices_in": len(vertices)}
+
+    vertices, faces = clean_mesh(vertices, faces, tolerance)
+    stats["faces_clean"] = len(faces)
+    stats["vertices_clean"] = len(vertices)
+    if verbose:
+        print(f"📐 Triângulos originais: {stats['faces_in']:,} ({stats['vertices_in']:,} vértices)")
+        print(f"🧹 Após limpeza:         {stats['faces_clean']:,} ({stats['vertices_clean']:,} vértices)")
+
+    if ratio < 1.0:
+        new_v, new_f, rep = decimate(vertices, faces, ratio=ratio, verbose=False)
+        dev = surface_deviation(vertices, new_v, new_f, rep)
+    else:
+        new_v, new_f = vertices, faces
+        dev = np.zeros(len(vertices))
+
+    diag = float(np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0)))
+    stats.update({
+        "faces_out": len(new_f),
+        "vertices_out": len(new_v),
+        "max_deviation": float(dev.max()) if len(dev) else 0.0,
+        "mean_deviation": float(dev.mean()) if len(dev) else 0.0,
+        "diagonal": diag,
+    })
+
+    if verbose:
+        reduction = (1 - stats["faces_out"] / max(stats["faces_in"], 1)) * 100
+        print(f"📐 Triângulos finais:    {stats['faces_out']:,} ({stats['vertices_out']:,} vértices)")
+        print(f"📉 Redução: {reduction:.1f}%")
+        print(f"📏 Desvio máximo: {stats['max_deviation'] * 1000:.3f} mm "
+              f"({stats['max_deviation'] / max(diag, 1e-12) * 100:.3f}% da diagonal)")
+        print(f"📏 Desvio médio:  {stats['mean_deviation'] * 1000:.3f} mm")
+
+    options = {}
+    if output_file.lower().endswith('.dae') and input_file.lower().endswith('.dae'):
+        options = {"up_axis": read_up_axis(input_file),
+                   "matrix": read_node_matrix(input_file)}
+    name = os.path.splitext(os.path.basename(output_file))[0]
+    write_mesh(output_file, new_v, new_f, name=name, **options)
+    if verbose:
+        print(f"💾 Exportado: {output_file}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Limpeza e decimação de malhas sem Blender")
+    parser.add_argument("input", help="Malha de entrada (.dae, .stl, .obj, .ply)")
+    parser.add_argument("output", help="Malha de saída (.dae, .stl, .obj)")
+    parser.add_argument("--ratio", type=float, default=0.15,
+                        help="Fração de triângulos a manter (1.0 = só limpeza)")
+    parser.add_argument("--weld", type=float, default=WELD_TOLERANCE,
+                        help="Tolerância para unir vértices (m)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"❌ Arquivo não encontrado: {args.input}")
+        sys.exit(1)
+
+    print(f"🔧 Otimizando malha: {args.input}")
+    try:
+        simplify_file(args.input, args.output, args.ratio, args.weld)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("✅ Otimização concluída!")
+
+
+if __name__ == "__main__":
+    main()
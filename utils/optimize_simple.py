@@ -1,29 +1,23 @@
-import bpy
-import sys
-
-# Limpar cena
-bpy.ops.wm.read_factory_settings(use_empty=True)
-
-# Importar PLY
-print("Importando PLY...")
-bpy.ops.import_mesh.ply(filepath="models/catia/2_Torre_temp.ply")
+#!/usr/bin/env python3
+"""
+Decimação da torre (12% dos polígonos) sem Blender.
 
-# Selecionar objeto
-obj = bpy.context.selected_objects[0]
-bpy.context.view_layer.objects.active = obj
-
-print(f"Polígonos originais: {len(obj.data.polygons):,}")
+Uso (a partir da raiz do projeto):
+    python3 utils/optimize_simple.py
+"""
+import sys
 
-# Aplicar Decimate
-print("Aplicando Decimate...")
-mod = obj.modifiers.new(name="Decimate", type='DECIMATE')
-mod.ratio = 0.12  # 12% dos polígonos
-bpy.ops.object.modifier_apply(modifier="Decimate")
+from mesh_simplify import simplify_file
 
-print(f"Polígonos finais: {len(obj.data.polygons):,}")
+INPUT_FILE = "models/catia/2_Torre_temp.ply"
+OUTPUT_FILE = "models/catia/2_Torre.dae"
+RATIO = 0.12  # 12% dos polígonos
 
-# Exportar como DAE
-print("Exportando DAE...")
-bpy.ops.wm.collada_export(filepath="models/catia/2_Torre.dae", apply_modifiers=True)
+print(f"Processando {INPUT_FILE}...")
+try:
+    simplify_file(INPUT_FILE, OUTPUT_FILE, RATIO)
+except (OSError, ValueError) as e:
+    print(f"❌ {e}")
+    sys.exit(1)
 
 print("✅ Concluído!")
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Gerador de formas de onda travado no tempo de simulação.
+
+06_torque_control_gui.py amostrava sin(2πft) num QTimer de 50 Hz com o
+último sim_time recebido, e 05_balls_control_gui.py usava time.time() a
+20 Hz: excitação acima de ~5-10 Hz saía com aliasing e as esferas
+derivavam em relação ao tempo simulado. WaveformEngine publica todos os
+canais cmd_force / cmd_pos de uma thread própria, na taxa da física:
+
+- SimClock acompanha /world/<world>/stats e estima o tempo simulado entre
+  as mensagens (fator de tempo real medido); com a simulação pausada a
+  estimativa para em até dois intervalos de stats
+- as amostras de cada canal são calculadas em blocos (vetorizado) na grade
+  k / rate do tempo simulado; a cada instante é publicada a amostra k
+  corrente. Amostras que a thread não alcançou são contadas em `skipped`
+  (cmd_force / cmd_pos valem pelo último valor recebido)
+- formas de onda são funções puras do tempo: trocar parâmetros com o mesmo
+  tipo e frequência mantém a fase
+
+Formas: Constant, Sine, Chirp (linear/log), Multisine (fases de
+Schroeder, periódica), PRBS (LFSR de comprimento máximo) e Step, somáveis
+com "+" (constante + senoide como no 06); Window limita uma forma a um
+intervalo do tempo simulado.
+
+Uso:
+    engine = WaveformEngine(node, rate=1000.0)
+    engine.set_waveform(cmd_force_topic("joint_cylinder"),
+                        Constant(50.0) + Chirp(200.0, 0.5, 100.0, duration=60.0))
+    engine.start()
+    ...
+    engine.stop()                # publica o valor de repouso de cada canal
+
+    python3 waveforms.py joint_cylinder chirp --amp 200 --f0 0.5 --f1 100 --duration 60
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from sim_transport import (MODEL_NAME, WORLD_NAME, Double, Node, WorldStatistics,
+                           cmd_force_topic, cmd_pos_topic, stats_topic)
+
+CMD_FORCE_JOINTS = ("joint_cylinder", "joint_cylinder_green")
+CMD_POS_JOINTS = ("joint_azimuth", "joint_elevation",
+                  "joint_sphere_1", "joint_sphere_2", "joint_sphere_3")
+
+DEFAULT_RATE = 1000.0     # Hz, max_step_size 0.001 do SDF
+BLOCK_SAMPLES = 256       # amostras pré-calculadas por canal
+MAX_SLEEP = 0.02          # s de relógio; limita a latência a trocas de forma
+
+
+# ==============================================================================
+# FORMAS DE ONDA
+# ==============================================================================
+class Waveform:
+    """Função vetorizada do tempo (s) -> valor; subclasses implementam __call__."""
+
+    def __init__(self, *args):
+        self.args = args
+
+    def __call__(self, t):
+        raise NotImplementedError
+
+    def __add__(self, other):
+        return Sum(self, other)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.args == other.args
+
+    def __hash__(self):
+        return hash((type(self), self.args))
+
+    def __repr__(self):
+        return f"{type(self).__name__}{self.args}"
+
+
+class Sum(Waveform):
+    def __init__(self, *parts):
+        super().__init__(*parts)
+        self.parts = parts
+
+    def __call__(self, t):
+        return sum(p(t) for p in self.parts)
+
+
+class Constant(Waveform):
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
+
+    def __call__(self, t):
+        return np.full(np.shape(t), float(self.value))
+
+
+class Sine(Waveform):
+    def __init__(self, amp, freq, phase=0.0):
+        super().__init__(amp, freq, phase)
+        self.amp, self.freq, self.phase = amp, freq, phase
+
+    def __call__(self, t):
+        return self.amp * np.sin(2 * np.pi * self.freq * np.asarray(t) + self.phase)
+
+
+class Chirp(Waveform):
+    """
+    Varredura de f0 a f1 em duration segundos (log ou linear); repeat=True
+    recomeça a cada duration, senão o sinal é zero depois do fim.
+    """
+
+    def __init__(self, amp, f0, f1, duration, method="log", repeat=True):
+        super().__init__(amp, f0, f1, duration, method, repeat)
+        if method == "log" and (f0 <= 0 or f1 <= 0):
+            raise ValueError("Chirp logarítmico precisa de f0, f1 > 0")
+        self.amp, self.f0, self.f1, self.duration = amp, f0, f1, duration
+        self.method, self.repeat = method, repeat
+
+    def frequency(self, t):
+        """Frequência instantânea (Hz)."""
+        tau = np.mod(t, self.duration) if self.repeat else np.minimum(t, self.duration)
+        if self.method == "log":
+            return self.f0 * (self.f1 / self.f0) ** (tau / self.duration)
+        return self.f0 + (self.f1 - self.f0) * tau / self.duration
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        tau = np.mod(t, self.duration) if self.repeat else t
+        T = self.duration
+        if self.method == "log":
+            k = self.f1 / self.f0
+            phase = self.f0 * T / math.log(k) * (k ** (tau / T) - 1) if k != 1 else self.f0 * tau
+        else:
+            phase = self.f0 * tau + (self.f1 - self.f0) * tau ** 2 / (2 * T)
+        y = self.amp * np.sin(2 * np.pi * phase)
+        return y if self.repeat else np.where((t >= 0) & (t <= T), y, 0.0)
+
+
+class Multisine(Waveform):
+    """
+    Soma de cossenos nas harmônicas de 1/period entre f0 e f1 (n linhas,
+    log-espaçadas) com fases de Schroeder; escalada para pico = amp.
+    Periódica em period: a FRF sai sem vazamento com segmentos múltiplos
+    de period. part=(i, m) fica só com as linhas i, i + m, ...: m sinais
+    com linhas intercaladas não se correlacionam (excitação MIMO).
+    """
+
+    def __init__(self, amp, f0, f1, n=50, period=10.0, part=(0, 1)):
+        super().__init__(amp, f0, f1, n, period, tuple(part))
+        df = 1.0 / period
+        lo = max(f0, df)
+        harmonics = np.unique(np.round(np.geomspace(lo, f1, n) / df)).astype(int)
+        harmonics = harmonics[harmonics > 0][part[0]::part[1]]
+        self.freqs = harmonics * df
+        m = len(self.freqs)
+        self.phases = -np.pi * np.arange(m) * (np.arange(m) - 1) / m
+        grid = np.linspace(0.0, period, 8192, endpoint=False)
+        peak = np.abs(self._raw(grid)).max()
+        self.scale = amp / peak if peak > 0 else 0.0
+        self.period = period
+
+    def _raw(self, t):
+        t = np.asarray(t, dtype=float)
+        return np.cos(2 * np.pi * t[..., None] * self.freqs + self.phases).sum(axis=-1)
+
+    def __call__(self, t):
+        return self.scale * self._raw(t)
+
+
+# Taps (1-indexados) de LFSRs de Fibonacci de comprimento máximo
+_LFSR_TAPS = {5: (5, 3), 6: (6, 5), 7: (7, 6), 8: (8, 6, 5, 4), 9: (9, 5), 10: (10, 7),
+              11: (11, 9), 12: (12, 11, 10, 4), 13: (13, 12, 11, 8), 14: (14, 13, 12, 2),
+              15: (15, 14), 16: (16, 15, 13, 4)}
+
+
+class PRBS(Waveform):
+    """±amp numa sequência de comprimento máximo (2^order - 1 bits) a clock Hz."""
+
+    def __init__(self, amp, clock, order=10, seed=1):
+        super().__init__(amp, clock, order, seed)
+        if order not in _LFSR_TAPS:
+            raise ValueError(f"Ordem do PRBS entre {min(_LFSR_TAPS)} e {max(_LFSR_TAPS)}")
+        self.amp, self.clock = amp, clock
+        taps = [t - 1 for t in _LFSR_TAPS[order]]
+        seed = seed % 2 ** order or 1        # estado nulo trava o registrador
+        state = [(seed >> i) & 1 for i in range(order)]
+        bits = np.empty(2 ** order - 1, dtype=np.int8)
+        for i in range(len(bits)):
+            bits[i] = state[-1]
+            feedback = 0
+            for t in taps:
+                feedback ^= state[t]
+            state = [feedback] + state[:-1]
+        self.bits = 2 * bits.astype(float) - 1
+
+    def __call__(self, t):
+        idx = np.floor(np.asarray(t, dtype=float) * self.clock).astype(np.int64)
+        return self.amp * self.bits[np.mod(idx, len(self.bits))]
+
+
+class Step(Waveform):
+    def __init__(self, amp, t0=0.0, base=0.0):
+        super().__init__(amp, t0, base)
+        self.amp, self.t0, self.base = amp, t0, base
+
+    def __call__(self, t):
+        return np.where(np.asarray(t) >= self.t0, self.base + self.amp, self.base)
+
+
+class Window(Waveform):
+    """waveform(t - start) entre start e start + duration; zero fora (None = sem fim)."""
+
+    def __init__(self, waveform, start=0.0, duration=None):
+        super().__init__(waveform, start, duration)
+        self.waveform, self.start, self.duration = waveform, start, duration
+
+    def __call__(self, t):
+        t = np.asarray(t, dtype=float)
+        inside = t >= self.start
+        if self.duration is not None:
+            inside &= t < self.start + self.duration
+        return np.where(inside, self.waveform(t - self.start), 0.0)
+
+
+WAVEFORMS = {"constant": Constant, "sine": Sine, "chirp": Chirp, "multisine": Multisine,
+             "prbs": PRBS, "step": Step, "window": Window}
+
+
+def make_waveform(spec):
+    """
+    Forma de onda a partir de um dict {"type": nome, parâmetros...}
+    (arquivos de cenário) ou de uma lista deles (somados); em "window" o
+    campo "waveform" é outra especificação.
+    """
+    if isinstance(spec, (list, tuple)):
+        parts = [make_waveform(s) for s in spec]
+        return parts[0] if len(parts) == 1 else Sum(*parts)
+    params = dict(spec)
+    kind = params.pop("type")
+    if "waveform" in params:
+        params["waveform"] = make_waveform(params["waveform"])
+    if kind not in WAVEFORMS:
+        raise ValueError(f"Forma de onda desconhecida: {kind!r} (use {', '.join(WAVEFORMS)})")
+    return WAVEFORMS[kind](**params)
+
+
+# ==============================================================================
+# RELÓGIO E MOTOR
+# ==============================================================================
+class SimClock:
+    """
+    Tempo simulado entre as mensagens de stats: último sim_time recebido +
+    fator de tempo real x tempo de relógio desde então, até dois intervalos
+    de stats à frente (simulação pausada ou travada não avança o relógio).
+    Fator e intervalo vêm das últimas `window` mensagens, para que rajadas
+    de entrega do transporte não distorçam a estimativa.
+    """
+
+    def __init__(self, window=20):
+        self.lock = threading.Lock()
+        self.ticks = deque(maxlen=window)
+        self.sim = None
+        self.wall = None
+        self.rtf = 1.0
+        self.interval = 0.0
+        self.resets = 0
+
+    def tick(self, sim_time, wall=None):
+        wall = time.perf_counter() if wall is None else wall
+        with self.lock:
+            if self.sim is not None and sim_time < self.sim:
+                self.resets += 1          # mundo reiniciado
+                self.ticks.clear()
+            self.ticks.append((sim_time, wall))
+            self.sim, self.wall = sim_time, wall
+            if len(self.ticks) > 1:
+                (s0, w0), (s1, w1) = self.ticks[0], self.ticks[-1]
+                if w1 > w0:
+                    self.rtf = (s1 - s0) / (w1 - w0)
+                    self.interval = (w1 - w0) / (len(self.ticks) - 1)
+
+    def on_stats(self, msg):
+        self.tick(msg.sim_time.sec + msg.sim_time.nsec * 1e-9)
+
+    def now(self, wall=None):
+        """Tempo simulado estimado (s) ou None antes da primeira mensagem."""
+        wall = time.perf_counter() if wall is None else wall
+        with self.lock:
+            if self.sim is None:
+                return None
+            ahead = max(wall - self.wall, 0.0)
+            if self.interval:
+                ahead = min(ahead, 2 * self.interval)
+            return self.sim + self.rtf * ahead
+
+
+class Channel:
+    """
+    Tópico de comando (Double) do motor.
+
+    Args:
+        rest: valor publicado ao desligar a forma ou parar o motor
+        limits: (mín, máx) aplicados às amostras, ou None
+    """
+
+    def __init__(self, topic, rest=0.0, limits=None):
+        self.topic = topic
+        self.rest = rest
+        self.limits = limits
+        self.waveform = None
+
+
+def default_channels(model=MODEL_NAME):
+    """cmd_force dos cilindros e cmd_pos das juntas PID e das esferas."""
+    topics = [cmd_force_topic(j, model) for j in CMD_FORCE_JOINTS]
+    topics += [cmd_pos_topic(j, model) for j in CMD_POS_JOINTS]
+    return [Channel(t) for t in topics]
+
+
+class WaveformEngine:
+    """
+    Publica as formas de onda dos canais na grade k / rate do tempo simulado.
+
+    Args:
+        node: nó de transporte (anuncia os tópicos e assina stats)
+        channels: lista de Channel (padrão: default_channels())
+        rate: taxa de amostragem (Hz)
+        origin: tempo simulado do t = 0 das formas; None = instante do
+                start() / reset_origin(); 0.0 = tempo absoluto (fase do 06)
+    """
+
+    def __init__(self, node, channels=None, rate=DEFAULT_RATE, origin=None,
+                 world=WORLD_NAME, block=BLOCK_SAMPLES):
+        self.node = node
+        self.rate = rate
+        self.block = block
+        self.fixed_origin = origin
+        self.origin = origin
+        self.channels = {c.topic: c for c in (channels or default_channels())}
+        self.publishers = {t: node.advertise(t, Double) for t in self.channels}
+        self.clock = SimClock()
+        node.subscribe(WorldStatistics, stats_topic(world), self.clock.on_stats)
+
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.last = {}
+        self.k_last = None
+        self.published = 0
+        self.skipped = 0
+        self._resets = 0
+        self._block_start = None
+        self._block_topics = ()
+        self._block_values = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -- Configuração --
+    def set_waveform(self, topic, waveform):
+        """Troca a forma do canal; None publica o repouso uma vez e silencia."""
+        with self.lock:
+            channel = self.channels[topic]
+            if channel.waveform == waveform:
+                return
+            channel.waveform = waveform
+            self._block_start = None
+            if waveform is None and self.running:
+                self._publish(topic, channel.rest)
+
+    def add_listener(self, callback):
+        """callback(t_sim, k, {tópico: valor}) a cada amostra publicada (thread do motor)."""
+        self.listeners.append(callback)
+
+    def reset_origin(self):
+        """t = 0 das formas no tempo simulado atual (sincroniza as fases)."""
+        with self.lock:
+            self.origin = self.clock.now() if self.fixed_origin is None else self.fixed_origin
+            self.k_last = None
+            self._block_start = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self.reset_origin()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="waveforms", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, publish_rest=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        if publish_rest:
+            for topic, channel in self.channels.items():
+                self._publish(topic, channel.rest)
+
+    # -- Amostragem --
+    def samples(self, k):
+        """{tópico: valor} da amostra k (tempo origin + k / rate) dos canais ativos."""
+        with self.lock:
+            if self._block_start is None or not (self._block_start <= k < self._block_start + self.block):
+                self._fill_block(k)
+            i = k - self._block_start
+            return {t: float(v[i]) for t, v in zip(self._block_topics, self._block_values)}
+
+    def _fill_block(self, k):
+        t = (k + np.arange(self.block)) / self.rate
+        topics, values = [], []
+        for topic, channel in self.channels.items():
+            if channel.waveform is None:
+                continue
+            v = np.broadcast_to(channel.waveform(t), t.shape).astype(float)
+            if channel.limits is not None:
+                v = np.clip(v, *channel.limits)
+            topics.append(topic)
+            values.append(v)
+        self._block_start = k
+        self._block_topics = tuple(topics)
+        self._block_values = values
+
+    def _publish(self, topic, value):
+        msg = Double()
+        msg.data = value
+        self.publishers[topic].publish(msg)
+        self.last[topic] = value
+
+    def _run(self):
+        while not self._stop.is_set():
+            t = self.clock.now()
+            if t is None:
+                self._stop.wait(MAX_SLEEP)
+                continue
+            if self.origin is None or self.clock.resets != self._resets:
+                self._resets = self.clock.resets
+                self.reset_origin()
+            k = int(math.floor((t - self.origin) * self.rate + 1e-9))
+            if self.k_last is None or k > self.k_last:
+                if self.k_last is not None:
+                    self.skipped += k - self.k_last - 1
+                self.k_last = k
+                values = self.samples(k)
+                for topic, value in values.items():
+                    self._publish(topic, value)
+                self.published += 1
+                for callback in self.listeners:
+                    callback(self.origin + k / self.rate, k, values)
+            # dorme até a próxima amostra (em tempo de relógio)
+            wait = (self.origin + (k + 1) / self.rate - t) / max(self.clock.rtf, 1e-3)
+            self._stop.wait(min(max(wait, 0.0), MAX_SLEEP))
+
+
+# ==============================================================================
+# LINHA DE COMANDO
+# ==============================================================================
+def _cli_shapes(args):
+    """Formas montáveis pelos argumentos da linha de comando ("window" precisa de outra forma)."""
+    return {
+        "constant": lambda: Constant(args.amp),
+        "sine": lambda: Sine(args.amp, args.freq),
+        "chirp": lambda: Chirp(args.amp, args.f0, args.f1, args.sweep),
+        "multisine": lambda: Multisine(args.amp, args.f0, args.f1, args.lines, args.period),
+        "prbs": lambda: PRBS(args.amp, args.clock, args.order),
+        "step": lambda: Step(args.amp),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excitação de uma junta travada no tempo simulado")
+    parser.add_argument("joint", help="joint_cylinder, joint_azimuth, joint_sphere_1, ...")
+    parser.add_argument("kind", choices=sorted(_cli_shapes(None)))
+    parser.add_argument("--amp", type=float, default=100.0, help="Amplitude (Nm, rad ou m)")
+    parser.add_argument("--offset", type=float, default=0.0)
+    parser.add_argument("--freq", type=float, default=1.0, help="sine")
+    parser.add_argument("--f0", type=float, default=0.5, help="chirp / multisine")
+    parser.add_argument("--f1", type=float, default=50.0, help="chirp / multisine")
+    parser.add_argument("--sweep", type=float, default=60.0, help="Duração do chirp (s)")
+    parser.add_argument("--lines", type=int, default=50, help="Linhas do multisine")
+    parser.add_argument("--period", type=float, default=10.0, help="Período do multisine (s)")
+    parser.add_argument("--clock", type=float, default=100.0, help="Clock do PRBS (Hz)")
+    parser.add_argument("--order", type=int, default=10, help="Ordem do PRBS")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE)
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Segundos de simulação (padrão: até Ctrl+C)")
+    args = parser.parse_args()
+
+    topic = (cmd_force_topic if args.joint in CMD_FORCE_JOINTS else cmd_pos_topic)(args.joint)
+    waveform = _cli_shapes(args)[args.kind]()
+    if args.offset:
+        waveform = Constant(args.offset) + waveform
+
+    node = Node()
+    engine = WaveformEngine(node, [Channel(topic, rest=args.offset)], rate=args.rate)
+    engine.set_waveform(topic, waveform)
+    engine.start()
+    print(f"🌊 {waveform} -> {topic} a {args.rate:.0f} Hz (Ctrl+C para parar)")
+    try:
+        while engine.clock.now() is None or args.duration is None \
+                or engine.clock.now() - engine.origin < args.duration:
+            time.sleep(1.0)
+            print(f"   t = {engine.clock.now() or 0.0:.2f} s | publicadas {engine.published} "
+                  f"| puladas {engine.skipped} | RTF {engine.clock.rtf:.2f}")
+    except KeyboardInterrupt:
+        pass
+    engine.stop()
+    print("✅ Parado (repouso publicado)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())